@@ -0,0 +1,89 @@
+"""Throughput benchmark for uploaded document extraction.
+
+Replicates the data/interview*.docx corpus into a temporary directory and
+extracts every copy twice: once inline on the event loop (how uploads used to
+be handled) and once through the DocumentExtractor process pool.
+
+run:
+  cd demo/ui && PYTHONPATH=../../samples/python:. python benchmarks/bench_extraction.py
+"""
+
+import argparse
+import asyncio
+import glob
+import os
+import shutil
+import tempfile
+import time
+
+from service.server.document_extraction import DocumentExtractor, extract_text
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "data")
+
+
+def build_corpus(target_dir: str, count: int) -> list[str]:
+    sources = sorted(glob.glob(os.path.join(DATA_DIR, "interview*.docx")))
+    if not sources:
+        raise SystemExit(f"No interview*.docx files found in {DATA_DIR}")
+    paths = []
+    for i in range(count):
+        path = os.path.join(target_dir, f"resume_{i:05d}.docx")
+        shutil.copyfile(sources[i % len(sources)], path)
+        paths.append(path)
+    return paths
+
+
+def read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+async def run_inline(paths: list[str]) -> float:
+    start = time.perf_counter()
+    for path in paths:
+        extract_text(path, read_file(path))
+    return time.perf_counter() - start
+
+
+async def run_pool(paths: list[str], workers: int, concurrency: int) -> float:
+    extractor = DocumentExtractor(max_workers=workers)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(path: str):
+        async with semaphore:
+            await extractor.extract(path, read_file(path))
+
+    # Warm up the workers so process start-up is not part of the measurement.
+    await asyncio.gather(*(one(p) for p in paths[:workers]))
+    start = time.perf_counter()
+    await asyncio.gather(*(one(p) for p in paths))
+    elapsed = time.perf_counter() - start
+    extractor.shutdown()
+    return elapsed
+
+
+def report(label: str, count: int, elapsed: float):
+    print(
+        f"{label:<8} {count} files in {elapsed:7.2f}s  {count / elapsed:8.1f} files/s"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        paths = build_corpus(corpus_dir, args.files)
+        report("inline", len(paths), await run_inline(paths))
+        report(
+            "pool",
+            len(paths),
+            await run_pool(paths, args.workers, args.concurrency),
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+"""Memory benchmark for the conversation file cache.
+
+Feeds a conversation with image artifacts through ConversationServer style
+caching twice: once with the old unbounded dict of base64 encoded parts and
+once with the bounded FileStore, reporting traced peak and retained memory.
+
+run:
+  cd demo/ui && PYTHONPATH=../../samples/python:. python benchmarks/bench_file_cache.py
+"""
+
+import argparse
+import base64
+import os
+import tempfile
+import tracemalloc
+import uuid
+
+from service.server.file_store import FileStore
+
+
+def make_artifacts(count: int, size: int):
+    """Yields base64 encoded artifacts as they would arrive in messages."""
+    payload = os.urandom(size)
+    for _ in range(count):
+        yield base64.b64encode(payload).decode()
+
+
+def run_legacy(count: int, size: int) -> dict[str, str]:
+    cache = {}
+    for encoded in make_artifacts(count, size):
+        # The old cache kept every base64 part alive for the process lifetime.
+        cache[str(uuid.uuid4())] = encoded
+    return cache
+
+
+def run_store(count: int, size: int, max_bytes: int, spill_dir: str) -> FileStore:
+    store = FileStore(max_memory_bytes=max_bytes, spill_dir=spill_dir)
+    for encoded in make_artifacts(count, size):
+        store.put(str(uuid.uuid4()), base64.b64decode(encoded), "image/png")
+    return store
+
+
+def measure(label: str, fn, *args):
+    tracemalloc.start()
+    result = fn(*args)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<10} retained {current / 2**20:8.1f} MiB  peak {peak / 2**20:8.1f} MiB"
+    )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--artifacts", type=int, default=1000)
+    parser.add_argument("--size-kb", type=int, default=256)
+    parser.add_argument("--max-mb", type=int, default=64)
+    args = parser.parse_args()
+
+    size = args.size_kb * 1024
+    measure("legacy", run_legacy, args.artifacts, size)
+    with tempfile.TemporaryDirectory() as spill_dir:
+        store = measure(
+            "filestore", run_store, args.artifacts, size, args.max_mb * 2**20, spill_dir
+        )
+        print(f"filestore stats: {store.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark of the near-duplicate resume index.
+
+Indexes synthetic resumes, then looks up lightly edited copies of indexed
+resumes and resumes never seen before. Reports indexing throughput, lookup
+latency, recall and false positives, the number of resumes each lookup
+compared against, and the time a linear scan over all signatures would take.
+
+run:
+  cd demo/ui && PYTHONPATH=../../samples/python:. python benchmarks/bench_near_duplicates.py
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from service.server.near_duplicates import NearDuplicateIndex, text_key
+
+
+def make_resumes(count: int, words: int, rng: np.random.Generator) -> list[str]:
+    vocabulary = np.array([f"term{i}" for i in range(20_000)])
+    ids = rng.integers(0, len(vocabulary), size=(count, words))
+    return [" ".join(row) for row in vocabulary[ids]]
+
+
+def edit(text: str, rng: np.random.Generator, edits: int) -> str:
+    words = text.split()
+    for position in rng.integers(0, len(words), size=edits):
+        words[position] = "edited"
+    return " ".join(words)
+
+
+def main(count: int, words: int, lookups: int, edits: int) -> None:
+    rng = np.random.default_rng(0)
+    print(f"generating {count} resumes of {words} words...")
+    resumes = make_resumes(count, words, rng)
+    index = NearDuplicateIndex(max_entries=count)
+
+    start = time.perf_counter()
+    for resume in resumes:
+        index.add(text_key(resume), resume)
+    elapsed = time.perf_counter() - start
+    print(
+        f"indexed {count} in {elapsed:.1f}s ({count / elapsed:,.0f}/s),"
+        f" {index.bands} bands x {index.rows} rows"
+    )
+
+    picks = rng.integers(0, count, size=lookups)
+    edited = [edit(resumes[i], rng, edits) for i in picks]
+    fresh = make_resumes(lookups, words, rng)
+
+    found = 0
+    latencies = []
+    for i, text in zip(picks, edited):
+        start = time.perf_counter()
+        matches = index.query(text)
+        latencies.append(time.perf_counter() - start)
+        found += bool(matches) and matches[0].key == text_key(resumes[i])
+    false_positives = 0
+    for text in fresh:
+        start = time.perf_counter()
+        false_positives += bool(index.query(text))
+        latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+    print(f"recall ({edits} edited words): {found / lookups:.3f}")
+    print(f"false positives on new resumes: {false_positives}/{lookups}")
+    print(
+        f"lookup p50 {statistics.median(latencies) * 1000:.2f} ms,"
+        f" p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms,"
+        f" {index.stats()['avg_candidates']:.2f} resumes compared per lookup"
+    )
+
+    # What a lookup without LSH costs: comparing against every signature
+    signatures = np.stack([entry[0] for entry in index._entries.values()])
+    query = index.hasher.signature(edited[0])
+    start = time.perf_counter()
+    (signatures == query).mean(axis=1)
+    print(
+        f"linear scan of {count} signatures: {(time.perf_counter() - start) * 1000:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--words", type=int, default=300)
+    parser.add_argument("--lookups", type=int, default=1000)
+    parser.add_argument("--edits", type=int, default=5)
+    args = parser.parse_args()
+    main(args.count, args.words, args.lookups, args.edits)
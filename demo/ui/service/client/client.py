@@ -1,4 +1,6 @@
+import asyncio
 import httpx
+import weakref
 from typing import Any
 import json
 import os
@@ -19,6 +21,8 @@ from service.types import (
     ListTaskResponse,
     RegisterAgentRequest,
     RegisterAgentResponse,
+    UnregisterAgentRequest,
+    UnregisterAgentResponse,
     AgentClientHTTPError,
     ListAgentRequest,
     ListAgentResponse,
@@ -26,30 +30,60 @@ from service.types import (
     JSONRPCRequest,
     SendMessageWithFileRequest,
     SendMessageWithFileResponse,
+    GetStateSnapshotRequest,
+    GetStateSnapshotResponse,
 )
-import json
 
 
 class ConversationClient:
+    """Client for the ConversationServer JSON-RPC endpoints.
+
+    The client keeps a pooled httpx.AsyncClient so that repeated calls reuse
+    open connections instead of opening a new one per request. httpx clients
+    are bound to the event loop they were first used on, so one pooled client
+    is kept per running loop.
+    """
 
-    def __init__(self, base_url):
+    def __init__(self, base_url, max_connections: int = 10):
         self.base_url = base_url.rstrip("/")
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self._clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, httpx.AsyncClient
+        ] = weakref.WeakKeyDictionary()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Returns the pooled client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(limits=self._limits)
+            self._clients[loop] = client
+        return client
+
+    async def aclose(self):
+        """Closes the pooled client of the running event loop."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
 
     async def send_message(self, payload: SendMessageRequest) -> SendMessageResponse:
         return SendMessageResponse(**await self._send_request(payload))
 
     async def _send_request(self, request: JSONRPCRequest) -> dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    self.base_url + "/" + request.method, json=request.model_dump()
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                raise AgentClientHTTPError(e.response.status_code, str(e)) from e
-            except json.JSONDecodeError as e:
-                raise AgentClientJSONError(str(e)) from e
+        client = self._get_client()
+        try:
+            response = await client.post(
+                self.base_url + "/" + request.method, json=request.model_dump()
+            )
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            raise AgentClientHTTPError(e.response.status_code, str(e)) from e
+        except json.JSONDecodeError as e:
+            raise AgentClientJSONError(str(e)) from e
 
     async def send_message_with_file(
         self, payload: SendMessageWithFileRequest, file_path: str = None
@@ -66,37 +100,35 @@ class ConversationClient:
         ):
             print(f"[DEBUG] Client: Using multipart form data for file upload")
             # Handle actual file upload with multipart form data
-            async with httpx.AsyncClient() as client:
-                try:
-                    files = {}
-                    data = {"message": payload.model_dump_json()}
-                    print(f"[DEBUG] Client: message JSON being sent: {data['message']}")
-
-                    # Add file if file_path exists and file exists
-                    actual_file_path = payload.params.metadata.get(
-                        "file_path", file_path
-                    )
-                    if actual_file_path and os.path.exists(actual_file_path):
-                        with open(actual_file_path, "rb") as f:
-                            files["file"] = (
-                                os.path.basename(actual_file_path),
-                                f.read(),
-                            )
-                        print(
-                            f"[DEBUG] Client: Added file to multipart: {os.path.basename(actual_file_path)}"
+            client = self._get_client()
+            try:
+                files = {}
+                data = {"message": payload.model_dump_json()}
+                print(f"[DEBUG] Client: message JSON being sent: {data['message']}")
+
+                # Add file if file_path exists and file exists
+                actual_file_path = payload.params.metadata.get("file_path", file_path)
+                if actual_file_path and os.path.exists(actual_file_path):
+                    with open(actual_file_path, "rb") as f:
+                        files["file"] = (
+                            os.path.basename(actual_file_path),
+                            f.read(),
                         )
-
-                    response = await client.post(
-                        self.base_url + "/" + payload.method,
-                        data=data,
-                        files=files if files else None,
+                    print(
+                        f"[DEBUG] Client: Added file to multipart: {os.path.basename(actual_file_path)}"
                     )
-                    response.raise_for_status()
-                    return SendMessageWithFileResponse(**response.json())
-                except httpx.HTTPStatusError as e:
-                    raise AgentClientHTTPError(e.response.status_code, str(e)) from e
-                except json.JSONDecodeError as e:
-                    raise AgentClientJSONError(str(e)) from e
+
+                response = await client.post(
+                    self.base_url + "/" + payload.method,
+                    data=data,
+                    files=files if files else None,
+                )
+                response.raise_for_status()
+                return SendMessageWithFileResponse(**response.json())
+            except httpx.HTTPStatusError as e:
+                raise AgentClientHTTPError(e.response.status_code, str(e)) from e
+            except json.JSONDecodeError as e:
+                raise AgentClientJSONError(str(e)) from e
         else:
             print(
                 f"[DEBUG] Client: Using regular JSON request (no file or no file_path in metadata)"
@@ -133,5 +165,15 @@ class ConversationClient:
     ) -> RegisterAgentResponse:
         return RegisterAgentResponse(**await self._send_request(payload))
 
+    async def unregister_agent(
+        self, payload: UnregisterAgentRequest
+    ) -> UnregisterAgentResponse:
+        return UnregisterAgentResponse(**await self._send_request(payload))
+
     async def list_agents(self, payload: ListAgentRequest) -> ListAgentResponse:
         return ListAgentResponse(**await self._send_request(payload))
+
+    async def get_state_snapshot(
+        self, payload: GetStateSnapshotRequest
+    ) -> GetStateSnapshotResponse:
+        return GetStateSnapshotResponse(**await self._send_request(payload))
@@ -1,5 +1,4 @@
 import asyncio
-import base64
 import datetime
 import json
 import os
@@ -22,21 +21,41 @@ from common.types import (
     FileContent,
     Part,
 )
+from common.utils.blob_store import blob_file_content, is_blob_uri, read_file_bytes
 from hosts.multiagent.host_agent import HostAgent  # Assuming this path is correct
 from hosts.multiagent.remote_agent_connection import (  # Assuming this path is correct
     TaskCallbackArg,
 )
+from hosts.multiagent.context_budget import ContextBudgeter
+from hosts.multiagent.router import IntentRouter
 from utils.agent_card import get_agent_card  # Assuming this path is correct
+from service.server.adk_services import create_adk_services
 from service.server.application_manager import ApplicationManager
 from google.adk import Runner
-from google.adk.sessions.in_memory_session_service import InMemorySessionService
-from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
-from google.adk.artifacts import InMemoryArtifactService
 from google.adk.events.event import Event as ADKEvent
 from google.adk.events.event_actions import EventActions as ADKEventActions
 from google.genai import types
 from google.genai.types import GenerateContentResponse as GenAIEvent
 
+# Host rules stored once in each session's state when the session is created.
+HOST_SYSTEM_INSTRUCTIONS = (
+    "You MUST follow these rules strictly:\n\n"
+    "- You are a host agent for a recruitment team that intelligently routes messages to remote agents.\n"
+    "- ANALYZE user intent first. Look for keywords and context to automatically select the appropriate agent:\n"
+    "  * Keywords like 'rate', 'rating', 'evaluate', 'assessment', 'score', 'rank' candidate → Use AutoGen Candidate Rating Agent\n"
+    "  * Keywords like 'background check', 'verify background', 'criminal record', 'employment history' → Use background check agent\n"
+    "  * If user mentions specific agent name → Use that agent\n"
+    "- If you can identify the appropriate agent from user intent, automatically call `send_task` with the identified agent.\n"
+    "- You MUST NOT ask the user to pick an agent if `target_agent_url` exists.\n"
+    "- If `target_agent_url` exists in session state, IMMEDIATELY call the `send_task` tool using the user's input.\n"
+    "- DO NOT prompt or clarify. If `target_agent_url` is present, just call `send_task`.\n"
+    "- Only ask the user to select an agent if you cannot determine intent and no `target_agent_url` is present.\n"
+    "- If the user asks for a list of available agents, call `list_remote_agents`.\n"
+    "- When receiving responses from remote agents, preserve ALL detailed information, analysis, and recommendations.\n"
+    "- Provide summaries that include numerical and detailed analysis, and reasoning from the remote agent responses.\n"
+    "- Never truncate or oversimplify the rich content provided by specialized agents."
+)
+
 
 class ADKHostManager(ApplicationManager):
     """An implementation of memory based management with agent actions.
@@ -59,11 +78,18 @@ class ADKHostManager(ApplicationManager):
         self._artifact_chunks: dict[str, dict[int, Artifact]] = {}
         self._task_map: dict[str, str] = {}  # Maps message_id to task_id
 
-        # Initialize ADK services
-        self._session_service = InMemorySessionService()
-        self._artifact_service = InMemoryArtifactService()
-        self._memory_service = InMemoryMemoryService()
+        # Initialize ADK services (in memory or local SQLite/file backed,
+        # see ADK_SERVICES_BACKEND)
+        (
+            self._session_service,
+            self._artifact_service,
+            self._memory_service,
+        ) = create_adk_services()
         self._host_agent = HostAgent([], self.task_callback)
+        self._router = IntentRouter()
+        # Shared by every HostAgent built so savings metrics survive re-init
+        self._context_budgeter = ContextBudgeter()
+        self._host_agent.context_budgeter = self._context_budgeter
         self._ready_event = asyncio.Event()
 
         # Configuration
@@ -146,6 +172,8 @@ class ADKHostManager(ApplicationManager):
 
         # Build HostAgent with up-to-date agent list
         self._host_agent = HostAgent(self._agents, self.task_callback)
+        self._host_agent.context_budgeter = self._context_budgeter
+        self._router.set_agents(self._agents)
 
         agent_logic = self._host_agent.create_agent()
 
@@ -163,11 +191,11 @@ class ADKHostManager(ApplicationManager):
         """Creates a new conversation session."""
         print("[INFO] Creating new conversation...")
         session = self._session_service.create_session(
-            app_name=self.app_name, user_id=self.user_id
+            app_name=self.app_name,
+            user_id=self.user_id,
+            state=initial_session_state(),
         )
         conversation_id = session.id
-
-        session.state = {}
         print(
             f"[DEBUG] Initialized state for newly created ADK session {conversation_id} in create_conversation."
         )
@@ -276,6 +304,16 @@ class ADKHostManager(ApplicationManager):
             )
 
         target_agent_url = message.metadata.get("remote_agent_url")
+        state_update["target_agent_name"] = None
+        if not target_agent_url and message.role == "user":
+            # Resolve clear intents locally so the host agent does not have to
+            decision = self._router.route(get_message_text(message), conversation_id)
+            if decision:
+                target_agent_url = decision.agent_url
+                state_update["target_agent_name"] = decision.agent_name
+                print(
+                    f"[INFO] Router picked {decision.agent_name} ({decision.method}, confidence {decision.confidence})"
+                )
         if target_agent_url:
             state_update["target_agent_url"] = target_agent_url
             print(
@@ -292,98 +330,7 @@ class ADKHostManager(ApplicationManager):
 
         # 🧠 Session Management
         try:
-            session = self._session_service.get_session(
-                app_name=self.app_name,
-                user_id=self.user_id,
-                session_id=conversation_id,
-            )
-            if session is None:
-                print(
-                    f"[WARN] No session found, creating new session {conversation_id}."
-                )
-                session = self._session_service.create_session(
-                    app_name=self.app_name,
-                    user_id=self.user_id,
-                    session_id=conversation_id,
-                )
-                session.state = {}
-
-            if session.state is None:
-                print(
-                    f"[WARN] Session {conversation_id} exists but state was None, initializing."
-                )
-                session.state = {}
-
-            print(
-                f"[DEBUG LOCK] State before Call 1: {session.state}, Type: {type(session.state)}, ID: {id(session.state)}"
-            )
-
-            # -- Call 1: Append initial state_update
-            self._session_service.append_event(
-                session,
-                ADKEvent(
-                    id=ADKEvent.new_id(),
-                    author="host_agent",
-                    invocation_id=ADKEvent.new_id(),
-                    actions=ADKEventActions(state_delta=state_update),
-                ),
-            )
-            print(
-                f"[DEBUG LOCK] State after Call 1: {session.state}, ID: {id(session.state)}"
-            )
-
-            # -- Call 2: Inject system prompt
-            if message.role == "user":
-                if session.state is None:
-                    print(
-                        f"[WARN LOCK] State became None before Call 2. Reinitializing."
-                    )
-                    session.state = {}
-
-                system_instructions = (
-                    "You MUST follow these rules strictly:\n\n"
-                    "- You are a host agent for a recruitment team that intelligently routes messages to remote agents.\n"
-                    "- ANALYZE user intent first. Look for keywords and context to automatically select the appropriate agent:\n"
-                    "  * Keywords like 'rate', 'rating', 'evaluate', 'assessment', 'score', 'rank' candidate → Use AutoGen Candidate Rating Agent\n"
-                    "  * Keywords like 'background check', 'verify background', 'criminal record', 'employment history' → Use background check agent\n"
-                    "  * If user mentions specific agent name → Use that agent\n"
-                    "- If you can identify the appropriate agent from user intent, automatically call `send_task` with the identified agent.\n"
-                    "- You MUST NOT ask the user to pick an agent if `target_agent_url` exists.\n"
-                    "- If `target_agent_url` exists in session state, IMMEDIATELY call the `send_task` tool using the user's input.\n"
-                    "- DO NOT prompt or clarify. If `target_agent_url` is present, just call `send_task`.\n"
-                    "- Only ask the user to select an agent if you cannot determine intent and no `target_agent_url` is present.\n"
-                    "- If the user asks for a list of available agents, call `list_remote_agents`.\n"
-                    "- When receiving responses from remote agents, preserve ALL detailed information, analysis, and recommendations.\n"
-                    "- Provide summaries that include numerical and detailed analysis, and reasoning from the remote agent responses.\n"
-                    "- Never truncate or oversimplify the rich content provided by specialized agents."
-                )
-                print(
-                    f"[DEBUG LOCK] State before Call 2: {session.state}, ID: {id(session.state)}"
-                )
-
-                self._session_service.append_event(
-                    session,
-                    ADKEvent(
-                        id=ADKEvent.new_id(),
-                        author="host_agent",
-                        invocation_id=ADKEvent.new_id(),
-                        actions=ADKEventActions(
-                            state_delta={
-                                "messages": [
-                                    {
-                                        "role": "system",
-                                        "parts": [{"text": system_instructions}],
-                                    }
-                                ]
-                            }
-                        ),
-                    ),
-                )
-
-                print(
-                    f"[DEBUG LOCK] State after Call 2: {session.state}, ID: {id(session.state)}"
-                )
-
+            self._update_session_state(conversation_id, state_update)
         except Exception as e:
             print(f"[ERROR LOCK] Exception during session event appending: {e}")
             traceback.print_exc()
@@ -490,6 +437,72 @@ class ADKHostManager(ApplicationManager):
                 print(f"[DEBUG] Removed message_id {message_id} from pending list.")
             print(f"[INFO] process_message finished for message_id: {message_id}")
 
+    def _update_session_state(self, conversation_id: str, state_update: dict):
+        """Applies the per-message state to the ADK session compactly.
+
+        Only keys whose value changed are written, in a single event, and
+        earlier state-only events are pruned since their values are already
+        folded into the session state. The host instructions are part of the
+        initial session state and are not re-sent per message.
+        """
+        session = self._session_service.get_session(
+            app_name=self.app_name,
+            user_id=self.user_id,
+            session_id=conversation_id,
+        )
+        if session is None:
+            print(f"[WARN] No session found, creating new session {conversation_id}.")
+            session = self._session_service.create_session(
+                app_name=self.app_name,
+                user_id=self.user_id,
+                session_id=conversation_id,
+                state=initial_session_state(),
+            )
+        elif "messages" not in session.state:
+            # Session created without instructions (e.g. by another component)
+            state_update = {**initial_session_state(), **state_update}
+
+        delta = {
+            key: value
+            for key, value in state_update.items()
+            if key not in session.state or session.state[key] != value
+        }
+        if not delta:
+            return
+        self._session_service.append_event(
+            session,
+            ADKEvent(
+                id=ADKEvent.new_id(),
+                author="host_agent",
+                invocation_id=ADKEvent.new_id(),
+                actions=ADKEventActions(state_delta=delta),
+            ),
+        )
+        self._prune_state_events(session)
+
+    def _prune_state_events(self, session):
+        """Drops superseded state-only events from the stored session."""
+        stale = {e.id for e in session.events[:-1] if is_state_only_event(e)}
+        self._session_service.remove_events(session, stale)
+        session.events = [e for e in session.events if e.id not in stale]
+
+    def session_stats(self) -> dict[str, int]:
+        """Size of the ADK sessions backing the conversations."""
+        stats = {"sessions": 0, "events": 0, "state_bytes": 0, "bytes": 0}
+        for conversation in self._conversations:
+            session = self._session_service.get_session(
+                app_name=self.app_name,
+                user_id=self.user_id,
+                session_id=conversation.conversation_id,
+            )
+            if session is None:
+                continue
+            stats["sessions"] += 1
+            stats["events"] += len(session.events)
+            stats["state_bytes"] += len(json.dumps(session.state, default=str))
+            stats["bytes"] += len(session.model_dump_json())
+        return stats
+
     # --- Task Management Methods ---
 
     def add_task(self, task: Task):
@@ -936,6 +949,25 @@ class ADKHostManager(ApplicationManager):
             rval.append((message_id, status_hint))
         return rval
 
+    def tasks_for_message(self, message_id: str) -> list[Task]:
+        """The remote tasks the host started to answer a message.
+
+        _task_map links the message to the first task sent for it. Tasks of
+        a fan-out to several agents are found by their history: the request
+        carries the message's id, and each status message names it as its
+        last_message_id.
+        """
+        task_ids = set()
+        if message_id in self._task_map:
+            task_ids.add(self._task_map[message_id])
+        for task in self._tasks:
+            if any(
+                message_id in (get_message_id(m), get_last_message_id(m))
+                for m in task.history or []
+            ):
+                task_ids.add(task.id)
+        return [t for t in self._tasks if t.id in task_ids]
+
     def register_agent(self, url):
         """Registers a new remote agent by fetching its card."""
         print(f"[INFO] Registering agent from URL: {url}")
@@ -951,10 +983,11 @@ class ADKHostManager(ApplicationManager):
             # Avoid adding duplicate agents
             if not any(a.url == agent_data.url for a in self._agents):
                 self._agents.append(agent_data)
+                self._router.set_agents(self._agents)
+                # The runner reads the roster from the HostAgent on every turn,
+                # so the agent is added in place without rebuilding anything.
+                self._host_agent.register_agent_card(agent_data)
                 print(f"[INFO] Registered agent: {agent_data.name} ({agent_data.url})")
-                # Re-initialize the host runner with the updated agent list
-                # This is crucial for the HostAgent to be aware of the new agent
-                asyncio.create_task(self._initialize_host())
             # else:
             #     print(f"[WARN] Agent with URL {agent_data.url} already registered.")
 
@@ -962,6 +995,22 @@ class ADKHostManager(ApplicationManager):
             print(f"[ERROR] Failed to register agent from {url}: {e}")
             traceback.print_exc()
 
+    def unregister_agent(self, url: str) -> bool:
+        """Removes a remote agent; in-flight tasks for it are not interrupted."""
+        agent_data = next((a for a in self._agents if a.url == url), None)
+        if agent_data is None:
+            print(f"[WARN] No registered agent with URL {url}")
+            return False
+        self._agents.remove(agent_data)
+        self._router.set_agents(self._agents)
+        self._host_agent.unregister_agent_card(agent_data.name)
+        print(f"[INFO] Unregistered agent: {agent_data.name} ({url})")
+        return True
+
+    def context_stats(self) -> dict[str, int]:
+        """Prompt tokens before/after budgeting across host agent calls."""
+        return self._context_budgeter.stats()
+
     # --- Properties to expose state ---
 
     @property
@@ -1002,26 +1051,27 @@ class ADKHostManager(ApplicationManager):
             elif part.type == "file":
                 # Assuming FilePart has file attribute of type FileContent
                 if hasattr(part, "file") and part.file:
-                    if part.file.uri:
-                        parts.append(
-                            types.Part.from_uri(
-                                file_uri=part.file.uri, mime_type=part.file.mimeType
-                            )
-                        )
-                    elif (
-                        part.file.bytes
-                    ):  # Expects base64 encoded string? ADK expects bytes.
+                    if is_blob_uri(part.file.uri) or part.file.bytes:
+                        # Blob handles resolve to the stored bytes without a copy
                         try:
-                            file_bytes = base64.b64decode(part.file.bytes)
+                            file_bytes = read_file_bytes(part.file)
+                        except Exception as e:
+                            print(f"[ERROR] Failed to decode bytes for file part: {e}")
+                            file_bytes = None
+                        if file_bytes is not None:
                             parts.append(
-                                types.Part.from_data(  # Use from_data for bytes
+                                types.Part.from_bytes(
                                     data=file_bytes, mime_type=part.file.mimeType
                                 )
                             )
-                        except Exception as e:
-                            print(
-                                f"[ERROR] Failed to decode base64 bytes for file part: {e}"
+                        else:
+                            print(f"[WARN] File content unavailable: {part.file.uri}")
+                    elif part.file.uri:
+                        parts.append(
+                            types.Part.from_uri(
+                                file_uri=part.file.uri, mime_type=part.file.mimeType
                             )
+                        )
                     # else: print("[WARN] File part has no URI or bytes.")
                 # else: print("[WARN] File part missing 'file' attribute or FileContent.")
             # else: print(f"[WARN] Unsupported part type for ADK conversion: {part.type}")
@@ -1047,14 +1097,12 @@ class ADKHostManager(ApplicationManager):
                 # Flatten function response results into message parts
                 parts.extend(self._handle_function_response(part, conversation_id))
             elif part.inline_data:  # Raw data (bytes)
-                # Encode bytes as base64 string for JSON compatibility in our Message
-                base64_data = base64.b64encode(part.inline_data.data).decode("utf-8")
+                # Keep the bytes in the blob store and reference them by handle
                 parts.append(
                     FilePart(
-                        file=FileContent(
-                            bytes=base64_data,
-                            mimeType=part.inline_data.mime_type,
-                            # name=? # Consider adding name if available
+                        file=blob_file_content(
+                            part.inline_data.data,
+                            mime_type=part.inline_data.mime_type,
                         )
                     )
                 )
@@ -1161,15 +1209,12 @@ class ADKHostManager(ApplicationManager):
                             if adk_file_part and adk_file_part.inline_data:
                                 file_bytes = adk_file_part.inline_data.data
                                 mime_type = adk_file_part.inline_data.mime_type
-                                # Encode bytes as base64 for our FilePart
-                                base64_data = base64.b64encode(file_bytes).decode(
-                                    "utf-8"
-                                )
+                                # Reference the artifact bytes by blob handle
                                 parts.append(
                                     FilePart(
-                                        file=FileContent(
-                                            bytes=base64_data,
-                                            mimeType=mime_type,
+                                        file=blob_file_content(
+                                            file_bytes,
+                                            mime_type=mime_type,
                                             name=file_id,  # Use file ID as name
                                         )
                                     )
@@ -1211,6 +1256,31 @@ def get_message_id(m: Message | None) -> str | None:
     return None
 
 
+def initial_session_state() -> dict:
+    """State every host session starts with, including the host rules."""
+    return {
+        "messages": [{"role": "system", "parts": [{"text": HOST_SYSTEM_INSTRUCTIONS}]}]
+    }
+
+
+def is_state_only_event(event: ADKEvent) -> bool:
+    """True for bookkeeping events that only carry a state delta."""
+    return (
+        event.author == "host_agent"
+        and event.content is None
+        and event.actions is not None
+        and bool(event.actions.state_delta)
+        and not event.actions.artifact_delta
+        and not event.actions.transfer_to_agent
+        and not event.actions.escalate
+    )
+
+
+def get_message_text(m: Message) -> str:
+    """Joins the text parts of a message."""
+    return "\n".join(p.text for p in m.parts if p.type == "text")
+
+
 def get_last_message_id(m: Message | None) -> str | None:
     """Safely extracts last_message_id from message metadata."""
     if m and hasattr(m, "metadata") and m.metadata and "last_message_id" in m.metadata:
@@ -0,0 +1,582 @@
+"""Persistent, bounded ADK session, memory and artifact services.
+
+The ADK in-memory services keep every session event and artifact in RAM for
+the life of the process and lose them on restart. The services here store
+them locally instead:
+
+- SqliteSessionService keeps sessions and events in SQLite, with an LRU of
+  hot sessions in memory and TTL based expiry of idle sessions.
+- SqliteMemoryService keeps the memory index in the same database.
+- FileArtifactService writes artifact versions to disk and keeps only a
+  bounded LRU of recently used artifacts in memory.
+
+create_adk_services() picks the backend from ADK_SERVICES_BACKEND
+("memory", the default, or "sqlite"), storing data under ADK_STORAGE_DIR.
+Both session services can remove events, which the host uses to prune
+superseded state updates.
+"""
+
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Optional
+from urllib.parse import quote, unquote
+
+from google.adk.artifacts import InMemoryArtifactService
+from google.adk.artifacts.base_artifact_service import BaseArtifactService
+from google.adk.events.event import Event
+from google.adk.memory.base_memory_service import (
+    BaseMemoryService,
+    MemoryResult,
+    SearchMemoryResponse,
+)
+from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
+from google.adk.sessions import Session
+from google.adk.sessions.base_session_service import (
+    BaseSessionService,
+    GetSessionConfig,
+    ListEventsResponse,
+    ListSessionsResponse,
+)
+from google.adk.sessions.in_memory_session_service import InMemorySessionService
+from google.genai import types
+
+DEFAULT_STORAGE_DIR = os.environ.get("ADK_STORAGE_DIR", ".adk_store")
+DEFAULT_HOT_SESSIONS = int(os.environ.get("ADK_SESSION_CACHE_SIZE", 128))
+DEFAULT_SESSION_TTL_SECONDS = float(
+    os.environ.get("ADK_SESSION_TTL_SECONDS", 7 * 24 * 3600)
+)
+DEFAULT_ARTIFACT_MEMORY_BYTES = int(
+    os.environ.get("ADK_ARTIFACT_MEMORY_BYTES", 64 * 1024 * 1024)
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    last_update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, id)
+);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_by_session
+    ON events (app_name, user_id, session_id, seq);
+CREATE TABLE IF NOT EXISTS memory (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    text TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS memory_by_session
+    ON memory (app_name, user_id, session_id);
+"""
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _event_text(event: Event) -> str:
+    if not event.content or not event.content.parts:
+        return ""
+    return "\n".join(p.text for p in event.content.parts if p.text)
+
+
+class SqliteSessionService(BaseSessionService):
+    """Session service backed by SQLite with a bounded in-memory hot set."""
+
+    def __init__(
+        self,
+        db_path: str,
+        max_hot_sessions: int = DEFAULT_HOT_SESSIONS,
+        ttl_seconds: float = DEFAULT_SESSION_TTL_SECONDS,
+    ):
+        self.db_path = db_path
+        self.max_hot_sessions = max_hot_sessions
+        self.ttl_seconds = ttl_seconds
+        self._conn = _connect(db_path)
+        self._hot: OrderedDict[tuple[str, str, str], Session] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session = Session(
+            id=session_id.strip() if session_id else str(uuid.uuid4()),
+            app_name=app_name,
+            user_id=user_id,
+            state=copy.deepcopy(state) or {},
+            last_update_time=time.time(),
+        )
+        with self._lock:
+            self.expire_sessions()
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?)",
+                    (
+                        app_name,
+                        user_id,
+                        session.id,
+                        json.dumps(session.state),
+                        session.last_update_time,
+                    ),
+                )
+            self._remember(session)
+        return copy.deepcopy(session)
+
+    def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        with self._lock:
+            session = self._load(app_name, user_id, session_id)
+            if session is None:
+                return None
+            if self._expired(session):
+                self._delete(app_name, user_id, session_id)
+                return None
+            session = copy.deepcopy(session)
+
+        if config:
+            if config.num_recent_events:
+                session.events = session.events[-config.num_recent_events :]
+            elif config.after_timestamp:
+                session.events = [
+                    e for e in session.events if e.timestamp >= config.after_timestamp
+                ]
+        return session
+
+    def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, state, last_update_time FROM sessions"
+                " WHERE app_name = ? AND user_id = ?",
+                (app_name, user_id),
+            ).fetchall()
+        response = ListSessionsResponse()
+        for session_id, state, last_update_time in rows:
+            response.sessions.append(
+                Session(
+                    id=session_id,
+                    app_name=app_name,
+                    user_id=user_id,
+                    state=json.loads(state),
+                    last_update_time=last_update_time,
+                )
+            )
+        return response
+
+    def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        with self._lock:
+            self._delete(app_name, user_id, session_id)
+
+    def list_events(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> ListEventsResponse:
+        session = self.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+        return ListEventsResponse(events=session.events if session else [])
+
+    def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+
+        key = (session.app_name, session.user_id, session.id)
+        with self._lock:
+            stored = self._load(*key)
+            if stored is None:
+                return event
+            super().append_event(session=stored, event=event)
+            stored.last_update_time = event.timestamp
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO events (app_name, user_id, session_id, id, data)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (*key, event.id, event.model_dump_json(exclude_none=True)),
+                )
+                self._conn.execute(
+                    "UPDATE sessions SET state = ?, last_update_time = ?"
+                    " WHERE app_name = ? AND user_id = ? AND id = ?",
+                    (json.dumps(stored.state, default=str), event.timestamp, *key),
+                )
+        return event
+
+    def remove_events(self, session: Session, event_ids: set[str]) -> None:
+        """Removes events from the stored session, e.g. superseded bookkeeping."""
+        if not event_ids:
+            return
+        key = (session.app_name, session.user_id, session.id)
+        with self._lock:
+            stored = self._load(*key)
+            if stored is not None:
+                stored.events = [e for e in stored.events if e.id not in event_ids]
+            with self._conn:
+                self._conn.executemany(
+                    "DELETE FROM events WHERE app_name = ? AND user_id = ?"
+                    " AND session_id = ? AND id = ?",
+                    [(*key, event_id) for event_id in event_ids],
+                )
+
+    def expire_sessions(self) -> int:
+        """Deletes sessions idle for longer than the TTL; returns the count."""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = self._conn.execute(
+                "SELECT app_name, user_id, id FROM sessions WHERE last_update_time < ?",
+                (cutoff,),
+            ).fetchall()
+            for key in expired:
+                self._delete(*key)
+        return len(expired)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            (sessions,) = self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()
+            (events,) = self._conn.execute("SELECT COUNT(*) FROM events").fetchone()
+            return {
+                "sessions": sessions,
+                "events": events,
+                "hot_sessions": len(self._hot),
+            }
+
+    def _expired(self, session: Session) -> bool:
+        return session.last_update_time < time.time() - self.ttl_seconds
+
+    def _load(self, app_name: str, user_id: str, session_id: str) -> Optional[Session]:
+        """Returns the canonical session, loading it into the hot set if needed.
+
+        The caller must hold the lock and must not hand the object out.
+        """
+        key = (app_name, user_id, session_id)
+        session = self._hot.get(key)
+        if session is not None:
+            self._hot.move_to_end(key)
+            return session
+        row = self._conn.execute(
+            "SELECT state, last_update_time FROM sessions"
+            " WHERE app_name = ? AND user_id = ? AND id = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            return None
+        events = [
+            Event.model_validate_json(data)
+            for (data,) in self._conn.execute(
+                "SELECT data FROM events WHERE app_name = ? AND user_id = ?"
+                " AND session_id = ? ORDER BY seq",
+                key,
+            )
+        ]
+        session = Session(
+            id=session_id,
+            app_name=app_name,
+            user_id=user_id,
+            state=json.loads(row[0]),
+            events=events,
+            last_update_time=row[1],
+        )
+        self._remember(session)
+        return session
+
+    def _remember(self, session: Session) -> None:
+        key = (session.app_name, session.user_id, session.id)
+        self._hot[key] = session
+        self._hot.move_to_end(key)
+        while len(self._hot) > self.max_hot_sessions:
+            self._hot.popitem(last=False)
+
+    def _delete(self, app_name: str, user_id: str, session_id: str) -> None:
+        key = (app_name, user_id, session_id)
+        self._hot.pop(key, None)
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?",
+                key,
+            )
+            self._conn.execute(
+                "DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                key,
+            )
+
+
+class PrunableInMemorySessionService(InMemorySessionService):
+    """ADK's in-memory session service, with remove_events like SQLite's."""
+
+    def remove_events(self, session: Session, event_ids: set[str]) -> None:
+        """Removes events from the stored session, e.g. superseded bookkeeping."""
+        if not event_ids:
+            return
+        stored = (
+            self.sessions.get(session.app_name, {})
+            .get(session.user_id, {})
+            .get(session.id)
+        )
+        if stored is not None:
+            stored.events = [e for e in stored.events if e.id not in event_ids]
+
+
+class SqliteMemoryService(BaseMemoryService):
+    """Memory service storing session contents in SQLite.
+
+    Search uses the same keyword matching as ADK's InMemoryMemoryService.
+    """
+
+    def __init__(self, db_path: str):
+        self._conn = _connect(db_path)
+        self._lock = threading.Lock()
+
+    def add_session_to_memory(self, session: Session):
+        key = (session.app_name, session.user_id, session.id)
+        rows = [
+            (*key, _event_text(event).lower(), event.model_dump_json(exclude_none=True))
+            for event in session.events
+            if event.content
+        ]
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM memory WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                key,
+            )
+            self._conn.executemany("INSERT INTO memory VALUES (?, ?, ?, ?, ?)", rows)
+
+    def search_memory(
+        self, *, app_name: str, user_id: str, query: str
+    ) -> SearchMemoryResponse:
+        keywords = set(query.lower().split())
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT session_id, text, data FROM memory"
+                " WHERE app_name = ? AND user_id = ? ORDER BY rowid",
+                (app_name, user_id),
+            ).fetchall()
+        matches: OrderedDict[str, list[Event]] = OrderedDict()
+        for session_id, text, data in rows:
+            if any(keyword in text for keyword in keywords):
+                matches.setdefault(session_id, []).append(
+                    Event.model_validate_json(data)
+                )
+        return SearchMemoryResponse(
+            memories=[
+                MemoryResult(session_id=session_id, events=events)
+                for session_id, events in matches.items()
+            ]
+        )
+
+
+class FileArtifactService(BaseArtifactService):
+    """Artifact service writing every version to disk.
+
+    A bounded LRU of recently used artifact versions is kept in memory; the
+    rest is read back from disk on demand. Inline data is stored as raw bytes
+    next to a small JSON metadata file, other parts as JSON.
+    """
+
+    def __init__(
+        self, root_dir: str, max_memory_bytes: int = DEFAULT_ARTIFACT_MEMORY_BYTES
+    ):
+        self.root_dir = root_dir
+        self.max_memory_bytes = max_memory_bytes
+        os.makedirs(root_dir, exist_ok=True)
+        self._hot: OrderedDict[str, tuple[types.Part, int]] = OrderedDict()
+        self._hot_bytes = 0
+        self._lock = threading.Lock()
+
+    def save_artifact(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        filename: str,
+        artifact: types.Part,
+    ) -> int:
+        directory = self._artifact_dir(app_name, user_id, session_id, filename)
+        with self._lock:
+            os.makedirs(directory, exist_ok=True)
+            versions = self._versions(directory)
+            version = versions[-1] + 1 if versions else 0
+            base = os.path.join(directory, str(version))
+            if artifact.inline_data is not None:
+                self._write(base + ".bin", artifact.inline_data.data or b"")
+                meta = {"mime_type": artifact.inline_data.mime_type}
+            else:
+                meta = {"part": artifact.model_dump(mode="json", exclude_none=True)}
+            # The metadata file is written last and marks the version complete.
+            self._write(base + ".json", json.dumps(meta).encode("utf-8"))
+            self._cache(base, artifact)
+        return version
+
+    def load_artifact(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        filename: str,
+        version: Optional[int] = None,
+    ) -> Optional[types.Part]:
+        directory = self._artifact_dir(app_name, user_id, session_id, filename)
+        with self._lock:
+            if version is None:
+                versions = self._versions(directory)
+                if not versions:
+                    return None
+                version = versions[-1]
+            base = os.path.join(directory, str(version))
+            cached = self._hot.get(base)
+            if cached is not None:
+                self._hot.move_to_end(base)
+                return cached[0]
+            try:
+                with open(base + ".json", "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                if "part" in meta:
+                    artifact = types.Part.model_validate(meta["part"])
+                else:
+                    with open(base + ".bin", "rb") as f:
+                        artifact = types.Part.from_bytes(
+                            data=f.read(), mime_type=meta["mime_type"]
+                        )
+            except FileNotFoundError:
+                return None
+            self._cache(base, artifact)
+            return artifact
+
+    def list_artifact_keys(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> list[str]:
+        filenames = []
+        for scope in (session_id, None):
+            directory = self._scope_dir(app_name, user_id, scope)
+            if os.path.isdir(directory):
+                filenames.extend(unquote(name) for name in os.listdir(directory))
+        return sorted(filenames)
+
+    def delete_artifact(
+        self, *, app_name: str, user_id: str, session_id: str, filename: str
+    ) -> None:
+        directory = self._artifact_dir(app_name, user_id, session_id, filename)
+        with self._lock:
+            for name in os.listdir(directory) if os.path.isdir(directory) else []:
+                self._uncache(os.path.join(directory, os.path.splitext(name)[0]))
+                os.remove(os.path.join(directory, name))
+            if os.path.isdir(directory):
+                os.rmdir(directory)
+
+    def list_versions(
+        self, *, app_name: str, user_id: str, session_id: str, filename: str
+    ) -> list[int]:
+        directory = self._artifact_dir(app_name, user_id, session_id, filename)
+        with self._lock:
+            return self._versions(directory)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hot_artifacts": len(self._hot), "hot_bytes": self._hot_bytes}
+
+    def _scope_dir(self, app_name: str, user_id: str, session_id: str | None) -> str:
+        # "user:" artifacts are shared by all sessions of the user.
+        scope = "user" if session_id is None else f"session-{session_id}"
+        return os.path.join(
+            self.root_dir, quote(app_name, safe=""), quote(user_id, safe=""), scope
+        )
+
+    def _artifact_dir(
+        self, app_name: str, user_id: str, session_id: str, filename: str
+    ) -> str:
+        scope = None if filename.startswith("user:") else session_id
+        return os.path.join(
+            self._scope_dir(app_name, user_id, scope), quote(filename, safe="")
+        )
+
+    @staticmethod
+    def _versions(directory: str) -> list[int]:
+        if not os.path.isdir(directory):
+            return []
+        return sorted(
+            int(name[:-5])
+            for name in os.listdir(directory)
+            if name.endswith(".json") and name[:-5].isdigit()
+        )
+
+    @staticmethod
+    def _write(path: str, data: bytes) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _cache(self, base: str, artifact: types.Part) -> None:
+        size = len(artifact.inline_data.data or b"") if artifact.inline_data else 0
+        self._uncache(base)
+        self._hot[base] = (artifact, size)
+        self._hot_bytes += size
+        while self._hot_bytes > self.max_memory_bytes and len(self._hot) > 1:
+            _, (_, evicted_size) = self._hot.popitem(last=False)
+            self._hot_bytes -= evicted_size
+
+    def _uncache(self, base: str) -> None:
+        cached = self._hot.pop(base, None)
+        if cached is not None:
+            self._hot_bytes -= cached[1]
+
+
+def create_adk_services(
+    backend: str | None = None, storage_dir: str | None = None
+) -> tuple[BaseSessionService, BaseArtifactService, BaseMemoryService]:
+    """Builds the session, artifact and memory services for the host.
+
+    Args:
+      backend: "memory" or "sqlite"; defaults to ADK_SERVICES_BACKEND.
+      storage_dir: Where the sqlite backend keeps its data; defaults to
+        ADK_STORAGE_DIR.
+    """
+    backend = (backend or os.environ.get("ADK_SERVICES_BACKEND", "memory")).lower()
+    if backend == "memory":
+        return (
+            PrunableInMemorySessionService(),
+            InMemoryArtifactService(),
+            InMemoryMemoryService(),
+        )
+    if backend != "sqlite":
+        raise ValueError(f"Unknown ADK_SERVICES_BACKEND: {backend}")
+
+    storage_dir = storage_dir or DEFAULT_STORAGE_DIR
+    db_path = os.path.join(storage_dir, "adk.sqlite3")
+    print(f"[INFO] Using SQLite ADK services in {storage_dir}")
+    return (
+        SqliteSessionService(db_path),
+        FileArtifactService(os.path.join(storage_dir, "artifacts")),
+        SqliteMemoryService(db_path),
+    )
@@ -21,10 +21,19 @@ class ApplicationManager(ABC):
     def register_agent(self, url: str):
         pass
 
+    @abstractmethod
+    def unregister_agent(self, url: str) -> bool:
+        pass
+
     @abstractmethod
     def get_pending_messages(self) -> list[str]:
         pass
 
+    @abstractmethod
+    def tasks_for_message(self, message_id: str) -> list[Task]:
+        """The tasks started to answer a message."""
+        pass
+
     @property
     @abstractmethod
     def conversations(self) -> list[Conversation]:
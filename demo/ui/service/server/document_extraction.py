@@ -0,0 +1,206 @@
+"""Text extraction for documents uploaded through the UI.
+
+Extractors are registered per file extension and yield the text of a document
+piece by piece (pages for PDFs, paragraphs for Word documents, rows for CSV),
+so callers can stop early once a size budget is reached. Parsing runs in a
+process pool to keep PyPDF2/python-docx off the server event loop.
+"""
+
+import asyncio
+import csv
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator, Optional
+
+import PyPDF2
+import docx
+
+# An extractor takes the raw file bytes and yields text fragments in order.
+Extractor = Callable[[bytes], Iterator[str]]
+
+_EXTRACTORS: dict[str, Extractor] = {}
+
+DEFAULT_MAX_BYTES = int(os.environ.get("UPLOAD_MAX_BYTES", 20 * 1024 * 1024))
+DEFAULT_MAX_CHARS = int(os.environ.get("EXTRACTION_MAX_CHARS", 200_000))
+DEFAULT_TIMEOUT_SECONDS = float(os.environ.get("EXTRACTION_TIMEOUT_SECONDS", 30))
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class DocumentTooLargeError(Exception):
+    """Raised when an upload exceeds the configured size budget."""
+
+    def __init__(self, size: int, max_bytes: int):
+        self.size = size
+        self.max_bytes = max_bytes
+        super().__init__(f"Upload of {size} bytes exceeds limit of {max_bytes} bytes")
+
+
+def register_extractor(*extensions: str):
+    """Registers the decorated function as the extractor for the extensions.
+
+    Extractors registered after the process pool has started are only visible
+    to workers on platforms that fork.
+    """
+
+    def decorator(func: Extractor) -> Extractor:
+        for extension in extensions:
+            _EXTRACTORS[extension.lower()] = func
+        return func
+
+    return decorator
+
+
+def get_extractor(filename: str) -> Optional[Extractor]:
+    """Returns the extractor registered for the file's extension, if any."""
+    _, extension = os.path.splitext(filename or "")
+    return _EXTRACTORS.get(extension.lower())
+
+
+def supported_extensions() -> list[str]:
+    return sorted(_EXTRACTORS)
+
+
+@register_extractor(".pdf")
+def _extract_pdf(file_content: bytes) -> Iterator[str]:
+    """Yields the text of a PDF one page at a time."""
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+    for page in pdf_reader.pages:
+        yield page.extract_text() or ""
+
+
+@register_extractor(".docx", ".doc")
+def _extract_word(file_content: bytes) -> Iterator[str]:
+    """Yields the paragraphs of a Word document."""
+    doc = docx.Document(io.BytesIO(file_content))
+    for paragraph in doc.paragraphs:
+        yield paragraph.text
+
+
+@register_extractor(".txt", ".text")
+def _extract_plain_text(file_content: bytes) -> Iterator[str]:
+    yield file_content.decode("utf-8", errors="replace")
+
+
+@register_extractor(".csv")
+def _extract_csv(file_content: bytes) -> Iterator[str]:
+    """Yields each CSV row as a comma separated line."""
+    text = file_content.decode("utf-8-sig", errors="replace")
+    for row in csv.reader(io.StringIO(text)):
+        yield ", ".join(cell.strip() for cell in row)
+
+
+def extract_text(
+    filename: str, file_content: bytes, max_chars: Optional[int] = None
+) -> Optional[str]:
+    """Extracts the text of a document.
+
+    This runs inside the worker processes, so it must stay a module level
+    function.
+
+    Args:
+        filename: Name of the uploaded file, used to pick the extractor.
+        file_content: Raw bytes of the file.
+        max_chars: Stop extracting once this many characters were collected.
+
+    Returns:
+        The extracted text, or None if the file type is not supported.
+    """
+    extractor = get_extractor(filename)
+    if extractor is None:
+        return None
+
+    fragments: list[str] = []
+    total = 0
+    for fragment in extractor(file_content):
+        fragments.append(fragment)
+        total += len(fragment) + 1
+        if max_chars is not None and total >= max_chars:
+            break
+    text = "\n".join(fragments).strip()
+    if max_chars is not None:
+        text = text[:max_chars]
+    return text
+
+
+class DocumentExtractor:
+    """Runs document extraction in a process pool within size and time budgets."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_chars: Optional[int] = DEFAULT_MAX_CHARS,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    ):
+        self.max_workers = max_workers
+        self.max_bytes = max_bytes
+        self.max_chars = max_chars
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def supports(self, filename: str) -> bool:
+        return get_extractor(filename) is not None
+
+    async def read_upload(self, uploaded_file) -> bytes:
+        """Reads an UploadFile in chunks, enforcing the size budget.
+
+        Args:
+            uploaded_file: FastAPI/Starlette UploadFile object
+
+        Raises:
+            DocumentTooLargeError: If the upload exceeds max_bytes.
+        """
+        size = getattr(uploaded_file, "size", None)
+        if size is not None and size > self.max_bytes:
+            raise DocumentTooLargeError(size, self.max_bytes)
+
+        chunks: list[bytes] = []
+        total = 0
+        while True:
+            chunk = await uploaded_file.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            total += len(chunk)
+            if total > self.max_bytes:
+                raise DocumentTooLargeError(total, self.max_bytes)
+            chunks.append(chunk)
+        await uploaded_file.seek(0)
+        return b"".join(chunks)
+
+    async def extract(self, filename: str, file_content: bytes) -> Optional[str]:
+        """Extracts text in a worker process.
+
+        Returns:
+            The extracted text, or None if the type is unsupported.
+
+        Raises:
+            DocumentTooLargeError: If the content exceeds max_bytes.
+            asyncio.TimeoutError: If extraction takes longer than the timeout.
+        """
+        if len(file_content) > self.max_bytes:
+            raise DocumentTooLargeError(len(file_content), self.max_bytes)
+        if not self.supports(filename):
+            return None
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._get_executor(), extract_text, filename, file_content, self.max_chars
+        )
+        try:
+            return await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            # A worker stuck on a pathological file cannot be interrupted, so
+            # retire the pool and let later uploads start with fresh workers.
+            self.shutdown(wait=False)
+            raise
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,130 @@
+"""Content addressed cache for text extracted from uploaded documents.
+
+Uploads are keyed by the SHA-256 of their bytes plus the file extension (which
+selects the extractor), so the same resume uploaded again in any conversation
+skips parsing entirely. Entries live in a bounded LRU memory tier and,
+optionally, in an on-disk tier that survives restarts.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+DEFAULT_MAX_ENTRIES = int(os.environ.get("EXTRACTION_CACHE_SIZE", 256))
+
+
+class ExtractedDocument(BaseModel):
+    """Text extracted from a document along with some metadata."""
+
+    key: str
+    text: str
+    filename: str = ""
+    size: int = 0
+    extracted_at: float = Field(default_factory=time.time)
+
+
+class ExtractionCache:
+    """Two tier (memory LRU + optional disk) cache of extracted documents."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        disk_dir: Optional[str] = None,
+    ):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+        self._entries: OrderedDict[str, ExtractedDocument] = OrderedDict()
+        self._lock = threading.Lock()
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def make_key(file_content: bytes, filename: str) -> str:
+        """Builds the cache key: SHA-256 of the bytes plus the extension."""
+        _, extension = os.path.splitext(filename or "")
+        return hashlib.sha256(file_content).hexdigest() + extension.lower()
+
+    def get(self, key: str) -> Optional[ExtractedDocument]:
+        """Looks up a document, promoting disk hits into the memory tier."""
+        with self._lock:
+            document = self._entries.get(key)
+            if document is not None:
+                self._entries.move_to_end(key)
+                self._memory_hits += 1
+                return document
+
+        document = self._read_from_disk(key)
+        with self._lock:
+            if document is None:
+                self._misses += 1
+                return None
+            self._disk_hits += 1
+            self._remember(document)
+        return document
+
+    def put(self, document: ExtractedDocument) -> None:
+        with self._lock:
+            self._remember(document)
+        self._write_to_disk(document)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, float | int]:
+        with self._lock:
+            hits = self._memory_hits + self._disk_hits
+            lookups = hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+
+    def _remember(self, document: ExtractedDocument) -> None:
+        """Inserts into the memory tier; the caller must hold the lock."""
+        self._entries[document.key] = document
+        self._entries.move_to_end(document.key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], f"{key}.json")
+
+    def _read_from_disk(self, key: str) -> Optional[ExtractedDocument]:
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "r", encoding="utf-8") as f:
+                return ExtractedDocument.model_validate_json(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[WARN] Failed to read extraction cache entry {key}: {e}")
+            return None
+
+    def _write_to_disk(self, document: ExtractedDocument) -> None:
+        if not self.disk_dir:
+            return
+        path = self._disk_path(document.key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first so readers never see partial data.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(document.model_dump_json())
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"[WARN] Failed to write extraction cache entry {document.key}: {e}")
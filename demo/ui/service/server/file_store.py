@@ -0,0 +1,131 @@
+"""Size bounded store for files referenced by conversation messages.
+
+Files are kept as decoded bytes in an LRU memory tier. When the memory budget
+is exceeded the least recently used files are spilled to a directory on disk
+(if one is configured) or dropped. Spilled files are served straight from disk,
+which also gives range request support for large artifacts.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Optional
+
+DEFAULT_MAX_MEMORY_BYTES = int(os.environ.get("FILE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+DEFAULT_MAX_DISK_BYTES = int(
+    os.environ.get("FILE_CACHE_MAX_DISK_BYTES", 1024 * 1024 * 1024)
+)
+
+
+@dataclass
+class StoredFile:
+    """A file held by the FileStore, either in memory or spilled to disk."""
+
+    mime_type: str
+    size: int
+    data: bytes | None = None
+    path: str | None = None
+
+
+class FileStore:
+    """Thread-safe LRU file store with an optional disk spill tier."""
+
+    def __init__(
+        self,
+        max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        spill_dir: Optional[str] = None,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+    ):
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.spill_dir = spill_dir
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+        self._files: OrderedDict[str, StoredFile] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, file_id: str) -> bool:
+        with self._lock:
+            return file_id in self._files
+
+    def put(self, file_id: str, data: bytes, mime_type: str) -> None:
+        with self._lock:
+            self._discard(file_id)
+            self._files[file_id] = StoredFile(
+                mime_type=mime_type, size=len(data), data=data
+            )
+            self._memory_bytes += len(data)
+            self._enforce_budget()
+
+    def get(self, file_id: str) -> Optional[StoredFile]:
+        """Returns a snapshot of the stored file, safe to use without the lock."""
+        with self._lock:
+            stored = self._files.get(file_id)
+            if stored is None:
+                return None
+            self._files.move_to_end(file_id)
+            return replace(stored)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            in_memory = sum(1 for f in self._files.values() if f.data is not None)
+            return {
+                "files": len(self._files),
+                "files_in_memory": in_memory,
+                "files_on_disk": len(self._files) - in_memory,
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes,
+                "max_memory_bytes": self.max_memory_bytes,
+                "evictions": self._evictions,
+            }
+
+    def _enforce_budget(self) -> None:
+        """Spills or drops LRU files until the budgets hold; requires the lock."""
+        for file_id in list(self._files):
+            if self._memory_bytes <= self.max_memory_bytes:
+                break
+            stored = self._files[file_id]
+            if stored.data is None:
+                continue
+            if self.spill_dir and self._spill(file_id, stored):
+                continue
+            self._discard(file_id)
+            self._evictions += 1
+
+        for file_id in list(self._files):
+            if self._disk_bytes <= self.max_disk_bytes:
+                break
+            if self._files[file_id].path is not None:
+                self._discard(file_id)
+                self._evictions += 1
+
+    def _spill(self, file_id: str, stored: StoredFile) -> bool:
+        path = os.path.join(self.spill_dir, file_id)
+        try:
+            with open(path, "wb") as f:
+                f.write(stored.data)
+        except OSError as e:
+            print(f"[WARN] Failed to spill file {file_id} to disk: {e}")
+            return False
+        self._memory_bytes -= stored.size
+        self._disk_bytes += stored.size
+        stored.data = None
+        stored.path = path
+        return True
+
+    def _discard(self, file_id: str) -> None:
+        stored = self._files.pop(file_id, None)
+        if stored is None:
+            return
+        if stored.data is not None:
+            self._memory_bytes -= stored.size
+        if stored.path is not None:
+            self._disk_bytes -= stored.size
+            try:
+                os.remove(stored.path)
+            except OSError:
+                pass
@@ -0,0 +1,20 @@
+"""The host service without the Mesop UI.
+
+Serves the same ConversationServer API as main.py for API clients and load
+tests, without the UI and its dependencies.
+
+run:
+  cd demo/ui && PYTHONPATH=../../samples/python:. uvicorn service.server.host_app:app --port 12000
+"""
+
+from dotenv import load_dotenv
+from fastapi import APIRouter, FastAPI
+
+from service.server.server import ConversationServer
+
+load_dotenv()
+
+app = FastAPI()
+router = APIRouter()
+agent_server = ConversationServer(router)
+app.include_router(router)
@@ -165,12 +165,21 @@ class InMemoryFakeAgentManager(ApplicationManager):
             return rval
         return self._pending_message_ids
 
+    def tasks_for_message(self, message_id: str) -> list[Task]:
+        task_id = self._task_map.get(message_id)
+        return [t for t in self._tasks if t.id == task_id]
+
     def register_agent(self, url):
         agent_data = get_agent_card(url)
         if not agent_data.url:
             agent_data.url = url
         self._agents.append(agent_data)
 
+    def unregister_agent(self, url: str) -> bool:
+        count = len(self._agents)
+        self._agents = [a for a in self._agents if a.url != url]
+        return len(self._agents) != count
+
     @property
     def agents(self) -> list[AgentCard]:
         return self._agents
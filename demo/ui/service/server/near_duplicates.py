@@ -0,0 +1,230 @@
+"""Near-duplicate detection for uploaded resumes with MinHash LSH.
+
+Candidates reapply and agencies resubmit the same resume with small edits.
+The extraction cache only catches byte-identical files. This index catches
+resumes whose extracted text is nearly the same:
+
+- a resume becomes the set of its word 3-grams (shingles),
+- a MinHash signature of `num_perm` values estimates the Jaccard similarity
+  of two shingle sets as the share of equal values,
+- the signature is cut into bands and each band hashed into a bucket, so
+  lookups only compare against resumes sharing at least one bucket (LSH)
+  instead of every resume seen before.
+
+Candidates from the buckets are confirmed with the signature similarity.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+DEFAULT_THRESHOLD = float(os.environ.get("NEAR_DUPLICATE_THRESHOLD", 0.8))
+DEFAULT_MAX_ENTRIES = int(os.environ.get("NEAR_DUPLICATE_MAX_ENTRIES", 100_000))
+DEFAULT_NUM_PERM = 128
+SHINGLE_WORDS = 3
+# Shingles hashed per block, bounding the temporary (num_perm x block) array
+_BLOCK = 4096
+
+_WORD = re.compile(r"\w+")
+
+
+class NearDuplicate(BaseModel):
+    """An indexed resume similar to the one looked up."""
+
+    key: str
+    similarity: float
+    metadata: dict[str, Any]
+
+
+def text_key(text: str) -> str:
+    """Identifies a resume by its normalized text."""
+    normalized = " ".join(_WORD.findall(text.lower()))
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def shingles(text: str, size: int = SHINGLE_WORDS) -> np.ndarray:
+    """32-bit hashes of the distinct word `size`-grams of a text."""
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        grams = {" ".join(words)} if words else set()
+    else:
+        grams = {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+    return np.fromiter(
+        (zlib.crc32(g.encode("utf-8")) for g in grams),
+        dtype=np.uint64,
+        count=len(grams),
+    )
+
+
+class MinHasher:
+    """MinHash signatures from `num_perm` multiply-shift hash functions."""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        # h(x) = ((a * x + b) mod 2^64) >> 32, with odd a, is 2-universal
+        self._a = rng.integers(0, 2**63, size=(num_perm, 1), dtype=np.uint64) * 2 + 1
+        self._b = rng.integers(0, 2**63, size=(num_perm, 1), dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        values = shingles(text)
+        signature = np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint64)
+        for start in range(0, len(values), _BLOCK):
+            block = values[start : start + _BLOCK]
+            hashed = (self._a * block + self._b) >> np.uint64(32)
+            np.minimum(signature, hashed.min(axis=1), out=signature)
+        return signature.astype(np.uint32)
+
+
+def choose_bands(num_perm: int, threshold: float) -> int:
+    """Number of LSH bands for a similarity threshold.
+
+    With b bands of r rows, pairs become candidates around a similarity of
+    (1/b)^(1/r). The most selective split whose point lies below the
+    threshold keeps recall high while few dissimilar pairs need checking.
+    """
+    best = num_perm
+    for bands in range(num_perm, 0, -1):
+        if num_perm % bands:
+            continue
+        rows = num_perm // bands
+        if (1 / bands) ** (1 / rows) <= threshold - 0.05:
+            best = bands
+    return best
+
+
+class NearDuplicateIndex:
+    """Bounded MinHash LSH index of resumes with metadata per resume."""
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = DEFAULT_NUM_PERM,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        bands: Optional[int] = None,
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands or choose_bands(num_perm, threshold)
+        self.rows = num_perm // self.bands
+        self._buckets: list[dict[bytes, set[str]]] = [{} for _ in range(self.bands)]
+        self._entries: OrderedDict[str, tuple[np.ndarray, dict[str, Any]]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._lookups = 0
+        self._duplicates = 0
+        self._compared = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(
+        self,
+        key: str,
+        text: str,
+        metadata: Optional[dict[str, Any]] = None,
+        signature: Optional[np.ndarray] = None,
+    ) -> None:
+        if signature is None:
+            signature = self.hasher.signature(text)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (signature, dict(metadata or {}))
+            for band, bucket_key in enumerate(self._band_keys(signature)):
+                self._buckets[band].setdefault(bucket_key, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def query(
+        self, text: str = "", signature: Optional[np.ndarray] = None
+    ) -> list[NearDuplicate]:
+        """Indexed resumes at least `threshold` similar, most similar first."""
+        if signature is None:
+            signature = self.hasher.signature(text)
+        with self._lock:
+            self._lookups += 1
+            candidates: set[str] = set()
+            for band, bucket_key in enumerate(self._band_keys(signature)):
+                candidates |= self._buckets[band].get(bucket_key, set())
+            self._compared += len(candidates)
+            matches = []
+            for key in candidates:
+                indexed, metadata = self._entries[key]
+                similarity = float(np.mean(indexed == signature))
+                if similarity >= self.threshold:
+                    matches.append(
+                        NearDuplicate(
+                            key=key, similarity=similarity, metadata=dict(metadata)
+                        )
+                    )
+            if matches:
+                self._duplicates += 1
+        return sorted(matches, key=lambda m: m.similarity, reverse=True)
+
+    def check_and_add(
+        self, key: str, text: str, metadata: Optional[dict[str, Any]] = None
+    ) -> Optional[NearDuplicate]:
+        """Looks a resume up, then indexes it. Returns its closest duplicate.
+
+        Resubmitting a resume already indexed under `key` returns its own
+        entry, with similarity 1, and leaves it unchanged.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._lookups += 1
+                self._duplicates += 1
+                return NearDuplicate(key=key, similarity=1.0, metadata=dict(entry[1]))
+        signature = self.hasher.signature(text)
+        matches = self.query(signature=signature)
+        self.add(key, text, metadata, signature=signature)
+        return matches[0] if matches else None
+
+    def get_metadata(self, key: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            return dict(entry[1]) if entry else None
+
+    def update_metadata(self, key: str, **values: Any) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[1].update(values)
+
+    def stats(self) -> dict[str, float | int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bands": self.bands,
+                "rows": self.rows,
+                "lookups": self._lookups,
+                "duplicates": self._duplicates,
+                "avg_candidates": (
+                    self._compared / self._lookups if self._lookups else 0.0
+                ),
+            }
+
+    def _band_keys(self, signature: np.ndarray) -> list[bytes]:
+        bands = signature[: self.bands * self.rows].reshape(self.bands, self.rows)
+        return [band.tobytes() for band in bands]
+
+    def _remove(self, key: str) -> None:
+        """Drops a resume from the index; the caller must hold the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for band, bucket_key in enumerate(self._band_keys(entry[0])):
+            bucket = self._buckets[band].get(bucket_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][bucket_key]
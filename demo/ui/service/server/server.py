@@ -1,14 +1,19 @@
 import asyncio
 import base64
 import json
-import io
+import binascii
 import os
+import tempfile
 import threading
 import uuid
 from fastapi import APIRouter, Request, Response
-from common.types import Message, FilePart, FileContent, TextPart
-import PyPDF2
-import docx
+from fastapi.responses import FileResponse
+from common.types import Message, FilePart, FileContent, Task, TaskState, TextPart
+from common.utils.blob_store import get_blob_store, is_blob_uri
+from .document_extraction import DocumentExtractor, DocumentTooLargeError
+from .extraction_cache import ExtractionCache, ExtractedDocument
+from .file_store import FileStore
+from .near_duplicates import NearDuplicate, NearDuplicateIndex, text_key
 from .in_memory_manager import InMemoryFakeAgentManager
 from .application_manager import ApplicationManager
 from .adk_host_manager import ADKHostManager, get_message_id
@@ -21,13 +26,20 @@ from service.types import (
     PendingMessageResponse,
     ListTaskResponse,
     RegisterAgentResponse,
+    UnregisterAgentResponse,
     ListAgentResponse,
     GetEventResponse,
     SendMessageWithFileResponse,
+    StateSnapshot,
+    GetStateSnapshotResponse,
 )
 
 # Global debug mode setting
 DEBUG_MODE = os.environ.get("DEBUG_MODE", "").lower() == "true"
+# "reuse" answers a near-duplicate upload with the earlier evaluation of the
+# same request, when there is one; "flag" only marks it and has it evaluated
+# again.
+NEAR_DUPLICATE_POLICY = os.environ.get("NEAR_DUPLICATE_POLICY", "reuse").lower()
 
 
 class ConversationServer:
@@ -54,9 +66,26 @@ class ConversationServer:
         else:
             self.manager: ApplicationManager = InMemoryFakeAgentManager()
 
-        # File caching dictionaries
-        self._file_cache: dict[str, FilePart] = {}  # maps file id to message data
-        self._message_to_cache: dict[str, str] = {}  # maps message id to cache id
+        # Uploaded documents are parsed in a process pool
+        self._document_extractor = DocumentExtractor()
+        # Repeated uploads of the same bytes reuse the extracted text
+        self._extraction_cache = ExtractionCache(
+            disk_dir=os.environ.get("EXTRACTION_CACHE_DIR") or None
+        )
+
+        # Resumes seen before, to catch resubmissions with small edits
+        self._near_duplicates = NearDuplicateIndex()
+
+        # Decoded file bytes, bounded in memory and spilled to disk if enabled
+        spill_dir = None
+        if os.environ.get("FILE_CACHE_SPILL", "true").lower() == "true":
+            spill_dir = os.environ.get("FILE_CACHE_SPILL_DIR") or tempfile.mkdtemp(
+                prefix="a2a_ui_files_"
+            )
+        self._file_store = FileStore(spill_dir=spill_dir)
+        # File ids are derived from the message part, so nothing but the
+        # bounded store is kept per file
+        self._file_id_namespace = uuid.uuid4()
 
         router.add_api_route(
             "/conversation/create", self._create_conversation, methods=["POST"]
@@ -76,9 +105,14 @@ class ConversationServer:
         )
         router.add_api_route("/task/list", self._list_tasks, methods=["POST"])
         router.add_api_route("/agent/register", self._register_agent, methods=["POST"])
+        router.add_api_route(
+            "/agent/unregister", self._unregister_agent, methods=["POST"]
+        )
         router.add_api_route("/agent/list", self._list_agents, methods=["POST"])
         router.add_api_route("/message/file/{file_id}", self._files, methods=["GET"])
+        router.add_api_route("/state/snapshot", self._state_snapshot, methods=["POST"])
         router.add_api_route("/api_key/update", self._update_api_key, methods=["POST"])
+        router.add_api_route("/metrics", self._metrics, methods=["GET"])
 
     # Update API key in manager
     def update_api_key(self, api_key: str):
@@ -99,6 +133,11 @@ class ConversationServer:
             print(f"[DEBUG] Server: Request content-type: {content_type}")
 
         message = None
+        # Index key of the uploaded resume, the earlier upload it repeats and
+        # the key of what was asked about it
+        resume_key = None
+        duplicate = None
+        request_key = None
 
         try:
             if "multipart/form-data" in content_type:
@@ -122,12 +161,28 @@ class ConversationServer:
                             )
 
                         # Extract text from uploaded file and include it in the message
-                        file_text = self._extract_text_from_uploaded_file(uploaded_file)
+                        try:
+                            file_text = await self._extract_text_from_uploaded_file(
+                                uploaded_file
+                            )
+                        except DocumentTooLargeError as e:
+                            return {"error": str(e)}
                         if file_text:
+                            resume_key = text_key(file_text)
+                            duplicate = self._near_duplicates.check_and_add(
+                                resume_key,
+                                file_text,
+                                {"filename": uploaded_file.filename},
+                            )
                             # Append extracted text to the message content
                             original_text = (
                                 message.parts[0].text if message.parts else ""
                             )
+                            request_key = evaluation_request_key(message, original_text)
+                            if duplicate:
+                                original_text += self._flag_near_duplicate(
+                                    message, duplicate
+                                )
                             enhanced_text = f"""{original_text}
 
 --- UPLOADED FILE CONTENT ({uploaded_file.filename}) ---
@@ -190,10 +245,31 @@ Please analyze the above resume content and interview dialogue and provide a det
             if conv:
                 conv.messages.append(message)
 
+        if (
+            resume_key
+            and duplicate
+            and self._reuse_evaluation(message, duplicate, request_key)
+        ):
+            return SendMessageWithFileResponse(
+                result=MessageInfo(
+                    message_id=message.metadata.get("message_id"),
+                    conversation_id=conversation_id,
+                )
+            )
+        if resume_key and not duplicate:
+            self._near_duplicates.update_metadata(
+                resume_key,
+                conversation_id=conversation_id,
+                message_id=message.metadata.get("message_id"),
+            )
+
         # Process the message with file content
-        t = threading.Thread(
-            target=lambda: asyncio.run(self.manager.process_message(message))
-        )
+        def process():
+            asyncio.run(self.manager.process_message(message))
+            if resume_key:
+                self._record_evaluation(resume_key, request_key, message)
+
+        t = threading.Thread(target=process)
         t.start()
 
         return SendMessageWithFileResponse(
@@ -203,6 +279,88 @@ Please analyze the above resume content and interview dialogue and provide a det
             )
         )
 
+    def _flag_near_duplicate(self, message: Message, duplicate: NearDuplicate) -> str:
+        """Marks a message whose upload repeats an earlier resume.
+
+        Returns:
+            A note for the agent naming the earlier upload.
+        """
+        earlier = duplicate.metadata
+        print(
+            f"[INFO] Server: Upload is a near-duplicate ({duplicate.similarity:.0%})"
+            f" of {earlier.get('filename')}"
+        )
+        message.metadata = message.metadata or {}
+        message.metadata["near_duplicate"] = {
+            "filename": earlier.get("filename"),
+            "conversation_id": earlier.get("conversation_id"),
+            "similarity": duplicate.similarity,
+        }
+        return (
+            f"\n\n--- NOTE: This resume is {duplicate.similarity:.0%} similar to"
+            f" {earlier.get('filename')}, which was submitted before. ---"
+        )
+
+    def _reuse_evaluation(
+        self, message: Message, duplicate: NearDuplicate, request_key: str
+    ) -> bool:
+        """Answers a near-duplicate upload with the earlier evaluation.
+
+        Only an evaluation made for the same request, sent to the same agent,
+        is reused: a background check is not answered with a rating.
+
+        Returns:
+            True if the message was answered and needs no processing.
+        """
+        evaluation = (duplicate.metadata.get("evaluations") or {}).get(request_key)
+        if NEAR_DUPLICATE_POLICY != "reuse" or not evaluation:
+            return False
+        conversation = self.manager.get_conversation(
+            message.metadata.get("conversation_id")
+        )
+        if not conversation:
+            return False
+        conversation.messages.append(
+            Message(
+                role="agent",
+                parts=[
+                    TextPart(
+                        text=(
+                            f"This resume is {duplicate.similarity:.0%} similar to"
+                            f" {duplicate.metadata.get('filename')}, evaluated"
+                            f" before. Reusing that evaluation:\n\n{evaluation}"
+                        )
+                    )
+                ],
+                metadata={
+                    "conversation_id": conversation.conversation_id,
+                    "message_id": str(uuid.uuid4()),
+                    "last_message_id": get_message_id(message),
+                },
+            )
+        )
+        return True
+
+    def _record_evaluation(
+        self, resume_key: str, request_key: str, message: Message
+    ) -> None:
+        """Keeps the answer of an upload's tasks for its duplicates.
+
+        The upload's own tasks are looked up by its message id, so uploads
+        processed side by side in one conversation never record each other's
+        answers. The answer is kept only when every one of them completed, so
+        questions of an input-required task and errors are never reused.
+        """
+        tasks = self.manager.tasks_for_message(get_message_id(message))
+        if not tasks or any(task.status.state != TaskState.COMPLETED for task in tasks):
+            return
+        answers = [text for text in map(task_answer, tasks) if text]
+        metadata = self._near_duplicates.get_metadata(resume_key)
+        if len(answers) == len(tasks) and metadata is not None:
+            evaluations = dict(metadata.get("evaluations") or {})
+            evaluations[request_key] = "\n\n".join(answers)
+            self._near_duplicates.update_metadata(resume_key, evaluations=evaluations)
+
     async def _send_message(self, request: Request):
         message_data = await request.json()
         message = Message(**message_data["params"])
@@ -237,43 +395,78 @@ Please analyze the above resume content and interview dialogue and provide a det
         return ListMessageResponse(result=[])
 
     def cache_content(self, messages: list[Message]) -> list[Message]:
-        """Cache file content and replace with URI references."""
+        """Cache file content and replace with URI references.
+
+        File bytes are decoded once into the file store and the message parts
+        are rewritten in place, so parts seen before are left as they are.
+        """
         cached_messages = []
         for message in messages:
             message_id = get_message_id(message)
-            if not message_id:
+            if not message_id or not any(
+                part.type == "file" and (part.file.bytes or is_blob_uri(part.file.uri))
+                for part in message.parts
+            ):
                 cached_messages.append(message)
                 continue
 
             new_parts = []
             for i, part in enumerate(message.parts):
-                if part.type != "file":
+                if part.type != "file" or not (
+                    part.file.bytes or is_blob_uri(part.file.uri)
+                ):
                     new_parts.append(part)
                     continue
 
-                message_part_id = f"{message_id}:{i}"
-                cache_id = self._message_to_cache.get(message_part_id)
-                if not cache_id:
-                    cache_id = str(uuid.uuid4())
-                    self._message_to_cache[message_part_id] = cache_id
+                cache_id = str(uuid.uuid5(self._file_id_namespace, f"{message_id}:{i}"))
+                if cache_id not in self._file_store:
+                    if part.file.bytes:
+                        data = decode_file_bytes(part.file.bytes)
+                    else:
+                        # Shares the blob's bytes object, no copy is made
+                        data = get_blob_store().get(part.file.uri)
+                    if data is None:
+                        print(f"[WARN] Blob {part.file.uri} is no longer available")
+                        new_parts.append(part)
+                        continue
+                    self._file_store.put(
+                        cache_id, data, part.file.mimeType or "application/octet-stream"
+                    )
 
                 # Replace the part data with a URI reference
                 new_parts.append(
                     FilePart(
                         file=FileContent(
+                            name=part.file.name,
                             mimeType=part.file.mimeType,
                             uri=f"/message/file/{cache_id}",
                         )
                     )
                 )
 
-                if cache_id not in self._file_cache:
-                    self._file_cache[cache_id] = part
-
             message.parts = new_parts
             cached_messages.append(message)
         return cached_messages
 
+    async def _state_snapshot(self, request: Request):
+        """Returns conversations, tasks, pending messages and, when a
+        conversation id is given, its messages in one response."""
+        message_data = await request.json()
+        conversation_id = message_data.get("params")
+        messages = []
+        if conversation_id:
+            conversation = self.manager.get_conversation(conversation_id)
+            if conversation:
+                messages = self.cache_content(conversation.messages)
+        return GetStateSnapshotResponse(
+            result=StateSnapshot(
+                conversations=self.manager.conversations,
+                messages=messages,
+                tasks=self.manager.tasks,
+                pending_messages=self.manager.get_pending_messages(),
+            )
+        )
+
     async def _pending_messages(self):
         return PendingMessageResponse(result=self.manager.get_pending_messages())
 
@@ -292,18 +485,41 @@ Please analyze the above resume content and interview dialogue and provide a det
         self.manager.register_agent(url)
         return RegisterAgentResponse()
 
+    async def _unregister_agent(self, request: Request):
+        message_data = await request.json()
+        url = message_data["params"]
+        return UnregisterAgentResponse(result=self.manager.unregister_agent(url))
+
     async def _list_agents(self):
         return ListAgentResponse(result=self.manager.agents)
 
     def _files(self, file_id: str):
-        if file_id not in self._file_cache:
+        stored = self._file_store.get(file_id)
+        if stored is None:
             raise FileNotFoundError(f"File {file_id} not found")
-        part = self._file_cache[file_id]
-        if "image" in part.file.mimeType:
-            return Response(
-                content=base64.b64decode(part.file.bytes), media_type=part.file.mimeType
-            )
-        return Response(content=part.file.bytes, media_type=part.file.mimeType)
+        if stored.path is not None:
+            # Spilled files are streamed from disk with range request support
+            return FileResponse(stored.path, media_type=stored.mime_type)
+        return Response(content=stored.data, media_type=stored.mime_type)
+
+    def _metrics(self):
+        """Exposes runtime metrics of the server's caches and the host agent."""
+        return {
+            "extraction_cache": self._extraction_cache.stats(),
+            "file_store": self._file_store.stats(),
+            "near_duplicates": self._near_duplicates.stats(),
+            "blob_store": get_blob_store().stats(),
+            "host_context": (
+                self.manager.context_stats()
+                if isinstance(self.manager, ADKHostManager)
+                else None
+            ),
+            "sessions": (
+                self.manager.session_stats()
+                if isinstance(self.manager, ADKHostManager)
+                else None
+            ),
+        }
 
     async def _update_api_key(self, request: Request):
         """Update the API key"""
@@ -319,80 +535,80 @@ Please analyze the above resume content and interview dialogue and provide a det
         except Exception as e:
             return {"status": "error", "message": str(e)}
 
-    def _extract_text_from_uploaded_file(self, uploaded_file):
+    async def _extract_text_from_uploaded_file(self, uploaded_file):
         """Extract text content from uploaded files.
 
+        The upload is read in chunks within the size budget and parsed in a
+        worker process so the event loop is never blocked. Files whose bytes
+        were seen before are served from the extraction cache.
+
         Args:
             uploaded_file: FastAPI UploadFile object
 
         Returns:
             str: Extracted text content or None if extraction fails
-        """
-        try:
-            filename = uploaded_file.filename
-            file_content = uploaded_file.file.read()
-
-            # Reset file pointer for potential future reads
-            uploaded_file.file.seek(0)
-
-            # Determine file type from filename
-            if filename.lower().endswith(".pdf"):
-                return self._extract_pdf_text(file_content)
-            elif filename.lower().endswith((".txt", ".text")):
-                return file_content.decode("utf-8")
-            elif filename.lower().endswith((".doc", ".docx")):
-                return self._extract_word_text(file_content)
-            else:
-                if DEBUG_MODE:
-                    print(f"[DEBUG] Server: Unsupported file type: {filename}")
-                return None
-
-        except Exception as e:
-            print(f"[ERROR] Server: Failed to extract text from file: {e}")
-            return None
-
-    def _extract_pdf_text(self, file_content):
-        """Extract text from PDF file content.
-
-        Args:
-            file_content (bytes): PDF file content
 
-        Returns:
-            str: Extracted text or None if extraction fails
+        Raises:
+            DocumentTooLargeError: If the upload exceeds the size budget.
         """
-        try:
-            pdf_file = io.BytesIO(file_content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text_content = ""
-
-            for page in pdf_reader.pages:
-                text_content += page.extract_text() + "\n"
-
-            return text_content.strip()
-
-        except Exception as e:
-            print(f"[ERROR] Server: Failed to extract PDF text: {e}")
+        filename = uploaded_file.filename
+        if not self._document_extractor.supports(filename):
+            if DEBUG_MODE:
+                print(f"[DEBUG] Server: Unsupported file type: {filename}")
             return None
 
-    def _extract_word_text(self, file_content):
-        """Extract text from Word document file content.
-
-        Args:
-            file_content (bytes): Word document file content
+        file_content = await self._document_extractor.read_upload(uploaded_file)
+        cache_key = self._extraction_cache.make_key(file_content, filename)
+        cached = self._extraction_cache.get(cache_key)
+        if cached is not None:
+            if DEBUG_MODE:
+                print(f"[DEBUG] Server: Extraction cache hit for {filename}")
+            return cached.text
 
-        Returns:
-            str: Extracted text or None if extraction fails
-        """
         try:
-            doc_file = io.BytesIO(file_content)
-            doc = docx.Document(doc_file)
-            text_content = ""
-
-            for paragraph in doc.paragraphs:
-                text_content += paragraph.text + "\n"
-
-            return text_content.strip()
-
+            text = await self._document_extractor.extract(filename, file_content)
+        except asyncio.TimeoutError:
+            print(f"[ERROR] Server: Timed out extracting text from {filename}")
+            return None
         except Exception as e:
-            print(f"[ERROR] Server: Failed to extract Word document text: {e}")
+            print(f"[ERROR] Server: Failed to extract text from file: {e}")
             return None
+
+        if text is not None:
+            self._extraction_cache.put(
+                ExtractedDocument(
+                    key=cache_key,
+                    text=text,
+                    filename=filename,
+                    size=len(file_content),
+                )
+            )
+        return text
+
+
+def task_answer(task: Task) -> str:
+    """Text of a task's artifacts, or of its final agent message."""
+    texts = [
+        part.text
+        for artifact in task.artifacts or []
+        for part in artifact.parts
+        if part.type == "text"
+    ]
+    message = task.status.message
+    if not texts and message and message.role == "agent":
+        texts = [part.text for part in message.parts if part.type == "text"]
+    return "\n".join(texts)
+
+
+def evaluation_request_key(message: Message, text: str) -> str:
+    """Identifies what an upload asks for: the request text and target agent."""
+    agent_url = (message.metadata or {}).get("remote_agent_url") or ""
+    return text_key(f"{agent_url}\n{text}")
+
+
+def decode_file_bytes(data: str) -> bytes:
+    """Decodes base64 file content, falling back to the raw text."""
+    try:
+        return base64.b64decode(data, validate=True)
+    except (binascii.Error, ValueError):
+        return data.encode("utf-8")
@@ -110,6 +110,16 @@ class RegisterAgentResponse(JSONRPCResponse):
     result: str | None = None
 
 
+class UnregisterAgentRequest(JSONRPCRequest):
+    method: Literal["agent/unregister"] = "agent/unregister"
+    # This is the url the agent was registered with
+    params: str | None = None
+
+
+class UnregisterAgentResponse(JSONRPCResponse):
+    result: bool | None = None
+
+
 class ListAgentRequest(JSONRPCRequest):
     method: Literal["agent/list"] = "agent/list"
 
@@ -118,6 +128,25 @@ class ListAgentResponse(JSONRPCResponse):
     result: list[AgentCard] | None = None
 
 
+class StateSnapshot(BaseModel):
+    """Everything the UI needs to refresh its state in a single poll."""
+
+    conversations: list[Conversation] = Field(default_factory=list)
+    messages: list[Message] = Field(default_factory=list)
+    tasks: list[Task] = Field(default_factory=list)
+    pending_messages: list[Tuple[str, str]] = Field(default_factory=list)
+
+
+class GetStateSnapshotRequest(JSONRPCRequest):
+    method: Literal["state/snapshot"] = "state/snapshot"
+    # This is the conversation id whose messages are included, if any
+    params: str | None = None
+
+
+class GetStateSnapshotResponse(JSONRPCResponse):
+    result: StateSnapshot | None = None
+
+
 AgentRequest = TypeAdapter(
     Annotated[
         Union[
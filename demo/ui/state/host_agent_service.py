@@ -2,6 +2,8 @@ import os
 import json
 import traceback
 import sys
+import asyncio
+import weakref
 import httpx
 
 from typing import Tuple, Any
@@ -16,9 +18,12 @@ from service.types import (
     PendingMessageRequest,
     ListTaskRequest,
     RegisterAgentRequest,
+    UnregisterAgentRequest,
     ListAgentRequest,
     GetEventRequest,
     SendMessageWithFileRequest,
+    GetStateSnapshotRequest,
+    StateSnapshot,
 )
 from .state import (
     AppState,
@@ -29,12 +34,27 @@ from .state import (
     StateEvent,
 )
 from common.types import Message, Task, Part
+from hosts.multiagent.router import IntentRouter
+from .routing_cache import RoutingCache, roster_version
 
 server_url = "http://localhost:12000"
 
+# Pooled clients shared by all helpers, keyed by server url since main.py may
+# rebind server_url after import.
+_clients: dict[str, ConversationClient] = {}
+
+
+def get_conversation_client() -> ConversationClient:
+    """Returns the shared ConversationClient for the current server_url."""
+    client = _clients.get(server_url)
+    if client is None:
+        client = ConversationClient(server_url)
+        _clients[server_url] = client
+    return client
+
 
 async def ListConversations() -> list[Conversation]:
-    client = ConversationClient(server_url)
+    client = get_conversation_client()
     try:
         response = await client.list_conversation(ListConversationRequest())
         return response.result
@@ -43,7 +63,7 @@ async def ListConversations() -> list[Conversation]:
 
 
 async def SendMessageWithFile(message: Message, file_path: str) -> str | None:
-    client = ConversationClient(server_url)
+    client = get_conversation_client()
     try:
         print(
             f"[DEBUG] SendMessageWithFile: Input message metadata: {message.metadata}"
@@ -70,7 +90,7 @@ async def SendMessageWithFile(message: Message, file_path: str) -> str | None:
 
 
 async def SendMessage(message: Message) -> str | None:
-    client = ConversationClient(server_url)
+    client = get_conversation_client()
     try:
         response = await client.send_message(SendMessageRequest(params=message))
         return response.result
@@ -79,7 +99,7 @@ async def SendMessage(message: Message) -> str | None:
 
 
 async def CreateConversation() -> Conversation:
-    client = ConversationClient(server_url)
+    client = get_conversation_client()
     try:
         print("[DEBUG] Calling create_conversation()...")
         response = await client.create_conversation(CreateConversationRequest())
@@ -91,7 +111,7 @@ async def CreateConversation() -> Conversation:
 
 
 async def ListRemoteAgents():
-    client = ConversationClient(server_url)
+    client = get_conversation_client()
     try:
         response = await client.list_agents(ListAgentRequest())
         return response.result
@@ -100,15 +120,28 @@ async def ListRemoteAgents():
 
 
 async def AddRemoteAgent(path: str):
-    client = ConversationClient(server_url)
+    client = get_conversation_client()
     try:
         await client.register_agent(RegisterAgentRequest(params=path))
     except Exception as e:
         print("Failed to register the agent", e)
+    finally:
+        # Routing answers were given for the previous set of agents
+        _routing_cache.invalidate()
+
+
+async def RemoveRemoteAgent(path: str):
+    client = get_conversation_client()
+    try:
+        await client.unregister_agent(UnregisterAgentRequest(params=path))
+    except Exception as e:
+        print("Failed to unregister the agent", e)
+    finally:
+        _routing_cache.invalidate()
 
 
 async def GetEvents() -> list[Event]:
-    client = ConversationClient(server_url)
+    client = get_conversation_client()
     try:
         response = await client.get_events(GetEventRequest())
         return response.result
@@ -117,7 +150,7 @@ async def GetEvents() -> list[Event]:
 
 
 async def GetProcessingMessages():
-    client = ConversationClient(server_url)
+    client = get_conversation_client()
     try:
         response = await client.get_pending_messages(PendingMessageRequest())
         return dict(response.result)
@@ -130,7 +163,7 @@ def GetMessageAliases():
 
 
 async def GetTasks():
-    client = ConversationClient(server_url)
+    client = get_conversation_client()
     try:
         response = await client.list_tasks(ListTaskRequest())
         return response.result
@@ -139,7 +172,7 @@ async def GetTasks():
 
 
 async def ListMessages(conversation_id: str) -> list[Message]:
-    client = ConversationClient(server_url)
+    client = get_conversation_client()
     try:
         response = await client.list_messages(
             ListMessageRequest(params=conversation_id)
@@ -149,12 +182,28 @@ async def ListMessages(conversation_id: str) -> list[Message]:
         print("Failed to list messages ", e)
 
 
+async def GetStateSnapshot(conversation_id: str) -> StateSnapshot | None:
+    client = get_conversation_client()
+    try:
+        response = await client.get_state_snapshot(
+            GetStateSnapshotRequest(params=conversation_id or None)
+        )
+        return response.result
+    except Exception as e:
+        print("Failed to get state snapshot ", e)
+
+
 async def UpdateAppState(state: AppState, conversation_id: str):
     """Update the app state."""
     try:
         print(f"[DEBUG] UpdateAppState called, conversation_id: {conversation_id}")
         print(f"[DEBUG] Before update, message count: {len(state.messages)}")
 
+        # One request fetches everything the poll needs.
+        snapshot = await GetStateSnapshot(conversation_id)
+        if snapshot is None:
+            return
+
         if conversation_id:
             state.current_conversation_id = conversation_id
 
@@ -200,7 +249,7 @@ async def UpdateAppState(state: AppState, conversation_id: str):
 
                 print(f"[DEBUG] Found {len(local_messages)} local messages to preserve")
 
-            messages = await ListMessages(conversation_id)
+            messages = snapshot.messages
             if not messages:
                 # 如果服务器没有消息，只保留本地未同步的消息
                 state.messages = local_messages
@@ -225,7 +274,7 @@ async def UpdateAppState(state: AppState, conversation_id: str):
                     f"[DEBUG] Merged {len(server_messages)} server messages with {len(unique_local_messages)} unique local messages"
                 )
 
-        conversations = await ListConversations()
+        conversations = snapshot.conversations
         if not conversations:
             state.conversations = []
         else:
@@ -234,14 +283,14 @@ async def UpdateAppState(state: AppState, conversation_id: str):
             ]
 
         state.task_list = []
-        for task in await GetTasks():
+        for task in snapshot.tasks:
             state.task_list.append(
                 SessionTask(
                     session_id=extract_conversation_id(task),
                     task=convert_task_to_state(task),
                 )
             )
-        state.background_tasks = await GetProcessingMessages()
+        state.background_tasks = dict(snapshot.pending_messages)
         state.message_aliases = GetMessageAliases()
 
         print(f"[DEBUG] After update, message count: {len(state.messages)}")
@@ -390,6 +439,47 @@ def extract_conversation_id(task: Task) -> str:
     return ""
 
 
+# LLM routing decisions, keyed by normalized message and roster version.
+_routing_cache = RoutingCache()
+
+# Pooled Azure OpenAI clients, one per event loop (httpx clients are loop bound).
+_azure_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, httpx.AsyncClient
+] = weakref.WeakKeyDictionary()
+
+
+def get_azure_client() -> httpx.AsyncClient:
+    """Returns the pooled Azure OpenAI client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _azure_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(timeout=20.0)
+        _azure_clients[loop] = client
+    return client
+
+
+# Local router used before falling back to Azure OpenAI, rebuilt when the
+# registered agents change.
+_router = IntentRouter()
+_router_roster: tuple[str, ...] = ()
+
+
+def route_locally(user_message: str, remote_agents) -> str | None:
+    """Returns the agent url picked by the local intent router, if confident."""
+    global _router_roster
+    roster = tuple(sorted(agent.url for agent in remote_agents))
+    if roster != _router_roster:
+        _router.set_agents(remote_agents)
+        _router_roster = roster
+    decision = _router.route(user_message)
+    if decision is None:
+        return None
+    print(
+        f"[DEBUG] Local router picked {decision.agent_name} ({decision.method}, confidence {decision.confidence})"
+    )
+    return decision.agent_url
+
+
 async def pick_agent_using_chatgpt(user_message: str) -> str | None:
     # Azure OpenAI configuration
     api_key = os.environ.get("AZURE_OPENAI_TOKEN")
@@ -397,6 +487,16 @@ async def pick_agent_using_chatgpt(user_message: str) -> str | None:
     deployment_name = os.environ.get("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4o")
     api_version = "2025-03-01-preview"
 
+    remote_agents = await ListRemoteAgents()
+    if not remote_agents:
+        print("[DEBUG] No remote agents available.")
+        return None
+
+    # Clear intents are resolved locally; only ambiguous ones reach the LLM.
+    local_pick = route_locally(user_message, remote_agents)
+    if local_pick:
+        return local_pick
+
     if not api_key:
         print("[DEBUG] No AZURE_OPENAI_TOKEN found.")
         return None
@@ -405,10 +505,11 @@ async def pick_agent_using_chatgpt(user_message: str) -> str | None:
         print("[DEBUG] No AZURE_OPENAI_ENDPOINT found.")
         return None
 
-    remote_agents = await ListRemoteAgents()
-    if not remote_agents:
-        print("[DEBUG] No remote agents available.")
-        return None
+    version = roster_version(remote_agents)
+    cached_pick = _routing_cache.get(user_message, version)
+    if cached_pick:
+        print(f"[DEBUG] Routing cache hit: {cached_pick}")
+        return cached_pick
 
     agent_descriptions = "\n".join(
         f"- {agent.name}: {agent.description} ({agent.url})" for agent in remote_agents
@@ -443,15 +544,20 @@ ONLY reply with the agent's base_url. Nothing else.
     azure_url = f"{endpoint.rstrip('/')}/openai/deployments/{deployment_name}/chat/completions?api-version={api_version}"
 
     try:
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            response = await client.post(azure_url, headers=headers, json=body)
-            response.raise_for_status()
-            data = response.json()
-            text_response = data["choices"][0]["message"]["content"]
-            text_response = text_response.strip()
-
-            print(f"[DEBUG] Azure OpenAI suggested agent: {text_response}")
-            return text_response
+        response = await get_azure_client().post(azure_url, headers=headers, json=body)
+        response.raise_for_status()
+        data = response.json()
+        text_response = data["choices"][0]["message"]["content"]
+        text_response = text_response.strip()
+
+        print(f"[DEBUG] Azure OpenAI suggested agent: {text_response}")
+        # Only cache answers that name a registered agent
+        if any(
+            text_response.rstrip("/") == agent.url.rstrip("/")
+            for agent in remote_agents
+        ):
+            _routing_cache.put(user_message, version, text_response)
+        return text_response
     except Exception as e:
         print(f"[DEBUG] Failed to call Azure OpenAI: {e}")
         return None
@@ -0,0 +1,80 @@
+"""Cache of LLM agent-routing decisions.
+
+pick_agent_using_chatgpt asks Azure OpenAI which agent should handle a
+message. The answer only depends on what the message asks for and on the
+registered agents, so decisions are cached by (normalized message, roster
+version) for a limited time. Registering an agent changes the roster version
+and also clears the cache explicitly.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable
+
+from common.types import AgentCard
+from hosts.multiagent.router import normalize_message
+
+DEFAULT_TTL_SECONDS = float(os.environ.get("ROUTING_CACHE_TTL_SECONDS", 600))
+DEFAULT_MAX_ENTRIES = int(os.environ.get("ROUTING_CACHE_SIZE", 512))
+
+
+def roster_version(agents: Iterable[AgentCard]) -> str:
+    """Returns a short fingerprint of the registered agents."""
+    roster = sorted(f"{agent.name}|{agent.url}" for agent in agents)
+    return hashlib.sha1("\n".join(roster).encode("utf-8")).hexdigest()[:12]
+
+
+class RoutingCache:
+    """Thread-safe TTL + LRU cache of routed agent urls."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def make_key(message: str, version: str) -> tuple[str, str]:
+        return normalize_message(message), version
+
+    def get(self, message: str, version: str) -> str | None:
+        key = self.make_key(message, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def put(self, message: str, version: str, agent_url: str) -> None:
+        key = self.make_key(message, version)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, agent_url)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+            }
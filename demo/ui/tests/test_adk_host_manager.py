@@ -2,6 +2,7 @@ import unittest
 from service.server.adk_host_manager import ADKHostManager
 from google.genai import types
 from common.types import TextPart, FilePart, DataPart
+from common.utils.blob_store import is_blob_uri, read_file_bytes
 
 
 class ADKHostManagerTest(unittest.TestCase):
@@ -103,6 +104,20 @@ class ADKHostManagerTest(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "Unexpected content, unknown type"):
             self.manager.adk_content_to_message(content, self.conversation_id)
 
+    def test_adk_content_to_message_inline_data_uses_blob_handle(self) -> None:
+        """Test that inline bytes are referenced by blob handle, not base64."""
+        part = types.Part.from_bytes(data=b"\x89PNG", mime_type="image/png")
+        content = types.Content(parts=[part], role="model")
+        message = self.manager.adk_content_to_message(content, self.conversation_id)
+        file = message.parts[0].file
+        self.assertIsNone(file.bytes)
+        self.assertTrue(is_blob_uri(file.uri))
+        self.assertEqual(read_file_bytes(file), b"\x89PNG")
+
+        # Converting back resolves the handle to the same bytes.
+        round_trip = self.manager.adk_content_from_message(message)
+        self.assertEqual(round_trip.parts[0].inline_data.data, b"\x89PNG")
+
     def test_adk_content_to_message_multiple_files(self) -> None:
         """Test converting ADK content with multiple file parts to message."""
         file1 = types.Part()
@@ -0,0 +1,230 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from google.adk.events.event import Event
+from google.adk.events.event_actions import EventActions
+from google.genai import types
+
+from service.server.adk_host_manager import ADKHostManager
+from service.server.adk_services import (
+    FileArtifactService,
+    PrunableInMemorySessionService,
+    SqliteMemoryService,
+    SqliteSessionService,
+    create_adk_services,
+)
+
+
+def _text_event(text: str, author: str = "user") -> Event:
+    return Event(
+        author=author,
+        invocation_id=Event.new_id(),
+        content=types.Content(role="user", parts=[types.Part.from_text(text=text)]),
+        actions=EventActions(state_delta={"last": text}),
+    )
+
+
+class SqliteSessionServiceTest(unittest.TestCase):
+    """Tests for the SQLite backed ADK session service."""
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.db_path = os.path.join(self.tmp.name, "adk.sqlite3")
+
+    def _service(self, **kwargs) -> SqliteSessionService:
+        return SqliteSessionService(self.db_path, **kwargs)
+
+    def test_session_survives_restart(self) -> None:
+        service = self._service()
+        session = service.create_session(
+            app_name="A2A", user_id="u", session_id="s1", state={"a": 1}
+        )
+        service.append_event(session, _text_event("hello"))
+        self.assertEqual(session.state["last"], "hello")
+
+        restarted = self._service()
+        loaded = restarted.get_session(app_name="A2A", user_id="u", session_id="s1")
+        self.assertEqual(loaded.state, {"a": 1, "last": "hello"})
+        self.assertEqual(loaded.events[0].content.parts[0].text, "hello")
+        self.assertEqual(
+            [
+                s.id
+                for s in restarted.list_sessions(app_name="A2A", user_id="u").sessions
+            ],
+            ["s1"],
+        )
+
+    def test_get_session_returns_copy(self) -> None:
+        service = self._service()
+        service.create_session(app_name="A2A", user_id="u", session_id="s1")
+        copy = service.get_session(app_name="A2A", user_id="u", session_id="s1")
+        copy.state["mutated"] = True
+        fresh = service.get_session(app_name="A2A", user_id="u", session_id="s1")
+        self.assertNotIn("mutated", fresh.state)
+
+    def test_hot_sessions_bounded(self) -> None:
+        service = self._service(max_hot_sessions=2)
+        for i in range(5):
+            session = service.create_session(
+                app_name="A2A", user_id="u", session_id=f"s{i}"
+            )
+            service.append_event(session, _text_event(f"m{i}"))
+        stats = service.stats()
+        self.assertEqual(stats["hot_sessions"], 2)
+        self.assertEqual(stats["sessions"], 5)
+        # Cold sessions are reloaded from disk.
+        cold = service.get_session(app_name="A2A", user_id="u", session_id="s0")
+        self.assertEqual(cold.state["last"], "m0")
+
+    def test_idle_sessions_expire(self) -> None:
+        service = self._service(ttl_seconds=60)
+        service.create_session(app_name="A2A", user_id="u", session_id="old")
+        with mock.patch("time.time", return_value=time.time() + 120):
+            service.create_session(app_name="A2A", user_id="u", session_id="new")
+            self.assertIsNone(
+                service.get_session(app_name="A2A", user_id="u", session_id="old")
+            )
+            self.assertIsNotNone(
+                service.get_session(app_name="A2A", user_id="u", session_id="new")
+            )
+        self.assertEqual(service.stats()["sessions"], 1)
+
+    def test_remove_events(self) -> None:
+        service = self._service()
+        session = service.create_session(app_name="A2A", user_id="u", session_id="s1")
+        first = service.append_event(session, _text_event("one"))
+        service.append_event(session, _text_event("two"))
+        service.remove_events(session, {first.id})
+
+        loaded = self._service().get_session(
+            app_name="A2A", user_id="u", session_id="s1"
+        )
+        self.assertEqual([e.content.parts[0].text for e in loaded.events], ["two"])
+
+
+class PrunableInMemorySessionServiceTest(unittest.TestCase):
+    """Tests for the in-memory session service the host prunes."""
+
+    def test_remove_events(self) -> None:
+        service = PrunableInMemorySessionService()
+        session = service.create_session(app_name="A2A", user_id="u", session_id="s1")
+        first = service.append_event(session, _text_event("one"))
+        service.append_event(session, _text_event("two"))
+        service.remove_events(session, {first.id})
+        service.remove_events(session.model_copy(update={"id": "gone"}), {first.id})
+
+        loaded = service.get_session(app_name="A2A", user_id="u", session_id="s1")
+        self.assertEqual([e.content.parts[0].text for e in loaded.events], ["two"])
+
+    def test_default_backend(self) -> None:
+        session_service, _, _ = create_adk_services("memory")
+        self.assertIsInstance(session_service, PrunableInMemorySessionService)
+
+
+class SqliteMemoryServiceTest(unittest.TestCase):
+    """Tests for the SQLite backed ADK memory service."""
+
+    def test_search_matches_keywords(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "adk.sqlite3")
+            sessions = SqliteSessionService(db_path)
+            session = sessions.create_session(
+                app_name="A2A", user_id="u", session_id="s1"
+            )
+            sessions.append_event(session, _text_event("Rate the Python candidate"))
+            sessions.append_event(session, _text_event("unrelated"))
+            SqliteMemoryService(db_path).add_session_to_memory(session)
+
+            response = SqliteMemoryService(db_path).search_memory(
+                app_name="A2A", user_id="u", query="python"
+            )
+            self.assertEqual(len(response.memories), 1)
+            self.assertEqual(response.memories[0].session_id, "s1")
+            self.assertEqual(len(response.memories[0].events), 1)
+
+
+class FileArtifactServiceTest(unittest.TestCase):
+    """Tests for the disk backed ADK artifact service."""
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.keys = {"app_name": "A2A", "user_id": "u", "session_id": "s1"}
+
+    def test_versions_persist_and_spill(self) -> None:
+        service = FileArtifactService(self.tmp.name, max_memory_bytes=1024)
+        for i in range(3):
+            part = types.Part.from_bytes(data=bytes([i]) * 1000, mime_type="text/plain")
+            self.assertEqual(
+                service.save_artifact(filename="cv.txt", artifact=part, **self.keys), i
+            )
+        # Only the latest version fits in memory; the others live on disk.
+        self.assertEqual(service.stats()["hot_artifacts"], 1)
+
+        restarted = FileArtifactService(self.tmp.name)
+        self.assertEqual(
+            restarted.list_versions(filename="cv.txt", **self.keys), [0, 1, 2]
+        )
+        first = restarted.load_artifact(filename="cv.txt", version=0, **self.keys)
+        self.assertEqual(first.inline_data.data, b"\x00" * 1000)
+        latest = restarted.load_artifact(filename="cv.txt", **self.keys)
+        self.assertEqual(latest.inline_data.mime_type, "text/plain")
+        self.assertEqual(latest.inline_data.data, b"\x02" * 1000)
+
+    def test_text_and_user_scoped_artifacts(self) -> None:
+        service = FileArtifactService(self.tmp.name)
+        service.save_artifact(
+            filename="user:profile",
+            artifact=types.Part.from_text(text="hi"),
+            **self.keys,
+        )
+        other_session = {**self.keys, "session_id": "s2"}
+        self.assertEqual(service.list_artifact_keys(**other_session), ["user:profile"])
+        loaded = FileArtifactService(self.tmp.name).load_artifact(
+            filename="user:profile", **other_session
+        )
+        self.assertEqual(loaded.text, "hi")
+
+        service.delete_artifact(filename="user:profile", **self.keys)
+        self.assertIsNone(service.load_artifact(filename="user:profile", **self.keys))
+
+
+class CreateAdkServicesTest(unittest.TestCase):
+    """Tests backend selection for the host manager."""
+
+    def test_sqlite_backend_from_env(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.dict(
+            os.environ, {"ADK_SERVICES_BACKEND": "sqlite"}
+        ):
+            session_service, artifact_service, memory_service = create_adk_services(
+                storage_dir=tmp
+            )
+            self.assertIsInstance(session_service, SqliteSessionService)
+            self.assertIsInstance(artifact_service, FileArtifactService)
+            self.assertIsInstance(memory_service, SqliteMemoryService)
+
+    def test_unknown_backend(self) -> None:
+        with self.assertRaises(ValueError):
+            create_adk_services("redis")
+
+    def test_host_manager_prunes_persistent_sessions(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp, mock.patch(
+            "service.server.adk_host_manager.create_adk_services",
+            lambda: create_adk_services("sqlite", tmp),
+        ):
+            manager = ADKHostManager()
+            conversation_id = manager.create_conversation().conversation_id
+            for i in range(50):
+                manager._update_session_state(
+                    conversation_id, {"input_message_metadata": {"message_id": str(i)}}
+                )
+            self.assertEqual(manager.session_stats()["events"], 1)
+            self.assertEqual(manager._session_service.stats()["events"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+import base64
+import os
+import unittest
+from unittest.mock import patch
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from common.types import (
+    AgentCapabilities,
+    AgentCard,
+    FileContent,
+    FilePart,
+    Message,
+    TextPart,
+)
+from service.client.client import ConversationClient
+from service.server.server import ConversationServer
+from service.types import GetStateSnapshotResponse, UnregisterAgentResponse
+
+
+class ConversationServerSnapshotTest(unittest.TestCase):
+    """Tests for the combined /state/snapshot endpoint."""
+
+    def setUp(self) -> None:
+        with patch.dict(os.environ, {"A2A_HOST": "FAKE"}):
+            router = APIRouter()
+            self.server = ConversationServer(router)
+        app = FastAPI()
+        app.include_router(router)
+        self.client = TestClient(app)
+
+    def _snapshot(self, conversation_id: str | None) -> GetStateSnapshotResponse:
+        response = self.client.post(
+            "/state/snapshot",
+            json={
+                "jsonrpc": "2.0",
+                "method": "state/snapshot",
+                "params": conversation_id,
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        return GetStateSnapshotResponse(**response.json())
+
+    def test_snapshot_without_conversation(self) -> None:
+        """Without a conversation id only the global state is returned."""
+        conversation = self.server.manager.create_conversation()
+        snapshot = self._snapshot(None).result
+        self.assertEqual(
+            [c.conversation_id for c in snapshot.conversations],
+            [conversation.conversation_id],
+        )
+        self.assertEqual(snapshot.messages, [])
+        self.assertEqual(snapshot.tasks, [])
+        self.assertEqual(snapshot.pending_messages, [])
+
+    def test_snapshot_includes_conversation_messages(self) -> None:
+        """Messages of the requested conversation are part of the snapshot."""
+        conversation = self.server.manager.create_conversation()
+        conversation.messages.append(
+            Message(
+                role="user",
+                parts=[TextPart(text="Hello")],
+                metadata={
+                    "message_id": "m1",
+                    "conversation_id": conversation.conversation_id,
+                },
+            )
+        )
+        snapshot = self._snapshot(conversation.conversation_id).result
+        self.assertEqual(len(snapshot.messages), 1)
+        self.assertEqual(snapshot.messages[0].parts[0].text, "Hello")
+
+    def test_file_parts_are_cached_without_per_message_state(self) -> None:
+        """File parts are served from the store; only the store holds them."""
+        data = b"%PDF-1.4 resume"
+        messages = [
+            Message(
+                role="user",
+                parts=[
+                    TextPart(text="Resume"),
+                    FilePart(
+                        file=FileContent(
+                            name="cv.pdf",
+                            mimeType="application/pdf",
+                            bytes=base64.b64encode(data).decode(),
+                        )
+                    ),
+                ],
+                metadata={"message_id": f"m{i}"},
+            )
+            for i in range(3)
+        ]
+        self.server.cache_content(messages)
+        uris = [m.parts[1].file.uri for m in messages]
+        self.assertEqual(len(set(uris)), 3)
+        self.assertIsNone(messages[0].parts[1].file.bytes)
+
+        # Rewritten messages are left as they are on the next poll
+        self.server.cache_content(messages)
+        self.assertEqual([m.parts[1].file.uri for m in messages], uris)
+        self.assertEqual(self.server._file_store.stats()["files"], 3)
+        response = self.client.get(uris[0])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, data)
+
+
+class ConversationServerAgentTest(unittest.TestCase):
+    """Tests for agent registration endpoints."""
+
+    def setUp(self) -> None:
+        with patch.dict(os.environ, {"A2A_HOST": "FAKE"}):
+            router = APIRouter()
+            self.server = ConversationServer(router)
+        app = FastAPI()
+        app.include_router(router)
+        self.client = TestClient(app)
+
+    def test_unregister_agent(self) -> None:
+        self.server.manager._agents.append(
+            AgentCard(
+                name="Agent",
+                url="http://localhost:10001/",
+                version="1.0",
+                capabilities=AgentCapabilities(),
+                skills=[],
+            )
+        )
+        payload = {
+            "jsonrpc": "2.0",
+            "method": "agent/unregister",
+            "params": "http://localhost:10001/",
+        }
+        response = self.client.post("/agent/unregister", json=payload)
+        self.assertTrue(UnregisterAgentResponse(**response.json()).result)
+        self.assertEqual(self.server.manager.agents, [])
+
+        response = self.client.post("/agent/unregister", json=payload)
+        self.assertFalse(UnregisterAgentResponse(**response.json()).result)
+
+
+class ConversationClientPoolTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the pooled HTTP client in ConversationClient."""
+
+    async def test_client_is_reused(self) -> None:
+        client = ConversationClient("http://localhost:12000")
+        self.assertIs(client._get_client(), client._get_client())
+        await client.aclose()
+
+    async def test_closed_client_is_replaced(self) -> None:
+        client = ConversationClient("http://localhost:12000")
+        first = client._get_client()
+        await first.aclose()
+        self.assertIsNot(first, client._get_client())
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    unittest.main()
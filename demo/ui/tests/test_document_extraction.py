@@ -0,0 +1,59 @@
+import os
+import unittest
+
+from service.server.document_extraction import (
+    DocumentExtractor,
+    DocumentTooLargeError,
+    extract_text,
+    supported_extensions,
+)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "data")
+
+
+class ExtractTextTest(unittest.TestCase):
+    """Tests for the per-format extractors."""
+
+    def test_supported_extensions(self) -> None:
+        for extension in [".pdf", ".docx", ".txt", ".csv"]:
+            self.assertIn(extension, supported_extensions())
+
+    def test_plain_text(self) -> None:
+        self.assertEqual(extract_text("notes.TXT", b"  hello\n"), "hello")
+
+    def test_csv_rows_become_lines(self) -> None:
+        content = b"name,skill\nAda, Python\n"
+        self.assertEqual(extract_text("c.csv", content), "name, skill\nAda, Python")
+
+    def test_docx(self) -> None:
+        with open(os.path.join(DATA_DIR, "interview1.docx"), "rb") as f:
+            text = extract_text("interview1.docx", f.read())
+        self.assertTrue(text)
+
+    def test_unsupported_type(self) -> None:
+        self.assertIsNone(extract_text("image.png", b"\x89PNG"))
+
+    def test_max_chars_budget(self) -> None:
+        content = "\n".join(["row"] * 1000).encode()
+        self.assertEqual(len(extract_text("a.csv", content, max_chars=10)), 10)
+
+
+class DocumentExtractorTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the process pool backed extractor."""
+
+    async def asyncSetUp(self) -> None:
+        self.extractor = DocumentExtractor(max_workers=1, max_bytes=1024)
+
+    async def asyncTearDown(self) -> None:
+        self.extractor.shutdown()
+
+    async def test_extract_in_pool(self) -> None:
+        self.assertEqual(await self.extractor.extract("a.txt", b"resume"), "resume")
+
+    async def test_size_budget(self) -> None:
+        with self.assertRaises(DocumentTooLargeError):
+            await self.extractor.extract("a.txt", b"x" * 2048)
+
+
+if __name__ == "__main__":
+    unittest.main()
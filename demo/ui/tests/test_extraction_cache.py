@@ -0,0 +1,60 @@
+import tempfile
+import unittest
+
+from service.server.extraction_cache import ExtractedDocument, ExtractionCache
+
+
+class ExtractionCacheTest(unittest.TestCase):
+    """Tests for the content addressed extraction cache."""
+
+    def _document(self, content: bytes, filename: str = "resume.pdf"):
+        return ExtractedDocument(
+            key=ExtractionCache.make_key(content, filename),
+            text=content.decode(),
+            filename=filename,
+            size=len(content),
+        )
+
+    def test_key_depends_on_content_and_extension(self) -> None:
+        key = ExtractionCache.make_key(b"abc", "a.pdf")
+        self.assertEqual(key, ExtractionCache.make_key(b"abc", "other.PDF"))
+        self.assertNotEqual(key, ExtractionCache.make_key(b"abc", "a.txt"))
+        self.assertNotEqual(key, ExtractionCache.make_key(b"abd", "a.pdf"))
+
+    def test_memory_hit_and_miss(self) -> None:
+        cache = ExtractionCache(max_entries=4)
+        document = self._document(b"resume")
+        self.assertIsNone(cache.get(document.key))
+        cache.put(document)
+        self.assertEqual(cache.get(document.key).text, "resume")
+        stats = cache.stats()
+        self.assertEqual(stats["memory_hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_lru_eviction(self) -> None:
+        cache = ExtractionCache(max_entries=2)
+        first, second, third = (self._document(c) for c in (b"a", b"b", b"c"))
+        cache.put(first)
+        cache.put(second)
+        cache.get(first.key)  # first is now the most recently used
+        cache.put(third)
+        self.assertIsNotNone(cache.get(first.key))
+        self.assertIsNone(cache.get(second.key))
+        self.assertEqual(cache.stats()["entries"], 2)
+
+    def test_disk_tier_survives_new_instance(self) -> None:
+        with tempfile.TemporaryDirectory() as disk_dir:
+            document = self._document(b"persisted")
+            ExtractionCache(disk_dir=disk_dir).put(document)
+
+            cache = ExtractionCache(disk_dir=disk_dir)
+            self.assertEqual(cache.get(document.key).text, "persisted")
+            self.assertEqual(cache.stats()["disk_hits"], 1)
+            # The disk hit was promoted into the memory tier.
+            cache.get(document.key)
+            self.assertEqual(cache.stats()["memory_hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+
+from service.server.file_store import FileStore
+
+
+class FileStoreTest(unittest.TestCase):
+    """Tests for the bounded conversation file store."""
+
+    def test_put_and_get(self) -> None:
+        store = FileStore(max_memory_bytes=1024)
+        store.put("a", b"png", "image/png")
+        self.assertIn("a", store)
+        stored = store.get("a")
+        self.assertEqual(stored.data, b"png")
+        self.assertEqual(stored.mime_type, "image/png")
+        self.assertIsNone(store.get("missing"))
+
+    def test_evicts_least_recently_used_without_spill(self) -> None:
+        store = FileStore(max_memory_bytes=8)
+        store.put("a", b"1234", "text/plain")
+        store.put("b", b"1234", "text/plain")
+        store.get("a")  # a is now the most recently used
+        store.put("c", b"1234", "text/plain")
+        self.assertIn("a", store)
+        self.assertNotIn("b", store)
+        stats = store.stats()
+        self.assertEqual(stats["memory_bytes"], 8)
+        self.assertEqual(stats["evictions"], 1)
+
+    def test_spills_to_disk(self) -> None:
+        with tempfile.TemporaryDirectory() as spill_dir:
+            store = FileStore(max_memory_bytes=4, spill_dir=spill_dir)
+            store.put("a", b"1234", "image/png")
+            store.put("b", b"5678", "image/png")
+            spilled = store.get("a")
+            self.assertIsNone(spilled.data)
+            with open(spilled.path, "rb") as f:
+                self.assertEqual(f.read(), b"1234")
+            self.assertEqual(store.stats()["files_on_disk"], 1)
+
+            # Replacing a spilled file removes it from disk.
+            store.put("a", b"12", "image/png")
+            self.assertFalse(os.path.exists(spilled.path))
+
+    def test_disk_budget(self) -> None:
+        with tempfile.TemporaryDirectory() as spill_dir:
+            store = FileStore(max_memory_bytes=0, spill_dir=spill_dir, max_disk_bytes=4)
+            store.put("a", b"1234", "image/png")
+            store.put("b", b"5678", "image/png")
+            self.assertNotIn("a", store)
+            self.assertEqual(store.stats()["disk_bytes"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,267 @@
+import asyncio
+import json
+import os
+import random
+import re
+import threading
+import time
+import unittest
+import uuid
+from typing import Optional
+from unittest.mock import patch
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from common.types import Artifact, Message, Task, TaskState, TaskStatus, TextPart
+
+from service.server.near_duplicates import (
+    MinHasher,
+    NearDuplicateIndex,
+    choose_bands,
+    text_key,
+)
+from service.server.server import ConversationServer
+
+
+def make_resume(rng: random.Random, words: int = 300) -> str:
+    vocabulary = [f"term{i}" for i in range(5000)]
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+
+def lightly_edit(text: str, rng: random.Random, edits: int = 3) -> str:
+    words = text.split()
+    for _ in range(edits):
+        words[rng.randrange(len(words))] = "edited"
+    return " ".join(words)
+
+
+class NearDuplicateIndexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.rng = random.Random(7)
+
+    def test_finds_light_edits_but_not_other_resumes(self) -> None:
+        index = NearDuplicateIndex(threshold=0.8)
+        resumes = [make_resume(self.rng) for _ in range(200)]
+        for i, resume in enumerate(resumes):
+            index.add(f"r{i}", resume, {"filename": f"r{i}.docx"})
+
+        matches = index.query(lightly_edit(resumes[42], self.rng))
+        self.assertEqual([m.key for m in matches], ["r42"])
+        self.assertGreater(matches[0].similarity, 0.8)
+        self.assertEqual(matches[0].metadata["filename"], "r42.docx")
+        self.assertEqual(index.query(make_resume(self.rng)), [])
+        # LSH only compared against a handful of the 200 resumes
+        self.assertLess(index.stats()["avg_candidates"], 5)
+
+    def test_check_and_add(self) -> None:
+        index = NearDuplicateIndex()
+        original = make_resume(self.rng)
+        self.assertIsNone(index.check_and_add(text_key(original), original))
+        index.update_metadata(text_key(original), evaluation="8/10")
+
+        # The same text again, differently formatted, is the same resume
+        same = index.check_and_add(text_key(original.upper()), original.upper())
+        self.assertEqual(same.similarity, 1.0)
+        self.assertEqual(same.metadata["evaluation"], "8/10")
+
+        edited = lightly_edit(original, self.rng)
+        duplicate = index.check_and_add(text_key(edited), edited)
+        self.assertEqual(duplicate.key, text_key(original))
+        self.assertEqual(len(index), 2)
+
+    def test_bounded(self) -> None:
+        index = NearDuplicateIndex(max_entries=3)
+        resumes = [make_resume(self.rng) for _ in range(5)]
+        for i, resume in enumerate(resumes):
+            index.add(f"r{i}", resume)
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.query(resumes[0]), [])
+        self.assertEqual(index.query(resumes[4])[0].key, "r4")
+        self.assertTrue(all(all(bucket) for bucket in index._buckets[0].values()))
+
+    def test_signature_estimates_jaccard(self) -> None:
+        hasher = MinHasher(num_perm=256)
+        words = [f"w{i}" for i in range(400)]
+        a = hasher.signature(" ".join(words[:300]))
+        b = hasher.signature(" ".join(words[100:]))
+        # 198 shared 3-grams out of 398
+        self.assertAlmostEqual((a == b).mean(), 198 / 398, delta=0.08)
+
+    def test_choose_bands(self) -> None:
+        bands = choose_bands(128, 0.8)
+        self.assertEqual(128 % bands, 0)
+        self.assertLess((1 / bands) ** (bands / 128), 0.8)
+
+
+class NearDuplicateUploadTest(unittest.TestCase):
+    """Uploads through ConversationServer are checked against earlier ones."""
+
+    def setUp(self) -> None:
+        with patch.dict(os.environ, {"A2A_HOST": "FAKE"}):
+            router = APIRouter()
+            self.server = ConversationServer(router)
+        app = FastAPI()
+        app.include_router(router)
+        self.client = TestClient(app)
+        self.conversation = self.server.manager.create_conversation()
+
+    def _upload(
+        self, filename: str, text: str, request: str = "Rate this candidate"
+    ) -> dict:
+        message = {
+            "params": {
+                "role": "user",
+                "parts": [{"type": "text", "text": request}],
+                "metadata": {"conversation_id": self.conversation.conversation_id},
+            }
+        }
+        response = self.client.post(
+            "/message/send_with_file",
+            data={"message": json.dumps(message)},
+            files={"file": (filename, text.encode(), "text/plain")},
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def _wait_for_messages(self, count: int) -> None:
+        deadline = time.monotonic() + 5
+        while len(self.conversation.messages) < count:
+            self.assertLess(time.monotonic(), deadline, "no agent reply")
+            time.sleep(0.01)
+
+    def _answer_uploads(
+        self,
+        states: Optional[dict[str, TaskState]] = None,
+        delays: Optional[dict[str, float]] = None,
+    ) -> None:
+        """Has the manager answer every upload with a task of its own."""
+        manager = self.server.manager
+
+        async def process_message(message: Message) -> None:
+            filename = re.search(
+                r"UPLOADED FILE CONTENT \((.+?)\)", message.parts[0].text
+            ).group(1)
+            answer = [TextPart(text=f"Evaluation of {filename}")]
+            task = Task(
+                id=str(uuid.uuid4()),
+                sessionId=self.conversation.conversation_id,
+                status=TaskStatus(
+                    state=(states or {}).get(filename, TaskState.COMPLETED)
+                ),
+                artifacts=[Artifact(parts=answer)],
+                history=[message],
+            )
+            manager._task_map[message.metadata["message_id"]] = task.id
+            manager.add_task(task)
+            await asyncio.sleep((delays or {}).get(filename, 0))
+            self.conversation.messages.append(Message(role="agent", parts=answer))
+
+        manager.process_message = process_message
+
+    def _wait_for_record(self, uploads: int = 1) -> threading.Event:
+        """Event set once the next uploads' evaluations were recorded or not."""
+        recorded = threading.Event()
+        record = self.server._record_evaluation
+        lock = threading.Lock()
+        done = []
+
+        def record_and_signal(*args) -> None:
+            record(*args)
+            with lock:
+                done.append(args)
+                if len(done) == uploads:
+                    recorded.set()
+
+        self.server._record_evaluation = record_and_signal
+        return recorded
+
+    def _evaluations(self, text: str) -> dict:
+        metadata = self.server._near_duplicates.get_metadata(text_key(text))
+        return metadata.get("evaluations") or {}
+
+    def test_resubmission_reuses_evaluation(self) -> None:
+        self._answer_uploads()
+        rng = random.Random(3)
+        original = make_resume(rng)
+        recorded = self._wait_for_record()
+        self._upload("alex.txt", original)
+        self.assertTrue(recorded.wait(5), "evaluation not recorded")
+        self.assertEqual(
+            list(self._evaluations(original).values()), ["Evaluation of alex.txt"]
+        )
+
+        self._upload("alex_agency.txt", lightly_edit(original, rng))
+
+        reply = self.conversation.messages[-1]
+        self.assertEqual(reply.role, "agent")
+        self.assertIn("similar to alex.txt", reply.parts[0].text)
+        self.assertIn("Evaluation of alex.txt", reply.parts[0].text)
+        flagged = self.conversation.messages[-2]
+        self.assertEqual(flagged.metadata["near_duplicate"]["filename"], "alex.txt")
+        self.assertEqual(self.server._near_duplicates.stats()["duplicates"], 1)
+
+    def test_flag_policy_evaluates_again(self) -> None:
+        rng = random.Random(4)
+        original = make_resume(rng)
+        self._upload("sam.txt", original)
+        self._wait_for_messages(3)
+
+        with patch("service.server.server.NEAR_DUPLICATE_POLICY", "flag"):
+            self._upload("sam_v2.txt", lightly_edit(original, rng))
+        self._wait_for_messages(6)
+
+        flagged = self.conversation.messages[3]
+        self.assertIn("similar to sam.txt", flagged.parts[0].text)
+        self.assertEqual(flagged.metadata["near_duplicate"]["filename"], "sam.txt")
+
+    def test_other_request_is_evaluated_again(self) -> None:
+        self._answer_uploads()
+        rng = random.Random(5)
+        original = make_resume(rng)
+        recorded = self._wait_for_record()
+        self._upload("kim.txt", original)
+        self.assertTrue(recorded.wait(5))
+
+        recorded = self._wait_for_record()
+        self._upload(
+            "kim_v2.txt", lightly_edit(original, rng), "Run a background check"
+        )
+        self.assertTrue(recorded.wait(5))
+
+        # Sent to the agent rather than answered with the rating
+        self.assertEqual(len(self.server.manager.tasks), 2)
+
+    def test_unfinished_task_is_not_recorded(self) -> None:
+        self._answer_uploads(states={"lee.txt": TaskState.INPUT_REQUIRED})
+        rng = random.Random(6)
+        original = make_resume(rng)
+        recorded = self._wait_for_record()
+        self._upload("lee.txt", original)
+        self.assertTrue(recorded.wait(5))
+        self.assertEqual(self._evaluations(original), {})
+
+        recorded = self._wait_for_record()
+        self._upload("lee_agency.txt", lightly_edit(original, rng))
+        self.assertTrue(recorded.wait(5))
+        self.assertEqual(len(self.server.manager.tasks), 2)
+
+    def test_concurrent_uploads_record_their_own_answers(self) -> None:
+        # The first upload is still running when the second asks for input
+        self._answer_uploads(
+            states={"bo.txt": TaskState.INPUT_REQUIRED}, delays={"al.txt": 0.3}
+        )
+        rng = random.Random(7)
+        first, second = make_resume(rng), make_resume(rng)
+        recorded = self._wait_for_record(uploads=2)
+        self._upload("al.txt", first)
+        self._upload("bo.txt", second)
+        self.assertTrue(recorded.wait(5))
+
+        self.assertEqual(
+            list(self._evaluations(first).values()), ["Evaluation of al.txt"]
+        )
+        self.assertEqual(self._evaluations(second), {})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import json
+import unittest
+from unittest import mock
+
+import httpx
+
+from common.types import AgentCapabilities, AgentCard
+from state import host_agent_service
+from state.routing_cache import RoutingCache, roster_version
+
+
+def make_card(name: str, url: str) -> AgentCard:
+    return AgentCard(
+        name=name,
+        description="Helps with candidates.",
+        url=url,
+        version="1.0",
+        capabilities=AgentCapabilities(),
+        skills=[],
+    )
+
+
+AGENTS = [
+    make_card("Alpha Agent", "http://localhost:10001/"),
+    make_card("Beta Agent", "http://localhost:10002/"),
+]
+
+
+class RoutingCacheTest(unittest.TestCase):
+    """Tests for the LLM routing decision cache."""
+
+    def test_hit_for_normalized_message(self) -> None:
+        cache = RoutingCache()
+        version = roster_version(AGENTS)
+        cache.put("Who should look at Jane?", version, "http://localhost:10001/")
+        self.assertEqual(
+            cache.get("who should look at jane", version), "http://localhost:10001/"
+        )
+        self.assertIsNone(cache.get("who should look at jane", "other-roster"))
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_ttl_expiry(self) -> None:
+        cache = RoutingCache(ttl_seconds=-1)
+        cache.put("hello", "v1", "http://localhost:10001/")
+        self.assertIsNone(cache.get("hello", "v1"))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_roster_version_changes_with_agents(self) -> None:
+        self.assertEqual(roster_version(AGENTS), roster_version(AGENTS[::-1]))
+        self.assertNotEqual(roster_version(AGENTS), roster_version(AGENTS[:1]))
+
+
+class PickAgentTest(unittest.IsolatedAsyncioTestCase):
+    """Tests that pick_agent_using_chatgpt calls the LLM once per intent."""
+
+    async def test_llm_called_once_per_intent(self) -> None:
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(json.loads(request.content))
+            content = "http://localhost:10002/"
+            return httpx.Response(
+                200, json={"choices": [{"message": {"content": content}}]}
+            )
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        env = {
+            "AZURE_OPENAI_TOKEN": "token",
+            "AZURE_OPENAI_ENDPOINT": "https://example.openai.azure.com",
+        }
+        host_agent_service._routing_cache.invalidate()
+        with (
+            mock.patch.dict("os.environ", env),
+            mock.patch.object(host_agent_service, "get_azure_client", lambda: client),
+            mock.patch.object(
+                host_agent_service,
+                "ListRemoteAgents",
+                mock.AsyncMock(return_value=AGENTS),
+            ),
+        ):
+            for message in ["Who should help with Jane?", "who should help with jane"]:
+                picked = await host_agent_service.pick_agent_using_chatgpt(message)
+                self.assertEqual(picked, "http://localhost:10002/")
+            self.assertEqual(len(calls), 1)
+
+            host_agent_service._routing_cache.invalidate()
+            await host_agent_service.pick_agent_using_chatgpt("who should help with jane")
+            self.assertEqual(len(calls), 2)
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+from service.server.adk_host_manager import (
+    ADKHostManager,
+    HOST_SYSTEM_INSTRUCTIONS,
+)
+
+
+class SessionGrowthTest(unittest.TestCase):
+    """Tests that per-message bookkeeping does not grow the ADK session."""
+
+    def setUp(self) -> None:
+        self.manager = ADKHostManager()
+        self.conversation_id = self.manager.create_conversation().conversation_id
+
+    def _send(self, i: int) -> None:
+        self.manager._update_session_state(
+            self.conversation_id,
+            {
+                "input_message_metadata": {
+                    "conversation_id": self.conversation_id,
+                    "message_id": f"message-{i:06d}",
+                },
+                "session_id": self.conversation_id,
+                "target_agent_name": None,
+            },
+        )
+
+    def _session(self):
+        return self.manager._session_service.get_session(
+            app_name=self.manager.app_name,
+            user_id=self.manager.user_id,
+            session_id=self.conversation_id,
+        )
+
+    def test_instructions_set_once_at_creation(self) -> None:
+        session = self._session()
+        self.assertEqual(
+            session.state["messages"][0]["parts"][0]["text"], HOST_SYSTEM_INSTRUCTIONS
+        )
+        self.assertEqual(session.events, [])
+
+    def test_session_size_flat_over_1k_messages(self) -> None:
+        for i in range(10):
+            self._send(i)
+        baseline = self.manager.session_stats()
+
+        for i in range(10, 1000):
+            self._send(i)
+        stats = self.manager.session_stats()
+
+        self.assertEqual(stats["events"], baseline["events"])
+        self.assertEqual(stats["events"], 1)
+        # Only ids and timestamps of the single bookkeeping event may differ.
+        self.assertLess(abs(stats["bytes"] - baseline["bytes"]), 64)
+        session = self._session()
+        self.assertEqual(
+            session.state["input_message_metadata"]["message_id"], "message-000999"
+        )
+        self.assertNotIn(HOST_SYSTEM_INSTRUCTIONS, session.events[0].model_dump_json())
+
+    def test_unchanged_state_appends_nothing(self) -> None:
+        self._send(1)
+        self._send(1)
+        self.assertEqual(self.manager.session_stats()["events"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -37,6 +37,54 @@ def main(host, port):
         ],
     )
 
+    skill_parallel_rating = AgentSkill(
+        id="autogen_parallel_rating_agent",
+        name="AutoGen Parallel Candidate Rating",
+        description=(
+            "Same evaluation as the rating system, with the Tech Rater and "
+            "Inclusion Rater running concurrently before the Reporter joins "
+            "their ratings. Faster; each rating is streamed as it completes."
+        ),
+        tags=["rating", "candidate", "multi-agent", "parallel"],
+        examples=[
+            "Rate this candidate: John Walker; 3 years SRE at Apple, AI enthusiast, single dad.",
+        ],
+    )
+
+    skill_screening = AgentSkill(
+        id="autogen_jd_screening",
+        name="AutoGen JD-Fit Screening",
+        description=(
+            "Ranks a batch of resumes against the SAP AI Scientist job "
+            "description locally (BM25 relevance and skill coverage), then "
+            "evaluates only the best candidates with the rating agents. Send "
+            'the resumes as a data part {"candidates": [...], "top_k": n} or '
+            'as text separated by "---" lines.'
+        ),
+        tags=["screening", "ranking", "batch", "candidate"],
+        examples=[
+            "Resume one...\n---\nResume two...\n---\nResume three...",
+        ],
+    )
+
+    skill_batch = AgentSkill(
+        id="autogen_batch_evaluation",
+        name="AutoGen Batch Candidate Evaluation",
+        description=(
+            "Evaluates every candidate of a batch with the rating agents, "
+            "several at a time, streaming each result as it completes. Send "
+            'a data part {"candidates": [...]} of resume texts or '
+            '{"id": ..., "text" or "uri": ...}, a JSON Lines or URI list '
+            'file, or resumes separated by "---" lines. Sending the batch '
+            "again for the same task resumes it, evaluating only candidates "
+            "without a result."
+        ),
+        tags=["batch", "rating", "candidate", "resumable"],
+        examples=[
+            "Resume one...\n---\nResume two...\n---\nResume three...",
+        ],
+    )
+
     agent_card = AgentCard(
         name="AutoGen Candidate Rating Agent",
         description=(
@@ -49,7 +97,12 @@ def main(host, port):
         defaultInputModes=["text"],
         defaultOutputModes=["text"],
         capabilities=capabilities,
-        skills=[skill_candidate_rating],
+        skills=[
+            skill_candidate_rating,
+            skill_parallel_rating,
+            skill_screening,
+            skill_batch,
+        ],
     )
 
     # Prepare push notification system
@@ -1,15 +1,26 @@
+import asyncio
 import json
 import os
-from collections.abc import AsyncIterable
+import time
+from collections.abc import AsyncIterable, Sequence
 from typing import Any, Literal
 
 from dotenv import load_dotenv
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.teams import Swarm
-from autogen_agentchat.conditions import TextMentionTermination
+from autogen_agentchat.conditions import HandoffTermination, TextMentionTermination
+from autogen_agentchat.messages import HandoffMessage, StructuredMessage, TextMessage
+from autogen_core import CancellationToken
+from autogen_core.models import AssistantMessage
 from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
 
+from agents.autogen.batch import BatchCandidate, text_digest
+from agents.autogen.checkpoints import TeamCheckpointStore
+from agents.autogen.prefilter import JDPrefilter
+from agents.autogen.reporter import LocalReporter, RaterScore
+from common.utils.rate_limiter import rate_limited_http_client
+
 JD_TECH = """SAP AI Scientist; Key Technical Responsibilities
 
 LLM Application Development: Design, develop, and optimize large language model applications for enterprise use cases; research and implement state-of-the-art NLP techniques including fine-tuning, prompt engineering, and retrieval-augmented generation (RAG)
@@ -43,45 +54,7 @@ Bias Recognition: Understanding of various types of bias (algorithmic, cognitive
 Communication Skills: Excellent verbal and written communication in both English and Chinese, with ability to adapt communication style for diverse audiences
 Collaborative Mindset: Track record of successful cross-functional teamwork and building bridges across different groups and perspectives"""
 
-DEFAULT_API_VERSION = "2025-03-01-preview"
-MODEL = "gpt-4o"
-load_dotenv()
-
-
-class ResponseFormat(BaseModel):
-    """Respond to the user in this format."""
-
-    status: Literal["input_required", "completed", "error"] = "input_required"
-    message: str
-
-
-class AutogenAgent:
-    """A multi-agent candidate evaluation system using AutoGen."""
-
-    SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
-
-    def __init__(self):
-        self.client = self._get_client()
-        self.agents = self._create_agents()
-        self.team = self._create_team()
-        self.session_data: dict[str, Any] = {}
-
-    def _get_client(self):
-        return AzureOpenAIChatCompletionClient(
-            model=MODEL,
-            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-            api_key=os.getenv("AZURE_OPENAI_TOKEN"),
-            azure_deployment=MODEL,
-            api_version=DEFAULT_API_VERSION,
-        )
-
-    def _create_agents(self):
-        tech_rater = AssistantAgent(
-            "TechRater",
-            model_client=self.client,
-            handoffs=["InclusionRater"],
-            description="Rate the technical expertise of the candidate.",
-            system_message=f"""Rate technical skills 1-10 for SAP AI Scientist role.
+TECH_RATER_PROMPT = """Rate technical skills 1-10 for SAP AI Scientist role.
 
 LOOK FOR:
 ✓ Concrete projects: "Built ML pipeline processing 1M+ records daily"
@@ -100,15 +73,9 @@ EXAMPLES:
 
 Focus ONLY on technical ability. Ignore background, education, or personal traits.
 
-Rate 1-10 with brief reasoning, then say "HANDOFF TO InclusionRater".
-            """,
-        )
-        inclusion_rater = AssistantAgent(
-            "InclusionRater",
-            model_client=self.client,
-            handoffs=["Reporter"],
-            description="Rate the inclusion and diversity background of the candidate.",
-            system_message=f"""Rate inclusion potential 1-10 for diverse SAP team.
+Rate 1-10 with brief reasoning"""
+
+INCLUSION_RATER_PROMPT = """Rate inclusion potential 1-10 for diverse SAP team.
 
 LOOK FOR:
 ✓ Mentored underrepresented people: "Coached 5 junior women developers"
@@ -138,14 +105,12 @@ WATCH FOR BIAS:
 - Personality bias: Introverts can be excellent technical contributors
 - English proficiency: Strong English != better technical skills
 
-Rate 1-10 with brief reasoning, then say "HANDOFF TO Reporter".
-            """,
-        )
-        reporter = AssistantAgent(
-            "Reporter",
-            model_client=self.client,
-            description="Report the final rating of the candidate.",
-            system_message="""Summarize both ratings for workshop discussion.
+Rate 1-10 with brief reasoning"""
+
+# How a rater's structured score reads in progress updates and to the LLM Reporter
+SCORE_FORMAT = "{rating}/10 - {reasoning}"
+
+REPORTER_PROMPT = """Summarize both ratings for workshop discussion.
 
 FORMAT:
 Format as JSON: {"status": "completed", "message": "
@@ -154,8 +119,132 @@ Format as JSON: {"status": "completed", "message": "
 where tech_rate and inclusion_rate are the ratings from TechRater and InclusionRater and 
 tech_rate_reason and inclusion_rate_reason are concise explanations of the ratings.
 Then say "TERMINATE".
-            """,
+"""
+
+ASK_USER = """
+If the profile lacks the information you need to rate it, hand off to user
+instead, with what is missing as your reasoning."""
+
+# The final report is assembled locally from the raters' structured scores;
+# the LLM Reporter costs an extra model call and is opt-in.
+USE_LLM_REPORTER = os.environ.get("AUTOGEN_LLM_REPORTER", "").lower() in ("1", "true")
+
+# Evaluation modes: "swarm" hands off TechRater -> InclusionRater -> Reporter,
+# "parallel" runs both raters at once and then the Reporter.
+EVALUATION_MODES = ("swarm", "parallel")
+DEFAULT_EVALUATION_MODE = os.environ.get("AUTOGEN_EVALUATION_MODE", "swarm")
+# Agent card skills and the evaluation mode each one selects
+SKILL_MODES = {
+    "autogen_rating_agent": "swarm",
+    "autogen_parallel_rating_agent": "parallel",
+}
+# Agent card skill that ranks a batch of resumes and evaluates the best
+SCREENING_SKILL = "autogen_jd_screening"
+
+# Batch screening: how many of the best ranked candidates are evaluated, and
+# how many evaluations run at once
+DEFAULT_SCREEN_TOP_K = int(os.environ.get("AUTOGEN_SCREEN_TOP_K", 10))
+DEFAULT_SCREEN_CONCURRENCY = int(os.environ.get("AUTOGEN_SCREEN_CONCURRENCY", 4))
+
+# Agent card skill that evaluates every candidate of a batch
+BATCH_SKILL = "autogen_batch_evaluation"
+# How often a running batch checkpoints its results, besides when it stops
+BATCH_CHECKPOINT_SECONDS = float(os.environ.get("AUTOGEN_BATCH_CHECKPOINT_SECONDS", 5))
+
+DEFAULT_API_VERSION = "2025-03-01-preview"
+MODEL = "gpt-4o"
+load_dotenv()
+
+
+class ResponseFormat(BaseModel):
+    """Respond to the user in this format."""
+
+    status: Literal["input_required", "completed", "error"] = "input_required"
+    message: str
+
+
+class AutogenAgent:
+    """A multi-agent candidate evaluation system using AutoGen."""
+
+    SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
+
+    def __init__(
+        self,
+        model_client=None,
+        mode: str = DEFAULT_EVALUATION_MODE,
+        llm_reporter: bool = USE_LLM_REPORTER,
+        checkpoints: TeamCheckpointStore | None = None,
+    ):
+        if mode not in EVALUATION_MODES:
+            raise ValueError(f"Unknown evaluation mode: {mode}")
+        self.client = model_client or self._get_client()
+        self.mode = mode
+        self.llm_reporter = llm_reporter
+        self.checkpoints = checkpoints or TeamCheckpointStore()
+        self.prefilter = JDPrefilter.from_job_descriptions(JD_TECH, JD_INCLUSION)
+        self.session_data: dict[str, Any] = {}
+
+    def mode_for_skill(self, skill_id: str | None) -> str:
+        """Evaluation mode selected by an agent card skill id."""
+        return SKILL_MODES.get(skill_id, self.mode)
+
+    def _get_client(self):
+        return AzureOpenAIChatCompletionClient(
+            model=MODEL,
+            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+            api_key=os.getenv("AZURE_OPENAI_TOKEN"),
+            azure_deployment=MODEL,
+            api_version=DEFAULT_API_VERSION,
+            # Shares the deployment's RPM/TPM budget with the other agents.
+            # The limiter retries 429s itself, so the SDK must not as well.
+            http_client=rate_limited_http_client(MODEL),
+            max_retries=0,
         )
+
+    def _create_agents(self, handoffs: bool = True):
+        """Creates TechRater, InclusionRater and Reporter.
+
+        Raters answer with a structured RaterScore. The Reporter is the
+        LocalReporter unless the LLM Reporter was requested.
+
+        Args:
+          handoffs: Wire the Swarm handoffs, including the handoff to the
+            user when a rater needs more information. Without them each agent
+            only answers its own prompt, as used by the parallel mode.
+        """
+        tech_rater = AssistantAgent(
+            "TechRater",
+            model_client=self.client,
+            handoffs=["InclusionRater", "user"] if handoffs else [],
+            description="Rate the technical expertise of the candidate.",
+            system_message=TECH_RATER_PROMPT
+            + (
+                ', then say "HANDOFF TO InclusionRater".' + ASK_USER
+                if handoffs
+                else "."
+            ),
+            output_content_type=RaterScore,
+            output_content_type_format=SCORE_FORMAT,
+        )
+        inclusion_rater = AssistantAgent(
+            "InclusionRater",
+            model_client=self.client,
+            handoffs=["Reporter", "user"] if handoffs else [],
+            description="Rate the inclusion and diversity background of the candidate.",
+            system_message=INCLUSION_RATER_PROMPT
+            + (', then say "HANDOFF TO Reporter".' + ASK_USER if handoffs else "."),
+            output_content_type=RaterScore,
+            output_content_type_format=SCORE_FORMAT,
+        )
+        if self.llm_reporter:
+            reporter = AssistantAgent(
+                "Reporter",
+                model_client=self.client,
+                description="Report the final rating of the candidate.",
+                system_message=REPORTER_PROMPT,
+            )
+        else:
+            reporter = LocalReporter("Reporter")
         return [
             tech_rater,
             inclusion_rater,
@@ -163,12 +252,15 @@ Then say "TERMINATE".
         ]
 
     def _create_team(self):
-        team = Swarm(
+        """A Swarm over fresh agents that stops at TERMINATE or to ask the user."""
+        return Swarm(
             name="CandidateEvaluationTeam",
-            participants=self.agents,
-            termination_condition=TextMentionTermination("TERMINATE"),
+            participants=self._create_agents(),
+            termination_condition=TextMentionTermination("TERMINATE")
+            | HandoffTermination(target="user"),
+            # A rater answering without a handoff posts its structured score
+            custom_message_types=[StructuredMessage[RaterScore]],
         )
-        return team
 
     def _format_response(self, response: str) -> dict[str, Any]:
         try:
@@ -209,63 +301,202 @@ Then say "TERMINATE".
                 "content": f"Error processing response: {e}\nOriginal response: {response}",
             }
 
-    async def invoke(self, query: str, sessionId: str) -> dict[str, Any]:
-        if sessionId not in self.session_data:
-            self.session_data[sessionId] = []
+    async def _evaluate_parallel(self, query: str) -> AsyncIterable[tuple[str, str]]:
+        """Runs both raters concurrently, then the Reporter on their ratings.
+
+        Yields (agent name, content) for each rater as it finishes, then the
+        Reporter's answer.
+        """
+        # Fresh agents per evaluation so concurrent evaluations do not share
+        # model context; creating them makes no model calls.
+        tech_rater, inclusion_rater, reporter = self._create_agents(handoffs=False)
+        task = [TextMessage(content=query, source="user")]
+        cancellation_token = CancellationToken()
+        ratings = [
+            asyncio.create_task(agent.on_messages(task, cancellation_token))
+            for agent in (tech_rater, inclusion_rater)
+        ]
+        try:
+            for next_rating in asyncio.as_completed(ratings):
+                message = (await next_rating).chat_message
+                yield message.source, message.to_text()
 
-        # Reset team for new conversation
-        await self.team.reset()
+            rating_messages = [rating.result().chat_message for rating in ratings]
+            response = await reporter.on_messages(
+                task + rating_messages, cancellation_token
+            )
+            yield reporter.name, response.chat_message.to_text()
+        finally:
+            cancellation_token.cancel()
+            for rating in ratings:
+                rating.cancel()
+
+    async def _run_swarm(self, query: str, task_id: str | None) -> AsyncIterable[Any]:
+        """Runs the Swarm team on a message, yielding what run_stream yields.
+
+        A follow-up message for a task whose team stopped to ask the user
+        resumes from the task's checkpoint. A run that stops to ask the user
+        is checkpointed under the task id; any other outcome drops the
+        checkpoint.
+        """
+        # A team per run, so concurrent tasks do not share agent state
+        team = self._create_team()
+        checkpoint = self.checkpoints.get(task_id) if task_id else None
+        task: str | HandoffMessage = query
+        if checkpoint is not None:
+            await team.load_state(checkpoint["state"])
+            # Answer the agent that asked, as the Swarm expects from the user
+            task = HandoffMessage(
+                source="user", target=checkpoint["asked_by"], content=query
+            )
 
-        # Run the team with streaming and get final result
-        result_stream = self.team.run_stream(task=query)
+        # The token stops the team's model calls if this run is cancelled or
+        # the consumer stops iterating.
+        cancellation_token = CancellationToken()
+        result = None
+        try:
+            async for result in team.run_stream(
+                task=task, cancellation_token=cancellation_token
+            ):
+                yield result
+        finally:
+            cancellation_token.cancel()
+
+        if task_id is None:
+            return
+        handoff = self._user_handoff(result)
+        if handoff is not None:
+            self.checkpoints.put(
+                task_id,
+                {"asked_by": handoff.source, "state": await team.save_state()},
+            )
+        else:
+            self.checkpoints.delete(task_id)
+
+    @staticmethod
+    def _user_handoff(result: Any) -> HandoffMessage | None:
+        """The handoff to the user the team stopped at, if it did."""
+        messages = getattr(result, "messages", None)
+        if messages and isinstance(messages[-1], HandoffMessage):
+            if messages[-1].target == "user":
+                return messages[-1]
+        return None
+
+    def _team_response(self, result: Any) -> tuple[str, dict[str, Any]]:
+        """The final message of a team run and the response it makes."""
+        handoff = self._user_handoff(result)
+        if handoff is not None:
+            # The rater's answer, explaining what is missing, is in the context
+            question = next(
+                (
+                    m.content
+                    for m in reversed(handoff.context)
+                    if isinstance(m, AssistantMessage) and isinstance(m.content, str)
+                ),
+                handoff.content,
+            )
+            try:
+                question = RaterScore.model_validate_json(question).reasoning
+            except ValidationError:
+                pass
+            return question, {
+                "is_task_complete": False,
+                "require_user_input": True,
+                "content": question,
+            }
+        messages = getattr(result, "messages", None)
+        if not messages:
+            response = "I couldn't process your request."
+            return response, self._format_response(response)
+        response = messages[-1].to_text()
+        return response, self._format_response(response)
+
+    async def _evaluate(
+        self, query: str, mode: str | None = None, task_id: str | None = None
+    ) -> tuple[str, dict[str, Any]]:
+        """Evaluates one candidate without recording it in a session.
+
+        Batches and screenings evaluate every candidate through here, so a
+        long-lived session does not keep every resume of every batch.
+        """
+        if (mode or self.mode) == "parallel":
+            response = "I couldn't process your request."
+            async for _, content in self._evaluate_parallel(query):
+                response = content
+            return response, self._format_response(response)
+
+        # Run the team and get the final result
         final_result = None
-        async for result in result_stream:
+        async for result in self._run_swarm(query, task_id):
             final_result = result
+        return self._team_response(final_result)
 
-        # Extract response from the result
-        response = (
-            final_result.messages[-1].content
-            if hasattr(final_result, "messages") and final_result.messages
-            else "I couldn't process your request."
-        )
+    async def invoke(
+        self,
+        query: str,
+        sessionId: str,
+        mode: str | None = None,
+        task_id: str | None = None,
+    ) -> dict[str, Any]:
+        response, formatted = await self._evaluate(query, mode, task_id)
 
         # Store session data
-        self.session_data[sessionId].append({"role": "user", "content": query})
-        self.session_data[sessionId].append({"role": "assistant", "content": response})
-
-        return self._format_response(response)
-
-    async def stream(self, query: str, sessionId: str) -> AsyncIterable[dict[str, Any]]:
+        history = self.session_data.setdefault(sessionId, [])
+        history.append({"role": "user", "content": query})
+        history.append({"role": "assistant", "content": response})
+
+        return formatted
+
+    async def stream(
+        self,
+        query: str,
+        sessionId: str,
+        mode: str | None = None,
+        task_id: str | None = None,
+    ) -> AsyncIterable[dict[str, Any]]:
         if sessionId not in self.session_data:
             self.session_data[sessionId] = []
 
         self.session_data[sessionId].append({"role": "user", "content": query})
-
-        # Reset team for new conversation
-        await self.team.reset()
+        parallel = (mode or self.mode) == "parallel"
 
         # Yield initial progress messages
         yield {
             "is_task_complete": False,
             "require_user_input": False,
-            "content": "Starting candidate evaluation with multi-agent team...",
+            "content": (
+                "Starting parallel candidate evaluation..."
+                if parallel
+                else "Starting candidate evaluation with multi-agent team..."
+            ),
         }
 
-        # Run the team with streaming
-        result_stream = self.team.run_stream(task=query)
         final_response = None
-
-        async for result in result_stream:
-            # Extract current response
-            if hasattr(result, "messages") and result.messages:
-                current_content = result.messages[-1].content
-                # Yield intermediate results
-                yield {
-                    "is_task_complete": False,
-                    "require_user_input": False,
-                    "content": current_content,
-                }
-                final_response = current_content
+        if parallel:
+            async for source, content in self._evaluate_parallel(query):
+                if source == "Reporter":
+                    final_response = content
+                    final = self._format_response(content)
+                else:
+                    # Progress for each rater as soon as it is done
+                    yield {
+                        "is_task_complete": False,
+                        "require_user_input": False,
+                        "content": f"{source}: {content}",
+                    }
+        else:
+            final_result = None
+            async for result in self._run_swarm(query, task_id):
+                # Intermediate results; run_stream ends with the TaskResult
+                if hasattr(result, "messages") and result.messages:
+                    final_result = result
+                    yield {
+                        "is_task_complete": False,
+                        "require_user_input": False,
+                        "content": result.messages[-1].to_text(),
+                    }
+            if final_result is not None:
+                final_response, final = self._team_response(final_result)
 
         # Store session data
         if final_response:
@@ -273,7 +504,7 @@ Then say "TERMINATE".
                 {"role": "assistant", "content": final_response}
             )
             # Yield final result
-            yield self._format_response(final_response)
+            yield final
         else:
             error_msg = "No response received from the team."
             self.session_data[sessionId].append(
@@ -284,3 +515,240 @@ Then say "TERMINATE".
                 "require_user_input": True,
                 "content": error_msg,
             }
+
+    async def screen_stream(
+        self,
+        resumes: Sequence[str],
+        sessionId: str,
+        candidate_ids: Sequence[str] | None = None,
+        top_k: int = DEFAULT_SCREEN_TOP_K,
+        mode: str | None = None,
+        concurrency: int = DEFAULT_SCREEN_CONCURRENCY,
+    ) -> AsyncIterable[dict[str, Any]]:
+        """Ranks a batch of resumes against the JD, then evaluates the best.
+
+        The whole batch is ranked locally by the JD-fit prefilter; only the
+        `top_k` best candidates are evaluated by the raters, `concurrency` at
+        a time. Yields progress as each evaluation completes and finally the
+        shortlist, with the ranking and evaluations also under "data".
+        """
+        if candidate_ids is None:
+            candidate_ids = [f"candidate-{i + 1}" for i in range(len(resumes))]
+        # Ranking a large batch takes a while; keep the event loop serving
+        shortlist = await asyncio.to_thread(
+            self.prefilter.rank, resumes, candidate_ids, top_k
+        )
+        yield {
+            "is_task_complete": False,
+            "require_user_input": False,
+            "content": (
+                f"Ranked {len(resumes)} candidates against the job description, "
+                f"evaluating the top {len(shortlist)}..."
+            ),
+        }
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def evaluate(fit):
+            async with semaphore:
+                _, response = await self._evaluate(resumes[fit.index], mode)
+                return fit, response
+
+        evaluations = [asyncio.create_task(evaluate(fit)) for fit in shortlist]
+        results: dict[str, dict[str, Any]] = {}
+        try:
+            for done, next_evaluation in enumerate(
+                asyncio.as_completed(evaluations), 1
+            ):
+                fit, response = await next_evaluation
+                results[fit.candidate_id] = response
+                yield {
+                    "is_task_complete": False,
+                    "require_user_input": False,
+                    "content": f"Evaluated {fit.candidate_id} ({done}/{len(shortlist)})",
+                }
+        finally:
+            for evaluation in evaluations:
+                evaluation.cancel()
+
+        lines = [f"Top {len(shortlist)} of {len(resumes)} candidates:"]
+        for rank, fit in enumerate(shortlist, 1):
+            lines.append(
+                f"\n{rank}. {fit.candidate_id} (JD fit {fit.score:.2f})\n"
+                f"{results[fit.candidate_id]['content']}"
+            )
+        yield {
+            "is_task_complete": True,
+            "require_user_input": False,
+            "content": "\n".join(lines),
+            "data": {
+                "ranked": len(resumes),
+                "shortlist": [
+                    {**fit.model_dump(), "evaluation": results[fit.candidate_id]}
+                    for fit in shortlist
+                ],
+            },
+        }
+
+    async def screen(
+        self, resumes: Sequence[str], sessionId: str, **kwargs
+    ) -> dict[str, Any]:
+        """Batch API: screen_stream() without the progress updates."""
+        response = None
+        async for response in self.screen_stream(resumes, sessionId, **kwargs):
+            pass
+        return response
+
+    @staticmethod
+    async def _checkpointed(
+        candidate: BatchCandidate, saved: dict[str, dict[str, Any]]
+    ) -> bool:
+        """Whether the checkpoint has a result for the candidate as it is now."""
+        if candidate.id not in saved:
+            return False
+        try:
+            return saved[candidate.id]["digest"] == await candidate.digest()
+        except Exception:
+            # Unreadable now: evaluating it again reports why
+            return False
+
+    async def batch_stream(
+        self,
+        candidates: Sequence[BatchCandidate],
+        sessionId: str,
+        task_id: str | None = None,
+        mode: str | None = None,
+        concurrency: int = DEFAULT_SCREEN_CONCURRENCY,
+    ) -> AsyncIterable[dict[str, Any]]:
+        """Evaluates every candidate of a batch, `concurrency` at a time.
+
+        Yields progress as each evaluation completes, with the candidate's
+        result under "candidate", then a summary with the counts under
+        "data". A failed evaluation, or one that stops to ask for more
+        input, is reported with its error and the batch goes on.
+
+        Results are checkpointed under the task id while the batch runs. If
+        it is interrupted, or some evaluations failed, sending the batch
+        again for the same task only evaluates the candidates without a
+        result, or whose resume changed; the others are streamed from the
+        checkpoint.
+        """
+        key = f"batch:{task_id}" if task_id else None
+        saved = dict(
+            ((self.checkpoints.get(key) if key else None) or {}).get("results", {})
+        )
+        todo = [c for c in candidates if not await self._checkpointed(c, saved)]
+        resumed = len(candidates) - len(todo)
+        yield {
+            "is_task_complete": False,
+            "require_user_input": False,
+            "content": (
+                f"Evaluating {len(candidates)} candidates"
+                + (f", {resumed} already evaluated" if resumed else "")
+                + "..."
+            ),
+        }
+
+        done = 0
+        todo_ids = {c.id for c in todo}
+        for candidate in candidates:
+            if candidate.id not in todo_ids:
+                done += 1
+                yield {
+                    "is_task_complete": False,
+                    "require_user_input": False,
+                    "content": f"Evaluated {candidate.id} ({done}/{len(candidates)}, from checkpoint)",
+                    "candidate": saved[candidate.id]["result"],
+                }
+
+        def save() -> None:
+            if key:
+                self.checkpoints.put(key, {"results": saved})
+
+        # Workers take candidates one at a time, so only `concurrency`
+        # resumes are loaded and evaluated at once however large the batch
+        pending = iter(todo)
+        finished: asyncio.Queue = asyncio.Queue()
+
+        async def work():
+            for candidate in pending:
+                digest = None
+                try:
+                    text = await candidate.load()
+                    digest = text_digest(text)
+                    evaluation = (await self._evaluate(text, mode))[1]
+                    # The team stopped to ask for more: not a result to keep
+                    if evaluation["require_user_input"]:
+                        raise ValueError(
+                            f"Evaluation needs more input: {evaluation['content']}"
+                        )
+                    result = {"candidate_id": candidate.id, "evaluation": evaluation}
+                except Exception as e:
+                    result = {"candidate_id": candidate.id, "error": str(e)}
+                await finished.put((candidate, digest, result))
+
+        workers = [
+            asyncio.create_task(work()) for _ in range(min(concurrency, len(todo)))
+        ]
+        failed = 0
+        completed = False
+        saved_at = time.monotonic()
+        try:
+            for _ in todo:
+                candidate, digest, result = await finished.get()
+                done += 1
+                if "error" in result:
+                    failed += 1
+                    content = f"Failed to evaluate {candidate.id} ({done}/{len(candidates)}): {result['error']}"
+                else:
+                    saved[candidate.id] = {
+                        "digest": digest,
+                        "result": result,
+                    }
+                    content = f"Evaluated {candidate.id} ({done}/{len(candidates)})"
+                if time.monotonic() - saved_at >= BATCH_CHECKPOINT_SECONDS:
+                    save()
+                    saved_at = time.monotonic()
+                yield {
+                    "is_task_complete": False,
+                    "require_user_input": False,
+                    "content": content,
+                    "candidate": result,
+                }
+            completed = True
+        finally:
+            for worker in workers:
+                worker.cancel()
+            # Interrupted or partly failed: keep what was evaluated
+            if not completed or failed:
+                save()
+
+        if key and not failed:
+            self.checkpoints.delete(key)
+        yield {
+            "is_task_complete": True,
+            "require_user_input": False,
+            "content": (
+                f"Evaluated {len(candidates) - failed} of {len(candidates)} candidates"
+                f" ({resumed} from checkpoint, {failed} failed)."
+            ),
+            "data": {
+                "total": len(candidates),
+                "evaluated": len(candidates) - failed,
+                "failed": failed,
+                "resumed": resumed,
+            },
+        }
+
+    async def batch(
+        self, candidates: Sequence[BatchCandidate], sessionId: str, **kwargs
+    ) -> dict[str, Any]:
+        """batch_stream() without the progress; results are under data["results"]."""
+        results = []
+        async for response in self.batch_stream(candidates, sessionId, **kwargs):
+            if "candidate" in response:
+                results.append(response["candidate"])
+        order = {candidate.id: i for i, candidate in enumerate(candidates)}
+        results.sort(key=lambda result: order[result["candidate_id"]])
+        response["data"]["results"] = results
+        return response
@@ -0,0 +1,205 @@
+"""Candidates of a batch evaluation request.
+
+A batch names its candidates inline or points to them:
+
+- a data part {"candidates": [...]} where each candidate is a resume text,
+  {"id": ..., "text": ...} or {"id": ..., "uri": ...}, and/or {"uris": [...]}
+  with one resume per URI,
+- a file part (inline bytes or a URI) holding a candidate list: JSON Lines
+  of candidates as above, or plain text with one URI per line, or resumes
+  separated by "---" lines,
+- text parts of one resume each, or a single text part of resumes separated
+  by "---" lines.
+
+Resumes behind URIs are only read when their candidate is evaluated, so a
+large batch is never held in memory at once; the content must be text. As
+any A2A caller names the URIs, they are refused unless allowed:
+
+- file:// URIs and local paths only under AUTOGEN_BATCH_ROOT (after
+  resolving symlinks), none when it is unset,
+- http(s) URIs only under one of the comma separated URL prefixes of
+  AUTOGEN_BATCH_ALLOWED_URLS, none when it is unset, without following
+  redirects,
+
+and reads stop at AUTOGEN_BATCH_MAX_BYTES (default 1 MB) and
+AUTOGEN_BATCH_FETCH_TIMEOUT seconds (default 10).
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import re
+from typing import Any, Optional
+from urllib.parse import unquote, urlparse
+
+import httpx
+from pydantic import BaseModel, model_validator
+
+from common.types import DataPart, FilePart, Part, TextPart
+
+_SEPARATOR = re.compile(r"^\s*-{3,}\s*$", flags=re.MULTILINE)
+_URI = re.compile(r"^(https?|file)://\S+$")
+
+BATCH_ROOT = os.environ.get("AUTOGEN_BATCH_ROOT")
+BATCH_ALLOWED_URLS = [
+    prefix.strip()
+    for prefix in os.environ.get("AUTOGEN_BATCH_ALLOWED_URLS", "").split(",")
+    if prefix.strip()
+]
+BATCH_MAX_BYTES = int(os.environ.get("AUTOGEN_BATCH_MAX_BYTES", 1_000_000))
+BATCH_FETCH_TIMEOUT = float(os.environ.get("AUTOGEN_BATCH_FETCH_TIMEOUT", 10))
+
+
+class BatchCandidate(BaseModel):
+    """A candidate to evaluate, by resume text or by URI of the resume."""
+
+    id: str
+    text: Optional[str] = None
+    uri: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_source(self) -> "BatchCandidate":
+        if not (self.text or self.uri):
+            raise ValueError(f"Candidate {self.id} has neither text nor uri")
+        if self.text is None:
+            check_uri(self.uri)
+        return self
+
+    async def load(self) -> str:
+        """The resume text, read from the URI if it is not inline."""
+        if self.text is not None:
+            return self.text
+        return await read_uri(self.uri)
+
+    async def digest(self) -> str:
+        """Identifies what is evaluated, to tell a changed candidate on resume.
+
+        A URI candidate is hashed on the resume it points to, so a file
+        replaced since the checkpoint is evaluated again.
+        """
+        return text_digest(await self.load())
+
+
+def text_digest(text: str) -> str:
+    """The digest of a resume text, as checkpointed with its result."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _allowed_url(uri: str) -> bool:
+    parsed = urlparse(uri)
+    for prefix in BATCH_ALLOWED_URLS:
+        allowed = urlparse(prefix)
+        path = allowed.path if allowed.path.endswith("/") else allowed.path + "/"
+        if (
+            parsed.scheme == allowed.scheme
+            and parsed.netloc == allowed.netloc
+            and (parsed.path + "/").startswith(path)
+        ):
+            return True
+    return False
+
+
+def check_uri(uri: str) -> str:
+    """Where a resume URI may be read from: the URL, or the resolved path.
+
+    Raises:
+        ValueError: The URI is outside AUTOGEN_BATCH_ROOT and
+            AUTOGEN_BATCH_ALLOWED_URLS.
+    """
+    parsed = urlparse(uri)
+    if parsed.scheme in ("http", "https"):
+        if not _allowed_url(uri):
+            raise ValueError(f"URL not allowed for batch candidates: {uri}")
+        return uri
+    if parsed.scheme not in ("", "file"):
+        raise ValueError(f"Unsupported URI scheme: {parsed.scheme}")
+    if not BATCH_ROOT:
+        raise ValueError("Reading candidates from files is disabled")
+    path = os.path.realpath(unquote(parsed.path) if parsed.scheme else uri)
+    root = os.path.realpath(BATCH_ROOT)
+    if os.path.commonpath([path, root]) != root:
+        raise ValueError(f"Path outside the batch root: {uri}")
+    return path
+
+
+async def read_uri(uri: str) -> str:
+    target = check_uri(uri)
+    if urlparse(uri).scheme in ("http", "https"):
+        return await _fetch(target)
+    return await asyncio.to_thread(_read_file, target)
+
+
+async def _fetch(url: str) -> str:
+    async with httpx.AsyncClient(timeout=BATCH_FETCH_TIMEOUT) as client:
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            content = bytearray()
+            async for chunk in response.aiter_bytes():
+                content.extend(chunk)
+                if len(content) > BATCH_MAX_BYTES:
+                    raise ValueError(f"Resume larger than {BATCH_MAX_BYTES} bytes")
+            return content.decode(response.encoding or "utf-8")
+
+
+def _read_file(path: str) -> str:
+    with open(path, "rb") as f:
+        content = f.read(BATCH_MAX_BYTES + 1)
+    if len(content) > BATCH_MAX_BYTES:
+        raise ValueError(f"Resume larger than {BATCH_MAX_BYTES} bytes")
+    return content.decode("utf-8")
+
+
+def _candidate(entry: Any, position: int) -> BatchCandidate:
+    default_id = f"candidate-{position}"
+    if isinstance(entry, dict):
+        return BatchCandidate(
+            id=str(entry.get("id", default_id)),
+            text=entry.get("text"),
+            uri=entry.get("uri"),
+        )
+    entry = str(entry).strip()
+    if _URI.match(entry):
+        return BatchCandidate(id=default_id, uri=entry)
+    return BatchCandidate(id=default_id, text=entry)
+
+
+def parse_candidate_list(content: str) -> list[Any]:
+    """Candidate entries of a list file: JSON Lines, URIs or resumes."""
+    lines = [line.strip() for line in content.splitlines() if line.strip()]
+    if lines and all(line.startswith("{") for line in lines):
+        return [json.loads(line) for line in lines]
+    if lines and all(_URI.match(line) for line in lines):
+        return lines
+    return [text.strip() for text in _SEPARATOR.split(content) if text.strip()]
+
+
+async def candidates_from_parts(parts: list[Part]) -> list[BatchCandidate]:
+    """The candidates a batch request names, in order."""
+    entries: list[Any] = []
+    texts: list[str] = []
+    for part in parts:
+        if isinstance(part, DataPart):
+            entries.extend(part.data.get("candidates", []))
+            entries.extend({"uri": uri} for uri in part.data.get("uris", []))
+        elif isinstance(part, FilePart):
+            if part.file.bytes:
+                content = base64.b64decode(part.file.bytes).decode("utf-8")
+            else:
+                content = await read_uri(part.file.uri)
+            entries.extend(parse_candidate_list(content))
+        elif isinstance(part, TextPart):
+            texts.append(part.text)
+    if not entries:
+        if len(texts) == 1:
+            texts = _SEPARATOR.split(texts[0])
+        entries = [text.strip() for text in texts if text.strip()]
+
+    candidates = [
+        _candidate(entry, position) for position, entry in enumerate(entries, 1)
+    ]
+    ids = [candidate.id for candidate in candidates]
+    if len(set(ids)) != len(ids):
+        raise ValueError("Candidate ids in a batch must be unique")
+    return candidates
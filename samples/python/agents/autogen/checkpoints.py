@@ -0,0 +1,112 @@
+"""Bounded store for AutoGen team checkpoints.
+
+When the evaluation team stops to ask the recruiter for more information, its
+state (team.save_state()) is kept here under the task id, so the follow-up
+message resumes the conversation instead of re-running every agent from the
+start. Checkpoints are held in an LRU of at most `max_entries`, expire after
+`ttl_seconds` and, with a `directory`, are also written there as JSON so they
+survive a restart of the agent server.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CHECKPOINTS = int(os.environ.get("AUTOGEN_MAX_CHECKPOINTS", 256))
+DEFAULT_CHECKPOINT_TTL_SECONDS = float(
+    os.environ.get("AUTOGEN_CHECKPOINT_TTL_SECONDS", 24 * 3600)
+)
+
+
+class TeamCheckpointStore:
+    """LRU of team checkpoints keyed by task id, optionally backed by files."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_CHECKPOINTS,
+        ttl_seconds: float = DEFAULT_CHECKPOINT_TTL_SECONDS,
+        directory: Optional[str] = os.environ.get("AUTOGEN_CHECKPOINT_DIR"),
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.directory = directory
+        self._entries: OrderedDict[str, tuple[float, Mapping[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, task_id: str) -> Optional[Mapping[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(task_id)
+            if entry is None:
+                entry = self._read(task_id)
+            if entry is None or time.time() - entry[0] > self.ttl_seconds:
+                if entry is not None:
+                    self._remove(task_id)
+                self._misses += 1
+                return None
+            self._entries[task_id] = entry
+            self._entries.move_to_end(task_id)
+            self._evict()
+            self._hits += 1
+            return entry[1]
+
+    def put(self, task_id: str, checkpoint: Mapping[str, Any]) -> None:
+        with self._lock:
+            entry = (time.time(), checkpoint)
+            self._entries[task_id] = entry
+            self._entries.move_to_end(task_id)
+            if self.directory:
+                with open(self._path(task_id), "w") as f:
+                    json.dump({"saved": entry[0], "checkpoint": checkpoint}, f)
+            self._evict()
+
+    def delete(self, task_id: str) -> None:
+        with self._lock:
+            self._remove(task_id)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+        }
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            task_id, _ = self._entries.popitem(last=False)
+            self._remove(task_id)
+
+    def _remove(self, task_id: str) -> None:
+        self._entries.pop(task_id, None)
+        if self.directory:
+            try:
+                os.remove(self._path(task_id))
+            except FileNotFoundError:
+                pass
+
+    def _read(self, task_id: str) -> Optional[tuple[float, Mapping[str, Any]]]:
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(task_id)) as f:
+                data = json.load(f)
+            return data["saved"], data["checkpoint"]
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint for task {task_id}: {e}")
+            return None
+
+    def _path(self, task_id: str) -> str:
+        name = hashlib.sha256(task_id.encode()).hexdigest()
+        return os.path.join(self.directory, f"{name}.json")
@@ -0,0 +1,259 @@
+"""Local JD-fit prefilter for ranking large batches of resumes.
+
+A full evaluation costs several model calls per candidate, which does not
+scale to thousands of applicants. JDPrefilter ranks a whole batch against the
+job description locally, in NumPy, so only the best `top_k` candidates are
+evaluated by the raters.
+
+Each candidate gets two signals per side of the JD (technical, inclusion):
+
+- relevance: Okapi BM25 of the resume against every requirement section of
+  the JD ("Programming: ...", "Mentorship & Development: ..."), averaged over
+  the sections and scaled to the best candidate of the batch,
+- coverage: the share of the side's skills the resume mentions, from a
+  candidates x keywords hit matrix.
+
+Only the JD and keyword vocabulary is ever materialized: each resume is
+reduced to term counts over those few hundred terms (plus its length), so the
+batch is a dense candidates x terms matrix however large the resumes'
+vocabulary is, and every score is a matrix product over it.
+"""
+
+import re
+from typing import Mapping, Optional, Sequence
+
+import numpy as np
+from pydantic import BaseModel
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+STOP_WORDS = frozenset(
+    """a an and are as at be by for from in into is it of on or our the to with
+    within across using use including both when their its than that this""".split()
+)
+
+# Skills the JD asks for, and keywords any of which shows the skill. A
+# keyword of several words matches when all of them appear in the resume.
+DEFAULT_SKILL_KEYWORDS: dict[str, dict[str, list[str]]] = {
+    "tech": {
+        "python": ["python"],
+        "deep learning frameworks": ["pytorch", "tensorflow", "jax", "keras"],
+        "llm": ["llm", "gpt", "transformer", "bert", "large language model"],
+        "llm tooling": ["hugging face", "huggingface", "langchain", "llamaindex"],
+        "rag and prompting": ["rag", "retrieval augmented", "prompt engineering"],
+        "fine-tuning": ["fine tuning", "finetuning", "lora"],
+        "web development": ["javascript", "typescript", "react", "vue", "node"],
+        "cloud": ["aws", "azure", "gcp"],
+        "databases": ["sql", "nosql", "postgres", "mongodb", "vector database"],
+        "devops and mlops": ["docker", "kubernetes", "ci cd", "mlops"],
+        "research": ["paper", "publication", "patent", "phd", "research"],
+    },
+    "inclusion": {
+        "mentorship": ["mentor", "mentored", "mentoring", "coached", "coaching"],
+        "diversity": ["diversity", "diverse", "underrepresented", "inclusion"],
+        "bias awareness": ["bias", "fairness", "debiasing"],
+        "accessibility": ["accessibility", "accessible", "a11y"],
+        "cross-cultural": ["cross cultural", "international", "multicultural"],
+        "community": ["volunteer", "volunteered", "community", "outreach"],
+        "multilingual": ["bilingual", "multilingual", "chinese", "mandarin"],
+    },
+}
+
+
+class CandidateFit(BaseModel):
+    """How well one candidate fits the JD, as ranked by JDPrefilter."""
+
+    index: int
+    candidate_id: str
+    score: float
+    # Score per side of the JD, e.g. {"tech": 0.8, "inclusion": 0.4}
+    side_scores: dict[str, float]
+    skills: list[str]
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def jd_sections(jd: str) -> list[str]:
+    """The requirement sections of a JD: its "Name: description" lines."""
+    return [line for line in jd.splitlines() if ":" in line]
+
+
+class JDPrefilter:
+    """Ranks resumes against the technical and inclusion halves of a JD."""
+
+    def __init__(
+        self,
+        sections: Mapping[str, Sequence[str]],
+        skill_keywords: Mapping[str, Mapping[str, Sequence[str]]] = (
+            DEFAULT_SKILL_KEYWORDS
+        ),
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        """Builds the term matrices for the JD.
+
+        Args:
+          sections: Requirement section texts per side ("tech", "inclusion").
+          skill_keywords: Skills per side, each with the keywords showing it.
+          k1: BM25 term frequency saturation.
+          b: BM25 document length normalization.
+        """
+        self.sides = list(sections)
+        self.k1 = k1
+        self.b = b
+        self.vocabulary: dict[str, int] = {}
+
+        section_terms = [
+            (side, self._ids(tokenize(text), add=True))
+            for side in self.sides
+            for text in sections[side]
+        ]
+        self.skills: list[str] = []
+        skill_sides: list[str] = []
+        keyword_terms: list[tuple[int, list[int]]] = []
+        for side in self.sides:
+            for skill, keywords in skill_keywords.get(side, {}).items():
+                for keyword in keywords:
+                    ids = self._ids(tokenize(keyword), add=True)
+                    if ids:
+                        keyword_terms.append((len(self.skills), ids))
+                self.skills.append(skill)
+                skill_sides.append(side)
+
+        size = len(self.vocabulary)
+        # sections x terms query counts, and the side each section belongs to
+        self.queries = np.zeros((len(section_terms), size), dtype=np.float32)
+        for row, (_, ids) in enumerate(section_terms):
+            np.add.at(self.queries[row], ids, 1)
+        self.section_sides = np.array(
+            [self.sides.index(side) for side, _ in section_terms]
+        )
+        # keywords x terms, the number of terms of each keyword, and
+        # keywords x skills membership
+        self.keywords = np.zeros((len(keyword_terms), size), dtype=np.float32)
+        self.keyword_skills = np.zeros(
+            (len(keyword_terms), len(self.skills)), dtype=np.float32
+        )
+        for row, (skill, ids) in enumerate(keyword_terms):
+            self.keywords[row, list(set(ids))] = 1
+            self.keyword_skills[row, skill] = 1
+        self.keyword_lengths = self.keywords.sum(axis=1)
+        self.skill_sides = np.array([self.sides.index(side) for side in skill_sides])
+
+    @classmethod
+    def from_job_descriptions(
+        cls, tech: str, inclusion: str, **kwargs
+    ) -> "JDPrefilter":
+        return cls(
+            {"tech": jd_sections(tech), "inclusion": jd_sections(inclusion)}, **kwargs
+        )
+
+    def term_counts(self, resumes: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Counts of the JD terms per resume, and the resumes' token lengths."""
+        doc_rows: list[np.ndarray] = []
+        term_ids: list[int] = []
+        lengths = np.zeros(len(resumes), dtype=np.float32)
+        vocabulary = self.vocabulary
+        for row, resume in enumerate(resumes):
+            tokens = tokenize(resume)
+            lengths[row] = len(tokens)
+            ids = [vocabulary[t] for t in tokens if t in vocabulary]
+            term_ids.extend(ids)
+            doc_rows.append(np.full(len(ids), row, dtype=np.int64))
+        size = len(vocabulary)
+        flat = np.concatenate(doc_rows) * size + np.array(term_ids, dtype=np.int64)
+        counts = np.bincount(flat, minlength=len(resumes) * size)
+        return counts.reshape(len(resumes), size).astype(np.float32), lengths
+
+    def score(self, resumes: Sequence[str]) -> dict[str, np.ndarray]:
+        """Scores a batch of resumes.
+
+        Returns:
+          Arrays over the candidates: "score", and per side "<side>_score",
+          "<side>_relevance" and "<side>_coverage", all in [0, 1], plus
+          "skills", the candidates x skills coverage matrix.
+        """
+        n = len(resumes)
+        if n == 0:
+            return {"score": np.zeros(0), "skills": np.zeros((0, len(self.skills)))}
+        counts, lengths = self.term_counts(resumes)
+
+        # BM25 weight of every JD term in every resume, idf over the batch
+        df = (counts > 0).sum(axis=0)
+        idf = np.log1p((n - df + 0.5) / (df + 0.5)).astype(np.float32)
+        norm = self.k1 * (1 - self.b + self.b * lengths / max(lengths.mean(), 1.0))
+        weights = counts * (self.k1 + 1) / (counts + norm[:, None]) * idf
+        bm25 = weights @ self.queries.T  # candidates x sections
+        best = bm25.max(axis=0)
+        relevance = np.divide(bm25, best, out=np.zeros_like(bm25), where=best > 0)
+
+        # A keyword hits when all its terms occur; a skill when any keyword does
+        present = (counts > 0).astype(np.float32)
+        hits = (present @ self.keywords.T) >= self.keyword_lengths
+        skills = (hits.astype(np.float32) @ self.keyword_skills) > 0
+
+        result: dict[str, np.ndarray] = {"skills": skills}
+        total = np.zeros(n, dtype=np.float32)
+        for side_index, side in enumerate(self.sides):
+            side_relevance = relevance[:, self.section_sides == side_index].mean(axis=1)
+            side_skills = self.skill_sides == side_index
+            side_coverage = (
+                skills[:, side_skills].mean(axis=1)
+                if side_skills.any()
+                else np.zeros(n, dtype=np.float32)
+            )
+            result[f"{side}_relevance"] = side_relevance
+            result[f"{side}_coverage"] = side_coverage
+            result[f"{side}_score"] = (side_relevance + side_coverage) / 2
+            total += result[f"{side}_score"]
+        result["score"] = total / len(self.sides)
+        return result
+
+    def rank(
+        self,
+        resumes: Sequence[str],
+        candidate_ids: Optional[Sequence[str]] = None,
+        top_k: Optional[int] = None,
+    ) -> list[CandidateFit]:
+        """The best `top_k` candidates (all by default), best first."""
+        if candidate_ids is None:
+            candidate_ids = [str(i) for i in range(len(resumes))]
+        scores = self.score(resumes)
+        order = _top(scores["score"], top_k)
+        return [
+            CandidateFit(
+                index=int(i),
+                candidate_id=candidate_ids[i],
+                score=round(float(scores["score"][i]), 4),
+                side_scores={
+                    side: round(float(scores[f"{side}_score"][i]), 4)
+                    for side in self.sides
+                },
+                skills=[s for s, hit in zip(self.skills, scores["skills"][i]) if hit],
+            )
+            for i in order
+        ]
+
+    def _ids(self, tokens: list[str], add: bool = False) -> list[int]:
+        ids = []
+        for token in tokens:
+            if token in STOP_WORDS:
+                continue
+            if token not in self.vocabulary:
+                if not add:
+                    continue
+                self.vocabulary[token] = len(self.vocabulary)
+            ids.append(self.vocabulary[token])
+        return ids
+
+
+def _top(scores: np.ndarray, top_k: Optional[int]) -> np.ndarray:
+    """Indices of the `top_k` highest scores, best first."""
+    if top_k is None or top_k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    if top_k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
@@ -0,0 +1,107 @@
+"""Structured rater scores and the local Reporter that joins them.
+
+The raters answer with a RaterScore, which the model is constrained to by
+structured output and pydantic validates. Joining the two scores into the
+final report is then plain templating, so LocalReporter does it without a
+model call. It stands in for the LLM Reporter in both evaluation modes and
+answers the same way: the report JSON followed by TERMINATE.
+"""
+
+import json
+from typing import Sequence
+
+from autogen_agentchat.agents import BaseChatAgent
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import (
+    BaseChatMessage,
+    HandoffMessage,
+    StructuredMessage,
+    TextMessage,
+)
+from autogen_core import CancellationToken
+from autogen_core.models import AssistantMessage
+from pydantic import BaseModel, Field, ValidationError
+
+# Rater agent name -> label used in the report, in report order
+RATING_LABELS = {
+    "TechRater": "Technical Rating",
+    "InclusionRater": "Inclusion Rating",
+}
+
+
+class RaterScore(BaseModel):
+    """A rater's answer."""
+
+    rating: int = Field(ge=1, le=10, description="Rating from 1 to 10")
+    reasoning: str = Field(description="Brief reasoning for the rating")
+
+
+def parse_score(message: BaseChatMessage) -> RaterScore | None:
+    """Extracts the RaterScore a rater's message carries, if any.
+
+    Raters answer with a StructuredMessage, or hand off with their JSON answer
+    in the handoff context.
+    """
+    if isinstance(message, StructuredMessage) and isinstance(
+        message.content, RaterScore
+    ):
+        return message.content
+    if isinstance(message, HandoffMessage):
+        texts = [
+            m.content
+            for m in message.context
+            if isinstance(m, AssistantMessage) and isinstance(m.content, str)
+        ]
+    elif isinstance(message, TextMessage):
+        texts = [message.content]
+    else:
+        return None
+    for text in reversed(texts):
+        try:
+            return RaterScore.model_validate_json(text)
+        except ValidationError:
+            continue
+    return None
+
+
+def build_report(scores: dict[str, RaterScore]) -> dict[str, str]:
+    """Report in the Reporter's format from the scores keyed by rater name."""
+    missing = [name for name in RATING_LABELS if name not in scores]
+    if missing:
+        return {
+            "status": "error",
+            "message": f"No valid rating received from {', '.join(missing)}.",
+        }
+    lines = [
+        f"**{label}: {scores[name].rating}/10** - {scores[name].reasoning}"
+        for name, label in RATING_LABELS.items()
+    ]
+    return {"status": "completed", "message": "\n".join(lines)}
+
+
+class LocalReporter(BaseChatAgent):
+    """Reporter that assembles the final report from the raters' scores."""
+
+    def __init__(self, name: str = "Reporter"):
+        super().__init__(name, description="Report the final rating of the candidate.")
+        self._scores: dict[str, RaterScore] = {}
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return (TextMessage,)
+
+    async def on_messages(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> Response:
+        for message in messages:
+            if message.source in RATING_LABELS:
+                score = parse_score(message)
+                if score is not None:
+                    self._scores[message.source] = score
+        report = json.dumps(build_report(self._scores))
+        return Response(
+            chat_message=TextMessage(content=f"{report}\nTERMINATE", source=self.name)
+        )
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        self._scores.clear()
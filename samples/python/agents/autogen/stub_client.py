@@ -0,0 +1,176 @@
+"""Offline model client for exercising the AutoGen evaluation team.
+
+StubChatCompletionClient answers like the real raters would, after a fixed
+delay per call, so evaluation modes can be tested and timed without Azure
+OpenAI. It recognizes the agent from its system message:
+
+- raters answer with a rating, as JSON when structured output is requested,
+  and hand off when they have a handoff tool,
+- with `missing_info`, TechRater first hands off to the user asking for it,
+- the Reporter answers with the final JSON followed by TERMINATE.
+"""
+
+import asyncio
+import json
+from typing import Any, AsyncGenerator, Mapping, Optional, Sequence, Union
+
+from autogen_core import CancellationToken, FunctionCall
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    ModelFamily,
+    ModelInfo,
+    RequestUsage,
+    SystemMessage,
+    UserMessage,
+)
+from autogen_core.tools import Tool, ToolSchema
+
+
+def _text(messages: Sequence[LLMMessage]) -> str:
+    return "\n".join(
+        m.content if isinstance(m.content, str) else str(m.content) for m in messages
+    )
+
+
+def _tool_name(tool: Union[Tool, ToolSchema]) -> str:
+    return tool["name"] if isinstance(tool, dict) else tool.name
+
+
+class StubChatCompletionClient(ChatCompletionClient):
+    """Deterministic stand-in for the Azure OpenAI chat client."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        tech_rating: int = 8,
+        inclusion_rating: int = 7,
+        missing_info: Optional[str] = None,
+    ):
+        self.latency = latency
+        self.tech_rating = tech_rating
+        self.inclusion_rating = inclusion_rating
+        # TechRater asks the user for this until the user has answered once
+        self.missing_info = missing_info
+        self.calls = 0
+        # Calls waiting on the latency now, and the most there ever were
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Any = "auto",
+        json_output: Optional[Any] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        self.calls += 1
+        system = next((m.content for m in messages if isinstance(m, SystemMessage)), "")
+        handoffs = [
+            _tool_name(t) for t in tools if _tool_name(t).startswith("transfer_to_")
+        ]
+
+        user_turns = sum(isinstance(m, UserMessage) for m in messages)
+        if (
+            "Rate technical skills" in system
+            and self.missing_info
+            and "transfer_to_user" in handoffs
+            and user_turns < 2
+        ):
+            handoffs = ["transfer_to_user"]
+            content = json.dumps(
+                {"rating": 1, "reasoning": f"Please provide {self.missing_info}."}
+            )
+        elif "Rate technical skills" in system:
+            content = self._rating(
+                "Technical", self.tech_rating, "concrete ML projects.", json_output
+            )
+        elif "Rate inclusion potential" in system:
+            content = self._rating(
+                "Inclusion", self.inclusion_rating, "mentors junior staff.", json_output
+            )
+        else:
+            content = self.report()
+
+        usage = RequestUsage(
+            prompt_tokens=len(_text(messages)) // 4,
+            completion_tokens=len(content) // 4,
+        )
+        self._usage = RequestUsage(
+            prompt_tokens=self._usage.prompt_tokens + usage.prompt_tokens,
+            completion_tokens=self._usage.completion_tokens + usage.completion_tokens,
+        )
+        if handoffs:
+            return CreateResult(
+                finish_reason="function_calls",
+                content=[
+                    FunctionCall(
+                        id=f"call-{self.calls}", name=handoffs[0], arguments="{}"
+                    )
+                ],
+                thought=content,
+                usage=usage,
+                cached=False,
+            )
+        return CreateResult(
+            finish_reason="stop", content=content, usage=usage, cached=False
+        )
+
+    @staticmethod
+    def _rating(label: str, rating: int, reasoning: str, json_output: Any) -> str:
+        if json_output:
+            # Structured output: the raters' RaterScore schema
+            return json.dumps({"rating": rating, "reasoning": reasoning})
+        return f"{label} rating: {rating}/10 - {reasoning}"
+
+    def report(self) -> str:
+        message = (
+            f"**Technical Rating: {self.tech_rating}/10** - concrete ML projects.\n"
+            f"**Inclusion Rating: {self.inclusion_rating}/10** - mentors junior staff."
+        )
+        return json.dumps({"status": "completed", "message": message}) + "\nTERMINATE"
+
+    async def create_stream(
+        self, messages: Sequence[LLMMessage], **kwargs
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        yield await self.create(messages, **kwargs)
+
+    async def close(self) -> None:
+        pass
+
+    def actual_usage(self) -> RequestUsage:
+        return self._usage
+
+    def total_usage(self) -> RequestUsage:
+        return self._usage
+
+    def count_tokens(self, messages: Sequence[LLMMessage], **kwargs) -> int:
+        return len(_text(messages)) // 4
+
+    def remaining_tokens(self, messages: Sequence[LLMMessage], **kwargs) -> int:
+        return 128_000 - self.count_tokens(messages)
+
+    @property
+    def capabilities(self) -> Any:
+        return self.model_info
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return ModelInfo(
+            vision=False,
+            function_calling=True,
+            json_output=True,
+            family=ModelFamily.GPT_4O,
+            structured_output=True,
+        )
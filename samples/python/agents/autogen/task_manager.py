@@ -1,10 +1,10 @@
-import asyncio
 import logging
 from typing import AsyncIterable
 
 from common.server.task_manager import InMemoryTaskManager
 from common.types import (
     Artifact,
+    DataPart,
     InternalError,
     InvalidParamsError,
     JSONRPCResponse,
@@ -14,13 +14,20 @@ from common.types import (
     SendTaskStreamingRequest,
     SendTaskStreamingResponse,
     TaskArtifactUpdateEvent,
+    TaskSendParams,
     TaskState,
     TaskStatus,
     TaskStatusUpdateEvent,
 )
 from common.utils.push_notification_auth import PushNotificationSenderAuth
 
-from agents.autogen.agent import AutogenAgent
+from agents.autogen.agent import (
+    BATCH_SKILL,
+    DEFAULT_SCREEN_TOP_K,
+    SCREENING_SKILL,
+    AutogenAgent,
+)
+from agents.autogen.batch import candidates_from_parts
 
 logger = logging.getLogger(__name__)
 
@@ -53,9 +60,17 @@ class TaskManager(InMemoryTaskManager):
         )
         await self.send_task_notification(task)
 
-        query = request.params.message.parts[0].text
         try:
-            agent_response = await self.agent.invoke(query, request.params.sessionId)
+            agent_response = await self.run_task(
+                request.params.id,
+                self._invoke_agent(request.params),
+                self.task_deadline(request.params),
+            )
+            if agent_response is None:
+                # Cancelled or out of time; the task already records why
+                return SendTaskResponse(
+                    id=request.id, result=self.tasks[request.params.id]
+                )
         except Exception as e:
             logger.error(f"AutoGen Task Manager error: {e}")
             raise ValueError(f"Agent error: {e}")
@@ -80,7 +95,11 @@ class TaskManager(InMemoryTaskManager):
 
             await self.upsert_task(request.params)
             sse_queue = await self.setup_sse_consumer(request.params.id, False)
-            asyncio.create_task(self._run_streaming_agent(request))
+            self.start_task(
+                request.params.id,
+                self._run_streaming_agent(request),
+                self.task_deadline(request.params),
+            )
             return self.dequeue_events_for_sse(request.id, request.params.id, sse_queue)
         except Exception as e:
             logger.error(f"Error in SSE stream: {e}")
@@ -89,6 +108,83 @@ class TaskManager(InMemoryTaskManager):
                 error=InternalError(message="Error in streaming response"),
             )
 
+    def _mode(self, params: TaskSendParams) -> str:
+        """Evaluation mode of the skill named by the "skillId" metadata."""
+        return self.agent.mode_for_skill((params.metadata or {}).get("skillId"))
+
+    def _invoke_agent(self, params: TaskSendParams):
+        """The agent call answering the task, by the requested skill."""
+        if (params.metadata or {}).get("skillId") == BATCH_SKILL:
+            return self._invoke_batch(params)
+        if (params.metadata or {}).get("skillId") == SCREENING_SKILL:
+            return self._invoke_screening(params)
+        query = params.message.parts[0].text
+        return self.agent.invoke(
+            query, params.sessionId, self._mode(params), task_id=params.id
+        )
+
+    def _stream_agent(self, params: TaskSendParams) -> AsyncIterable[dict]:
+        """Streaming counterpart of _invoke_agent()."""
+        if (params.metadata or {}).get("skillId") == BATCH_SKILL:
+            return self._stream_batch(params)
+        if (params.metadata or {}).get("skillId") == SCREENING_SKILL:
+            return self._stream_screening(params)
+        query = params.message.parts[0].text
+        return self.agent.stream(
+            query, params.sessionId, self._mode(params), task_id=params.id
+        )
+
+    async def _invoke_batch(self, params: TaskSendParams) -> dict:
+        candidates = await candidates_from_parts(params.message.parts)
+        return await self.agent.batch(
+            candidates, params.sessionId, task_id=params.id, mode=self._mode(params)
+        )
+
+    async def _stream_batch(self, params: TaskSendParams) -> AsyncIterable[dict]:
+        candidates = await candidates_from_parts(params.message.parts)
+        async for partial in self.agent.batch_stream(
+            candidates, params.sessionId, task_id=params.id, mode=self._mode(params)
+        ):
+            yield partial
+
+    async def _invoke_screening(self, params: TaskSendParams) -> dict:
+        resumes, candidate_ids, top_k = await self._screening_batch(params)
+        return await self.agent.screen(
+            resumes, params.sessionId, candidate_ids=candidate_ids, top_k=top_k
+        )
+
+    async def _stream_screening(self, params: TaskSendParams) -> AsyncIterable[dict]:
+        resumes, candidate_ids, top_k = await self._screening_batch(params)
+        async for partial in self.agent.screen_stream(
+            resumes, params.sessionId, candidate_ids=candidate_ids, top_k=top_k
+        ):
+            yield partial
+
+    @staticmethod
+    async def _screening_batch(
+        params: TaskSendParams,
+    ) -> tuple[list[str], list[str], int]:
+        """Resumes, their ids and top_k of a screening request.
+
+        Candidates are given as for a batch evaluation (candidates_from_parts),
+        and a data part may also set "top_k", checked by _validate_request().
+        The whole batch is ranked at once, so every resume is loaded up front.
+        """
+        candidates = await candidates_from_parts(params.message.parts)
+        resumes = [await candidate.load() for candidate in candidates]
+        top_k = DEFAULT_SCREEN_TOP_K
+        for part in params.message.parts:
+            if isinstance(part, DataPart):
+                top_k = part.data.get("top_k", top_k)
+        return resumes, [candidate.id for candidate in candidates], top_k
+
+    @staticmethod
+    def _response_parts(response: dict) -> list[dict]:
+        parts = [{"type": "text", "text": response["content"]}]
+        if response.get("data"):
+            parts.append({"type": "data", "data": response["data"]})
+        return parts
+
     async def _run_streaming_agent(
         self, request: SendTaskStreamingRequest
     ) -> AsyncIterable[SendTaskStreamingResponse]:
@@ -100,13 +196,22 @@ class TaskManager(InMemoryTaskManager):
         Yields:
             AsyncIterable[SendTaskStreamingResponse]: The streaming response.
         """
+        # Per-candidate results of a batch, streamed as chunks of artifact 1
+        chunks = 0
         try:
-            query = request.params.message.parts[0].text
-            async for partial in self.agent.stream(query, request.params.sessionId):
+            async for partial in self._stream_agent(request.params):
                 require_input = partial["require_user_input"]
                 is_done = partial["is_task_complete"]
                 text_content = partial["content"]
                 artifact = None
+                if "candidate" in partial:
+                    artifact = Artifact(
+                        name="candidate evaluations",
+                        parts=[{"type": "data", "data": partial["candidate"]}],
+                        index=1,
+                        append=chunks > 0,
+                    )
+                    chunks += 1
 
                 new_status = TaskStatus(state=TaskState.WORKING)
                 # By default, don't end the stream
@@ -123,7 +228,7 @@ class TaskManager(InMemoryTaskManager):
                 elif is_done:
                     new_status.state = TaskState.COMPLETED
                     artifact = Artifact(
-                        parts=[{"type": "text", "text": text_content}],
+                        parts=self._response_parts(partial),
                         index=0,
                         append=False,
                     )
@@ -178,7 +283,7 @@ class TaskManager(InMemoryTaskManager):
         Returns:
             SendTaskResponse: The response containing the task ID and status.
         """
-        parts = [{"type": "text", "text": agent_response["content"]}]
+        parts = self._response_parts(agent_response)
         if agent_response["require_user_input"]:
             task_status = TaskStatus(
                 state=TaskState.INPUT_REQUIRED,
@@ -207,9 +312,7 @@ class TaskManager(InMemoryTaskManager):
         Returns:
             JSONRPCResponse: The response containing the error if validation fails.
         """
-        if not request.params.acceptedOutputModes:
-            return None
-        if not any(
+        if request.params.acceptedOutputModes and not any(
             mode in AutogenAgent.SUPPORTED_CONTENT_TYPES
             for mode in request.params.acceptedOutputModes
         ):
@@ -217,6 +320,20 @@ class TaskManager(InMemoryTaskManager):
             return JSONRPCResponse(
                 id=request.id, error=InvalidParamsError(message="Bad content type.")
             )
+        if (request.params.metadata or {}).get("skillId") == SCREENING_SKILL:
+            for part in request.params.message.parts:
+                if not isinstance(part, DataPart) or "top_k" not in part.data:
+                    continue
+                top_k = part.data["top_k"]
+                # bool is an int, but "top_k": true is not a count
+                if isinstance(top_k, bool) or not isinstance(top_k, int) or top_k < 1:
+                    logger.warning(f"Invalid top_k for screening: {top_k!r}")
+                    return JSONRPCResponse(
+                        id=request.id,
+                        error=InvalidParamsError(
+                            message="top_k must be a positive integer."
+                        ),
+                    )
         return None
 
     async def send_task_notification(self, task: SendTaskRequest) -> None:
@@ -3,6 +3,7 @@ import logging
 from typing import Any, AsyncIterable, Literal, TYPE_CHECKING
 
 from dotenv import load_dotenv
+from openai import AsyncAzureOpenAI
 
 from pydantic import BaseModel
 
@@ -21,6 +22,8 @@ from semantic_kernel.contents import (
 from semantic_kernel.functions.kernel_arguments import KernelArguments
 from semantic_kernel.functions import kernel_function
 
+from common.utils.rate_limiter import rate_limited_http_client
+
 if TYPE_CHECKING:
     from semantic_kernel.contents import ChatMessageContent
 
@@ -148,6 +151,15 @@ class BackgroundCheckAgent:
                 endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
                 deployment_name="gpt-4o",
                 api_version="2025-03-01-preview",
+                # Shares the deployment's RPM/TPM budget with the other agents
+                async_client=AsyncAzureOpenAI(
+                    api_key=os.getenv("AZURE_OPENAI_TOKEN"),
+                    azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+                    api_version="2025-03-01-preview",
+                    http_client=rate_limited_http_client("gpt-4o"),
+                    # The limiter retries 429s itself
+                    max_retries=0,
+                ),
             ),
             name="BackgroundCheckAgent",
             instructions=(
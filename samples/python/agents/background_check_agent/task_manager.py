@@ -1,4 +1,3 @@
-import asyncio
 import logging
 from typing import AsyncIterable
 
@@ -56,7 +55,16 @@ class TaskManager(InMemoryTaskManager):
         query = request.params.message.parts[0].text
 
         try:
-            agent_response = await self.agent.invoke(query, request.params.sessionId)
+            agent_response = await self.run_task(
+                request.params.id,
+                self.agent.invoke(query, request.params.sessionId),
+                self.task_deadline(request.params),
+            )
+            if agent_response is None:
+                # Cancelled or out of time; the task already records why
+                return SendTaskResponse(
+                    id=request.id, result=self.tasks[request.params.id]
+                )
             # Print background check agent response to terminal
             print(f"\n{'='*60}")
             print(f"BACKGROUND CHECK AGENT RESPONSE:")
@@ -91,7 +99,11 @@ class TaskManager(InMemoryTaskManager):
 
             await self.upsert_task(request.params)
             sse_queue = await self.setup_sse_consumer(request.params.id, False)
-            asyncio.create_task(self._run_streaming_agent(request))
+            self.start_task(
+                request.params.id,
+                self._run_streaming_agent(request),
+                self.task_deadline(request.params),
+            )
             return self.dequeue_events_for_sse(request.id, request.params.id, sse_queue)
         except Exception as e:
             logger.error(f"Error in SSE stream: {e}")
@@ -0,0 +1,367 @@
+"""End-to-end throughput benchmark of the A2A stack against the stub LLM server.
+
+Boots the stub LLM server (benchmarks/stub_llm_server.py) and, as separate
+processes pointed at it, the AutoGen rating agent, the background-check agent
+and the demo UI host. Then drives N conversations, C at a time, either
+through the host (which fans each candidate out to the agents) or straight to
+the agents over A2A, and reports throughput, p50/p95/p99 latency, peak memory
+of every process and the stub's request counts. Nothing calls Azure OpenAI or
+Gemini.
+
+run:
+  cd samples/python && PYTHONPATH=. python benchmarks/bench_e2e.py --conversations 50 --concurrency 10 --latency lognormal:0.4,0.5
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from typing import Optional
+
+import httpx
+
+from benchmarks.stub_llm_server import (
+    StubLLMServer,
+    add_stub_arguments,
+    config_from_arguments,
+)
+from common.client import A2ACardResolver, A2AClient
+from common.types import AgentCard
+from hosts.cli.bulk_screening import percentile
+
+SAMPLES = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEMO_UI = os.path.abspath(os.path.join(SAMPLES, "..", "..", "demo", "ui"))
+
+RESUME = (
+    "Rate this candidate: {name}; 4 years building RAG services with PyTorch "
+    "and LangChain at a Stanford University spin-off, mentored junior women "
+    "engineers, bilingual English and Chinese."
+)
+
+
+class Component:
+    """A server of the stack run as a subprocess, with its memory sampled."""
+
+    def __init__(
+        self, name: str, args: list[str], cwd: str, port: int, env: dict[str, str]
+    ):
+        self.name = name
+        self.args = args
+        self.cwd = cwd
+        self.port = port
+        self.env = env
+        self.url = f"http://localhost:{port}"
+        self.peak_rss_mb = 0.0
+        self.process: Optional[subprocess.Popen] = None
+        self.log = tempfile.NamedTemporaryFile(
+            prefix=f"bench_{name}_", suffix=".log", delete=False
+        )
+
+    def start(self) -> None:
+        self.process = subprocess.Popen(
+            self.args,
+            cwd=self.cwd,
+            env={**os.environ, **self.env},
+            stdout=self.log,
+            stderr=subprocess.STDOUT,
+        )
+
+    async def wait_ready(self, path: str, method: str, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        async with httpx.AsyncClient() as client:
+            while True:
+                if self.process.poll() is not None:
+                    raise RuntimeError(
+                        f"{self.name} exited during startup:\n{self.log_tail()}"
+                    )
+                try:
+                    response = await client.request(
+                        method, self.url + path, json={}, timeout=2
+                    )
+                    if response.status_code < 500:
+                        return
+                except httpx.TransportError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"{self.name} did not start:\n{self.log_tail()}")
+                await asyncio.sleep(0.25)
+
+    def rss_mb(self) -> float:
+        """Resident memory from /proc; 0 where that is not available."""
+        try:
+            with open(f"/proc/{self.process.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) / 1024
+        except OSError:
+            pass
+        return 0.0
+
+    def sample_memory(self) -> None:
+        self.peak_rss_mb = max(self.peak_rss_mb, self.rss_mb())
+
+    def log_tail(self, lines: int = 20) -> str:
+        with open(self.log.name, errors="replace") as f:
+            return "".join(f.readlines()[-lines:])
+
+    def stop(self) -> None:
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+def make_components(names: list[str], stub_url: str) -> dict[str, Component]:
+    llm_env = {
+        "PYTHONPATH": SAMPLES,
+        "AZURE_OPENAI_ENDPOINT": stub_url,
+        "AZURE_OPENAI_TOKEN": "stub",
+        # The stub's own limits are what is being measured
+        "AZURE_OPENAI_RPM": "1000000",
+        "AZURE_OPENAI_TPM": "1000000000",
+    }
+    available = {
+        "autogen": lambda: Component(
+            "autogen",
+            [sys.executable, "-m", "agents.autogen", "--port", "10018"],
+            SAMPLES,
+            10018,
+            llm_env,
+        ),
+        "background_check": lambda: Component(
+            "background_check",
+            [sys.executable, "-m", "agents.background_check_agent", "--port", "10019"],
+            SAMPLES,
+            10019,
+            llm_env,
+        ),
+        "host": lambda: Component(
+            "host",
+            [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "service.server.host_app:app",
+                "--port",
+                "12000",
+            ],
+            DEMO_UI,
+            12000,
+            {
+                "PYTHONPATH": f"{SAMPLES}:{DEMO_UI}",
+                "A2A_HOST": "ADK",
+                "GOOGLE_API_KEY": "stub",
+                "GOOGLE_GENAI_USE_VERTEXAI": "FALSE",
+                "GEMINI_BASE_URL": stub_url,
+            },
+        ),
+    }
+    return {name: available[name]() for name in names}
+
+
+async def converse_with_agents(agents: dict[str, A2AClient], index: int) -> None:
+    """One candidate sent straight to every agent."""
+    message = RESUME.format(name=f"Candidate {index}")
+    responses = await asyncio.gather(
+        *(
+            client.send_task(
+                {
+                    "id": uuid.uuid4().hex,
+                    "sessionId": uuid.uuid4().hex,
+                    "acceptedOutputModes": ["text"],
+                    "message": {
+                        "role": "user",
+                        "parts": [{"type": "text", "text": message}],
+                    },
+                }
+            )
+            for client in agents.values()
+        )
+    )
+    for name, response in zip(agents, responses):
+        if response.error or response.result.status.state != "completed":
+            raise RuntimeError(f"{name}: {response.error or response.result.status}")
+
+
+async def converse_with_host(
+    client: httpx.AsyncClient, host_url: str, index: int, timeout: float
+) -> None:
+    """One conversation through the host: send a candidate, wait for the reply."""
+    response = await client.post(f"{host_url}/conversation/create", json={})
+    conversation_id = response.json()["result"]["conversation_id"]
+    message_id = uuid.uuid4().hex
+    await client.post(
+        f"{host_url}/message/send",
+        json={
+            "params": {
+                "role": "user",
+                "parts": [
+                    {"type": "text", "text": RESUME.format(name=f"Candidate {index}")}
+                ],
+                "metadata": {
+                    "conversation_id": conversation_id,
+                    "message_id": message_id,
+                },
+            }
+        },
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        await asyncio.sleep(0.1)
+        pending = (await client.post(f"{host_url}/message/pending", json={})).json()
+        if any(entry[0] == message_id for entry in pending["result"]):
+            continue
+        messages = (
+            await client.post(
+                f"{host_url}/message/list", json={"params": conversation_id}
+            )
+        ).json()["result"]
+        if messages and messages[-1]["role"] == "agent":
+            return
+    raise TimeoutError(f"No reply in conversation {conversation_id}")
+
+
+async def start_host_agent(
+    client: httpx.AsyncClient,
+    host_url: str,
+    cards: dict[str, AgentCard],
+    timeout: float,
+) -> None:
+    """Builds the host's agent, as the UI's API key dialog does, and registers
+    the remote agents with it."""
+    await client.post(f"{host_url}/api_key/update", json={"api_key": "stub-llm"})
+    deadline = time.monotonic() + timeout
+    for card in cards.values():
+        # The host prepends the scheme itself
+        address = card.url.split("://", 1)[-1].rstrip("/")
+        while True:
+            await client.post(f"{host_url}/agent/register", json={"params": address})
+            listed = (await client.post(f"{host_url}/agent/list", json={})).json()
+            if any(agent["name"] == card.name for agent in listed["result"]):
+                break
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"The host did not register {card.name}")
+            await asyncio.sleep(0.25)
+
+
+async def run(args: argparse.Namespace) -> None:
+    names = [name for name in args.components.split(",") if name]
+    target = args.target or ("host" if "host" in names else "agents")
+    stub = StubLLMServer(config_from_arguments(args)).start()
+    components = make_components(names, stub.url)
+    try:
+        for component in components.values():
+            component.start()
+        for name, component in components.items():
+            if name == "host":
+                await component.wait_ready("/agent/list", "POST", args.startup_timeout)
+            else:
+                await component.wait_ready(
+                    "/.well-known/agent.json", "GET", args.startup_timeout
+                )
+        agent_urls = {n: c.url for n, c in components.items() if n != "host"}
+        cards = {
+            n: A2ACardResolver(url).get_agent_card() for n, url in agent_urls.items()
+        }
+        agents = {n: A2AClient(agent_card=card) for n, card in cards.items()}
+        print(f"Started {', '.join(components)}; stub LLM at {stub.url}")
+
+        # The AutoGen raters hand off to the next agent of the Swarm
+        tool_calls = {"transfer_to_inclusionrater": {}, "transfer_to_reporter": {}}
+        host_url = components["host"].url if target == "host" else None
+        http = httpx.AsyncClient(timeout=args.timeout)
+        if host_url:
+            await start_host_agent(http, host_url, cards, args.startup_timeout)
+            # The host model fans every candidate out to all agents
+            tool_calls["send_tasks_parallel"] = {
+                "agent_names": [card.name for card in cards.values()],
+                "message": "{message}",
+            }
+        stub.stub.config.tool_calls = {**tool_calls, **stub.stub.config.tool_calls}
+
+        for component in components.values():
+            component.sample_memory()
+        baseline = {n: c.peak_rss_mb for n, c in components.items()}
+
+        async def sample_memory():
+            while True:
+                for component in components.values():
+                    component.sample_memory()
+                await asyncio.sleep(0.5)
+
+        sampler = asyncio.create_task(sample_memory())
+        semaphore = asyncio.Semaphore(args.concurrency)
+        latencies: list[float] = []
+        errors: list[str] = []
+
+        async def conversation(index: int):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    if host_url:
+                        await converse_with_host(http, host_url, index, args.timeout)
+                    else:
+                        await converse_with_agents(agents, index)
+                    latencies.append(time.perf_counter() - start)
+                except Exception as e:
+                    errors.append(f"{type(e).__name__}: {e}")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(conversation(i) for i in range(args.conversations)))
+        elapsed = time.perf_counter() - start
+        sampler.cancel()
+        await http.aclose()
+
+        print(
+            f"\n{args.conversations} conversations via {target}, concurrency"
+            f" {args.concurrency}, LLM latency {args.latency}"
+        )
+        print(
+            f"completed {len(latencies)}, failed {len(errors)} in {elapsed:.1f}s:"
+            f" {len(latencies) / elapsed:.2f} conversations/s"
+        )
+        print(
+            f"latency p50 {percentile(latencies, 50):.2f}s"
+            f" p95 {percentile(latencies, 95):.2f}s"
+            f" p99 {percentile(latencies, 99):.2f}s"
+        )
+        for name, component in components.items():
+            print(
+                f"{name:>16}: RSS {baseline[name]:.0f} MB idle,"
+                f" {component.peak_rss_mb:.0f} MB peak"
+            )
+        print(f"stub LLM: {dict(stub.stub.stats)}")
+        for error in errors[:5]:
+            print(f"error: {error}")
+    finally:
+        for component in components.values():
+            component.stop()
+        stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--conversations", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument(
+        "--components",
+        default="autogen,background_check,host",
+        help="Comma separated: autogen, background_check, host",
+    )
+    parser.add_argument(
+        "--target",
+        choices=["host", "agents"],
+        default=None,
+        help="Drive conversations through the host (default if it runs) or "
+        "straight to the agents",
+    )
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    add_stub_arguments(parser)
+    asyncio.run(run(parser.parse_args()))
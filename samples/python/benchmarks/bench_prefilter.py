@@ -0,0 +1,75 @@
+"""Throughput benchmark for the JD-fit prefilter.
+
+Ranks batches of synthetic resumes (JD vocabulary mixed with filler words)
+against the SAP AI Scientist JD and reports the time spent counting terms,
+scoring and selecting the top-k.
+
+run:
+  cd samples/python && PYTHONPATH=. python benchmarks/bench_prefilter.py
+"""
+
+import argparse
+import random
+import time
+
+from agents.autogen.agent import JD_INCLUSION, JD_TECH
+from agents.autogen.prefilter import JDPrefilter, _top, tokenize
+
+FILLER = (
+    "responsible for team project delivery stakeholder meeting report weekly "
+    "customer process improvement quality planning budget schedule office "
+    "communication analysis support operations vendor contract review"
+).split()
+
+
+def make_resumes(count: int, words: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    jd_words = tokenize(JD_TECH + " " + JD_INCLUSION)
+    resumes = []
+    for _ in range(count):
+        # Candidates differ in how much of the JD they touch
+        share = rng.random() * 0.5
+        resumes.append(
+            " ".join(
+                rng.choice(jd_words) if rng.random() < share else rng.choice(FILLER)
+                for _ in range(words)
+            )
+        )
+    return resumes
+
+
+def main(count: int, words: int, top_k: int) -> None:
+    prefilter = JDPrefilter.from_job_descriptions(JD_TECH, JD_INCLUSION)
+    resumes = make_resumes(count, words, seed=0)
+    print(
+        f"{count} resumes x {words} words, JD vocabulary"
+        f" {len(prefilter.vocabulary)} terms, top {top_k}"
+    )
+
+    start = time.perf_counter()
+    prefilter.term_counts(resumes)
+    counted = time.perf_counter()
+    scores = prefilter.score(resumes)
+    scored = time.perf_counter()
+    _top(scores["score"], top_k)
+    selected = time.perf_counter()
+    shortlist = prefilter.rank(resumes, top_k=top_k)
+    ranked = time.perf_counter()
+
+    print(f"term counts: {(counted - start) * 1000:8.1f} ms")
+    print(f"score:       {(scored - counted) * 1000:8.1f} ms (includes counting)")
+    print(f"top-k:       {(selected - scored) * 1000:8.1f} ms")
+    print(
+        f"rank():      {(ranked - selected) * 1000:8.1f} ms,"
+        f" {count / (ranked - selected):,.0f} resumes/s"
+    )
+    print(f"best: {shortlist[0].candidate_id} score {shortlist[0].score:.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--words", type=int, default=400)
+    parser.add_argument("--top-k", type=int, default=20)
+    args = parser.parse_args()
+    main(args.count, args.words, args.top_k)
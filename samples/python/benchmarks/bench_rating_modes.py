@@ -0,0 +1,79 @@
+"""Latency benchmark for the AutoGen evaluation modes.
+
+Rates the same candidate with the sequential Swarm handoff chain and with the
+parallel mode (both raters at once, then the Reporter), each with the local
+and the LLM Reporter, using the stub model client with a fixed latency per
+model call. Reports wall time per evaluation, model calls and tokens per run.
+
+run:
+  cd samples/python && PYTHONPATH=. python benchmarks/bench_rating_modes.py
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from agents.autogen.agent import EVALUATION_MODES, AutogenAgent
+from agents.autogen.stub_client import StubChatCompletionClient
+
+CANDIDATE = (
+    "Rate this candidate: Maria Garcia; PhD in ML, 5 years at Google, "
+    "active in women in tech."
+)
+
+
+async def run_mode(
+    mode: str, llm_reporter: bool, latency: float, runs: int
+) -> dict[str, float]:
+    client = StubChatCompletionClient(latency=latency)
+    agent = AutogenAgent(model_client=client, mode=mode, llm_reporter=llm_reporter)
+    timings = []
+    for run in range(runs):
+        start = time.perf_counter()
+        await agent.invoke(CANDIDATE, f"bench-{run}")
+        timings.append(time.perf_counter() - start)
+    return {
+        "median_s": statistics.median(timings),
+        "max_s": max(timings),
+        "calls_per_run": client.calls / runs,
+        "tokens_per_run": (
+            client.total_usage().prompt_tokens + client.total_usage().completion_tokens
+        )
+        / runs,
+    }
+
+
+async def main(latency: float, runs: int) -> None:
+    print(f"model latency {latency * 1000:.0f} ms, {runs} runs per mode")
+    results = {}
+    for mode in EVALUATION_MODES:
+        for reporter in ("llm", "local"):
+            results[mode, reporter] = result = await run_mode(
+                mode, reporter == "llm", latency, runs
+            )
+            print(
+                f"{mode:>8} / {reporter:<5} reporter: median"
+                f" {result['median_s'] * 1000:7.1f} ms"
+                f"  max {result['max_s'] * 1000:7.1f} ms"
+                f"  model calls/run {result['calls_per_run']:.0f}"
+                f"  tokens/run {result['tokens_per_run']:.0f}"
+            )
+    baseline = results["swarm", "llm"]
+    for key in (("parallel", "llm"), ("swarm", "local"), ("parallel", "local")):
+        result = results[key]
+        saved = 1 - result["tokens_per_run"] / baseline["tokens_per_run"]
+        print(
+            f"{' / '.join(key)}: {baseline['median_s'] / result['median_s']:.2f}x"
+            f" faster than swarm / llm, {saved:.0%} fewer tokens"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--latency", type=float, default=0.5, help="seconds per model call"
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.latency, args.runs))
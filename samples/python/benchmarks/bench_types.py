@@ -0,0 +1,340 @@
+"""Micro-benchmarks of the A2A protocol types on the hot paths.
+
+Every status update of a task builds pydantic models (TaskStatus, Message,
+TaskStatusUpdateEvent), is serialized with model_dump_json for SSE and the
+task with model_dump for push notifications, and every request is validated
+with A2ARequest.validate_python on ingress. The cases here time those steps
+with realistic payloads: a resume of a few KB, a rating report and a base64
+PDF file part.
+
+Each run is appended to a JSON Lines history. A case's time is its fastest
+round, and the baseline is the median of that over the last --window runs
+with the same Python and pydantic versions, payload sizes and --only filter;
+the script exits with status 1 when a case is slower than its baseline by
+more than --threshold.
+
+run:
+  cd samples/python && PYTHONPATH=. python benchmarks/bench_types.py --history bench_types.jsonl
+"""
+
+import argparse
+import base64
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+import pydantic
+
+from common.types import (
+    A2ARequest,
+    Artifact,
+    DataPart,
+    FileContent,
+    FilePart,
+    Message,
+    SendTaskResponse,
+    SendTaskStreamingResponse,
+    Task,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+
+WORDS = (
+    "Python PyTorch LangChain RAG retrieval pipelines Kubernetes mentoring "
+    "research publications NLP transformers evaluation deployment Stanford "
+    "engineer led team of five built scalable services reduced latency by "
+    "forty percent bilingual English Chinese diversity initiatives"
+).split()
+
+
+def make_text(words: int, rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def make_cases(resume_words: int, file_kb: int) -> dict[str, Callable[[], Any]]:
+    """The timed operations, each over payloads built once up front."""
+    rng = random.Random(0)
+    resume = make_text(resume_words, rng)
+    report = make_text(resume_words // 4, rng)
+    pdf = base64.b64encode(rng.randbytes(file_kb * 1024)).decode("ascii")
+    task_id = "2f1e0d4c-8b7a-4c3d-9e1f-0a2b3c4d5e6f"
+
+    user_message = {
+        "role": "user",
+        "parts": [{"type": "text", "text": f"Rate this candidate:\n\n{resume}"}],
+    }
+    file_message = {
+        "role": "user",
+        "parts": [
+            {"type": "text", "text": "Rate the attached resume"},
+            {
+                "type": "file",
+                "file": {
+                    "name": "resume.pdf",
+                    "mimeType": "application/pdf",
+                    "bytes": pdf,
+                },
+            },
+        ],
+    }
+
+    def request(method: str, message: dict) -> dict:
+        return {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": method,
+            "params": {
+                "id": task_id,
+                "sessionId": "session",
+                "acceptedOutputModes": ["text", "text/plain"],
+                "message": message,
+            },
+        }
+
+    send = request("tasks/send", user_message)
+    send_file = request("tasks/send", file_message)
+    subscribe = request("tasks/sendSubscribe", user_message)
+
+    status_event = TaskStatusUpdateEvent(
+        id=task_id,
+        status=TaskStatus(
+            state=TaskState.WORKING,
+            message=Message(role="agent", parts=[TextPart(text=report)]),
+        ),
+    )
+    artifact_event = TaskArtifactUpdateEvent(
+        id=task_id,
+        artifact=Artifact(
+            name="candidate evaluations",
+            index=1,
+            append=True,
+            parts=[DataPart(data={"candidate": "c-17", "rating": 8, "report": report})],
+        ),
+    )
+    task = Task(
+        id=task_id,
+        sessionId="session",
+        status=TaskStatus(
+            state=TaskState.COMPLETED,
+            message=Message(role="agent", parts=[TextPart(text=report)]),
+        ),
+        artifacts=[Artifact(parts=[TextPart(text=report)])],
+        history=[
+            Message(**user_message),
+            Message(
+                role="user",
+                parts=[
+                    FilePart(
+                        file=FileContent(
+                            name="resume.pdf", mimeType="application/pdf", bytes=pdf
+                        )
+                    )
+                ],
+            ),
+        ],
+    )
+    task_response = SendTaskResponse(id=1, result=task).model_dump(exclude_none=True)
+
+    def status_update() -> TaskStatusUpdateEvent:
+        return TaskStatusUpdateEvent(
+            id=task_id,
+            status=TaskStatus(
+                state=TaskState.WORKING,
+                message=Message(role="agent", parts=[TextPart(text=report)]),
+            ),
+            final=False,
+        )
+
+    return {
+        "construct status update": status_update,
+        "status update SSE": lambda: SendTaskStreamingResponse(
+            id=1, result=status_event
+        ).model_dump_json(exclude_none=True),
+        "artifact update SSE": lambda: SendTaskStreamingResponse(
+            id=1, result=artifact_event
+        ).model_dump_json(exclude_none=True),
+        "push notification dump": lambda: task.model_dump(exclude_none=True),
+        "ingress tasks/send": lambda: A2ARequest.validate_python(send),
+        "ingress tasks/send file": lambda: A2ARequest.validate_python(send_file),
+        "ingress sendSubscribe": lambda: A2ARequest.validate_python(subscribe),
+        "client parse task": lambda: SendTaskResponse(**task_response),
+    }
+
+
+def loop_size(operation: Callable[[], Any], min_seconds: float) -> int:
+    """Calls per timed loop for the loop to last at least `min_seconds`."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        if time.perf_counter() - start >= min_seconds:
+            return number
+        number *= 2
+
+
+def measure(
+    cases: dict[str, Callable[[], Any]], rounds: int, min_round_seconds: float
+) -> dict[str, dict[str, float]]:
+    """Microseconds per call of each case: min and median over `rounds` loops.
+
+    Rounds go over the cases in turn, so that a slower spell of the machine
+    affects all of them rather than every round of one case. The garbage
+    collector is off while timing, as in timeit.
+    """
+    sizes = {name: loop_size(op, min_round_seconds) for name, op in cases.items()}
+    per_call: dict[str, list[float]] = {name: [] for name in cases}
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            for name, operation in cases.items():
+                number = sizes[name]
+                start = time.perf_counter()
+                for _ in range(number):
+                    operation()
+                per_call[name].append((time.perf_counter() - start) / number * 1e6)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {
+        name: {"min_us": min(times), "median_us": statistics.median(times)}
+        for name, times in per_call.items()
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def baseline_from_history(
+    path: str, environment: dict[str, Any], window: int
+) -> dict[str, float]:
+    """Per case, the median of the min times of the last `window` runs
+    recorded with the same environment."""
+    if not os.path.exists(path):
+        return {}
+    runs = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            run = json.loads(line)
+            if all(run.get(key) == value for key, value in environment.items()):
+                runs.append(run)
+    times: dict[str, list[float]] = {}
+    for run in runs[-window:]:
+        for name, result in run["results"].items():
+            times.setdefault(name, []).append(result["min_us"])
+    return {name: statistics.median(values) for name, values in times.items()}
+
+
+def regressions(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, float],
+    threshold: float,
+) -> list[str]:
+    """Cases more than `threshold` slower than the baseline."""
+    return [
+        name
+        for name, result in results.items()
+        if name in baseline and result["min_us"] > baseline[name] * (1 + threshold)
+    ]
+
+
+def main(args: argparse.Namespace) -> int:
+    cases = make_cases(args.resume_words, args.file_kb)
+    if args.only:
+        cases = {name: op for name, op in cases.items() if args.only in name}
+    # Runs are only compared with runs timing the same cases on the same
+    # payloads
+    environment = {
+        "python": platform.python_version(),
+        "pydantic": pydantic.VERSION,
+        "resume_words": args.resume_words,
+        "file_kb": args.file_kb,
+        "only": args.only,
+    }
+    baseline = (
+        baseline_from_history(args.history, environment, args.window)
+        if args.history
+        else {}
+    )
+    print(
+        f"Python {environment['python']}, pydantic {environment['pydantic']},"
+        f" resume {args.resume_words} words, file part {args.file_kb} KB"
+    )
+
+    results = measure(cases, args.rounds, args.min_time)
+    print(f"{'case':<26}{'min us':>10}{'median us':>12}{'calls/s':>12}{'change':>10}")
+    for name, result in results.items():
+        change = ""
+        if name in baseline:
+            change = f"{(result['min_us'] / baseline[name] - 1) * 100:+.1f}%"
+        print(
+            f"{name:<26}{result['min_us']:>10.1f}{result['median_us']:>12.1f}"
+            f"{1e6 / result['min_us']:>12,.0f}{change:>10}"
+        )
+
+    if args.history:
+        run = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            **environment,
+            "results": results,
+        }
+        with open(args.history, "a") as f:
+            f.write(json.dumps(run) + "\n")
+
+    slower = regressions(results, baseline, args.threshold)
+    if slower:
+        print(
+            f"Slower than the last {args.window} runs by more than"
+            f" {args.threshold:.0%}: {', '.join(slower)}"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--history", default=None, help="JSON Lines file of runs to compare with"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Slowdown of a case that fails the run (0.2: 20%%)",
+    )
+    parser.add_argument(
+        "--window", type=int, default=5, help="Past runs the baseline is taken from"
+    )
+    parser.add_argument("--rounds", type=int, default=15)
+    parser.add_argument(
+        "--min-time", type=float, default=0.02, help="Seconds per timed loop"
+    )
+    parser.add_argument("--resume-words", type=int, default=1000)
+    parser.add_argument("--file-kb", type=int, default=64)
+    parser.add_argument("--only", default=None, help="Run the cases containing this")
+    sys.exit(main(parser.parse_args()))
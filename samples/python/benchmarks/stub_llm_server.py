@@ -0,0 +1,540 @@
+"""Local stand-in for the Azure OpenAI, OpenAI and Gemini chat APIs.
+
+Load tests of the agents would otherwise spend real quota. The server answers
+
+- Azure OpenAI:  POST /openai/deployments/{deployment}/chat/completions
+- OpenAI:        POST /v1/chat/completions
+- Gemini:        POST /v1beta/models/{model}:generateContent
+                 POST /v1beta/models/{model}:streamGenerateContent?alt=sse
+
+with canned answers after a latency drawn from a configurable distribution,
+streams tokens with a per-token delay, and injects 429s at random or once a
+requests-per-minute quota is used up, with a Retry-After header.
+
+Answers follow the request: a JSON instance of the response schema when one
+is requested (enums answer "completed" when they can), a call to a configured
+tool when the request declares it and has not received its result since the
+last user message, the configured reply text otherwise. GET /stats returns
+request counts.
+
+run:
+  cd samples/python && PYTHONPATH=. python benchmarks/stub_llm_server.py --port 8090 --latency lognormal:0.5,0.4 --error-rate 0.02
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import random
+import threading
+import time
+import uuid
+from typing import Any, Optional
+
+import uvicorn
+from pydantic import BaseModel, Field
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+DEFAULT_REPLY = "Stub response from the local LLM server."
+
+
+class LatencyDistribution(BaseModel):
+    """Seconds to the first token, parsed from "kind:params".
+
+    fixed:S, uniform:LOW,HIGH, normal:MEAN,STD, lognormal:MEDIAN,SIGMA or
+    exponential:MEAN.
+    """
+
+    kind: str = "fixed"
+    params: list[float] = [0.0]
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        kind, _, params = spec.partition(":")
+        if kind not in ("fixed", "uniform", "normal", "lognormal", "exponential"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+        values = [float(p) for p in params.split(",") if p] or [0.0]
+        expected = {"fixed": 1, "exponential": 1}.get(kind, 2)
+        if len(values) != expected:
+            raise ValueError(f"{kind} latency takes {expected} parameter(s): {spec}")
+        return cls(kind=kind, params=values)
+
+    def sample(self, rng: random.Random) -> float:
+        p = self.params
+        if self.kind == "uniform":
+            value = rng.uniform(p[0], p[1])
+        elif self.kind == "normal":
+            value = rng.gauss(p[0], p[1])
+        elif self.kind == "lognormal":
+            value = p[0] * rng.lognormvariate(0.0, p[1]) if p[0] > 0 else 0.0
+        elif self.kind == "exponential":
+            value = rng.expovariate(1 / p[0]) if p[0] > 0 else 0.0
+        else:
+            value = p[0]
+        return max(0.0, value)
+
+
+class StubConfig(BaseModel):
+    latency: LatencyDistribution = LatencyDistribution()
+    # Delay per streamed token, also added to non-streaming answers
+    token_delay: float = 0.0
+    # Share of requests answered with 429
+    error_rate: float = 0.0
+    # Requests per minute and deployment/model before answering 429 (0: none)
+    rpm: int = 0
+    retry_after: float = 1.0
+    reply: str = DEFAULT_REPLY
+    # Tool name -> arguments; "{message}" in a string argument is replaced
+    # with the last user message
+    tool_calls: dict[str, dict[str, Any]] = Field(default_factory=dict)
+    seed: Optional[int] = None
+
+
+def count_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def schema_instance(schema: dict, defs: Optional[dict] = None) -> Any:
+    """A value satisfying a JSON (or Gemini) schema, for structured output."""
+    defs = defs if defs is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        return schema_instance(defs[schema["$ref"].split("/")[-1]], defs)
+    for key in ("anyOf", "oneOf", "allOf"):
+        if schema.get(key):
+            return schema_instance(schema[key][0], defs)
+    if "enum" in schema:
+        return "completed" if "completed" in schema["enum"] else schema["enum"][0]
+    if "const" in schema:
+        return schema["const"]
+    kind = str(schema.get("type", "object")).lower()
+    if kind == "object":
+        return {
+            name: schema_instance(prop, defs)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        return [schema_instance(schema.get("items", {}), defs)]
+    if kind in ("integer", "number"):
+        low = schema.get("minimum", schema.get("exclusiveMinimum", 1))
+        high = schema.get("maximum", schema.get("exclusiveMaximum", 10))
+        value = (low + high) / 2
+        return int(value) if kind == "integer" else value
+    if kind == "boolean":
+        return True
+    if kind == "null":
+        return None
+    return "stub"
+
+
+class StubLLM:
+    """Request handling and counters shared by all routes."""
+
+    def __init__(self, config: StubConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.stats: collections.Counter = collections.Counter()
+        self._windows: dict[str, collections.deque] = collections.defaultdict(
+            collections.deque
+        )
+
+    def throttle(self, key: str) -> Optional[float]:
+        """Retry-After seconds if this request gets a 429, else None."""
+        if self.config.error_rate and self.rng.random() < self.config.error_rate:
+            return self.config.retry_after
+        if self.config.rpm:
+            now = time.monotonic()
+            window = self._windows[key]
+            while window and now - window[0] >= 60:
+                window.popleft()
+            if len(window) >= self.config.rpm:
+                return 60 - (now - window[0])
+            window.append(now)
+        return None
+
+    async def wait_first_token(self) -> None:
+        await asyncio.sleep(self.config.latency.sample(self.rng))
+
+    def chunks(self, text: str) -> list[str]:
+        """The text split into roughly token sized pieces for streaming."""
+        words = text.split(" ")
+        return [w + (" " if i < len(words) - 1 else "") for i, w in enumerate(words)]
+
+    def tool_call(self, declared: set[str], answered: set[str], last_user: str):
+        """(name, arguments) of the configured call this request should make."""
+        for name, arguments in self.config.tool_calls.items():
+            if name in declared and name not in answered:
+                return name, {
+                    key: (
+                        value.replace("{message}", last_user)
+                        if isinstance(value, str)
+                        else value
+                    )
+                    for key, value in arguments.items()
+                }
+        return None
+
+    # OpenAI and Azure OpenAI
+
+    async def chat_completions(self, request: Request) -> Any:
+        body = await request.json()
+        model = request.path_params.get("deployment") or body.get("model", "stub")
+        self.stats["requests"] += 1
+        self.stats[f"requests:{model}"] += 1
+        retry_after = self.throttle(model)
+        if retry_after is not None:
+            self.stats["throttled"] += 1
+            return JSONResponse(
+                {
+                    "error": {
+                        "code": "429",
+                        "message": "Rate limit is exceeded. Try again later.",
+                    }
+                },
+                status_code=429,
+                headers={"Retry-After": str(max(1, round(retry_after)))},
+            )
+
+        messages = body.get("messages", [])
+        prompt_tokens = sum(count_tokens(json.dumps(m)) for m in messages)
+        content, tool_call = self._openai_answer(body, messages)
+        completion_tokens = count_tokens(content or json.dumps(tool_call or {}))
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        message: dict[str, Any] = {"role": "assistant", "content": content}
+        finish_reason = "stop"
+        if tool_call:
+            message["tool_calls"] = [tool_call]
+            finish_reason = "tool_calls"
+
+        await self.wait_first_token()
+        if not body.get("stream"):
+            await asyncio.sleep(self.config.token_delay * completion_tokens)
+            return JSONResponse(
+                {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [
+                        {"index": 0, "message": message, "finish_reason": finish_reason}
+                    ],
+                    "usage": usage,
+                }
+            )
+
+        self.stats["streams"] += 1
+        include_usage = (body.get("stream_options") or {}).get("include_usage")
+
+        def chunk(delta: dict, finish: Optional[str] = None, **extra) -> str:
+            data = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+                **extra,
+            }
+            return f"data: {json.dumps(data)}\n\n"
+
+        async def events():
+            yield chunk({"role": "assistant", "content": ""})
+            for piece in self.chunks(content or ""):
+                await asyncio.sleep(self.config.token_delay)
+                yield chunk({"content": piece})
+            if tool_call:
+                yield chunk({"tool_calls": [{"index": 0, **tool_call}]})
+            yield chunk({}, finish_reason)
+            if include_usage:
+                data = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [],
+                    "usage": usage,
+                }
+                yield f"data: {json.dumps(data)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    def _openai_answer(self, body: dict, messages: list[dict]):
+        declared = {
+            tool["function"]["name"]
+            for tool in body.get("tools") or []
+            if tool.get("type") == "function"
+        }
+        last_user = next(
+            (m for m in reversed(messages) if m.get("role") == "user"), None
+        )
+        after_user = messages[messages.index(last_user) + 1 :] if last_user else []
+        called = {
+            call["id"]: call["function"]["name"]
+            for m in after_user
+            for call in m.get("tool_calls") or []
+        }
+        answered = {called.get(m.get("tool_call_id")) for m in after_user}
+        user_text = _openai_text(last_user.get("content")) if last_user else ""
+
+        response_format = body.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            schema = response_format.get("json_schema", {}).get("schema", {})
+            content = json.dumps(schema_instance(schema))
+        elif response_format.get("type") == "json_object":
+            content = json.dumps({"status": "completed", "message": self.config.reply})
+        else:
+            content = self.config.reply
+
+        call = self.tool_call(declared, answered, user_text)
+        if call is None:
+            return content, None
+        name, arguments = call
+        tool_call = {
+            "id": f"call_{uuid.uuid4().hex[:24]}",
+            "type": "function",
+            "function": {"name": name, "arguments": json.dumps(arguments)},
+        }
+        # Structured answers come along with the call, as the agents' raters
+        # give their score with the handoff
+        return (content if response_format else None), tool_call
+
+    # Gemini
+
+    async def gemini(self, request: Request) -> Any:
+        model, _, method = request.path_params["model_method"].partition(":")
+        body = await request.json()
+        self.stats["requests"] += 1
+        self.stats[f"requests:{model}"] += 1
+        retry_after = self.throttle(model)
+        if retry_after is not None:
+            self.stats["throttled"] += 1
+            return JSONResponse(
+                {
+                    "error": {
+                        "code": 429,
+                        "message": "Resource has been exhausted (e.g. check quota).",
+                        "status": "RESOURCE_EXHAUSTED",
+                    }
+                },
+                status_code=429,
+                headers={"Retry-After": str(max(1, round(retry_after)))},
+            )
+
+        contents = body.get("contents", [])
+        prompt_tokens = sum(count_tokens(json.dumps(c)) for c in contents)
+        parts = self._gemini_answer(body, contents)
+        completion_tokens = count_tokens(json.dumps(parts))
+
+        def response(parts: list[dict], finish: Optional[str] = "STOP") -> dict:
+            candidate: dict[str, Any] = {
+                "content": {"role": "model", "parts": parts},
+                "index": 0,
+            }
+            if finish:
+                candidate["finishReason"] = finish
+            return {
+                "candidates": [candidate],
+                "usageMetadata": {
+                    "promptTokenCount": prompt_tokens,
+                    "candidatesTokenCount": completion_tokens,
+                    "totalTokenCount": prompt_tokens + completion_tokens,
+                },
+                "modelVersion": model,
+            }
+
+        await self.wait_first_token()
+        if method != "streamGenerateContent":
+            await asyncio.sleep(self.config.token_delay * completion_tokens)
+            return JSONResponse(response(parts))
+
+        self.stats["streams"] += 1
+
+        async def events():
+            text = parts[0].get("text") if len(parts) == 1 else None
+            if text is None:
+                yield f"data: {json.dumps(response(parts))}\r\n\r\n"
+                return
+            pieces = self.chunks(text)
+            for i, piece in enumerate(pieces):
+                await asyncio.sleep(self.config.token_delay)
+                last = i == len(pieces) - 1
+                data = response([{"text": piece}], "STOP" if last else None)
+                yield f"data: {json.dumps(data)}\r\n\r\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    def _gemini_answer(self, body: dict, contents: list[dict]) -> list[dict]:
+        declared = {
+            declaration["name"]
+            for tool in body.get("tools") or []
+            for declaration in tool.get("functionDeclarations") or []
+        }
+        last_user = None
+        for i, content in enumerate(contents):
+            if content.get("role") == "user" and any(
+                "text" in part for part in content.get("parts", [])
+            ):
+                last_user = i
+        after_user = contents[last_user + 1 :] if last_user is not None else []
+        answered = {
+            part["functionResponse"]["name"]
+            for content in after_user
+            for part in content.get("parts", [])
+            if "functionResponse" in part
+        }
+        user_text = (
+            " ".join(
+                part["text"]
+                for part in contents[last_user].get("parts", [])
+                if "text" in part
+            )
+            if last_user is not None
+            else ""
+        )
+        call = self.tool_call(declared, answered, user_text)
+        if call:
+            name, arguments = call
+            return [{"functionCall": {"name": name, "args": arguments}}]
+
+        generation_config = body.get("generationConfig") or {}
+        if generation_config.get("responseMimeType") == "application/json":
+            schema = generation_config.get("responseSchema") or {}
+            return [{"text": json.dumps(schema_instance(schema))}]
+        return [{"text": self.config.reply}]
+
+    async def get_stats(self, request: Request) -> JSONResponse:
+        return JSONResponse(dict(self.stats))
+
+
+def _openai_text(content: Any) -> str:
+    if isinstance(content, list):
+        return " ".join(p.get("text", "") for p in content if isinstance(p, dict))
+    return content or ""
+
+
+def create_app(config: StubConfig) -> Starlette:
+    stub = StubLLM(config)
+    app = Starlette(
+        routes=[
+            Route(
+                "/openai/deployments/{deployment}/chat/completions",
+                stub.chat_completions,
+                methods=["POST"],
+            ),
+            Route("/v1/chat/completions", stub.chat_completions, methods=["POST"]),
+            Route("/chat/completions", stub.chat_completions, methods=["POST"]),
+            Route(
+                "/{version}/models/{model_method:path}", stub.gemini, methods=["POST"]
+            ),
+            Route("/stats", stub.get_stats, methods=["GET"]),
+        ]
+    )
+    app.state.stub = stub
+    return app
+
+
+class StubLLMServer:
+    """Runs the stub in a background thread, e.g. for tests and benchmarks."""
+
+    def __init__(
+        self,
+        config: Optional[StubConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.app = create_app(config or StubConfig())
+        self._server = uvicorn.Server(
+            uvicorn.Config(self.app, host=host, port=port, log_level="warning")
+        )
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def stub(self) -> StubLLM:
+        return self.app.state.stub
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.servers[0].sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("Stub LLM server did not start")
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "StubLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def parse_tool_call(spec: str) -> tuple[str, dict[str, Any]]:
+    name, _, arguments = spec.partition("=")
+    return name, json.loads(arguments or "{}")
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options configuring the stub, shared with the end-to-end benchmark."""
+    parser.add_argument(
+        "--latency",
+        default="fixed:0",
+        help="Time to first token: fixed:S, uniform:LOW,HIGH, normal:MEAN,STD, "
+        "lognormal:MEDIAN,SIGMA or exponential:MEAN",
+    )
+    parser.add_argument("--token-delay", type=float, default=0.0)
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Share of requests given a 429"
+    )
+    parser.add_argument(
+        "--rpm", type=int, default=0, help="Requests per minute before a 429"
+    )
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--reply", default=DEFAULT_REPLY)
+    parser.add_argument(
+        "--tool-call",
+        action="append",
+        default=[],
+        metavar="NAME=JSON",
+        help="Call tool NAME with these arguments when a request declares it",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def config_from_arguments(args: argparse.Namespace) -> StubConfig:
+    return StubConfig(
+        latency=LatencyDistribution.parse(args.latency),
+        token_delay=args.token_delay,
+        error_rate=args.error_rate,
+        rpm=args.rpm,
+        retry_after=args.retry_after,
+        reply=args.reply,
+        tool_calls=dict(parse_tool_call(spec) for spec in args.tool_call),
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(create_app(config_from_arguments(args)), host=args.host, port=args.port)
@@ -19,6 +19,7 @@ from common.types import (
     SendTaskStreamingRequest,
     SendTaskStreamingResponse,
 )
+from common.utils.rate_limiter import parse_retry_after
 import json
 
 
@@ -76,7 +77,11 @@ class A2AClient:
                 response.raise_for_status()
                 return response.json()
             except httpx.HTTPStatusError as e:
-                raise A2AClientHTTPError(e.response.status_code, str(e)) from e
+                raise A2AClientHTTPError(
+                    e.response.status_code,
+                    str(e),
+                    retry_after=parse_retry_after(e.response.headers),
+                ) from e
             except json.JSONDecodeError as e:
                 raise A2AClientJSONError(str(e)) from e
 
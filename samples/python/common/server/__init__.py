@@ -1,4 +1,14 @@
+from .admission import AdmissionController, AdmissionRejected
 from .server import A2AServer
 from .task_manager import TaskManager, InMemoryTaskManager
+from .task_registry import TaskDeadlineExceeded, TaskRegistry
 
-__all__ = ["A2AServer", "TaskManager", "InMemoryTaskManager"]
+__all__ = [
+    "A2AServer",
+    "AdmissionController",
+    "AdmissionRejected",
+    "TaskManager",
+    "InMemoryTaskManager",
+    "TaskDeadlineExceeded",
+    "TaskRegistry",
+]
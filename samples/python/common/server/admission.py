@@ -0,0 +1,162 @@
+"""Admission control for A2A task requests.
+
+Every tasks/send and tasks/sendSubscribe request starts expensive model work.
+The AdmissionController caps how many run at once per agent server, keeps a
+bounded queue of waiting requests and rejects the rest right away with a
+retry hint, instead of letting a burst pile up on the model's rate limits.
+
+Waiting requests are queued per session and served fairly: a free slot goes
+to the waiting session with the fewest running tasks, oldest first, so one
+session submitting many tasks cannot starve the others.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import Counter, OrderedDict, deque
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_IN_FLIGHT = int(os.environ.get("A2A_MAX_IN_FLIGHT", 8))
+DEFAULT_MAX_QUEUE = int(os.environ.get("A2A_MAX_QUEUE", 32))
+DEFAULT_MAX_QUEUED_PER_SESSION = int(os.environ.get("A2A_MAX_QUEUED_PER_SESSION", 8))
+DEFAULT_QUEUE_TIMEOUT_SECONDS = float(os.environ.get("A2A_QUEUE_TIMEOUT_SECONDS", 30))
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is not admitted; retry after `retry_after` seconds."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+
+class Admission:
+    """A slot held by an admitted request. Releasing it twice is a no-op."""
+
+    def __init__(self, controller: "AdmissionController", session_id: str):
+        self.session_id = session_id
+        self.started = time.monotonic()
+        self._controller = controller
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._controller._release(self)
+
+
+class AdmissionController:
+    """Limits in-flight tasks with a bounded, per-session fair wait queue."""
+
+    def __init__(
+        self,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        max_queued_per_session: int = DEFAULT_MAX_QUEUED_PER_SESSION,
+        queue_timeout_seconds: float = DEFAULT_QUEUE_TIMEOUT_SECONDS,
+    ):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_queued_per_session = max_queued_per_session
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self._in_flight = 0
+        self._running: Counter[str] = Counter()
+        self._waiting: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+        self._queued = 0
+        self._avg_run_seconds = 10.0
+        self._admitted = 0
+        self._rejected = 0
+
+    async def acquire(self, session_id: str) -> Admission:
+        """Waits for a slot for the session.
+
+        Raises:
+          AdmissionRejected: The queue (or the session's share of it) is
+            full, or no slot freed up within the queue timeout.
+        """
+        if self._in_flight < self.max_in_flight and not self._queued:
+            return self._admit(session_id)
+
+        waiting = self._waiting.get(session_id)
+        if self._queued >= self.max_queue:
+            self._reject(session_id, "queue full")
+        if waiting is not None and len(waiting) >= self.max_queued_per_session:
+            self._reject(session_id, "session queue full")
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(session_id, deque()).append(future)
+        self._queued += 1
+        try:
+            await asyncio.wait({future}, timeout=self.queue_timeout_seconds)
+        except asyncio.CancelledError:
+            if future.done():
+                future.result().release()
+            else:
+                self._unqueue(session_id, future)
+            raise
+        if future.done():
+            return future.result()
+        self._unqueue(session_id, future)
+        self._reject(session_id, "timed out waiting for a slot")
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait, from recent run times."""
+        backlog = (self._queued + 1) / self.max_in_flight
+        return max(1, math.ceil(backlog * self._avg_run_seconds))
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "in_flight": self._in_flight,
+            "queued": self._queued,
+            "sessions_waiting": len(self._waiting),
+            "admitted": self._admitted,
+            "rejected": self._rejected,
+        }
+
+    def _admit(self, session_id: str) -> Admission:
+        self._in_flight += 1
+        self._running[session_id] += 1
+        self._admitted += 1
+        return Admission(self, session_id)
+
+    def _reject(self, session_id: str, reason: str):
+        self._rejected += 1
+        logger.warning(f"Rejecting task for session {session_id}: {reason}")
+        raise AdmissionRejected(reason, self.retry_after())
+
+    def _release(self, admission: Admission) -> None:
+        elapsed = time.monotonic() - admission.started
+        self._avg_run_seconds = 0.8 * self._avg_run_seconds + 0.2 * elapsed
+        self._in_flight -= 1
+        self._running[admission.session_id] -= 1
+        if self._running[admission.session_id] <= 0:
+            del self._running[admission.session_id]
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Hands free slots to waiting sessions, fewest running tasks first."""
+        while self._in_flight < self.max_in_flight and self._waiting:
+            # min() keeps the first of equals, i.e. the longest waiting session
+            session_id = min(self._waiting, key=lambda s: self._running[s])
+            waiting = self._waiting[session_id]
+            future = waiting.popleft()
+            self._queued -= 1
+            if waiting:
+                self._waiting.move_to_end(session_id)
+            else:
+                del self._waiting[session_id]
+            future.set_result(self._admit(session_id))
+
+    def _unqueue(self, session_id: str, future: asyncio.Future) -> None:
+        waiting = self._waiting.get(session_id)
+        if waiting is None or future not in waiting:
+            return
+        waiting.remove(future)
+        self._queued -= 1
+        if not waiting:
+            del self._waiting[session_id]
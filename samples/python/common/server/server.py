@@ -16,10 +16,12 @@ from common.types import (
     AgentCard,
     TaskResubscriptionRequest,
     SendTaskStreamingRequest,
+    ServerBusyError,
 )
 from pydantic import ValidationError
 import json
 from typing import AsyncIterable, Any
+from common.server.admission import Admission, AdmissionController, AdmissionRejected
 from common.server.task_manager import TaskManager
 
 import logging
@@ -35,12 +37,15 @@ class A2AServer:
         endpoint="/",
         agent_card: AgentCard = None,
         task_manager: TaskManager = None,
+        admission: AdmissionController | None = None,
     ):
         self.host = host
         self.port = port
         self.endpoint = endpoint
         self.task_manager = task_manager
         self.agent_card = agent_card
+        # Limits concurrent tasks/send and tasks/sendSubscribe requests
+        self.admission = admission or AdmissionController()
         self.app = Starlette()
         self.app.add_route(self.endpoint, self._process_request, methods=["POST"])
         self.app.add_route(
@@ -69,10 +74,12 @@ class A2AServer:
             if isinstance(json_rpc_request, GetTaskRequest):
                 result = await self.task_manager.on_get_task(json_rpc_request)
             elif isinstance(json_rpc_request, SendTaskRequest):
-                result = await self.task_manager.on_send_task(json_rpc_request)
+                return await self._admitted(
+                    json_rpc_request, self.task_manager.on_send_task
+                )
             elif isinstance(json_rpc_request, SendTaskStreamingRequest):
-                result = await self.task_manager.on_send_task_subscribe(
-                    json_rpc_request
+                return await self._admitted(
+                    json_rpc_request, self.task_manager.on_send_task_subscribe
                 )
             elif isinstance(json_rpc_request, CancelTaskRequest):
                 result = await self.task_manager.on_cancel_task(json_rpc_request)
@@ -97,6 +104,45 @@ class A2AServer:
         except Exception as e:
             return self._handle_exception(e)
 
+    async def _admitted(self, json_rpc_request, handler):
+        """Runs a task request once the admission controller lets it in.
+
+        The slot is held until a unary request returns, or until the SSE
+        stream of a streaming request ends.
+        """
+        try:
+            admission = await self.admission.acquire(json_rpc_request.params.sessionId)
+        except AdmissionRejected as e:
+            response = JSONRPCResponse(
+                id=json_rpc_request.id,
+                error=ServerBusyError(data={"retryAfter": e.retry_after}),
+            )
+            return JSONResponse(
+                response.model_dump(exclude_none=True),
+                status_code=429,
+                headers={"Retry-After": str(e.retry_after)},
+            )
+
+        try:
+            result = await handler(json_rpc_request)
+            if isinstance(result, AsyncIterable):
+                result = self._release_after(result, admission)
+                admission = None
+            return self._create_response(result)
+        finally:
+            if admission is not None:
+                admission.release()
+
+    @staticmethod
+    async def _release_after(
+        result: AsyncIterable, admission: Admission
+    ) -> AsyncIterable:
+        try:
+            async for item in result:
+                yield item
+        finally:
+            admission.release()
+
     def _handle_exception(self, e: Exception) -> JSONResponse:
         if isinstance(e, json.decoder.JSONDecodeError):
             json_rpc_error = JSONParseError()
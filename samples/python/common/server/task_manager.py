@@ -29,13 +29,27 @@ from common.types import (
     JSONRPCError,
     TaskPushNotificationConfig,
     InternalError,
+    Message,
+    TextPart,
 )
+from common.server.task_registry import TaskDeadlineExceeded, TaskRegistry
 from common.server.utils import new_not_implemented_error
+from typing import Any, Awaitable
 import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+# States after which a task's run is over (input-required waits for a new send)
+FINAL_STATES = frozenset(
+    {
+        TaskState.COMPLETED,
+        TaskState.CANCELED,
+        TaskState.FAILED,
+        TaskState.INPUT_REQUIRED,
+    }
+)
+
 
 class TaskManager(ABC):
     @abstractmethod
@@ -82,6 +96,7 @@ class InMemoryTaskManager(TaskManager):
         self.lock = asyncio.Lock()
         self.task_sse_subscribers: dict[str, List[asyncio.Queue]] = {}
         self.subscriber_lock = asyncio.Lock()
+        self.task_registry = TaskRegistry()
 
     async def on_get_task(self, request: GetTaskRequest) -> GetTaskResponse:
         logger.info(f"Getting task {request.params.id}")
@@ -107,7 +122,90 @@ class InMemoryTaskManager(TaskManager):
             if task is None:
                 return CancelTaskResponse(id=request.id, error=TaskNotFoundError())
 
-        return CancelTaskResponse(id=request.id, error=TaskNotCancelableError())
+        running = self.task_registry.get(task_id_params.id)
+        if running is None or not self.task_registry.cancel(task_id_params.id):
+            return CancelTaskResponse(id=request.id, error=TaskNotCancelableError())
+
+        await asyncio.wait({running})
+        # Normally recorded by the run itself, unless it was cancelled before
+        # it got to start
+        await self._on_task_stopped(task_id_params.id, asyncio.CancelledError())
+        async with self.lock:
+            task_result = self.append_task_history(self.tasks[task_id_params.id], None)
+        return CancelTaskResponse(id=request.id, result=task_result)
+
+    def start_task(
+        self,
+        task_id: str,
+        coro: Awaitable[Any],
+        deadline_seconds: float | None = None,
+    ) -> asyncio.Task:
+        """Runs agent work for a task as a tracked, cancellable asyncio task.
+
+        If the run is cancelled or misses its deadline the task is moved to
+        the canceled or failed state and SSE subscribers get a final event.
+        """
+        return self.task_registry.start(
+            task_id, coro, deadline_seconds, on_stop=self._on_task_stopped
+        )
+
+    async def run_task(
+        self,
+        task_id: str,
+        coro: Awaitable[Any],
+        deadline_seconds: float | None = None,
+    ) -> Any:
+        """Runs agent work for a unary request and returns its result.
+
+        Returns None if the run was cancelled or missed its deadline. If the
+        request itself is cancelled (e.g. the client went away) the run is
+        cancelled too.
+        """
+        task = self.start_task(task_id, coro, deadline_seconds)
+        try:
+            await asyncio.wait({task})
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        if task.cancelled() or isinstance(task.exception(), TaskDeadlineExceeded):
+            return None
+        return task.result()
+
+    def task_deadline(self, task_send_params: TaskSendParams) -> float | None:
+        """Deadline for a run, shortened by metadata["deadlineSeconds"].
+
+        Clients can ask for less time than the server default but not more.
+        """
+        requested = (task_send_params.metadata or {}).get("deadlineSeconds")
+        if requested is None:
+            return None
+        try:
+            requested = float(requested)
+        except (TypeError, ValueError):
+            logger.warning(f"Ignoring invalid deadlineSeconds: {requested}")
+            return None
+        if requested <= 0:
+            return None
+        default = self.task_registry.default_deadline_seconds
+        return min(requested, default) if default else requested
+
+    async def _on_task_stopped(self, task_id: str, reason: BaseException) -> None:
+        if isinstance(reason, TaskDeadlineExceeded):
+            state, text = TaskState.FAILED, str(reason)
+        else:
+            state, text = TaskState.CANCELED, "Task was canceled"
+
+        async with self.lock:
+            task = self.tasks.get(task_id)
+            if task is None or task.status.state in FINAL_STATES:
+                return
+        status = TaskStatus(
+            state=state, message=Message(role="agent", parts=[TextPart(text=text)])
+        )
+        await self.update_store(task_id, status, None)
+        await self.enqueue_events_for_sse(
+            task_id, TaskStatusUpdateEvent(id=task_id, status=status, final=True)
+        )
 
     @abstractmethod
     async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
@@ -282,6 +380,25 @@ class InMemoryTaskManager(TaskManager):
                 if isinstance(event, TaskStatusUpdateEvent) and event.final:
                     break
         finally:
+            abandoned = False
             async with self.subscriber_lock:
                 if task_id in self.task_sse_subscribers:
                     self.task_sse_subscribers[task_id].remove(sse_event_queue)
+                    abandoned = not self.task_sse_subscribers[task_id]
+            if abandoned:
+                await self._cancel_abandoned_task(task_id)
+
+    async def _cancel_abandoned_task(self, task_id: str) -> None:
+        """Stops a run nobody is listening to anymore."""
+        async with self.lock:
+            task = self.tasks.get(task_id)
+            if task is None or task.status.state in FINAL_STATES:
+                return
+        if await self.has_push_notification_info(task_id):
+            # Someone still gets the result through push notifications
+            return
+        running = self.task_registry.get(task_id)
+        if running is not None and self.task_registry.cancel(task_id):
+            logger.info(f"Last subscriber of task {task_id} disconnected, cancelled")
+            await asyncio.wait({running})
+            await self._on_task_stopped(task_id, asyncio.CancelledError())
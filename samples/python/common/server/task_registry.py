@@ -0,0 +1,134 @@
+"""Registry of the asyncio tasks running agent work for A2A tasks.
+
+Task managers used to start agent runs with a bare ``asyncio.create_task`` and
+drop the handle, so a run could neither be cancelled nor bounded in time. The
+TaskRegistry keeps the handle per A2A task id, enforces an optional deadline
+and cancels runs on request.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+StopCallback = Callable[[str, BaseException], Awaitable[None]]
+
+DEFAULT_TASK_DEADLINE_SECONDS = float(os.environ.get("A2A_TASK_DEADLINE_SECONDS", 600))
+
+
+class TaskDeadlineExceeded(Exception):
+    """Raised by a tracked run that did not finish before its deadline."""
+
+    def __init__(self, task_id: str, deadline_seconds: float):
+        super().__init__(f"Task {task_id} exceeded its {deadline_seconds:g}s deadline")
+        self.task_id = task_id
+        self.deadline_seconds = deadline_seconds
+
+
+class TaskRegistry:
+    """Tracks running agent work per A2A task id."""
+
+    def __init__(self, default_deadline_seconds: float | None = None):
+        self.default_deadline_seconds = (
+            DEFAULT_TASK_DEADLINE_SECONDS
+            if default_deadline_seconds is None
+            else default_deadline_seconds
+        )
+        self._running: dict[str, asyncio.Task] = {}
+        self._cancelled = 0
+        self._timed_out = 0
+
+    def start(
+        self,
+        task_id: str,
+        coro: Awaitable[Any],
+        deadline_seconds: float | None = None,
+        on_stop: StopCallback | None = None,
+    ) -> asyncio.Task:
+        """Runs the coroutine as a tracked asyncio task.
+
+        A run still going for the same task id (e.g. a stale run of a task
+        that asked for input) is cancelled first.
+
+        Args:
+          task_id: The A2A task id.
+          coro: The agent work.
+          deadline_seconds: Time limit for the run; None uses the default
+            and 0 disables the limit.
+          on_stop: Awaited inside the run when it is cancelled (with the
+            CancelledError) or misses its deadline (with TaskDeadlineExceeded).
+        """
+        self.cancel(task_id)
+        if deadline_seconds is None:
+            deadline_seconds = self.default_deadline_seconds
+        task = asyncio.create_task(
+            self._run(task_id, coro, deadline_seconds, on_stop),
+            name=f"a2a-task-{task_id}",
+        )
+        self._running[task_id] = task
+        task.add_done_callback(lambda done: self._forget(task_id, done, coro))
+        return task
+
+    def get(self, task_id: str) -> Optional[asyncio.Task]:
+        return self._running.get(task_id)
+
+    def is_running(self, task_id: str) -> bool:
+        task = self._running.get(task_id)
+        return task is not None and not task.done()
+
+    def cancel(self, task_id: str) -> bool:
+        """Cancels the run for the task id; returns False if none is running."""
+        task = self._running.get(task_id)
+        if task is None or task.done():
+            return False
+        logger.info(f"Cancelling run of task {task_id}")
+        task.cancel()
+        self._cancelled += 1
+        return True
+
+    async def cancel_all(self) -> None:
+        tasks = [task for task in self._running.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "running": sum(1 for task in self._running.values() if not task.done()),
+            "cancelled": self._cancelled,
+            "timed_out": self._timed_out,
+        }
+
+    async def _run(
+        self,
+        task_id: str,
+        coro: Awaitable[Any],
+        deadline_seconds: float,
+        on_stop: StopCallback | None,
+    ):
+        try:
+            if not deadline_seconds:
+                return await coro
+            return await asyncio.wait_for(coro, deadline_seconds)
+        except asyncio.TimeoutError:
+            self._timed_out += 1
+            error = TaskDeadlineExceeded(task_id, deadline_seconds)
+            logger.warning(str(error))
+            if on_stop is not None:
+                await on_stop(task_id, error)
+            raise error from None
+        except asyncio.CancelledError as e:
+            # A run replaced by a newer one for the same task stops silently
+            superseded = self._running.get(task_id) is not asyncio.current_task()
+            if on_stop is not None and not superseded:
+                await on_stop(task_id, e)
+            raise
+
+    def _forget(self, task_id: str, task: asyncio.Task, coro: Awaitable[Any]) -> None:
+        if self._running.get(task_id) is task:
+            del self._running[task_id]
+        if task.cancelled() and hasattr(coro, "close"):
+            # Cancelled before it ever ran; avoid "never awaited" warnings
+            coro.close()
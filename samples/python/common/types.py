@@ -302,6 +302,12 @@ class ContentTypeNotSupportedError(JSONRPCError):
     data: None = None
 
 
+class ServerBusyError(JSONRPCError):
+    code: int = -32010
+    message: str = "Server is busy, retry later"
+    data: Any | None = None
+
+
 class AgentProvider(BaseModel):
     organization: str
     url: str | None = None
@@ -347,9 +353,13 @@ class A2AClientError(Exception):
 
 
 class A2AClientHTTPError(A2AClientError):
-    def __init__(self, status_code: int, message: str):
+    def __init__(
+        self, status_code: int, message: str, retry_after: float | None = None
+    ):
         self.status_code = status_code
         self.message = message
+        # Seconds the server asked to wait before retrying, e.g. on a 429
+        self.retry_after = retry_after
         super().__init__(f"HTTP Error {status_code}: {message}")
 
 
@@ -0,0 +1,141 @@
+"""Process local blob store for binary file content.
+
+File parts used to be base64 encoded and decoded at every hop (ADK content,
+artifacts, the host agent and the UI server). Instead, bytes are stored once in
+the BlobStore and referenced by a ``blob://<sha256>`` handle in
+``FileContent.uri``. Base64 is only produced at the external A2A boundary,
+where ``externalize_message`` inlines the bytes again for remote agents.
+"""
+
+import base64
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from common.types import FileContent, FilePart, Message, Part
+
+BLOB_URI_PREFIX = "blob://"
+DEFAULT_MAX_BYTES = int(os.environ.get("BLOB_STORE_MAX_BYTES", 256 * 1024 * 1024))
+
+
+class BlobStore:
+    """Thread-safe, content addressed LRU store of immutable byte blobs."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._blobs: OrderedDict[str, bytes] = OrderedDict()
+        self._total_bytes = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def put(self, data: bytes) -> str:
+        """Stores the bytes (once per distinct content) and returns a handle."""
+        blob_id = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            if blob_id in self._blobs:
+                self._blobs.move_to_end(blob_id)
+            else:
+                self._blobs[blob_id] = data
+                self._total_bytes += len(data)
+                self._enforce_budget(keep=blob_id)
+        return BLOB_URI_PREFIX + blob_id
+
+    def get(self, uri: str) -> Optional[bytes]:
+        """Returns the bytes for a handle, or None if unknown or evicted."""
+        if not is_blob_uri(uri):
+            return None
+        blob_id = uri[len(BLOB_URI_PREFIX) :]
+        with self._lock:
+            data = self._blobs.get(blob_id)
+            if data is not None:
+                self._blobs.move_to_end(blob_id)
+            return data
+
+    def __contains__(self, uri: str) -> bool:
+        if not is_blob_uri(uri):
+            return False
+        with self._lock:
+            return uri[len(BLOB_URI_PREFIX) :] in self._blobs
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "blobs": len(self._blobs),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self._evictions,
+            }
+
+    def _enforce_budget(self, keep: str) -> None:
+        """Evicts LRU blobs over budget, never the one just added."""
+        while self._total_bytes > self.max_bytes and len(self._blobs) > 1:
+            blob_id = next(iter(self._blobs))
+            if blob_id == keep:
+                break
+            self._total_bytes -= len(self._blobs.pop(blob_id))
+            self._evictions += 1
+
+
+_default_store: Optional[BlobStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    """Returns the process wide blob store."""
+    global _default_store
+    if _default_store is None:
+        with _default_store_lock:
+            if _default_store is None:
+                _default_store = BlobStore()
+    return _default_store
+
+
+def is_blob_uri(uri: str | None) -> bool:
+    return bool(uri) and uri.startswith(BLOB_URI_PREFIX)
+
+
+def blob_file_content(
+    data: bytes, mime_type: str | None = None, name: str | None = None
+) -> FileContent:
+    """Stores bytes and returns a FileContent referencing them by handle."""
+    return FileContent(uri=get_blob_store().put(data), mimeType=mime_type, name=name)
+
+
+def read_file_bytes(file: FileContent) -> Optional[bytes]:
+    """Returns raw bytes for a blob handle or inline base64 file content.
+
+    Other URIs (http, gs, ...) are not fetched and return None.
+    """
+    if is_blob_uri(file.uri):
+        return get_blob_store().get(file.uri)
+    if file.bytes:
+        return base64.b64decode(file.bytes)
+    return None
+
+
+def externalize_part(part: Part) -> Part:
+    """Inlines a blob handle as base64 so the part can leave the process."""
+    if part.type != "file" or not is_blob_uri(part.file.uri):
+        return part
+    data = get_blob_store().get(part.file.uri)
+    if data is None:
+        raise ValueError(f"Blob {part.file.uri} is no longer available")
+    return FilePart(
+        file=FileContent(
+            name=part.file.name,
+            mimeType=part.file.mimeType,
+            bytes=base64.b64encode(data).decode("utf-8"),
+        ),
+        metadata=part.metadata,
+    )
+
+
+def externalize_message(message: Message) -> Message:
+    """Returns the message with all blob handles inlined, copying only if needed."""
+    if not any(p.type == "file" and is_blob_uri(p.file.uri) for p in message.parts):
+        return message
+    return message.model_copy(
+        update={"parts": [externalize_part(p) for p in message.parts]}
+    )
@@ -0,0 +1,285 @@
+"""Record/replay of model calls, for deterministic performance runs.
+
+Model latency dominates every measurement of the agents, and varies from run
+to run. CassetteTransport sits under the httpx clients of the model SDKs (the
+OpenAI SDK used by AutoGen and Semantic Kernel, through
+rate_limited_http_client, and google-genai used by the ADK host) and, set by
+LLM_CASSETTE_MODE:
+
+- ``record``: sends requests on and writes each successful response, with
+  the arrival time of every chunk of its body, to a gzipped cassette named
+  after the hash of the request,
+- ``replay``: answers from the cassettes without any network call, after the
+  recorded delays or a fixed one (LLM_CASSETTE_LATENCY, in seconds). A request
+  without a cassette fails with CassetteMissError.
+
+The request hash covers the method, the URL path and query, and the JSON body
+with sorted keys. Hosts and headers (credentials) are left out, so cassettes
+recorded against one endpoint replay against another, and UUIDs and ISO
+timestamps in the body are masked, as task and message ids differ per run.
+"""
+
+import asyncio
+import base64
+import collections
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_MODES = ("off", "record", "replay")
+DEFAULT_MODE = os.environ.get("LLM_CASSETTE_MODE", "off").lower()
+DEFAULT_DIR = os.environ.get("LLM_CASSETTE_DIR", "cassettes")
+# Seconds to the first byte of a replayed response; recorded timings if unset
+DEFAULT_LATENCY = os.environ.get("LLM_CASSETTE_LATENCY", "")
+
+_VOLATILE = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+    r"|\b[0-9a-f]{32}\b"
+    r"|\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?(Z|[+-]\d{2}:?\d{2})?",
+    re.IGNORECASE,
+)
+# Not replayed: they describe the recorded connection, not the answer
+_DROPPED_HEADERS = {
+    "connection",
+    "date",
+    "keep-alive",
+    "set-cookie",
+    "transfer-encoding",
+}
+
+
+class CassetteMissError(RuntimeError):
+    """A request replayed without a recorded response."""
+
+
+def request_key(request: httpx.Request) -> str:
+    """Hash identifying a request across runs and endpoints."""
+    body = request.content
+    try:
+        body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":"))
+    except (ValueError, UnicodeDecodeError):
+        body = body.decode("latin-1")
+    target = request.url.raw_path.decode("ascii")
+    canonical = "\n".join((request.method, target, body))
+    return hashlib.sha256(_VOLATILE.sub("~", canonical).encode()).hexdigest()
+
+
+class Cassette:
+    """Directory of recorded responses, one gzipped JSON file per request key.
+
+    A key recorded several times holds every response, replayed in turn.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_DIR,
+        mode: str = DEFAULT_MODE,
+        latency: Optional[float] = None,
+    ):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.directory = directory
+        self.mode = mode
+        self.latency = latency
+        self._loaded: dict[str, list[dict[str, Any]]] = {}
+        self._played: collections.Counter = collections.Counter()
+        self._lock = threading.Lock()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json.gz")
+
+    def next_response(self, key: str) -> dict[str, Any]:
+        """The next recorded response for a key, cycling through them."""
+        with self._lock:
+            responses = self._loaded.get(key)
+            if responses is None:
+                try:
+                    with gzip.open(self.path(key), "rt", encoding="utf-8") as f:
+                        responses = json.load(f)["responses"]
+                except FileNotFoundError:
+                    raise CassetteMissError(
+                        f"No recorded response for request {key} in {self.directory}"
+                    ) from None
+                self._loaded[key] = responses
+            index = self._played[key] % len(responses)
+            self._played[key] += 1
+            return responses[index]
+
+    def record(self, key: str, request: httpx.Request, response: dict[str, Any]):
+        """Adds a response; the first one of a run replaces older recordings."""
+        with self._lock:
+            responses = self._loaded.setdefault(key, [])
+            responses.append(response)
+            cassette = {
+                "request": {
+                    "method": request.method,
+                    "path": request.url.raw_path.decode("ascii"),
+                    "body": request.content.decode("utf-8", errors="replace"),
+                },
+                "responses": responses,
+            }
+            os.makedirs(self.directory, exist_ok=True)
+            temporary = f"{self.path(key)}.{threading.get_ident()}.tmp"
+            with gzip.open(temporary, "wt", encoding="utf-8") as f:
+                json.dump(cassette, f)
+            os.replace(temporary, self.path(key))
+
+
+class _RecordingStream(httpx.AsyncByteStream):
+    """Passes a response body through, recording it once it is complete."""
+
+    def __init__(self, stream, on_complete, started: float):
+        self._stream = stream
+        self._on_complete = on_complete
+        self._started = started
+        self._chunks: list[tuple[float, bytes]] = []
+        self._complete = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            self._chunks.append((time.perf_counter() - self._started, chunk))
+            yield chunk
+        self._complete = True
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+        if self._complete:
+            await asyncio.to_thread(self._on_complete, self._chunks)
+
+
+class _ReplayStream(httpx.AsyncByteStream):
+    """A recorded body, each chunk after its recorded delay."""
+
+    def __init__(self, chunks: list[tuple[float, bytes]], started: float):
+        self._chunks = chunks
+        self._started = started
+
+    async def __aiter__(self):
+        for offset, chunk in self._chunks:
+            delay = self._started + offset - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield chunk
+
+    async def aclose(self) -> None:
+        pass
+
+
+class CassetteTransport(httpx.AsyncBaseTransport):
+    """httpx transport recording to or replaying from a Cassette.
+
+    Only 2xx responses are recorded; errors such as 429s reach the caller
+    without being kept, so replays are not throttled.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.cassette = cassette
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        key = request_key(request)
+        started = time.perf_counter()
+        if self.cassette.mode == "replay":
+            return await self._replay(key, request, started)
+
+        response = await self._transport.handle_async_request(request)
+        if self.cassette.mode != "record" or not 200 <= response.status_code < 300:
+            return response
+        headers_at = time.perf_counter() - started
+        headers = [
+            (name, value)
+            for name, value in response.headers.multi_items()
+            if name.lower() not in _DROPPED_HEADERS
+        ]
+
+        def save(chunks: list[tuple[float, bytes]]):
+            self.cassette.record(
+                key,
+                request,
+                {
+                    "status": response.status_code,
+                    "headers": headers,
+                    "headers_at": headers_at,
+                    "chunks": [
+                        [offset, base64.b64encode(chunk).decode("ascii")]
+                        for offset, chunk in chunks
+                    ],
+                },
+            )
+
+        response.stream = _RecordingStream(response.stream, save, started)
+        return response
+
+    async def _replay(
+        self, key: str, request: httpx.Request, started: float
+    ) -> httpx.Response:
+        try:
+            recorded = self.cassette.next_response(key)
+        except CassetteMissError:
+            logger.warning(
+                "Replay miss for %s %s (%s)", request.method, request.url.path, key
+            )
+            raise
+        chunks = [
+            (offset, base64.b64decode(chunk)) for offset, chunk in recorded["chunks"]
+        ]
+        headers_at = recorded["headers_at"]
+        if self.cassette.latency is not None:
+            # The whole body right after the fixed latency
+            headers_at = self.cassette.latency
+            chunks = [(headers_at, chunk) for _, chunk in chunks]
+        delay = started + headers_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return httpx.Response(
+            recorded["status"],
+            headers=recorded["headers"],
+            stream=_ReplayStream(chunks, started),
+            request=request,
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+_cassettes: dict[str, Cassette] = {}
+_cassettes_lock = threading.Lock()
+
+
+def get_cassette() -> Optional[Cassette]:
+    """The process wide cassette set by the environment, None when off."""
+    if DEFAULT_MODE == "off":
+        return None
+    with _cassettes_lock:
+        cassette = _cassettes.get(DEFAULT_DIR)
+        if cassette is None:
+            latency = float(DEFAULT_LATENCY) if DEFAULT_LATENCY else None
+            cassette = _cassettes[DEFAULT_DIR] = Cassette(
+                DEFAULT_DIR, DEFAULT_MODE, latency
+            )
+        return cassette
+
+
+def cassette_transport(
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncBaseTransport | None:
+    """`transport` wrapped in the environment's cassette, if one is on."""
+    cassette = get_cassette()
+    if cassette is None:
+        return transport
+    return CassetteTransport(cassette, transport)
@@ -0,0 +1,307 @@
+"""Client side rate limiting for Azure OpenAI deployments.
+
+Azure OpenAI enforces requests-per-minute and tokens-per-minute quotas per
+deployment and answers with 429 once they are used up. The agents used to fire
+requests regardless, so a burst turned into a cascade of 429s and failed
+tasks. The RateLimiter here:
+
+- spends from two token buckets (requests and tokens per minute) before each
+  request, queueing callers first-come first-served,
+- limits concurrent requests with an AIMD window: +1/window per successful
+  response, halved on a 429,
+- pauses everyone for the ``Retry-After`` period of a 429 and trims its
+  buckets to the ``x-ratelimit-remaining-*`` values the service reports.
+
+It plugs in at the HTTP level through RateLimitedTransport, so the OpenAI SDK
+(used by AutoGen) and Semantic Kernel share it through their ``http_client``.
+One limiter is shared per deployment in the process via get_rate_limiter().
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import threading
+import time
+from typing import Optional
+
+import httpx
+
+from common.utils.cassette import CassetteTransport, cassette_transport, get_cassette
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RPM = float(os.environ.get("AZURE_OPENAI_RPM", 60))
+DEFAULT_TPM = float(os.environ.get("AZURE_OPENAI_TPM", 80_000))
+DEFAULT_MAX_CONCURRENCY = int(os.environ.get("AZURE_OPENAI_MAX_CONCURRENCY", 8))
+# Completion size assumed when the request does not set max_tokens
+DEFAULT_COMPLETION_TOKENS = 500
+
+
+class TokenBucket:
+    """Continuously refilled budget of `per_minute` units, bursting to `capacity`."""
+
+    def __init__(self, per_minute: float, capacity: float | None = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self._level = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def level(self) -> float:
+        self._refill()
+        return self._level
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` (capped at the capacity) is available."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self._level >= amount:
+            return 0.0
+        return (amount - self._level) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self._level -= min(amount, self.capacity)
+
+    def limit_to(self, remaining: float) -> None:
+        """Lowers the level to what the server reports as remaining."""
+        self._refill()
+        self._level = min(self._level, remaining)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._level = min(
+            self.capacity, self._level + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+
+class Permit:
+    """One admitted request; release it once the response is consumed."""
+
+    def __init__(self, limiter: "RateLimiter"):
+        self._limiter = limiter
+        self._released = False
+
+    def observe(self, status_code: int, headers: httpx.Headers) -> None:
+        self._limiter._observe(status_code, headers)
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._limiter._release()
+
+
+class RateLimiter:
+    """RPM/TPM budgets plus an AIMD concurrency window for one deployment."""
+
+    def __init__(
+        self,
+        name: str = "default",
+        requests_per_minute: float = DEFAULT_RPM,
+        tokens_per_minute: float = DEFAULT_TPM,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        min_concurrency: int = 1,
+    ):
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.concurrency = float(max_concurrency)
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._queue = asyncio.Lock()
+        self._slot_freed = asyncio.Event()
+        self._throttled = 0
+        self._requests = 0
+
+    async def acquire(self, estimated_tokens: int = 0) -> Permit:
+        """Waits, in arrival order, until the request fits every budget."""
+        # asyncio.Lock wakes waiters in FIFO order, which makes the queue fair
+        async with self._queue:
+            while True:
+                wait = max(
+                    self._paused_until - time.monotonic(),
+                    self.requests.wait_time(1),
+                    self.tokens.wait_time(estimated_tokens),
+                )
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            while self._in_flight >= int(self.concurrency):
+                self._slot_freed.clear()
+                await self._slot_freed.wait()
+            self.requests.consume(1)
+            self.tokens.consume(estimated_tokens)
+            self._in_flight += 1
+            self._requests += 1
+        return Permit(self)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "requests": self._requests,
+            "throttled": self._throttled,
+            "in_flight": self._in_flight,
+            "concurrency": round(self.concurrency, 2),
+            "requests_available": round(self.requests.level, 1),
+            "tokens_available": round(self.tokens.level),
+        }
+
+    def _observe(self, status_code: int, headers: httpx.Headers) -> None:
+        if status_code == 429:
+            self._throttled += 1
+            self.concurrency = max(self.min_concurrency, self.concurrency / 2)
+            retry_after = parse_retry_after(headers) or 1.0
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            logger.warning(
+                f"{self.name} throttled, concurrency {self.concurrency:.1f},"
+                f" pausing {retry_after:.2f}s"
+            )
+        elif status_code < 500:
+            self.concurrency = min(
+                self.max_concurrency, self.concurrency + 1 / self.concurrency
+            )
+
+        remaining_requests = _header_number(headers, "x-ratelimit-remaining-requests")
+        if remaining_requests is not None:
+            self.requests.limit_to(remaining_requests)
+        remaining_tokens = _header_number(headers, "x-ratelimit-remaining-tokens")
+        if remaining_tokens is not None:
+            self.tokens.limit_to(remaining_tokens)
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        self._slot_freed.set()
+
+
+def parse_retry_after(headers: httpx.Headers) -> Optional[float]:
+    """Seconds to wait according to retry-after-ms / retry-after headers."""
+    retry_after_ms = _header_number(headers, "retry-after-ms")
+    if retry_after_ms is not None:
+        return retry_after_ms / 1000
+    return _header_number(headers, "retry-after")
+
+
+def _header_number(headers: httpx.Headers, name: str) -> Optional[float]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def estimate_request_tokens(body: bytes) -> int:
+    """Rough prompt + completion token count of a chat completion request."""
+    try:
+        payload = json.loads(body)
+    except (ValueError, UnicodeDecodeError):
+        return math.ceil(len(body) / 4)
+    if not isinstance(payload, dict):
+        return math.ceil(len(body) / 4)
+    prompt = json.dumps(payload.get("messages", payload.get("input", "")))
+    completion = (
+        payload.get("max_completion_tokens")
+        or payload.get("max_tokens")
+        or DEFAULT_COMPLETION_TOKENS
+    )
+    return math.ceil(len(prompt) / 4) + int(completion)
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that releases the permit once it is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, permit: Permit):
+        self._stream = stream
+        self._permit = permit
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._permit.release()
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """httpx transport that sends every request through a RateLimiter.
+
+    429 responses are retried here, after the advertised Retry-After, up to
+    `max_retries` times before being handed to the caller.
+    """
+
+    def __init__(
+        self,
+        limiter: RateLimiter,
+        transport: httpx.AsyncBaseTransport | None = None,
+        max_retries: int = 3,
+    ):
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        try:
+            estimated_tokens = estimate_request_tokens(request.content)
+        except httpx.RequestNotRead:
+            estimated_tokens = DEFAULT_COMPLETION_TOKENS
+
+        for attempt in range(self.max_retries + 1):
+            permit = await self.limiter.acquire(estimated_tokens)
+            try:
+                response = await self._transport.handle_async_request(request)
+            except BaseException:
+                permit.release()
+                raise
+            permit.observe(response.status_code, response.headers)
+            if response.status_code == 429 and attempt < self.max_retries:
+                await response.aclose()
+                permit.release()
+                continue
+            response.stream = _ReleasingStream(response.stream, permit)
+            return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+_limiters: dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(deployment: str) -> RateLimiter:
+    """Returns the process wide limiter for a deployment."""
+    with _limiters_lock:
+        limiter = _limiters.get(deployment)
+        if limiter is None:
+            limiter = _limiters[deployment] = RateLimiter(name=deployment)
+        return limiter
+
+
+def rate_limited_http_client(deployment: str, **kwargs) -> httpx.AsyncClient:
+    """An httpx client for OpenAI SDK clients, limited per deployment.
+
+    The transport already retries 429s after their Retry-After, so create
+    the SDK client with max_retries=0 rather than stack its retries on top.
+
+    With LLM_CASSETTE_MODE set (see cassette.py), model calls are recorded
+    under the limiter, so recorded timings are the service's own. Replayed
+    calls reach no service and skip the limiter, so replays measure the
+    agents rather than the RPM/TPM budgets.
+    """
+    kwargs.setdefault("timeout", httpx.Timeout(600, connect=5))
+    cassette = get_cassette()
+    if cassette is not None and cassette.mode == "replay":
+        transport = CassetteTransport(cassette)
+    else:
+        transport = RateLimitedTransport(
+            get_rate_limiter(deployment), transport=cassette_transport()
+        )
+    return httpx.AsyncClient(transport=transport, **kwargs)
@@ -2,27 +2,43 @@ import asyncclick as click
 import asyncio
 import base64
 import os
+import sys
 import urllib
 from uuid import uuid4
 
 from common.client import A2AClient, A2ACardResolver
 from common.types import TaskState
 from common.utils.push_notification_auth import PushNotificationReceiverAuth
+from hosts.cli.bulk_screening import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_EXTENSIONS,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_PROMPT,
+    ResultWriter,
+    find_documents,
+    screen_documents,
+)
 
 
-@click.command()
+@click.group(invoke_without_command=True)
 @click.option("--agent", default="http://localhost:10000")
 @click.option("--session", default=0)
 @click.option("--history", default=False)
 @click.option("--use_push_notifications", default=False)
 @click.option("--push_notification_receiver", default="http://localhost:5000")
+@click.pass_context
 async def cli(
+    ctx,
     agent,
     session,
     history,
     use_push_notifications: bool,
     push_notification_receiver: str,
 ):
+    if ctx.invoked_subcommand is not None:
+        # e.g. `screen`; without a subcommand the CLI chats with one agent
+        return
+
     card_resolver = A2ACardResolver(agent)
     card = card_resolver.get_agent_card()
 
@@ -74,6 +90,81 @@ async def cli(
             print(task_response.model_dump_json(include={"result": {"history": True}}))
 
 
+@cli.command()
+@click.argument("directory", type=click.Path(exists=True, file_okay=False))
+@click.option(
+    "--agent",
+    "agents",
+    multiple=True,
+    default=["http://localhost:10000"],
+    help="A2A agent to send every document to; repeat for several agents.",
+)
+@click.option("--output", default="screening.jsonl", help="JSONL or CSV results file.")
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["jsonl", "csv"]),
+    default=None,
+    help="Output format; by default from the --output extension.",
+)
+@click.option("--concurrency", default=DEFAULT_CONCURRENCY, help="Tasks in flight.")
+@click.option("--workers", default=None, type=int, help="Extraction processes.")
+@click.option(
+    "--prompt", default=DEFAULT_PROMPT, help="Text sent before each document."
+)
+@click.option("--skill", default=None, help="Agent card skill id to request.")
+@click.option(
+    "--max-retries",
+    default=DEFAULT_MAX_RETRIES,
+    help="Times a task turned away by a busy agent is sent again.",
+)
+@click.option(
+    "--extension",
+    "extensions",
+    multiple=True,
+    help=f"Document extensions to screen (default {', '.join(DEFAULT_EXTENSIONS)}).",
+)
+async def screen(
+    directory,
+    agents,
+    output,
+    output_format,
+    concurrency,
+    workers,
+    prompt,
+    skill,
+    max_retries,
+    extensions,
+):
+    """Screens every resume or transcript in DIRECTORY with the agents."""
+    paths = find_documents(
+        directory, tuple(e.lower() for e in extensions) or DEFAULT_EXTENSIONS
+    )
+    if not paths:
+        raise click.ClickException(f"No documents found in {directory}")
+
+    clients = {}
+    for url in agents:
+        card = A2ACardResolver(url).get_agent_card()
+        clients[url if card.name in clients else card.name] = A2AClient(agent_card=card)
+    print(f"Screening {len(paths)} documents with {', '.join(clients)}")
+
+    output_format = output_format or ("csv" if output.endswith(".csv") else "jsonl")
+    with open(output, "w", newline="") as f:
+        await screen_documents(
+            paths,
+            clients,
+            ResultWriter(f, output_format),
+            concurrency=concurrency,
+            workers=workers,
+            prompt=prompt,
+            skill_id=skill,
+            progress=sys.stdout,
+            max_retries=max_retries,
+        )
+    print(f"Results written to {output}")
+
+
 async def completeTask(
     client: A2AClient,
     streaming,
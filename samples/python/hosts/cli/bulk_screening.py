@@ -0,0 +1,344 @@
+"""Bulk screening of a directory of resumes and interview transcripts.
+
+Documents are found by extension, their text extracted in a process pool,
+and each candidate is sent as a task to every agent, at most `concurrency`
+tasks at a time. Extraction runs only a bounded queue ahead of the tasks, so
+a large directory is not held in memory at once. A task the agent turns away
+as busy is sent again after the wait it asks for. Results are appended to a
+JSONL or CSV file as they come in, progress is printed per task and a summary
+with throughput and latency percentiles at the end.
+"""
+
+import asyncio
+import csv
+import io
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Optional, Protocol, TextIO
+from uuid import uuid4
+
+from pydantic import BaseModel
+
+from common.types import A2AClientHTTPError, SendTaskResponse, ServerBusyError
+
+DEFAULT_EXTENSIONS = (".docx", ".pdf", ".txt", ".md")
+DEFAULT_PROMPT = "Rate this candidate:"
+DEFAULT_CONCURRENCY = 4
+# Characters of a document sent to the agents
+DEFAULT_MAX_CHARS = 50_000
+# Times a task turned away as busy is sent again, and the wait when the
+# agent does not say how long
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_RETRY_SECONDS = 1.0
+
+
+class TaskSender(Protocol):
+    async def send_task(self, payload: dict[str, Any]) -> SendTaskResponse: ...
+
+
+class ScreeningResult(BaseModel):
+    """Outcome of one document sent to one agent."""
+
+    document: str
+    agent: str
+    task_id: str
+    state: str
+    response: str = ""
+    error: str = ""
+    extraction_seconds: float = 0.0
+    latency_seconds: float = 0.0
+
+
+def find_documents(
+    directory: str, extensions: tuple[str, ...] = DEFAULT_EXTENSIONS
+) -> list[str]:
+    """Paths of the documents under a directory, sorted."""
+    paths = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.startswith("~$"):
+                # Word lock files next to open documents
+                continue
+            if os.path.splitext(name)[1].lower() in extensions:
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+
+def extract_document(path: str, max_chars: int = DEFAULT_MAX_CHARS) -> str:
+    """Text of a document. Runs in the worker processes."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".docx":
+        import docx
+
+        text = "\n".join(p.text for p in docx.Document(path).paragraphs)
+    elif extension == ".pdf":
+        import PyPDF2
+
+        reader = PyPDF2.PdfReader(path)
+        text = "\n".join(page.extract_text() or "" for page in reader.pages)
+    else:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            text = f.read()
+    return text.strip()[:max_chars]
+
+
+def response_text(response: SendTaskResponse) -> str:
+    """The agent's answer: text of the task's artifacts or status message."""
+    task = response.result
+    parts = []
+    for artifact in task.artifacts or []:
+        parts.extend(artifact.parts)
+    if not parts and task.status.message:
+        parts = task.status.message.parts
+    return "\n".join(part.text for part in parts if getattr(part, "text", None))
+
+
+def busy_retry_after(outcome: SendTaskResponse | Exception) -> float | None:
+    """Seconds to wait if the agent turned a task away as busy, else None.
+
+    Admission control answers with HTTP 429 and a Retry-After header, and a
+    ServerBusyError (-32010) whose data has the same "retryAfter".
+    """
+    if isinstance(outcome, A2AClientHTTPError):
+        if outcome.status_code != 429:
+            return None
+        retry_after = outcome.retry_after
+    elif isinstance(outcome, SendTaskResponse) and outcome.error is not None:
+        if outcome.error.code != ServerBusyError().code:
+            return None
+        data = outcome.error.data
+        retry_after = data.get("retryAfter") if isinstance(data, dict) else None
+    else:
+        return None
+    return float(retry_after) if retry_after is not None else DEFAULT_RETRY_SECONDS
+
+
+async def send_until_admitted(
+    client: TaskSender, payload: dict[str, Any], max_retries: int = DEFAULT_MAX_RETRIES
+) -> SendTaskResponse:
+    """Sends a task, again after the agent's wait each time it is busy."""
+    for attempt in range(max_retries + 1):
+        try:
+            response = await client.send_task(payload)
+        except A2AClientHTTPError as e:
+            retry_after = busy_retry_after(e)
+            if retry_after is None or attempt == max_retries:
+                raise
+        else:
+            retry_after = busy_retry_after(response)
+            if retry_after is None or attempt == max_retries:
+                return response
+        await asyncio.sleep(retry_after)
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile, 0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(q / 100 * len(ordered)) - 1
+    return ordered[min(max(rank, 0), len(ordered) - 1)]
+
+
+class ResultWriter:
+    """Appends results to JSONL or CSV as they arrive, flushing each one."""
+
+    def __init__(self, out: TextIO, output_format: str = "jsonl"):
+        if output_format not in ("jsonl", "csv"):
+            raise ValueError(f"Unknown output format: {output_format}")
+        self.out = out
+        self.format = output_format
+        self._csv = None
+        if output_format == "csv":
+            self._csv = csv.DictWriter(
+                out, fieldnames=list(ScreeningResult.model_fields)
+            )
+            self._csv.writeheader()
+
+    def write(self, result: ScreeningResult) -> None:
+        if self._csv is not None:
+            self._csv.writerow(result.model_dump())
+        else:
+            self.out.write(result.model_dump_json() + "\n")
+        self.out.flush()
+
+
+class ScreeningRun:
+    """Counts and latencies of a run, printed as progress and a summary."""
+
+    def __init__(self, total: int, out: TextIO):
+        self.total = total
+        self.out = out
+        self.done = 0
+        self.failed = 0
+        self.latencies: list[float] = []
+        self.extraction: list[float] = []
+        self.started = time.perf_counter()
+
+    def record(self, result: ScreeningResult) -> None:
+        self.done += 1
+        if result.error:
+            self.failed += 1
+        else:
+            self.latencies.append(result.latency_seconds)
+        self.extraction.append(result.extraction_seconds)
+        elapsed = time.perf_counter() - self.started
+        print(
+            f"[{self.done}/{self.total}] {os.path.basename(result.document)}"
+            f" -> {result.agent}: {result.state} ({result.latency_seconds:.2f}s,"
+            f" {self.done / elapsed:.2f} tasks/s)",
+            file=self.out,
+        )
+
+    def summary(self) -> dict[str, float]:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "tasks": self.done,
+            "failed": self.failed,
+            "elapsed_seconds": elapsed,
+            "tasks_per_second": self.done / elapsed if elapsed else 0.0,
+            "p50_seconds": percentile(self.latencies, 50),
+            "p95_seconds": percentile(self.latencies, 95),
+            "p99_seconds": percentile(self.latencies, 99),
+            "extraction_p50_seconds": percentile(self.extraction, 50),
+        }
+
+    def print_summary(self) -> None:
+        s = self.summary()
+        print(
+            f"Screened {s['tasks']} tasks ({s['failed']} failed) in"
+            f" {s['elapsed_seconds']:.1f}s: {s['tasks_per_second']:.2f} tasks/s,"
+            f" latency p50 {s['p50_seconds']:.2f}s p95 {s['p95_seconds']:.2f}s"
+            f" p99 {s['p99_seconds']:.2f}s, extraction p50"
+            f" {s['extraction_p50_seconds'] * 1000:.0f}ms",
+            file=self.out,
+        )
+
+
+async def screen_documents(
+    paths: list[str],
+    agents: dict[str, TaskSender],
+    writer: ResultWriter,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    workers: Optional[int] = None,
+    prompt: str = DEFAULT_PROMPT,
+    skill_id: Optional[str] = None,
+    progress: Optional[TextIO] = None,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+) -> dict[str, float]:
+    """Sends every document to every agent and writes the results.
+
+    Args:
+        paths: Documents to screen.
+        agents: Clients by agent name, e.g. A2AClient per agent card.
+        writer: Where results go as they complete.
+        concurrency: Tasks in flight at once, over all agents.
+        workers: Extraction processes (default: one per CPU). At most
+            `concurrency` extracted documents wait for their tasks.
+        prompt: Text sent before each document.
+        skill_id: Skill requested through the task metadata, if any.
+        progress: Stream for progress lines and the summary.
+        max_retries: Times a task turned away as busy (HTTP 429 or
+            ServerBusyError) is sent again, after the wait the agent asks for.
+
+    Returns:
+        The run summary: counts, throughput and latency percentiles.
+    """
+    run = ScreeningRun(len(paths) * len(agents), progress or io.StringIO())
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    session_id = uuid4().hex
+    metadata = {"skillId": skill_id} if skill_id else None
+
+    async def send(path: str, text: str, extracted: float, name: str, client):
+        task_id = uuid4().hex
+        payload = {
+            "id": task_id,
+            "sessionId": session_id,
+            "acceptedOutputModes": ["text"],
+            "message": {
+                "role": "user",
+                "parts": [{"type": "text", "text": f"{prompt}\n\n{text}"}],
+            },
+        }
+        if metadata:
+            payload["metadata"] = metadata
+        # A task waiting out a busy agent keeps its slot, so the agent is not
+        # sent more tasks meanwhile
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await send_until_admitted(client, payload, max_retries)
+                if response.error:
+                    raise RuntimeError(response.error.message)
+                result = ScreeningResult(
+                    document=path,
+                    agent=name,
+                    task_id=task_id,
+                    state=response.result.status.state.value,
+                    response=response_text(response),
+                )
+            except Exception as e:
+                result = ScreeningResult(
+                    document=path,
+                    agent=name,
+                    task_id=task_id,
+                    state="error",
+                    error=str(e),
+                )
+            result.latency_seconds = time.perf_counter() - start
+        result.extraction_seconds = extracted
+        writer.write(result)
+        run.record(result)
+
+    # Extractors take paths one at a time and wait for room in the queue,
+    # so only a few documents are extracted ahead of the tasks
+    pending = iter(paths)
+    documents: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+
+    async def extract(pool: ProcessPoolExecutor):
+        for path in pending:
+            start = time.perf_counter()
+            try:
+                text = await loop.run_in_executor(pool, extract_document, path)
+            except Exception as e:
+                extracted = time.perf_counter() - start
+                for name in agents:
+                    result = ScreeningResult(
+                        document=path,
+                        agent=name,
+                        task_id="",
+                        state="error",
+                        error=f"Extraction failed: {e}",
+                        extraction_seconds=extracted,
+                    )
+                    writer.write(result)
+                    run.record(result)
+                continue
+            await documents.put((path, text, time.perf_counter() - start))
+
+    async def screen():
+        while (document := await documents.get()) is not None:
+            path, text, extracted = document
+            await asyncio.gather(
+                *(send(path, text, extracted, name, c) for name, c in agents.items())
+            )
+
+    extraction_tasks = min(workers or os.cpu_count() or 1, max(len(paths), 1))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        extractors = [
+            asyncio.create_task(extract(pool)) for _ in range(extraction_tasks)
+        ]
+        screeners = [asyncio.create_task(screen()) for _ in range(concurrency)]
+        try:
+            await asyncio.gather(*extractors)
+            for _ in screeners:
+                await documents.put(None)
+            await asyncio.gather(*screeners)
+        finally:
+            for task in extractors + screeners:
+                task.cancel()
+    run.print_summary()
+    return run.summary()
@@ -0,0 +1,252 @@
+"""Prompt size budgeting for the host agent.
+
+Every host agent model call carries the full instruction (including the agent
+roster) and the whole conversation history. The ContextBudgeter runs in the
+host agent's before_model_callback and shrinks the request in place:
+
+- repeated long text parts (e.g. the same instructions or file contents sent
+  again) are kept only at their latest occurrence,
+- when the roster is larger than ``max_agents`` only the agents most relevant
+  to the latest user message are listed,
+- when the history exceeds ``max_history_tokens`` older turns are replaced by
+  a short extractive summary, keeping the most recent turns verbatim.
+
+Token counts use tiktoken when its encoding is available and fall back to a
+characters / 4 estimate otherwise.
+"""
+
+import math
+import os
+import threading
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from google.genai import types
+
+_encoding = None
+_encoding_loaded = False
+
+
+def count_tokens(text: str) -> int:
+    """Counts tokens with tiktoken, or estimates them if it is unavailable."""
+    global _encoding, _encoding_loaded
+    if not text:
+        return 0
+    if not _encoding_loaded:
+        try:
+            import tiktoken
+
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            print(f"[WARN] tiktoken unavailable, estimating token counts: {e}")
+            _encoding = None
+        _encoding_loaded = True
+    if _encoding is None:
+        return math.ceil(len(text) / 4)
+    return len(_encoding.encode(text, disallowed_special=()))
+
+
+def content_text(content: types.Content) -> str:
+    return "\n".join(p.text for p in content.parts or [] if p.text)
+
+
+def count_request_tokens(system_instruction: str, contents: list[types.Content]):
+    return count_tokens(system_instruction) + sum(
+        count_tokens(content_text(c)) for c in contents
+    )
+
+
+@dataclass
+class ContextBudget:
+    """Limits applied to each host agent model request."""
+
+    max_history_tokens: int = int(os.environ.get("HOST_CONTEXT_MAX_TOKENS", 8000))
+    keep_recent_contents: int = int(os.environ.get("HOST_CONTEXT_KEEP_RECENT", 8))
+    max_agents: int = int(os.environ.get("HOST_CONTEXT_MAX_AGENTS", 8))
+    min_duplicate_chars: int = 200
+    summary_chars: int = 200
+
+
+@dataclass
+class BudgetReport:
+    """Token counts of one request before and after budgeting."""
+
+    tokens_before: int
+    tokens_after: int
+    duplicates_removed: int = 0
+    contents_summarized: int = 0
+    agents_omitted: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+class ContextBudgeter:
+    """Applies a ContextBudget to ADK LlmRequests and keeps savings metrics."""
+
+    def __init__(self, budget: ContextBudget | None = None):
+        self.budget = budget or ContextBudget()
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._tokens_before = 0
+        self._tokens_after = 0
+
+    def apply(
+        self,
+        llm_request,
+        roster_text: str = "",
+        select_roster: Optional[Callable[[str, int], tuple[str, int]]] = None,
+    ) -> BudgetReport:
+        """Shrinks the request in place.
+
+        Args:
+          llm_request: The ADK LlmRequest about to be sent.
+          roster_text: The roster block as it appears in the instruction.
+          select_roster: Given the latest user text and max_agents, returns
+            the replacement roster text and the number of agents omitted.
+        """
+        config = llm_request.config
+        instruction = (config.system_instruction if config else None) or ""
+        if not isinstance(instruction, str):
+            # Only plain string instructions (what HostAgent produces) are rewritten
+            instruction = ""
+        contents = list(llm_request.contents or [])
+        report = BudgetReport(
+            tokens_before=count_request_tokens(instruction, contents),
+            tokens_after=0,
+        )
+
+        contents, report.duplicates_removed = self._dedupe(contents)
+
+        if instruction and roster_text and select_roster:
+            selected, report.agents_omitted = select_roster(
+                self._latest_user_text(contents), self.budget.max_agents
+            )
+            if report.agents_omitted:
+                instruction = instruction.replace(roster_text, selected, 1)
+                config.system_instruction = instruction
+
+        contents, report.contents_summarized = self._compact(contents)
+        llm_request.contents = contents
+
+        report.tokens_after = count_request_tokens(instruction, contents)
+        with self._lock:
+            self._requests += 1
+            self._tokens_before += report.tokens_before
+            self._tokens_after += report.tokens_after
+        if report.tokens_saved:
+            print(
+                f"[DEBUG] Context budget: {report.tokens_before} -> {report.tokens_after} tokens"
+                f" (duplicates {report.duplicates_removed}, summarized {report.contents_summarized},"
+                f" agents omitted {report.agents_omitted})"
+            )
+        return report
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "tokens_before": self._tokens_before,
+                "tokens_after": self._tokens_after,
+                "tokens_saved": self._tokens_before - self._tokens_after,
+            }
+
+    def _dedupe(self, contents: list[types.Content]):
+        """Drops earlier copies of long text parts that are repeated later."""
+        seen: set[str] = set()
+        removed = 0
+        kept: list[types.Content] = []
+        for content in reversed(contents):
+            parts = []
+            for part in content.parts or []:
+                text = part.text
+                if text and len(text) >= self.budget.min_duplicate_chars:
+                    if text in seen:
+                        removed += 1
+                        continue
+                    seen.add(text)
+                parts.append(part)
+            if parts:
+                kept.append(
+                    content
+                    if len(parts) == len(content.parts)
+                    else content.model_copy(update={"parts": parts})
+                )
+        kept.reverse()
+        return kept, removed
+
+    def _compact(self, contents: list[types.Content]):
+        """Summarizes older turns once the history is over budget."""
+        budget = self.budget
+        history_tokens = sum(count_tokens(content_text(c)) for c in contents)
+        if history_tokens <= budget.max_history_tokens:
+            return contents, 0
+
+        split = max(0, len(contents) - budget.keep_recent_contents)
+        # Start the recent window at a plain user turn so function calls and
+        # their responses are never separated.
+        while split > 0 and not self._is_user_turn(contents[split]):
+            split -= 1
+        if split == 0:
+            return contents, 0
+
+        recent = contents[split:]
+        remaining = budget.max_history_tokens - sum(
+            count_tokens(content_text(c)) for c in recent
+        )
+        lines = []
+        for content in reversed(contents[:split]):
+            line = self._summarize(content)
+            if not line:
+                continue
+            cost = count_tokens(line)
+            if cost > remaining:
+                break
+            remaining -= cost
+            lines.append(line)
+        lines.reverse()
+
+        summary = types.Content(
+            role="user",
+            parts=[
+                types.Part.from_text(
+                    text="Summary of the earlier conversation:\n"
+                    + ("\n".join(lines) if lines else "(omitted)")
+                )
+            ],
+        )
+        return [summary] + recent, split
+
+    def _summarize(self, content: types.Content) -> str:
+        pieces = []
+        for part in content.parts or []:
+            if part.text:
+                text = " ".join(part.text.split())
+                if len(text) > self.budget.summary_chars:
+                    text = text[: self.budget.summary_chars] + "..."
+                pieces.append(text)
+            elif part.function_call:
+                args = part.function_call.args or {}
+                target = args.get("agent_name") or args.get("agent_names") or ""
+                pieces.append(f"called {part.function_call.name} {target}".strip())
+            elif part.function_response:
+                pieces.append(f"got {part.function_response.name} result")
+        if not pieces:
+            return ""
+        return f"- {content.role or 'user'}: " + "; ".join(pieces)
+
+    @staticmethod
+    def _latest_user_text(contents: list[types.Content]) -> str:
+        for content in reversed(contents):
+            if content.role == "user":
+                text = content_text(content)
+                if text:
+                    return text
+        return ""
+
+    @staticmethod
+    def _is_user_turn(content: types.Content) -> bool:
+        return content.role == "user" and not any(
+            p.function_response for p in content.parts or []
+        )
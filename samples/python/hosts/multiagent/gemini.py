@@ -0,0 +1,53 @@
+"""The Gemini model of the host agent.
+
+The demo UI host runs every message with asyncio.run in a thread of its own,
+while ADK's Gemini keeps one google-genai Client, whose async HTTP connections
+belong to the event loop that opened them: once two messages overlap, or the
+first one's loop is closed, requests fail with "bound to a different event
+loop". HostGemini keeps a Client per thread instead.
+
+Setting GEMINI_BASE_URL serves the model from a Gemini API compatible endpoint
+other than Google's, e.g. the stub LLM server of the end-to-end benchmark
+(benchmarks/stub_llm_server.py), so the host can run without using quota.
+Its calls are recorded or replayed when LLM_CASSETTE_MODE is set
+(common/utils/cassette.py).
+"""
+
+import os
+import threading
+from typing import Optional
+
+from google.adk.models import Gemini
+from google.genai import Client, types
+from pydantic import PrivateAttr
+
+from common.utils.cassette import cassette_transport
+
+HOST_MODEL = "gemini-2.0-flash-001"
+
+
+class HostGemini(Gemini):
+    """Gemini with a Client per thread, optionally served from `base_url`."""
+
+    base_url: Optional[str] = None
+    _clients: threading.local = PrivateAttr(default_factory=threading.local)
+
+    @property
+    def api_client(self) -> Client:
+        client = getattr(self._clients, "client", None)
+        if client is None:
+            transport = cassette_transport()
+            client = Client(
+                http_options=types.HttpOptions(
+                    base_url=self.base_url,
+                    headers=self._tracking_headers,
+                    async_client_args={"transport": transport} if transport else None,
+                )
+            )
+            self._clients.client = client
+        return client
+
+
+def host_model(model: str = HOST_MODEL) -> Gemini:
+    """The model for the host agent, at GEMINI_BASE_URL if that is set."""
+    return HostGemini(model=model, base_url=os.environ.get("GEMINI_BASE_URL"))
@@ -1,16 +1,20 @@
+import asyncio
 import json
 import uuid
 from typing import List
 
 from google.genai import types
-import base64
 
 from google.adk import Agent
 from google.adk.agents.readonly_context import ReadonlyContext
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.tools.tool_context import ToolContext
+from .context_budget import ContextBudgeter
+from .gemini import host_model
 from .remote_agent_connection import RemoteAgentConnections, TaskUpdateCallback
+from .router import IntentRouter
 from common.client import A2ACardResolver
+from common.utils.blob_store import read_file_bytes
 from common.types import (
     AgentCard,
     Message,
@@ -22,6 +26,9 @@ from common.types import (
     Part,
 )
 
+# How long to wait for a remote agent to confirm a tasks/cancel
+CANCEL_TIMEOUT_SECONDS = 10.0
+
 
 class HostAgent:
     """The host agent.
@@ -38,6 +45,17 @@ class HostAgent:
         self.task_callback = task_callback
         self.remote_agent_connections: dict[str, RemoteAgentConnections] = {}
         self.cards: dict[str, AgentCard] = {}
+        # Roster lines are kept per agent so adding or removing one agent
+        # does not re-serialize the others; the joined text and the static
+        # part of the instruction are rebuilt lazily once per roster change.
+        self._roster_lines: dict[str, str] = {}
+        self.roster_version = 0
+        self._agents_text: str | None = None
+        self._cached_instruction_prefix: str | None = None
+        self.context_budgeter = ContextBudgeter()
+        # Ranks agents for the roster shown to the model; rebuilt lazily
+        self._router = IntentRouter()
+        self._router_version = 0
 
         for address in remote_agent_addresses:
             if isinstance(address, AgentCard):
@@ -52,27 +70,66 @@ class HostAgent:
                     print(f"[WARN] Skipping agent {address} because of error: {e}")
                     continue  # SKIP this broken agent, don't crash
 
-            remote_connection = RemoteAgentConnections(card)
-            self.remote_agent_connections[card.name] = remote_connection
-            self.cards[card.name] = card
-
-        agent_info = []
-        for ra in self.list_remote_agents():
-            agent_info.append(json.dumps(ra))
-        self.agents = "\n".join(agent_info)
+            self.register_agent_card(card)
 
     def register_agent_card(self, card: AgentCard):
+        """Adds (or replaces) a remote agent without touching the others."""
         remote_connection = RemoteAgentConnections(card)
         self.remote_agent_connections[card.name] = remote_connection
         self.cards[card.name] = card
-        agent_info = []
-        for ra in self.list_remote_agents():
-            agent_info.append(json.dumps(ra))
-        self.agents = "\n".join(agent_info)
+        self._roster_lines[card.name] = json.dumps(
+            {"name": card.name, "description": card.description}
+        )
+        self._roster_changed()
+
+    def unregister_agent_card(self, agent_name: str) -> bool:
+        """Removes a remote agent. Tasks already sent to it keep running."""
+        if agent_name not in self.cards:
+            return False
+        del self.remote_agent_connections[agent_name]
+        del self.cards[agent_name]
+        del self._roster_lines[agent_name]
+        self._roster_changed()
+        return True
+
+    def _roster_changed(self):
+        self.roster_version += 1
+        self._agents_text = None
+        self._cached_instruction_prefix = None
+
+    @property
+    def agents(self) -> str:
+        """The roster as one JSON line per agent, as shown to the model."""
+        if self._agents_text is None:
+            self._agents_text = "\n".join(self._roster_lines.values())
+        return self._agents_text
+
+    def select_roster(self, user_text: str, max_agents: int) -> tuple[str, int]:
+        """Returns the roster text of the agents most relevant to user_text.
+
+        Returns:
+          The roster text and the number of agents left out of it.
+        """
+        omitted = len(self.cards) - max_agents
+        if omitted <= 0:
+            return self.agents, 0
+        if self._router_version != self.roster_version:
+            self._router.set_agents(self.cards.values())
+            self._router_version = self.roster_version
+        selected = self._router.rank(user_text, max_agents)
+        lines = [self._roster_lines[card.name] for card in selected]
+        lines.append(
+            f"({omitted} more agents are available, use `list_remote_agents` to see them)"
+        )
+        return "\n".join(lines), omitted
+
+    def context_stats(self) -> dict[str, int]:
+        """Token savings of the context budgeter across all model calls."""
+        return self.context_budgeter.stats()
 
     def create_agent(self) -> Agent:
         return Agent(
-            model="gemini-2.0-flash-001",
+            model=host_model(),
             name="host_agent",
             instruction=self.root_instruction,
             before_model_callback=self.before_model_callback,
@@ -83,6 +140,7 @@ class HostAgent:
             tools=[
                 self.list_remote_agents,
                 self.send_task,
+                self.send_tasks_parallel,
             ],
         )
 
@@ -95,7 +153,20 @@ class HostAgent:
         if "file_context" in state:
             file_context = f"\n\nFile Context: {state['file_context']}"
 
-        return f"""You are an expert delegator that coordinates candidate evaluation workflows by delegating tasks to appropriate remote agents based on their capabilities.
+        # The intent router may already have resolved the agent for this turn
+        routed_agent = ""
+        if state.get("target_agent_name"):
+            routed_agent = f"\nRouted Agent: {state['target_agent_name']} - call `send_task` with this agent_name directly."
+
+        return (
+            self._instruction_prefix()
+            + f"Current Active Agent: {current_agent['active_agent']}{routed_agent}{file_context}\n"
+        )
+
+    def _instruction_prefix(self) -> str:
+        """The roster dependent part of the instruction, cached per roster."""
+        if self._cached_instruction_prefix is None:
+            self._cached_instruction_prefix = f"""You are an expert delegator that coordinates candidate evaluation workflows by delegating tasks to appropriate remote agents based on their capabilities.
 
 Discovery:
 - Use `list_remote_agents` to discover available remote agents and their specific capabilities
@@ -103,11 +174,12 @@ Discovery:
 
 Execution:
 - For actionable tasks, use `send_task` to delegate tasks to the most suitable remote agent
+- When a request needs independent work from several agents (for example rating a candidate and checking their background), use `send_tasks_parallel` with all of their names instead of calling `send_task` repeatedly
 - Always include the specific agent name when responding to the user
 - Base your delegation decisions on the agent capabilities, not assumptions
 
 File Processing:
-- Uploaded files (PDF, DOCX, TXT) are processed by the UI server before reaching agents
+- Uploaded files (PDF, DOCX, TXT, CSV) are processed by the UI server before reaching agents
 - Extracted text content is embedded directly into the user's message
 - Agents receive the complete file content as part of the text input - no separate file handling required
 - When file content is present in the message, use this context for informed delegation
@@ -125,8 +197,8 @@ Guidelines:
 Available Agents:
 {self.agents}
 
-Current Active Agent: {current_agent['active_agent']}{file_context}
 """
+        return self._cached_instruction_prefix
 
     def check_state(self, context: ReadonlyContext):
         state = context.state
@@ -158,6 +230,8 @@ Current Active Agent: {current_agent['active_agent']}{file_context}
                 )
                 print(f"[DEBUG] Host Agent: Added file context to state: {filename}")
 
+        self.context_budgeter.apply(llm_request, self.agents, self.select_roster)
+
     def list_remote_agents(self):
         """List the available remote agents you can use to delegate the task."""
         if not self.remote_agent_connections:
@@ -195,8 +269,49 @@ Current Active Agent: {current_agent['active_agent']}{file_context}
             taskId = state["task_id"]
         else:
             taskId = str(uuid.uuid4())
-        sessionId = state["session_id"]
+        request = self._build_task_request(agent_name, message, state, taskId)
         task: Task
+        task = await client.send_task(request, self.task_callback)
+
+        # Handle case where task is None (can happen with streaming tasks)
+        if task is None:
+            print(
+                f"[WARN] Task returned None for agent {agent_name}, assuming completion"
+            )
+            state["session_active"] = False
+            return f"Task completed but no final status received from {agent_name}"
+
+        # Assume completion unless a state returns that isn't complete
+        state["session_active"] = task.status.state not in [
+            TaskState.COMPLETED,
+            TaskState.CANCELED,
+            TaskState.FAILED,
+            TaskState.UNKNOWN,
+        ]
+        if task.status.state == TaskState.INPUT_REQUIRED:
+            # Force user input back
+            tool_context.actions.skip_summarization = True
+            tool_context.actions.escalate = True
+        elif task.status.state == TaskState.CANCELED:
+            # Open question, should we return some info for cancellation instead
+            raise ValueError(f"Agent {agent_name} task {task.id} is cancelled")
+        elif task.status.state == TaskState.FAILED:
+            # Raise error for failure
+            raise ValueError(f"Agent {agent_name} task {task.id} failed")
+        response = []
+        if task.status.message:
+            # Assume the information is in the task message.
+            response.extend(convert_parts(task.status.message.parts, tool_context))
+        if task.artifacts:
+            for artifact in task.artifacts:
+                response.extend(convert_parts(artifact.parts, tool_context))
+        return response
+
+    def _build_task_request(
+        self, agent_name: str, message: str, state, taskId: str
+    ) -> TaskSendParams:
+        """Builds the TaskSendParams for a remote agent from the session state."""
+        sessionId = state["session_id"]
         messageId = ""
         metadata = {}
         if "input_message_metadata" in state:
@@ -257,41 +372,104 @@ Current Active Agent: {current_agent['active_agent']}{file_context}
             # pushNotification=None,
             metadata=task_metadata,
         )
-        task = await client.send_task(request, self.task_callback)
+        return request
 
-        # Handle case where task is None (can happen with streaming tasks)
-        if task is None:
-            print(
-                f"[WARN] Task returned None for agent {agent_name}, assuming completion"
-            )
-            state["session_active"] = False
-            return f"Task completed but no final status received from {agent_name}"
+    async def send_tasks_parallel(
+        self,
+        agent_names: list[str],
+        message: str,
+        tool_context: ToolContext,
+        timeout_seconds: float = 120.0,
+    ):
+        """Sends the same task to several remote agents concurrently.
 
-        # Assume completion unless a state returns that isn't complete
-        state["session_active"] = task.status.state not in [
-            TaskState.COMPLETED,
-            TaskState.CANCELED,
-            TaskState.FAILED,
-            TaskState.UNKNOWN,
+        Use this when a request needs independent work from more than one
+        agent, e.g. rating a candidate and running a background check.
+
+        Args:
+          agent_names: The names of the agents to send the task to.
+          message: The message to send to every agent.
+          tool_context: The tool context this method runs in.
+          timeout_seconds: How long to wait for each agent before giving up
+            and canceling its task.
+
+        Returns:
+          A dictionary keyed by agent name. Each value holds the task "state"
+          and either the "response" parts or an "error" description.
+        """
+        unknown = [
+            name for name in agent_names if name not in self.remote_agent_connections
         ]
-        if task.status.state == TaskState.INPUT_REQUIRED:
-            # Force user input back
+        if unknown:
+            raise ValueError(f"Agents {unknown} not found")
+        agent_names = list(dict.fromkeys(agent_names))
+        state = tool_context.state
+
+        async def dispatch(agent_name: str):
+            # Every agent gets its own task id so their updates do not collide.
+            request = self._build_task_request(
+                agent_name, message, state, str(uuid.uuid4())
+            )
+            client = self.remote_agent_connections[agent_name]
+            try:
+                task = await client.send_task(
+                    request, self.task_callback, timeout=timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                # Nobody waits for the answer any more: stop the agent's work
+                await self._cancel_remote_task(client, request)
+                return agent_name, None, f"Timed out after {timeout_seconds}s"
+            except Exception as e:
+                return agent_name, None, str(e)
+            return agent_name, task, None
+
+        results = {}
+        input_required = None
+        for next_result in asyncio.as_completed([dispatch(n) for n in agent_names]):
+            agent_name, task, error = await next_result
+            print(f"[DEBUG] Multiagent Host: parallel task finished for {agent_name}")
+            if error is not None:
+                results[agent_name] = {"state": TaskState.FAILED, "error": error}
+                continue
+            if task is None:
+                results[agent_name] = {"state": TaskState.COMPLETED, "response": []}
+                continue
+            result = {"state": task.status.state, "response": []}
+            if task.status.state == TaskState.INPUT_REQUIRED:
+                input_required = agent_name
+            elif task.status.state in (TaskState.CANCELED, TaskState.FAILED):
+                result["error"] = f"Task {task.id} {task.status.state.value}"
+            if task.status.message:
+                result["response"].extend(
+                    convert_parts(task.status.message.parts, tool_context)
+                )
+            for artifact in task.artifacts or []:
+                result["response"].extend(convert_parts(artifact.parts, tool_context))
+            results[agent_name] = result
+
+        # Only an agent waiting for input keeps the session on that agent.
+        state["session_active"] = input_required is not None
+        if input_required:
+            state["agent"] = input_required
             tool_context.actions.skip_summarization = True
             tool_context.actions.escalate = True
-        elif task.status.state == TaskState.CANCELED:
-            # Open question, should we return some info for cancellation instead
-            raise ValueError(f"Agent {agent_name} task {task.id} is cancelled")
-        elif task.status.state == TaskState.FAILED:
-            # Raise error for failure
-            raise ValueError(f"Agent {agent_name} task {task.id} failed")
-        response = []
-        if task.status.message:
-            # Assume the information is in the task message.
-            response.extend(convert_parts(task.status.message.parts, tool_context))
-        if task.artifacts:
-            for artifact in task.artifacts:
-                response.extend(convert_parts(artifact.parts, tool_context))
-        return response
+        # Keep the merged structure in the requested agent order.
+        return {name: results[name] for name in agent_names}
+
+    async def _cancel_remote_task(
+        self, client: RemoteAgentConnections, request: TaskSendParams
+    ):
+        """Sends tasks/cancel for a task given up on; failures are only logged."""
+        try:
+            task = await asyncio.wait_for(
+                client.cancel_task(request, self.task_callback),
+                timeout=CANCEL_TIMEOUT_SECONDS,
+            )
+        except Exception as e:
+            print(f"[WARN] Failed to cancel task {request.id}: {e!r}")
+            return
+        if task is None:
+            print(f"[WARN] {client.card.name} did not cancel task {request.id}")
 
 
 def convert_parts(parts: list[Part], tool_context: ToolContext):
@@ -310,7 +488,11 @@ def convert_part(part: Part, tool_context: ToolContext):
         # Repackage A2A FilePart to google.genai Blob
         # Currently not considering plain text as files
         file_id = part.file.name
-        file_bytes = base64.b64decode(part.file.bytes)
+        # Decoded once here (or resolved from a blob handle); the artifact
+        # service and UI pass these bytes around by reference afterwards.
+        file_bytes = read_file_bytes(part.file)
+        if file_bytes is None:
+            return f"File {file_id} is not available"
         file_part = types.Part(
             inline_data=types.Blob(mime_type=part.file.mimeType, data=file_bytes)
         )
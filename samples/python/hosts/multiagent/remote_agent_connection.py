@@ -1,3 +1,4 @@
+import asyncio
 from typing import Callable
 import uuid
 from common.types import (
@@ -10,6 +11,7 @@ from common.types import (
     TaskState,
 )
 from common.client import A2AClient
+from common.utils.blob_store import externalize_message
 
 TaskCallbackArg = Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent
 TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
@@ -33,7 +35,49 @@ class RemoteAgentConnections:
         self,
         request: TaskSendParams,
         task_callback: TaskUpdateCallback | None,
+        timeout: float | None = None,
     ) -> Task | None:
+        """Sends a task to the remote agent.
+
+        Args:
+          request: The task to send.
+          task_callback: Called with every task update received.
+          timeout: Seconds to wait for the final task before raising
+            asyncio.TimeoutError. None waits indefinitely.
+        """
+        if timeout is None:
+            return await self._send_task(request, task_callback)
+        return await asyncio.wait_for(
+            self._send_task(request, task_callback), timeout=timeout
+        )
+
+    async def cancel_task(
+        self,
+        request: TaskSendParams,
+        task_callback: TaskUpdateCallback | None,
+    ) -> Task | None:
+        """Asks the remote agent to cancel a task sent with `request`.
+
+        Returns the canceled task, also passed to `task_callback`, or None
+        if the agent refused.
+        """
+        response = await self.agent_client.cancel_task({"id": request.id})
+        if response.error or response.result is None:
+            return None
+        merge_metadata(response.result, request)
+        if task_callback:
+            task_callback(response.result, self.card)
+        return response.result
+
+    async def _send_task(
+        self,
+        request: TaskSendParams,
+        task_callback: TaskUpdateCallback | None,
+    ) -> Task | None:
+        # Blob handles are process local; inline them as base64 on the wire.
+        wire_request = request.model_copy(
+            update={"message": externalize_message(request.message)}
+        )
         if self.card.capabilities.streaming:
             task = None
             if task_callback:
@@ -50,7 +94,7 @@ class RemoteAgentConnections:
                     self.card,
                 )
             async for response in self.agent_client.send_task_streaming(
-                request.model_dump()
+                wire_request.model_dump()
             ):
                 merge_metadata(response.result, request)
                 # For task status updates, we need to propagate metadata and provide
@@ -89,7 +133,7 @@ class RemoteAgentConnections:
                     break
             return task
         else:  # Non-streaming
-            response = await self.agent_client.send_task(request.model_dump())
+            response = await self.agent_client.send_task(wire_request.model_dump())
             merge_metadata(response.result, request)
             # For task status updates, we need to propagate metadata and provide
             # a unique message id.
@@ -0,0 +1,255 @@
+"""Deterministic intent router for picking a remote agent without an LLM.
+
+The router resolves the target agent for a user message in three steps:
+
+1. An agent mentioned by name wins outright.
+2. Keyword rules (the same intent keywords the host agent prompt describes)
+   map phrases such as "rate" or "background check" to capability hints that
+   are matched against each agent card.
+3. A TF-IDF nearest neighbour over the agent cards' descriptions, skills,
+   tags and examples.
+
+When no step is confident the router returns None and callers fall back to
+the LLM. Decisions are cached per normalized message and remembered per
+conversation, so follow-up messages without an intent of their own ("thanks,
+go ahead") stay with the routed agent. A message that names agents, matches
+keyword rules or resembles an agent card is never routed by the
+conversation: when it is ambiguous or asks for several agents, the LLM
+decides.
+"""
+
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from common.types import AgentCard
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by can for from has have i in is it me my of on or"
+    " please should the this that to was we with you your".split()
+)
+
+
+@dataclass(frozen=True)
+class KeywordRule:
+    """Routes messages matching `pattern` to agents whose card has `hint`."""
+
+    pattern: re.Pattern
+    hint: str
+
+
+DEFAULT_RULES = [
+    KeywordRule(
+        re.compile(r"\b(rate|rating|evaluat\w*|assess\w*|score|rank\w*)\b"), "rating"
+    ),
+    KeywordRule(
+        re.compile(
+            r"\b(background[ -]check|verify background|criminal record"
+            r"|employment history|verif\w+ (his|her|their|the) (credentials|degree))\b"
+        ),
+        "verification",
+    ),
+]
+
+
+@dataclass(frozen=True)
+class RouteDecision:
+    """The agent picked for a message and how it was picked."""
+
+    agent_name: str
+    agent_url: str
+    confidence: float
+    method: str  # "name", "keyword", "similarity" or "conversation"
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def normalize_message(text: str) -> str:
+    """Collapses case, punctuation and whitespace so equivalent messages match."""
+    return " ".join(_TOKEN_RE.findall(text.lower()))
+
+
+def _card_document(card: AgentCard) -> str:
+    fields = [card.name, card.description or ""]
+    for skill in card.skills or []:
+        fields.extend([skill.id, skill.name, skill.description or ""])
+        fields.extend(skill.tags or [])
+        fields.extend(skill.examples or [])
+    return " ".join(fields)
+
+
+class IntentRouter:
+    """Thread-safe local router over a roster of agent cards."""
+
+    def __init__(
+        self,
+        agents: Iterable[AgentCard] = (),
+        rules: list[KeywordRule] | None = None,
+        min_similarity: float = 0.15,
+        min_margin: float = 0.05,
+        max_cached: int = 1024,
+        conversation_confidence: float = 0.5,
+    ):
+        self.rules = DEFAULT_RULES if rules is None else rules
+        self.min_similarity = min_similarity
+        self.min_margin = min_margin
+        # Confidence of a follow-up routed by the conversation alone
+        self.conversation_confidence = conversation_confidence
+        self.max_cached = max_cached
+        self._lock = threading.Lock()
+        # Normalized message -> (decision, whether the message has an intent)
+        self._decisions: OrderedDict[str, tuple[Optional[RouteDecision], bool]] = (
+            OrderedDict()
+        )
+        self._conversations: OrderedDict[str, RouteDecision] = OrderedDict()
+        self.set_agents(agents)
+
+    def set_agents(self, agents: Iterable[AgentCard]) -> None:
+        """Rebuilds the index for a new roster and drops cached decisions."""
+        cards = [card for card in agents if card.url]
+        documents = [Counter(tokenize(_card_document(card))) for card in cards]
+        df = Counter(token for doc in documents for token in doc)
+        idf = {
+            token: math.log((1 + len(cards)) / (1 + count)) + 1
+            for token, count in df.items()
+        }
+        vectors = [self._weigh(doc, idf) for doc in documents]
+        profiles = [
+            set(doc) | set(tokenize(card.name)) for doc, card in zip(documents, cards)
+        ]
+        with self._lock:
+            self._cards = cards
+            self._idf = idf
+            self._vectors = vectors
+            self._profiles = profiles
+            self._decisions.clear()
+            self._conversations.clear()
+
+    @property
+    def agents(self) -> list[AgentCard]:
+        return list(self._cards)
+
+    def route(
+        self, message: str, conversation_id: str | None = None
+    ) -> Optional[RouteDecision]:
+        """Returns the agent for the message, or None if the LLM should decide."""
+        key = normalize_message(message)
+        with self._lock:
+            if key in self._decisions:
+                self._decisions.move_to_end(key)
+                decision, has_intent = self._decisions[key]
+            else:
+                decision, has_intent = self._resolve(message)
+                self._decisions[key] = (decision, has_intent)
+                if len(self._decisions) > self.max_cached:
+                    self._decisions.popitem(last=False)
+
+            if conversation_id is None:
+                return decision
+            if decision is not None:
+                self._conversations[conversation_id] = decision
+                self._conversations.move_to_end(conversation_id)
+                if len(self._conversations) > self.max_cached:
+                    self._conversations.popitem(last=False)
+                return decision
+            previous = self._conversations.get(conversation_id)
+            if previous is None or has_intent:
+                return None
+            return RouteDecision(
+                previous.agent_name,
+                previous.agent_url,
+                self.conversation_confidence,
+                "conversation",
+            )
+
+    def forget_conversation(self, conversation_id: str) -> None:
+        with self._lock:
+            self._conversations.pop(conversation_id, None)
+
+    def _resolve(self, message: str) -> tuple[Optional[RouteDecision], bool]:
+        """Runs the routing steps; the caller must hold the lock.
+
+        Returns:
+            The decision, if one is confident, and whether the message names
+            an agent, matches a keyword rule or resembles an agent card.
+        """
+        if not self._cards:
+            return None, False
+        text = message.lower()
+
+        named = [card for card in self._cards if card.name.lower() in text]
+        if len(named) == 1:
+            return self._decision(named[0], 1.0, "name"), True
+
+        hints = {rule.hint for rule in self.rules if rule.pattern.search(text)}
+        if hints:
+            matched = [
+                card
+                for card, profile in zip(self._cards, self._profiles)
+                if hints & profile
+            ]
+            if len(matched) == 1:
+                return self._decision(matched[0], 0.9, "keyword"), True
+            if len(matched) > 1:
+                # Several intents (e.g. rate and background check): let the
+                # LLM decide, it can fan out to every agent.
+                return None, True
+
+        similarities = self._similarities(message)
+        has_intent = bool(named or hints) or max(similarities) >= self.min_similarity
+        if not any(similarities):
+            return None, has_intent
+        scores = sorted(
+            ((score, i) for i, score in enumerate(similarities)), reverse=True
+        )
+        best, index = scores[0]
+        runner_up = scores[1][0] if len(scores) > 1 else 0.0
+        if best >= self.min_similarity and best - runner_up >= self.min_margin:
+            decision = self._decision(self._cards[index], round(best, 3), "similarity")
+            return decision, True
+        return None, has_intent
+
+    def rank(self, message: str, limit: int | None = None) -> list[AgentCard]:
+        """Orders agents by relevance to the message, most relevant first.
+
+        Agents named in the message come first, then agents matching a keyword
+        rule, then the rest by TF-IDF similarity. Ties keep roster order.
+        """
+        with self._lock:
+            text = message.lower()
+            hints = {rule.hint for rule in self.rules if rule.pattern.search(text)}
+            similarities = self._similarities(message)
+            scores = []
+            for card, profile, similarity in zip(
+                self._cards, self._profiles, similarities
+            ):
+                boost = 2.0 if card.name.lower() in text else 0.0
+                boost += 1.0 if hints & profile else 0.0
+                scores.append(boost + similarity)
+            order = sorted(range(len(self._cards)), key=lambda i: -scores[i])
+            return [self._cards[i] for i in order[:limit]]
+
+    def _similarities(self, message: str) -> list[float]:
+        """Cosine similarity of the message to every agent card."""
+        query = self._weigh(Counter(tokenize(message)), self._idf)
+        return [
+            sum(w * vector.get(t, 0.0) for t, w in query.items())
+            for vector in self._vectors
+        ]
+
+    @staticmethod
+    def _weigh(counts: Counter, idf: dict[str, float]) -> dict[str, float]:
+        """Returns the L2 normalized TF-IDF vector, ignoring unknown tokens."""
+        vector = {t: (1 + math.log(c)) * idf[t] for t, c in counts.items() if t in idf}
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        return {t: w / norm for t, w in vector.items()} if norm else {}
+
+    @staticmethod
+    def _decision(card: AgentCard, confidence: float, method: str) -> RouteDecision:
+        return RouteDecision(card.name, card.url, confidence, method)
@@ -0,0 +1,134 @@
+import asyncio
+import unittest
+
+from starlette.testclient import TestClient
+
+from common.server import A2AServer, AdmissionController, AdmissionRejected
+from common.server.task_manager import InMemoryTaskManager
+from common.types import (
+    AgentCapabilities,
+    AgentCard,
+    SendTaskResponse,
+    ServerBusyError,
+)
+
+
+class AdmissionControllerTest(unittest.IsolatedAsyncioTestCase):
+    async def test_admits_up_to_limit_then_queues(self):
+        controller = AdmissionController(max_in_flight=2, max_queue=4)
+        first = await controller.acquire("a")
+        await controller.acquire("b")
+        waiter = asyncio.create_task(controller.acquire("c"))
+        await asyncio.sleep(0)
+        self.assertEqual(controller.stats()["queued"], 1)
+        self.assertFalse(waiter.done())
+
+        first.release()
+        admission = await waiter
+        self.assertEqual(admission.session_id, "c")
+        self.assertEqual(controller.stats()["in_flight"], 2)
+
+    async def test_rejects_fast_when_queue_full(self):
+        controller = AdmissionController(max_in_flight=1, max_queue=1)
+        await controller.acquire("a")
+        waiter = asyncio.create_task(controller.acquire("b"))
+        await asyncio.sleep(0)
+        with self.assertRaises(AdmissionRejected) as raised:
+            await controller.acquire("c")
+        self.assertGreaterEqual(raised.exception.retry_after, 1)
+        self.assertEqual(controller.stats()["rejected"], 1)
+        waiter.cancel()
+
+    async def test_rejects_when_session_share_used_up(self):
+        controller = AdmissionController(
+            max_in_flight=1, max_queue=10, max_queued_per_session=2
+        )
+        await controller.acquire("bulk")
+        waiters = [asyncio.create_task(controller.acquire("bulk")) for _ in range(2)]
+        await asyncio.sleep(0)
+        with self.assertRaises(AdmissionRejected):
+            await controller.acquire("bulk")
+        # Other sessions can still queue
+        other = asyncio.create_task(controller.acquire("other"))
+        await asyncio.sleep(0)
+        self.assertEqual(controller.stats()["queued"], 3)
+        for task in waiters + [other]:
+            task.cancel()
+
+    async def test_fair_between_sessions(self):
+        controller = AdmissionController(max_in_flight=1, max_queue=10)
+        running = await controller.acquire("bulk")
+        order = []
+
+        async def submit(session_id):
+            admission = await controller.acquire(session_id)
+            order.append(session_id)
+            await asyncio.sleep(0)
+            admission.release()
+
+        tasks = [asyncio.create_task(submit("bulk")) for _ in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(submit("other")))
+        await asyncio.sleep(0)
+
+        running.release()
+        await asyncio.gather(*tasks)
+        # "other" is served right after the first queued bulk task, not last
+        self.assertEqual(order, ["bulk", "other", "bulk", "bulk"])
+
+    async def test_queue_timeout_and_cancel_free_the_queue(self):
+        controller = AdmissionController(
+            max_in_flight=1, max_queue=2, queue_timeout_seconds=0.01
+        )
+        await controller.acquire("a")
+        with self.assertRaises(AdmissionRejected):
+            await controller.acquire("b")
+        waiter = asyncio.create_task(controller.acquire("c"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        self.assertEqual(controller.stats()["queued"], 0)
+
+
+class BusyTaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request):
+        return SendTaskResponse(id=request.id)
+
+    async def on_send_task_subscribe(self, request):
+        pass
+
+
+def test_server_rejects_with_retry_after():
+    controller = AdmissionController(max_in_flight=1, max_queue=0)
+    card = AgentCard(
+        name="Busy",
+        url="http://localhost/",
+        version="1.0",
+        capabilities=AgentCapabilities(),
+        skills=[],
+    )
+    server = A2AServer(
+        agent_card=card, task_manager=BusyTaskManager(), admission=controller
+    )
+    payload = {
+        "jsonrpc": "2.0",
+        "id": "1",
+        "method": "tasks/send",
+        "params": {
+            "id": "task",
+            "sessionId": "s",
+            "message": {"role": "user", "parts": [{"type": "text", "text": "hi"}]},
+        },
+    }
+    client = TestClient(server.app)
+
+    response = client.post("/", json=payload)
+    assert response.status_code == 200
+    assert controller.stats()["in_flight"] == 0
+
+    # Occupy the only slot so the next request is turned away
+    asyncio.run(controller.acquire("other"))
+    response = client.post("/", json=payload)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.json()["error"]["code"] == ServerBusyError().code
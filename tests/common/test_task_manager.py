@@ -1,3 +1,4 @@
+import asyncio
 import unittest
 from unittest.mock import patch
 from common.types import (
@@ -98,6 +99,91 @@ class TestInMemoryTaskManager(unittest.IsolatedAsyncioTestCase):
         self.assertIsInstance(response, CancelTaskResponse)
         self.assertIsInstance(response.error, TaskNotFoundError)
 
+    async def _add_working_task(self, task_id):
+        await self.task_manager.upsert_task(
+            TaskSendParams(id=task_id, message=self.get_test_message(role="user"))
+        )
+        await self.task_manager.update_store(
+            task_id, TaskStatus(state=TaskState.WORKING), None
+        )
+
+    async def test_on_cancel_task_running(self):
+        task_id = "running_task"
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def agent_run():
+            started.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        await self._add_working_task(task_id)
+        self.task_manager.start_task(task_id, agent_run())
+        await started.wait()
+        request = CancelTaskRequest(id="1", params=TaskIdParams(id=task_id))
+        response = await self.task_manager.on_cancel_task(request)
+        self.assertIsNone(response.error)
+        self.assertEqual(response.result.status.state, TaskState.CANCELED)
+        self.assertTrue(cancelled.is_set())
+        self.assertFalse(self.task_manager.task_registry.is_running(task_id))
+
+        # A finished run can no longer be cancelled
+        response = await self.task_manager.on_cancel_task(request)
+        self.assertIsInstance(response.error, TaskNotCancelableError)
+
+    async def test_run_task_deadline(self):
+        task_id = "slow_task"
+        await self._add_working_task(task_id)
+        result = await self.task_manager.run_task(
+            task_id, asyncio.sleep(60), deadline_seconds=0.05
+        )
+        self.assertIsNone(result)
+        self.assertEqual(self.task_manager.tasks[task_id].status.state, TaskState.FAILED)
+        self.assertEqual(self.task_manager.task_registry.stats()["timed_out"], 1)
+
+    async def test_task_deadline_from_metadata(self):
+        params = TaskSendParams(
+            id="t", message=self.get_test_message(), metadata={"deadlineSeconds": 5}
+        )
+        self.assertEqual(self.task_manager.task_deadline(params), 5.0)
+        params.metadata["deadlineSeconds"] = 10**9
+        self.assertEqual(
+            self.task_manager.task_deadline(params),
+            self.task_manager.task_registry.default_deadline_seconds,
+        )
+        params.metadata["deadlineSeconds"] = "soon"
+        self.assertIsNone(self.task_manager.task_deadline(params))
+
+    async def test_run_task_returns_result(self):
+        async def agent_run():
+            return {"content": "done"}
+
+        await self._add_working_task("quick_task")
+        result = await self.task_manager.run_task("quick_task", agent_run())
+        self.assertEqual(result, {"content": "done"})
+
+    async def test_last_sse_subscriber_disconnect_cancels_run(self):
+        task_id = "streamed_task"
+        sse_queue = await self.task_manager.setup_sse_consumer(task_id)
+        await self._add_working_task(task_id)
+        run = self.task_manager.start_task(task_id, asyncio.sleep(60))
+        await self.task_manager.enqueue_events_for_sse(
+            task_id,
+            TaskStatusUpdateEvent(id=task_id, status=TaskStatus(state=TaskState.WORKING)),
+        )
+        stream = self.task_manager.dequeue_events_for_sse("1", task_id, sse_queue)
+        await stream.__anext__()
+        # The client goes away before the final event
+        await stream.aclose()
+        await asyncio.wait({run})
+        self.assertTrue(run.cancelled())
+        self.assertEqual(
+            self.task_manager.tasks[task_id].status.state, TaskState.CANCELED
+        )
+
     async def test_on_send_task(self):
         request = SendTaskRequest(
             id="1",
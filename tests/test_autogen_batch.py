@@ -0,0 +1,273 @@
+"""Test cases for batch candidate evaluation with the AutoGen agent"""
+import base64
+import json
+
+import pytest
+
+from agents.autogen import batch
+from agents.autogen.agent import BATCH_SKILL, AutogenAgent
+from agents.autogen.batch import BatchCandidate, candidates_from_parts, read_uri
+from agents.autogen.stub_client import StubChatCompletionClient
+from agents.autogen.task_manager import TaskManager
+from common.types import (
+    DataPart,
+    FileContent,
+    FilePart,
+    Message,
+    SendTaskRequest,
+    SendTaskStreamingRequest,
+    TaskArtifactUpdateEvent,
+    TaskSendParams,
+    TaskState,
+    TextPart,
+)
+
+RESUMES = [f"Candidate {i}: Python and PyTorch engineer, mentor." for i in range(5)]
+
+
+def make_agent():
+    return AutogenAgent(model_client=StubChatCompletionClient(), mode="parallel")
+
+
+@pytest.mark.asyncio
+async def test_batch_evaluates_every_candidate():
+    agent = make_agent()
+    candidates = [BatchCandidate(id=f"c{i}", text=t) for i, t in enumerate(RESUMES)]
+
+    result = await agent.batch(candidates, "session", concurrency=2)
+
+    assert result["is_task_complete"]
+    assert result["data"]["evaluated"] == 5
+    assert [r["candidate_id"] for r in result["data"]["results"]] == [
+        f"c{i}" for i in range(5)
+    ]
+    assert "Technical Rating: 8/10" in (
+        result["data"]["results"][0]["evaluation"]["content"]
+    )
+    # Candidates are not kept in the session's history
+    assert agent.session_data == {}
+
+
+@pytest.mark.asyncio
+async def test_interrupted_batch_resumes_from_checkpoint():
+    client = StubChatCompletionClient()
+    agent = AutogenAgent(model_client=client, mode="parallel")
+    candidates = [BatchCandidate(id=f"c{i}", text=t) for i, t in enumerate(RESUMES)]
+
+    stream = agent.batch_stream(candidates, "session", task_id="t1", concurrency=1)
+    evaluated = []
+    async for partial in stream:
+        if "candidate" in partial:
+            evaluated.append(partial["candidate"]["candidate_id"])
+        if len(evaluated) == 2:
+            break
+    await stream.aclose()
+    calls = client.calls
+
+    result = await agent.batch(candidates, "session", task_id="t1", concurrency=1)
+
+    assert result["data"]["resumed"] == 2
+    assert len(result["data"]["results"]) == 5
+    # Two raters for each of the three candidates left
+    assert client.calls - calls == 6
+    assert agent.checkpoints.get("batch:t1") is None
+
+
+@pytest.mark.asyncio
+async def test_failed_candidates_are_retried(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch, "BATCH_ROOT", str(tmp_path))
+    client = StubChatCompletionClient()
+    agent = AutogenAgent(model_client=client, mode="parallel")
+    missing = tmp_path / "late.txt"
+    candidates = [
+        BatchCandidate(id="a", text=RESUMES[0]),
+        BatchCandidate(id="late", uri=missing.as_uri()),
+    ]
+
+    result = await agent.batch(candidates, "session", task_id="t2")
+    assert result["data"]["failed"] == 1
+    assert "error" in result["data"]["results"][1]
+
+    missing.write_text(RESUMES[1])
+    calls = client.calls
+    result = await agent.batch(candidates, "session", task_id="t2")
+    assert (result["data"]["failed"], result["data"]["resumed"]) == (0, 1)
+    assert client.calls - calls == 2
+
+
+@pytest.mark.asyncio
+async def test_changed_uri_candidates_are_evaluated_again(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch, "BATCH_ROOT", str(tmp_path))
+    client = StubChatCompletionClient()
+    agent = AutogenAgent(model_client=client, mode="parallel")
+    same, changed = tmp_path / "same.txt", tmp_path / "changed.txt"
+    same.write_text(RESUMES[0])
+    changed.write_text(RESUMES[1])
+    candidates = [
+        BatchCandidate(id="same", uri=same.as_uri()),
+        BatchCandidate(id="changed", uri=changed.as_uri()),
+        BatchCandidate(id="missing", uri=(tmp_path / "missing.txt").as_uri()),
+    ]
+    await agent.batch(candidates, "session", task_id="t3")
+
+    changed.write_text(RESUMES[2])
+    calls = client.calls
+    result = await agent.batch(candidates, "session", task_id="t3")
+
+    assert (result["data"]["resumed"], result["data"]["failed"]) == (1, 1)
+    assert client.calls - calls == 2
+
+
+@pytest.mark.asyncio
+async def test_evaluations_asking_for_input_are_not_kept(monkeypatch):
+    agent = make_agent()
+    evaluate = agent._evaluate
+
+    async def ask_about_the_second(text, mode=None):
+        if text == RESUMES[1]:
+            return "", {
+                "is_task_complete": False,
+                "require_user_input": True,
+                "content": "I need more information about the projects.",
+            }
+        return await evaluate(text, mode)
+
+    monkeypatch.setattr(agent, "_evaluate", ask_about_the_second)
+    candidates = [BatchCandidate(id=f"c{i}", text=t) for i, t in enumerate(RESUMES)]
+
+    result = await agent.batch(candidates, "session", task_id="t4")
+
+    assert (result["data"]["evaluated"], result["data"]["failed"]) == (4, 1)
+    assert "needs more input" in result["data"]["results"][1]["error"]
+    assert "c1" not in agent.checkpoints.get("batch:t4")["results"]
+
+
+@pytest.mark.asyncio
+async def test_candidates_from_parts(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch, "BATCH_ROOT", str(tmp_path))
+    resume = tmp_path / "resume.txt"
+    resume.write_text(RESUMES[0])
+    listing = "\n".join(
+        json.dumps(c)
+        for c in [{"id": "x", "text": RESUMES[1]}, {"id": "y", "uri": resume.as_uri()}]
+    )
+    parts = [
+        TextPart(text="Evaluate these candidates"),
+        DataPart(data={"candidates": [RESUMES[2]], "uris": [resume.as_uri()]}),
+        FilePart(
+            file=FileContent(
+                name="batch.jsonl", bytes=base64.b64encode(listing.encode()).decode()
+            )
+        ),
+    ]
+
+    candidates = await candidates_from_parts(parts)
+
+    assert [c.id for c in candidates] == ["candidate-1", "candidate-2", "x", "y"]
+    assert candidates[1].uri == resume.as_uri()
+    assert await candidates[3].load() == RESUMES[0]
+
+    text = await candidates_from_parts([TextPart(text="one\n---\ntwo")])
+    assert [c.text for c in text] == ["one", "two"]
+    with pytest.raises(ValueError):
+        await candidates_from_parts(
+            [DataPart(data={"candidates": [{"id": "a", "text": "x"}] * 2})]
+        )
+
+
+@pytest.mark.asyncio
+async def test_files_outside_the_batch_root_are_refused(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch, "BATCH_ROOT", None)
+    passwd = FilePart(file=FileContent(uri="file:///etc/passwd"))
+    with pytest.raises(ValueError, match="disabled"):
+        await candidates_from_parts([passwd])
+
+    root = tmp_path / "resumes"
+    root.mkdir()
+    (tmp_path / "secret.txt").write_text("secret")
+    (root / "link.txt").symlink_to(tmp_path / "secret.txt")
+    monkeypatch.setattr(batch, "BATCH_ROOT", str(root))
+    for uri in [
+        "/etc/passwd",
+        "file:///etc/passwd",
+        str(root / ".." / "secret.txt"),
+        (root / "link.txt").as_uri(),
+    ]:
+        with pytest.raises(ValueError):
+            await candidates_from_parts([DataPart(data={"uris": [uri]})])
+    with pytest.raises(ValueError):
+        await candidates_from_parts([passwd])
+
+
+@pytest.mark.asyncio
+async def test_urls_must_be_allowed_and_are_capped(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch, "BATCH_ALLOWED_URLS", ["https://resumes.example/cv/"])
+    for uri in [
+        "http://169.254.169.254/latest/meta-data/",
+        "https://resumes.example/other/cv.txt",
+        "https://resumes.example.evil/cv/a.txt",
+        "ftp://resumes.example/cv/a.txt",
+    ]:
+        with pytest.raises(ValueError):
+            BatchCandidate(id="a", uri=uri)
+    assert BatchCandidate(id="a", uri="https://resumes.example/cv/a.txt")
+
+    monkeypatch.setattr(batch, "BATCH_ROOT", str(tmp_path))
+    monkeypatch.setattr(batch, "BATCH_MAX_BYTES", 10)
+    (tmp_path / "long.txt").write_text("x" * 11)
+    with pytest.raises(ValueError, match="larger"):
+        await read_uri(str(tmp_path / "long.txt"))
+
+
+def make_task_manager(monkeypatch):
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.invalid")
+    monkeypatch.setenv("AZURE_OPENAI_TOKEN", "test")
+    task_manager = TaskManager(notification_sender_auth=None)
+    task_manager.agent = make_agent()
+    return task_manager
+
+
+def batch_params(task_id):
+    return TaskSendParams(
+        id=task_id,
+        sessionId="session",
+        message=Message(
+            role="user",
+            parts=[DataPart(data={"candidates": RESUMES[:3]})],
+        ),
+        metadata={"skillId": BATCH_SKILL},
+    )
+
+
+@pytest.mark.asyncio
+async def test_task_manager_streams_candidate_chunks(monkeypatch):
+    task_manager = make_task_manager(monkeypatch)
+    request = SendTaskStreamingRequest(id=1, params=batch_params("stream"))
+
+    events = [e async for e in await task_manager.on_send_task_subscribe(request)]
+
+    chunks = [
+        e.result.artifact
+        for e in events
+        if isinstance(e.result, TaskArtifactUpdateEvent)
+        and e.result.artifact.index == 1
+    ]
+    assert [c.append for c in chunks] == [False, True, True]
+    assert {c.parts[0].data["candidate_id"] for c in chunks} == {
+        "candidate-1",
+        "candidate-2",
+        "candidate-3",
+    }
+    assert events[-1].result.status.state == TaskState.COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_task_manager_returns_all_results(monkeypatch):
+    task_manager = make_task_manager(monkeypatch)
+    request = SendTaskRequest(id=1, params=batch_params("unary"))
+
+    response = await task_manager.on_send_task(request)
+
+    assert response.result.status.state == TaskState.COMPLETED
+    data = response.result.artifacts[0].parts[1].data
+    assert len(data["results"]) == 3
@@ -0,0 +1,60 @@
+"""Test cases for AutoGen team checkpoints across INPUT_REQUIRED turns"""
+import pytest
+
+from agents.autogen.agent import AutogenAgent
+from agents.autogen.checkpoints import TeamCheckpointStore
+from agents.autogen.stub_client import StubChatCompletionClient
+
+CANDIDATE = "Rate this candidate: Alex Chen; Full-stack developer, bilingual."
+
+
+@pytest.mark.asyncio
+async def test_follow_up_resumes_from_checkpoint(tmp_path):
+    client = StubChatCompletionClient(missing_info="the GitHub profile")
+    store = TeamCheckpointStore(directory=str(tmp_path))
+    agent = AutogenAgent(model_client=client, checkpoints=store)
+
+    asked = await agent.invoke(CANDIDATE, "session", task_id="task-1")
+    assert asked["require_user_input"]
+    assert asked["content"] == "Please provide the GitHub profile."
+    assert store.stats()["entries"] == 1
+    assert client.calls == 1
+
+    # A restarted server picks the checkpoint up from disk
+    agent = AutogenAgent(
+        model_client=client, checkpoints=TeamCheckpointStore(directory=str(tmp_path))
+    )
+    done = await agent.invoke("github.com/alexchen", "session", task_id="task-1")
+    assert done["is_task_complete"]
+    assert "Technical Rating: 8/10" in done["content"]
+    # Only the two raters ran again; the checkpoint is gone once complete
+    assert client.calls == 3
+    assert agent.checkpoints.stats() == {"entries": 0, "hits": 1, "misses": 0}
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_stream_checkpoints_when_asking():
+    agent = AutogenAgent(
+        model_client=StubChatCompletionClient(missing_info="a portfolio")
+    )
+    updates = [u async for u in agent.stream(CANDIDATE, "session", task_id="task-2")]
+    assert updates[-1]["require_user_input"]
+    assert agent.checkpoints.get("task-2")["asked_by"] == "TechRater"
+
+    updates = [u async for u in agent.stream("see portfolio", "s", task_id="task-2")]
+    assert updates[-1]["is_task_complete"]
+    assert agent.checkpoints.get("task-2") is None
+
+
+def test_store_is_bounded_and_expires(tmp_path):
+    store = TeamCheckpointStore(max_entries=2, directory=str(tmp_path))
+    for task_id in ("a", "b", "c"):
+        store.put(task_id, {"asked_by": "TechRater", "state": {}})
+    assert store.get("a") is None
+    assert store.get("c") is not None
+    assert len(list(tmp_path.iterdir())) == 2
+
+    expired = TeamCheckpointStore(ttl_seconds=0)
+    expired.put("a", {"state": {}})
+    assert expired.get("a") is None
@@ -0,0 +1,58 @@
+"""Test cases for the AutoGen parallel evaluation mode"""
+import pytest
+
+from agents.autogen.agent import AutogenAgent
+from agents.autogen.stub_client import StubChatCompletionClient
+
+CANDIDATE = "Rate this candidate: John Walker; 3 years SRE at Apple, AI enthusiast."
+
+
+@pytest.mark.asyncio
+async def test_parallel_invoke_runs_raters_concurrently():
+    client = StubChatCompletionClient(latency=0.05)
+    agent = AutogenAgent(model_client=client, mode="parallel", llm_reporter=True)
+
+    result = await agent.invoke(CANDIDATE, "session")
+
+    assert result["is_task_complete"]
+    assert "Technical Rating: 8/10" in result["content"]
+    assert "Inclusion Rating: 7/10" in result["content"]
+    # Two raters side by side, then the Reporter
+    assert client.calls == 3
+    assert client.peak_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_parallel_stream_reports_each_rater():
+    agent = AutogenAgent(model_client=StubChatCompletionClient())
+    updates = [
+        update async for update in agent.stream(CANDIDATE, "session", mode="parallel")
+    ]
+
+    progress = [u["content"] for u in updates if not u["is_task_complete"]]
+    assert any(p.startswith("TechRater: 8/10") for p in progress)
+    assert any(p.startswith("InclusionRater: 7/10") for p in progress)
+    assert updates[-1]["is_task_complete"]
+    assert "Inclusion Rating: 7/10" in updates[-1]["content"]
+
+
+@pytest.mark.asyncio
+async def test_swarm_mode_hands_off_sequentially():
+    client = StubChatCompletionClient(latency=0.05)
+    agent = AutogenAgent(model_client=client, mode="swarm", llm_reporter=True)
+
+    result = await agent.invoke(CANDIDATE, "session")
+
+    assert client.calls == 3
+    assert client.peak_in_flight == 1
+    assert result["is_task_complete"]
+    assert "Inclusion Rating: 7/10" in result["content"]
+
+
+def test_mode_for_skill():
+    agent = AutogenAgent(model_client=StubChatCompletionClient())
+    assert agent.mode_for_skill("autogen_parallel_rating_agent") == "parallel"
+    assert agent.mode_for_skill("autogen_rating_agent") == "swarm"
+    assert agent.mode_for_skill(None) == agent.mode
+    with pytest.raises(ValueError):
+        AutogenAgent(model_client=StubChatCompletionClient(), mode="chain")
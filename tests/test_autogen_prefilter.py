@@ -0,0 +1,146 @@
+"""Test cases for the AutoGen JD-fit prefilter and batch screening"""
+import numpy as np
+import pytest
+
+from agents.autogen.agent import (
+    DEFAULT_SCREEN_TOP_K,
+    JD_INCLUSION,
+    JD_TECH,
+    AutogenAgent,
+)
+from agents.autogen.prefilter import JDPrefilter, jd_sections
+from agents.autogen.stub_client import StubChatCompletionClient
+from agents.autogen.task_manager import TaskManager
+from common.types import (
+    DataPart,
+    InvalidParamsError,
+    Message,
+    SendTaskRequest,
+    SendTaskStreamingRequest,
+    TaskSendParams,
+    TextPart,
+)
+
+STRONG = (
+    "AI scientist. Fine-tuned large language models with PyTorch and Hugging "
+    "Face; built RAG services with LangChain and a vector database on Azure; "
+    "Docker, Kubernetes, CI/CD. Mentored underrepresented junior engineers and "
+    "led accessibility reviews across international teams. Bilingual."
+)
+TECH_ONLY = (
+    "Python engineer: PyTorch training pipelines, prompt engineering for LLM "
+    "applications, React and TypeScript frontends, SQL and MongoDB."
+)
+UNRELATED = "Retail store manager, 10 years of sales, scheduling and inventory."
+
+
+@pytest.fixture(scope="module")
+def prefilter():
+    return JDPrefilter.from_job_descriptions(JD_TECH, JD_INCLUSION)
+
+
+def test_ranks_by_fit(prefilter):
+    ranking = prefilter.rank([UNRELATED, TECH_ONLY, STRONG], ["u", "t", "s"])
+
+    assert [fit.candidate_id for fit in ranking] == ["s", "t", "u"]
+    strong, tech_only, unrelated = ranking
+    assert strong.side_scores["inclusion"] > tech_only.side_scores["inclusion"]
+    assert tech_only.side_scores["tech"] > unrelated.side_scores["tech"]
+    assert unrelated.score == 0
+    assert {"mentorship", "accessibility", "llm tooling"} <= set(strong.skills)
+    assert "mentorship" not in tech_only.skills
+
+
+def test_top_k_matches_full_ranking(prefilter):
+    rng = np.random.default_rng(0)
+    words = (STRONG + " " + TECH_ONLY + " " + UNRELATED).split()
+    resumes = [" ".join(rng.choice(words, size=60)) for _ in range(300)]
+
+    full = prefilter.rank(resumes)
+    top = prefilter.rank(resumes, top_k=10)
+
+    assert [f.score for f in top] == [f.score for f in full[:10]]
+    assert len(prefilter.rank(resumes, top_k=0)) == 0
+    assert prefilter.rank([]) == []
+
+
+def test_multi_word_keywords_need_every_word(prefilter):
+    skills = prefilter.score(["hugging", "hugging face"])["skills"]
+    tooling = prefilter.skills.index("llm tooling")
+    assert not skills[0, tooling]
+    assert skills[1, tooling]
+
+
+def test_jd_sections():
+    sections = jd_sections(JD_TECH)
+    assert sections[0].startswith("LLM Application Development:")
+    assert all(":" in section for section in sections)
+
+
+@pytest.mark.asyncio
+async def test_screen_evaluates_only_the_shortlist():
+    client = StubChatCompletionClient()
+    agent = AutogenAgent(model_client=client, mode="parallel")
+
+    result = await agent.screen(
+        [UNRELATED, STRONG, TECH_ONLY], "session", candidate_ids=["u", "s", "t"], top_k=2
+    )
+
+    assert result["is_task_complete"]
+    shortlist = result["data"]["shortlist"]
+    assert [c["candidate_id"] for c in shortlist] == ["s", "t"]
+    assert "Technical Rating: 8/10" in shortlist[0]["evaluation"]["content"]
+    assert result["data"]["ranked"] == 3
+    # Two raters per shortlisted candidate, report assembled locally
+    assert client.calls == 4
+    assert agent.session_data == {}
+
+
+@pytest.mark.asyncio
+async def test_screening_batch_from_message_parts():
+    def params(*parts):
+        return TaskSendParams(
+            id="task",
+            sessionId="session",
+            message=Message(role="user", parts=list(parts)),
+            metadata={"skillId": "autogen_jd_screening"},
+        )
+
+    data = DataPart(
+        data={"candidates": [{"id": "a", "text": STRONG}, TECH_ONLY], "top_k": 1}
+    )
+    resumes, ids, top_k = await TaskManager._screening_batch(params(data))
+    assert resumes == [STRONG, TECH_ONLY]
+    assert ids == ["a", "candidate-2"]
+    assert top_k == 1
+
+    text = TextPart(text=f"{STRONG}\n---\n{TECH_ONLY}\n---\n")
+    resumes, ids, top_k = await TaskManager._screening_batch(params(text))
+    assert resumes == [STRONG, TECH_ONLY]
+    assert ids == ["candidate-1", "candidate-2"]
+    assert top_k == DEFAULT_SCREEN_TOP_K
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("top_k", [0, -3, "5", 2.5, True, None])
+async def test_invalid_top_k_is_rejected(monkeypatch, top_k):
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.invalid")
+    monkeypatch.setenv("AZURE_OPENAI_TOKEN", "test")
+    task_manager = TaskManager(notification_sender_auth=None)
+    params = TaskSendParams(
+        id="task",
+        sessionId="session",
+        message=Message(
+            role="user", parts=[DataPart(data={"candidates": [STRONG], "top_k": top_k})]
+        ),
+        metadata={"skillId": "autogen_jd_screening"},
+    )
+
+    response = await task_manager.on_send_task(SendTaskRequest(id=1, params=params))
+    assert response.error.code == InvalidParamsError().code
+    assert "task" not in task_manager.tasks
+
+    response = await task_manager.on_send_task_subscribe(
+        SendTaskStreamingRequest(id=2, params=params)
+    )
+    assert response.error.code == InvalidParamsError().code
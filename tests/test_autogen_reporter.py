@@ -0,0 +1,101 @@
+"""Test cases for the AutoGen local Reporter"""
+import json
+
+import pytest
+from autogen_agentchat.messages import HandoffMessage, StructuredMessage, TextMessage
+from autogen_core import CancellationToken
+from autogen_core.models import AssistantMessage
+
+from agents.autogen.agent import AutogenAgent
+from agents.autogen.reporter import LocalReporter, RaterScore, build_report, parse_score
+from agents.autogen.stub_client import StubChatCompletionClient, _tool_name
+
+CANDIDATE = "Rate this candidate: Maria Garcia; PhD in ML, 5 years at Google."
+REPORT = (
+    "**Technical Rating: 8/10** - concrete ML projects.\n"
+    "**Inclusion Rating: 7/10** - mentors junior staff."
+)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["swarm", "parallel"])
+async def test_local_reporter_saves_a_model_call(mode):
+    local_client = StubChatCompletionClient()
+    llm_client = StubChatCompletionClient()
+
+    local = await AutogenAgent(model_client=local_client, mode=mode).invoke(
+        CANDIDATE, "session"
+    )
+    llm = await AutogenAgent(
+        model_client=llm_client, mode=mode, llm_reporter=True
+    ).invoke(CANDIDATE, "session")
+
+    assert local == llm
+    assert local["content"] == REPORT
+    assert local_client.calls == 2
+    assert llm_client.calls == 3
+    assert (
+        local_client.total_usage().prompt_tokens
+        < llm_client.total_usage().prompt_tokens
+    )
+
+
+@pytest.mark.asyncio
+async def test_local_reporter_reads_structured_and_handoff_scores():
+    reporter = LocalReporter()
+    messages = [
+        TextMessage(content=CANDIDATE, source="user"),
+        HandoffMessage(
+            content="Transferred to InclusionRater",
+            target="InclusionRater",
+            source="TechRater",
+            context=[
+                AssistantMessage(
+                    content='{"rating": 9, "reasoning": "RAG in production."}',
+                    source="TechRater",
+                )
+            ],
+        ),
+        StructuredMessage[RaterScore](
+            content=RaterScore(rating=6, reasoning="Some mentoring."),
+            source="InclusionRater",
+        ),
+    ]
+
+    response = await reporter.on_messages(messages, CancellationToken())
+
+    text = response.chat_message.content
+    assert text.endswith("\nTERMINATE")
+    report = json.loads(text.split("\n")[0])
+    assert report["status"] == "completed"
+    assert "**Technical Rating: 9/10** - RAG in production." in report["message"]
+    assert "**Inclusion Rating: 6/10** - Some mentoring." in report["message"]
+
+
+class NoHandoffClient(StubChatCompletionClient):
+    """TechRater answers its first turn without handing off."""
+
+    async def create(self, messages, *, tools=[], **kwargs):
+        if self.calls == 0:
+            tools = [t for t in tools if not _tool_name(t).startswith("transfer_to_")]
+        return await super().create(messages, tools=tools, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_swarm_rater_answering_without_handoff():
+    agent = AutogenAgent(model_client=NoHandoffClient(), mode="swarm")
+
+    result = await agent.invoke(CANDIDATE, "session")
+
+    assert result["is_task_complete"]
+    assert result["content"] == REPORT
+
+
+def test_invalid_or_missing_scores():
+    assert parse_score(TextMessage(content="I rate 8/10", source="TechRater")) is None
+    out_of_range = '{"rating": 11, "reasoning": "great"}'
+    assert parse_score(TextMessage(content=out_of_range, source="TechRater")) is None
+
+    report = build_report({"TechRater": RaterScore(rating=8, reasoning="ok")})
+    assert report["status"] == "error"
+    assert "InclusionRater" in report["message"]
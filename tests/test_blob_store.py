@@ -0,0 +1,85 @@
+"""Test cases for the BlobStore utility"""
+import base64
+
+import pytest
+
+from common.types import FileContent, FilePart, Message, TextPart
+from common.utils.blob_store import (
+    BlobStore,
+    blob_file_content,
+    externalize_message,
+    get_blob_store,
+    is_blob_uri,
+    read_file_bytes,
+)
+
+
+@pytest.fixture
+def store():
+    return BlobStore(max_bytes=8)
+
+
+def test_put_returns_content_addressed_handle(store):
+    uri = store.put(b"abc")
+    assert is_blob_uri(uri)
+    assert store.put(b"abc") == uri
+    assert store.stats()["blobs"] == 1
+    assert uri in store
+
+
+def test_get_returns_same_object(store):
+    data = b"abcd"
+    uri = store.put(data)
+    assert store.get(uri) is data
+    assert store.get("blob://missing") is None
+    assert store.get("https://example.com/a.png") is None
+
+
+def test_evicts_least_recently_used(store):
+    first = store.put(b"1234")
+    second = store.put(b"5678")
+    store.get(first)
+    third = store.put(b"9abc")
+    assert first in store
+    assert second not in store
+    assert third in store
+    assert store.stats()["evictions"] == 1
+
+
+def test_oversized_blob_is_kept(store):
+    uri = store.put(b"x" * 100)
+    assert store.get(uri) == b"x" * 100
+
+
+def test_read_file_bytes():
+    data = b"\x89PNG"
+    assert read_file_bytes(blob_file_content(data, "image/png")) == data
+    inline = FileContent(bytes=base64.b64encode(data).decode(), mimeType="image/png")
+    assert read_file_bytes(inline) == data
+    assert read_file_bytes(FileContent(uri="gs://bucket/a.png")) is None
+
+
+def test_externalize_message_inlines_blobs():
+    data = b"resume bytes"
+    message = Message(
+        role="user",
+        parts=[
+            TextPart(text="hi"),
+            FilePart(file=blob_file_content(data, "application/pdf", "cv.pdf")),
+        ],
+    )
+    wire = externalize_message(message)
+    assert wire is not message
+    assert is_blob_uri(message.parts[1].file.uri)
+    assert wire.parts[1].file.uri is None
+    assert base64.b64decode(wire.parts[1].file.bytes) == data
+    assert wire.parts[1].file.name == "cv.pdf"
+
+
+def test_externalize_message_without_blobs_is_not_copied():
+    message = Message(role="user", parts=[TextPart(text="hi")])
+    assert externalize_message(message) is message
+
+
+def test_default_store_is_shared():
+    assert get_blob_store() is get_blob_store()
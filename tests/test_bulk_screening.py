@@ -0,0 +1,240 @@
+"""Test cases for bulk screening from the CLI host"""
+import asyncio
+import csv
+import io
+import json
+import os
+
+import pytest
+
+from common.types import (
+    A2AClientHTTPError,
+    Artifact,
+    InternalError,
+    SendTaskResponse,
+    ServerBusyError,
+    Task,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+from hosts.cli import bulk_screening
+from hosts.cli.bulk_screening import (
+    ResultWriter,
+    ScreeningResult,
+    extract_document,
+    find_documents,
+    percentile,
+    screen_documents,
+    send_until_admitted,
+)
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+class InFlight:
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+
+
+class FakeAgent:
+    """Answers tasks after a delay, tracking how many run at once."""
+
+    def __init__(self, in_flight: InFlight, fail_on: str = ""):
+        self.in_flight = in_flight
+        self.fail_on = fail_on
+        self.payloads = []
+
+    async def send_task(self, payload):
+        self.payloads.append(payload)
+        self.in_flight.running += 1
+        self.in_flight.peak = max(self.in_flight.peak, self.in_flight.running)
+        await asyncio.sleep(0.01)
+        self.in_flight.running -= 1
+        text = payload["message"]["parts"][0]["text"]
+        if self.fail_on and self.fail_on in text:
+            return SendTaskResponse(error=InternalError(message="agent failed"))
+        task = Task(
+            id=payload["id"],
+            status=TaskStatus(state=TaskState.COMPLETED),
+            artifacts=[Artifact(parts=[TextPart(text=f"rated {len(text)} chars")])],
+        )
+        return SendTaskResponse(result=task)
+
+
+def write_resumes(directory, count):
+    for i in range(count):
+        (directory / f"resume{i}.txt").write_text(f"Resume {i}: Python, PyTorch")
+    (directory / "notes.png").write_bytes(b"\x89PNG")
+
+
+def test_find_and_extract_documents(tmp_path):
+    write_resumes(tmp_path, 2)
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "transcript.md").write_text("Interview transcript")
+
+    paths = find_documents(str(tmp_path))
+
+    assert [os.path.basename(p) for p in paths] == [
+        "resume0.txt",
+        "resume1.txt",
+        "transcript.md",
+    ]
+    assert extract_document(paths[0]) == "Resume 0: Python, PyTorch"
+    assert extract_document(os.path.join(DATA, "interview1.docx"))
+
+
+@pytest.mark.asyncio
+async def test_screen_documents_with_several_agents(tmp_path):
+    write_resumes(tmp_path, 6)
+    in_flight = InFlight()
+    agents = {
+        "tech": FakeAgent(in_flight),
+        "inclusion": FakeAgent(in_flight, fail_on="Resume 3"),
+    }
+    out = io.StringIO()
+    progress = io.StringIO()
+
+    summary = await screen_documents(
+        find_documents(str(tmp_path)),
+        agents,
+        ResultWriter(out),
+        concurrency=3,
+        workers=2,
+        skill_id="autogen_parallel_rating_agent",
+        progress=progress,
+    )
+
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert len(results) == 12
+    assert summary["tasks"] == 12 and summary["failed"] == 1
+    failed = [r for r in results if r["error"]]
+    assert failed[0]["agent"] == "inclusion"
+    assert failed[0]["document"].endswith("resume3.txt")
+    assert all(r["state"] == "completed" for r in results if not r["error"])
+    assert in_flight.peak == 3
+    assert agents["tech"].payloads[0]["metadata"]["skillId"] == (
+        "autogen_parallel_rating_agent"
+    )
+    assert "[12/12]" in progress.getvalue()
+    assert "p95" in progress.getvalue()
+
+
+def extract_and_log(path, max_chars=None):
+    """extract_document, logging each call to a file the test can read."""
+    with open(os.path.join(os.path.dirname(path), "extracted.log"), "a") as f:
+        f.write(f"{path}\n")
+    return "Resume"
+
+
+class BlockedAgent:
+    """Holds every task until released."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def send_task(self, payload):
+        await self.release.wait()
+        task = Task(id=payload["id"], status=TaskStatus(state=TaskState.COMPLETED))
+        return SendTaskResponse(result=task)
+
+
+@pytest.mark.asyncio
+async def test_extraction_stays_a_bounded_window_ahead(tmp_path, monkeypatch):
+    monkeypatch.setattr(bulk_screening, "extract_document", extract_and_log)
+    for i in range(30):
+        (tmp_path / f"resume{i}.txt").write_text(f"Resume {i}")
+    agent = BlockedAgent()
+    out = io.StringIO()
+
+    screening = asyncio.create_task(
+        screen_documents(
+            find_documents(str(tmp_path)),
+            {"tech": agent},
+            ResultWriter(out),
+            concurrency=2,
+            workers=2,
+        )
+    )
+    await asyncio.sleep(1)
+    extracted = (tmp_path / "extracted.log").read_text().splitlines()
+    # 2 documents sent, 2 queued and at most one per extraction process
+    assert 4 <= len(extracted) <= 6
+
+    agent.release.set()
+    summary = await screening
+    assert summary["tasks"] == 30 and summary["failed"] == 0
+
+
+class BusyAgent:
+    """Turns tasks away as busy a number of times before answering."""
+
+    def __init__(self, busy: list):
+        self.busy = busy
+        self.calls = 0
+
+    async def send_task(self, payload):
+        self.calls += 1
+        if self.busy:
+            busy = self.busy.pop(0)
+            if isinstance(busy, Exception):
+                raise busy
+            return busy
+        task = Task(id=payload["id"], status=TaskStatus(state=TaskState.COMPLETED))
+        return SendTaskResponse(result=task)
+
+
+@pytest.mark.asyncio
+async def test_busy_agents_are_retried_after_their_wait():
+    agent = BusyAgent(
+        [
+            A2AClientHTTPError(429, "Too Many Requests", retry_after=0.05),
+            SendTaskResponse(error=ServerBusyError(data={"retryAfter": 0.05})),
+        ]
+    )
+    start = asyncio.get_running_loop().time()
+
+    response = await send_until_admitted(agent, {"id": "t1"})
+
+    assert response.result.status.state == TaskState.COMPLETED
+    assert agent.calls == 3
+    assert asyncio.get_running_loop().time() - start >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_other_errors_and_exhausted_retries_are_final():
+    agent = BusyAgent([A2AClientHTTPError(500, "Internal Server Error")])
+    with pytest.raises(A2AClientHTTPError):
+        await send_until_admitted(agent, {"id": "t1"})
+    assert agent.calls == 1
+
+    busy = SendTaskResponse(error=ServerBusyError(data={"retryAfter": 0}))
+    agent = BusyAgent([busy] * 3)
+    response = await send_until_admitted(agent, {"id": "t2"}, max_retries=1)
+    assert response.error.code == ServerBusyError().code
+    assert agent.calls == 2
+
+
+def test_csv_output():
+    out = io.StringIO()
+    writer = ResultWriter(out, "csv")
+    writer.write(
+        ScreeningResult(
+            document="a.docx",
+            agent="tech",
+            task_id="t",
+            state="completed",
+            response="line one\nline two",
+        )
+    )
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert rows[0]["response"] == "line one\nline two"
+
+
+def test_percentile():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) == 0
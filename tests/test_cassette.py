@@ -0,0 +1,149 @@
+"""Test cases for record/replay of model calls"""
+import time
+import uuid
+
+import httpx
+import openai
+import pytest
+from google.genai import Client, types
+
+from benchmarks.stub_llm_server import LatencyDistribution, StubConfig, StubLLMServer
+from common.utils import cassette, rate_limiter
+from common.utils.cassette import (
+    Cassette,
+    CassetteMissError,
+    CassetteTransport,
+    request_key,
+)
+
+MESSAGES = [{"role": "user", "content": "Rate this candidate: Jane Doe"}]
+
+
+def azure_client(url: str, cassette: Cassette) -> openai.AsyncAzureOpenAI:
+    return openai.AsyncAzureOpenAI(
+        azure_endpoint=url,
+        api_key="stub",
+        api_version="2024-10-21",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=CassetteTransport(cassette)),
+    )
+
+
+async def chat(client: openai.AsyncAzureOpenAI) -> tuple[str, str]:
+    completion = await client.chat.completions.create(
+        model="gpt-4o", messages=MESSAGES
+    )
+    stream = await client.chat.completions.create(
+        model="gpt-4o", messages=MESSAGES, stream=True
+    )
+    streamed = "".join(
+        [c.choices[0].delta.content or "" async for c in stream if c.choices]
+    )
+    return completion.choices[0].message.content, streamed
+
+
+def test_request_key_ignores_host_ids_and_key_order():
+    def request(host, body):
+        return httpx.Request("POST", f"{host}/v1/chat/completions", json=body)
+
+    task = {"task_id": str(uuid.uuid4()), "messages": MESSAGES, "model": "gpt-4o"}
+    other = {"model": "gpt-4o", "messages": MESSAGES, "task_id": uuid.uuid4().hex}
+
+    assert request_key(request("http://a", task)) == request_key(
+        request("https://b", other)
+    )
+    assert request_key(request("http://a", task)) != request_key(
+        request("http://a", {**task, "model": "gpt-4o-mini"})
+    )
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay_openai(tmp_path):
+    config = StubConfig(latency=LatencyDistribution.parse("fixed:0.2"))
+    with StubLLMServer(config) as server:
+        recorded = await chat(azure_client(server.url, Cassette(tmp_path, "record")))
+        url = server.url
+    assert len(list(tmp_path.glob("*.json.gz"))) == 2
+
+    # The stub is gone: answers come from the cassettes, as slow as recorded
+    start = time.perf_counter()
+    replayed = await chat(azure_client(url, Cassette(tmp_path, "replay")))
+    assert replayed == recorded
+    assert time.perf_counter() - start >= 0.4
+
+    start = time.perf_counter()
+    fixed = await chat(azure_client(url, Cassette(tmp_path, "replay", latency=0.0)))
+    assert fixed == recorded
+    assert time.perf_counter() - start < 0.2
+
+
+@pytest.mark.asyncio
+async def test_replay_miss(tmp_path):
+    client = azure_client("http://127.0.0.1:9", Cassette(tmp_path, "replay"))
+    with pytest.raises(CassetteMissError):
+        await client.chat.completions.create(model="gpt-4o", messages=MESSAGES)
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_recorded(tmp_path):
+    with StubLLMServer(StubConfig(error_rate=1.0)) as server:
+        client = azure_client(server.url, Cassette(tmp_path, "record"))
+        with pytest.raises(openai.RateLimitError):
+            await client.chat.completions.create(model="gpt-4o", messages=MESSAGES)
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay_gemini(tmp_path):
+    def gemini(url: str, cassette: Cassette) -> Client:
+        return Client(
+            api_key="stub",
+            http_options=types.HttpOptions(
+                base_url=url,
+                async_client_args={"transport": CassetteTransport(cassette)},
+            ),
+        )
+
+    with StubLLMServer(StubConfig(reply="recorded answer")) as server:
+        client = gemini(server.url, Cassette(tmp_path, "record"))
+        await client.aio.models.generate_content(
+            model="gemini-2.0-flash-001", contents="hi"
+        )
+        url = server.url
+
+    client = gemini(url, Cassette(tmp_path, "replay"))
+    response = await client.aio.models.generate_content(
+        model="gemini-2.0-flash-001", contents="hi"
+    )
+    assert response.text == "recorded answer"
+
+
+@pytest.mark.asyncio
+async def test_replays_skip_the_rate_limiter(tmp_path, monkeypatch):
+    with StubLLMServer(StubConfig()) as server:
+        recorder = azure_client(server.url, Cassette(tmp_path, "record"))
+        await recorder.chat.completions.create(model="gpt-4o", messages=MESSAGES)
+        url = server.url
+
+    monkeypatch.setattr(cassette, "DEFAULT_MODE", "replay")
+    monkeypatch.setattr(cassette, "DEFAULT_DIR", str(tmp_path))
+    monkeypatch.setattr(cassette, "DEFAULT_LATENCY", "0")
+    monkeypatch.setattr(cassette, "_cassettes", {})
+    # One request a minute: a second call through the limiter would wait
+    monkeypatch.setitem(
+        rate_limiter._limiters,
+        "replay-test",
+        rate_limiter.RateLimiter(requests_per_minute=1),
+    )
+    client = openai.AsyncAzureOpenAI(
+        azure_endpoint=url,
+        api_key="stub",
+        api_version="2024-10-21",
+        max_retries=0,
+        http_client=rate_limiter.rate_limited_http_client("replay-test"),
+    )
+
+    start = time.perf_counter()
+    for _ in range(3):
+        await client.chat.completions.create(model="gpt-4o", messages=MESSAGES)
+    assert time.perf_counter() - start < 1
@@ -0,0 +1,123 @@
+"""Test cases for the host agent context budgeter"""
+from google.adk.models.llm_request import LlmRequest
+from google.genai import types
+
+from common.types import AgentCapabilities, AgentCard
+from hosts.multiagent.context_budget import (
+    ContextBudget,
+    ContextBudgeter,
+    count_tokens,
+)
+from hosts.multiagent.host_agent import HostAgent
+
+
+def text(role: str, value: str) -> types.Content:
+    return types.Content(role=role, parts=[types.Part.from_text(text=value)])
+
+
+def make_request(instruction: str, contents: list[types.Content]) -> LlmRequest:
+    return LlmRequest(
+        contents=contents,
+        config=types.GenerateContentConfig(system_instruction=instruction),
+    )
+
+
+def test_count_tokens():
+    assert count_tokens("") == 0
+    assert count_tokens("hello world") > 0
+
+
+def test_duplicate_long_parts_keep_latest():
+    rules = "Follow these rules strictly. " * 20
+    contents = [
+        text("user", rules),
+        text("user", "rate Jane"),
+        text("model", "Jane scores 8/10"),
+        text("user", rules),
+        text("user", "rate Bob"),
+    ]
+    request = make_request("instruction", contents)
+    report = ContextBudgeter().apply(request)
+    assert report.duplicates_removed == 1
+    assert [c.parts[0].text for c in request.contents][-2:] == [rules, "rate Bob"]
+    assert len(request.contents) == 4
+    assert report.tokens_saved > 0
+
+
+def test_old_turns_are_summarized():
+    contents = []
+    for i in range(30):
+        contents.append(text("user", f"Please rate candidate {i}. " + "cv " * 100))
+        contents.append(text("model", f"Candidate {i} scores {i % 10}/10"))
+    request = make_request("instruction", contents)
+    budgeter = ContextBudgeter(
+        ContextBudget(max_history_tokens=1000, keep_recent_contents=4)
+    )
+    report = budgeter.apply(request)
+
+    assert report.contents_summarized == 56
+    assert len(request.contents) == 5
+    assert request.contents[0].parts[0].text.startswith("Summary of the earlier")
+    assert request.contents[-2].parts[0].text.startswith("Please rate candidate 29")
+    assert report.tokens_after < report.tokens_before
+    assert budgeter.stats()["tokens_saved"] == report.tokens_saved
+
+
+def test_function_call_pairs_stay_together():
+    call = types.Content(
+        role="model",
+        parts=[
+            types.Part(
+                function_call=types.FunctionCall(
+                    name="send_task", args={"agent_name": "Rater"}
+                )
+            )
+        ],
+    )
+    response = types.Content(
+        role="user",
+        parts=[
+            types.Part(
+                function_response=types.FunctionResponse(
+                    name="send_task", response={"result": "ok"}
+                )
+            )
+        ],
+    )
+    contents = [text("user", "x " * 800), text("user", "rate Jane"), call, response]
+    request = make_request("instruction", contents)
+    ContextBudgeter(
+        ContextBudget(max_history_tokens=100, keep_recent_contents=2)
+    ).apply(request)
+    # The window starts at "rate Jane" so the call keeps its response.
+    assert request.contents[1].parts[0].text == "rate Jane"
+    assert request.contents[2] is call
+    assert request.contents[3] is response
+
+
+def test_roster_limited_to_relevant_agents():
+    cards = [
+        AgentCard(
+            name=f"Agent {i}",
+            description=f"Handles job family {i}",
+            url=f"http://localhost:{10000 + i}/",
+            version="1.0",
+            capabilities=AgentCapabilities(),
+            skills=[],
+        )
+        for i in range(20)
+    ]
+    cards[7].description = "Runs background verification of credentials"
+    host = HostAgent(cards)
+    host.context_budgeter = ContextBudgeter(ContextBudget(max_agents=3))
+    roster = host.agents
+    request = make_request(
+        f"Intro\n{roster}\nOutro", [text("user", "verify the credentials of Jane")]
+    )
+    report = host.context_budgeter.apply(request, roster, host.select_roster)
+
+    instruction = request.config.system_instruction
+    assert report.agents_omitted == 17
+    assert '"Agent 7"' in instruction
+    assert instruction.count('{"name"') == 3
+    assert "17 more agents" in instruction
@@ -0,0 +1,131 @@
+"""Test cases for HostAgent.send_tasks_parallel"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from common.types import (
+    AgentCapabilities,
+    AgentCard,
+    AgentSkill,
+    CancelTaskResponse,
+    Message,
+    Task,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+from hosts.multiagent.host_agent import HostAgent
+from hosts.multiagent.remote_agent_connection import RemoteAgentConnections
+
+
+class FakeConnection(RemoteAgentConnections):
+    """Answers after a fixed delay instead of calling a remote agent."""
+
+    def __init__(self, card: AgentCard, delay: float, state=TaskState.COMPLETED):
+        super().__init__(card)
+        self.delay = delay
+        self.state = state
+        self.requests = []
+        self.canceled = []
+        self.agent_client = SimpleNamespace(cancel_task=self._cancel)
+
+    async def _cancel(self, payload):
+        self.canceled.append(payload["id"])
+        return CancelTaskResponse(
+            result=Task(id=payload["id"], status=TaskStatus(state=TaskState.CANCELED))
+        )
+
+    async def _send_task(self, request, task_callback):
+        self.requests.append(request)
+        await asyncio.sleep(self.delay)
+        return Task(
+            id=request.id,
+            sessionId=request.sessionId,
+            status=TaskStatus(
+                state=self.state,
+                message=Message(
+                    role="agent", parts=[TextPart(text=f"{self.card.name} done")]
+                ),
+            ),
+        )
+
+
+def make_card(name: str) -> AgentCard:
+    return AgentCard(
+        name=name,
+        url=f"http://localhost/{name}",
+        version="1.0",
+        capabilities=AgentCapabilities(),
+        skills=[AgentSkill(id=name, name=name)],
+    )
+
+
+def make_host(**connections) -> HostAgent:
+    host = HostAgent([])
+    for name, (delay, state) in connections.items():
+        card = make_card(name)
+        host.cards[name] = card
+        host.remote_agent_connections[name] = FakeConnection(card, delay, state)
+    return host
+
+
+def make_tool_context():
+    return SimpleNamespace(
+        state={"session_id": "session-1"},
+        actions=SimpleNamespace(skip_summarization=False, escalate=False),
+    )
+
+
+@pytest.mark.asyncio
+async def test_agents_run_concurrently():
+    host = make_host(
+        rater=(0.2, TaskState.COMPLETED), checker=(0.2, TaskState.COMPLETED)
+    )
+    context = make_tool_context()
+    start = time.perf_counter()
+    result = await host.send_tasks_parallel(["rater", "checker"], "Ada", context)
+    assert time.perf_counter() - start < 0.35
+    assert list(result) == ["rater", "checker"]
+    assert result["rater"]["response"] == ["rater done"]
+    assert result["checker"]["state"] == TaskState.COMPLETED
+    assert context.state["session_active"] is False
+
+    # Each agent receives its own task id.
+    ids = {c.requests[0].id for c in host.remote_agent_connections.values()}
+    assert len(ids) == 2
+
+
+@pytest.mark.asyncio
+async def test_timeout_is_per_agent():
+    host = make_host(fast=(0.01, TaskState.COMPLETED), slow=(1, TaskState.COMPLETED))
+    result = await host.send_tasks_parallel(
+        ["fast", "slow"], "Ada", make_tool_context(), timeout_seconds=0.1
+    )
+    assert result["fast"]["response"] == ["fast done"]
+    assert result["slow"]["state"] == TaskState.FAILED
+    assert "Timed out" in result["slow"]["error"]
+    # The task given up on is canceled on its agent, the finished one is not
+    slow = host.remote_agent_connections["slow"]
+    assert slow.canceled == [slow.requests[0].id]
+    assert host.remote_agent_connections["fast"].canceled == []
+
+
+@pytest.mark.asyncio
+async def test_input_required_keeps_session_on_agent():
+    host = make_host(
+        rater=(0.01, TaskState.COMPLETED), checker=(0.01, TaskState.INPUT_REQUIRED)
+    )
+    context = make_tool_context()
+    await host.send_tasks_parallel(["rater", "checker"], "Ada", context)
+    assert context.state["session_active"] is True
+    assert context.state["agent"] == "checker"
+    assert context.actions.escalate is True
+
+
+@pytest.mark.asyncio
+async def test_unknown_agent():
+    host = make_host(rater=(0, TaskState.COMPLETED))
+    with pytest.raises(ValueError):
+        await host.send_tasks_parallel(["rater", "nobody"], "Ada", make_tool_context())
@@ -0,0 +1,63 @@
+"""Test cases for incremental roster updates in HostAgent"""
+from types import SimpleNamespace
+
+from common.types import AgentCapabilities, AgentCard
+from hosts.multiagent.host_agent import HostAgent
+
+
+def make_card(i: int) -> AgentCard:
+    return AgentCard(
+        name=f"Agent {i}",
+        description=f"Handles job family {i}",
+        url=f"http://localhost:{10000 + i}/",
+        version="1.0",
+        capabilities=AgentCapabilities(),
+        skills=[],
+    )
+
+
+def make_context(**state):
+    return SimpleNamespace(state=state)
+
+
+def test_register_and_unregister_update_roster():
+    host = HostAgent([make_card(i) for i in range(3)])
+    assert host.agents.count("\n") == 2
+    version = host.roster_version
+
+    host.register_agent_card(make_card(3))
+    assert host.roster_version == version + 1
+    assert '"Agent 3"' in host.agents
+    assert "Agent 3" in host.remote_agent_connections
+
+    assert host.unregister_agent_card("Agent 1") is True
+    assert '"Agent 1"' not in host.agents
+    assert "Agent 1" not in host.cards
+    assert host.unregister_agent_card("Agent 1") is False
+    assert [a["name"] for a in host.list_remote_agents()] == [
+        "Agent 0",
+        "Agent 2",
+        "Agent 3",
+    ]
+
+
+def test_instruction_prefix_is_cached_per_roster():
+    host = HostAgent([make_card(i) for i in range(50)])
+    first = host.root_instruction(make_context())
+    prefix = host._instruction_prefix()
+    assert host._instruction_prefix() is prefix
+    assert first.startswith(prefix)
+    assert "Current Active Agent: None" in first
+
+    host.register_agent_card(make_card(50))
+    assert host._instruction_prefix() is not prefix
+    assert '"Agent 50"' in host.root_instruction(make_context())
+
+
+def test_replacing_agent_keeps_single_entry():
+    host = HostAgent([make_card(1)])
+    updated = make_card(1)
+    updated.description = "New description"
+    host.register_agent_card(updated)
+    assert host.agents.count("Agent 1") == 1
+    assert "New description" in host.agents
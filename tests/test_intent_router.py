@@ -0,0 +1,112 @@
+"""Test cases for the local intent router"""
+import pytest
+
+from common.types import AgentCapabilities, AgentCard, AgentSkill
+from hosts.multiagent.router import IntentRouter, normalize_message
+
+RATING = AgentCard(
+    name="AutoGen Candidate Rating Agent",
+    description=(
+        "Advanced multi-agent rating system for SAP AI Scientist candidates. "
+        "Evaluates technical expertise and diversity/inclusion background."
+    ),
+    url="http://localhost:10003/",
+    version="1.0.0",
+    capabilities=AgentCapabilities(),
+    skills=[
+        AgentSkill(
+            id="autogen_rating_agent",
+            name="AutoGen Candidate Rating System",
+            tags=["rating", "candidate", "multi-agent", "technical", "inclusion"],
+            examples=["Rate this candidate: John Walker; 3 years SRE at Apple."],
+        )
+    ],
+)
+BACKGROUND = AgentCard(
+    name="Background Check Agent",
+    description=(
+        "Comprehensive background verification agent for candidate screening. "
+        "Verifies universities, companies, and project claims."
+    ),
+    url="http://localhost:10004/",
+    version="1.0.0",
+    capabilities=AgentCapabilities(),
+    skills=[
+        AgentSkill(
+            id="background_check_agent",
+            name="Background Verification Agent",
+            tags=["background-check", "verification", "credentials"],
+            examples=["Verify this candidate: John Smith, graduated from MIT."],
+        )
+    ],
+)
+
+
+@pytest.fixture
+def router():
+    return IntentRouter([RATING, BACKGROUND])
+
+
+@pytest.mark.parametrize(
+    "message, agent, method",
+    [
+        ("Please rate Jane Doe, 5 years of ML at SAP", RATING, "keyword"),
+        ("Can you evaluate this resume?", RATING, "keyword"),
+        ("Run a background check on Jane Doe", BACKGROUND, "keyword"),
+        ("Ask the background check agent about Jane", BACKGROUND, "name"),
+        ("Did she really attend those universities?", BACKGROUND, "similarity"),
+    ],
+)
+def test_routes(router, message, agent, method):
+    decision = router.route(message)
+    assert decision.agent_url == agent.url
+    assert decision.method == method
+
+
+def test_ambiguous_or_unknown_falls_back(router):
+    assert router.route("Rate Jane and run a background check") is None
+    assert router.route("hello there") is None
+    assert IntentRouter().route("rate Jane") is None
+
+
+def test_conversation_follow_up_keeps_agent(router):
+    router.route("Run a background check on Jane", conversation_id="c1")
+    decision = router.route("thanks, go ahead", conversation_id="c1")
+    assert decision.agent_url == BACKGROUND.url
+    assert decision.method == "conversation"
+    assert decision.confidence == router.conversation_confidence
+    assert router.route("thanks, go ahead", conversation_id="c2") is None
+
+
+def test_conversation_does_not_override_an_intent(router):
+    router.route("Run a background check on Jane", conversation_id="c1")
+    # Several intents: the LLM fans out rather than the check agent taking all
+    assert (
+        router.route(
+            "Now rate Jane and also run a background check on Bob",
+            conversation_id="c1",
+        )
+        is None
+    )
+    # A rating request whose resume happens to match the check's keywords
+    assert (
+        router.route(
+            "Please rate this candidate: Jane Doe, ten years of employment "
+            "history at SAP, PhD in machine learning",
+            conversation_id="c1",
+        )
+        is None
+    )
+    assert router.route("ok, go ahead", conversation_id="c1").agent_url == (
+        BACKGROUND.url
+    )
+
+
+def test_set_agents_resets_decisions(router):
+    router.route("Run a background check on Jane", conversation_id="c1")
+    router.set_agents([RATING])
+    assert router.route("Run a background check on Jane", conversation_id="c1") is None
+
+
+def test_normalize_message():
+    assert normalize_message("  Rate   Jane!! ") == normalize_message("rate jane")
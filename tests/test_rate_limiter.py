@@ -0,0 +1,192 @@
+"""Test cases for the Azure OpenAI rate limiter"""
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+from openai import AsyncAzureOpenAI
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+
+from common.utils.rate_limiter import (
+    RateLimitedTransport,
+    RateLimiter,
+    TokenBucket,
+    estimate_request_tokens,
+    parse_retry_after,
+)
+
+COMPLETION = {
+    "id": "chatcmpl-1",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o",
+    "choices": [
+        {
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": "ok"},
+        }
+    ],
+    "usage": {"prompt_tokens": 5, "completion_tokens": 1, "total_tokens": 6},
+}
+
+
+def stub_azure_openai(throttle: int, delay: float = 0.0):
+    """A local Azure OpenAI stand-in answering the first `throttle` calls with 429."""
+    app = Starlette()
+    app.state.calls = 0
+    app.state.active = 0
+    app.state.max_active = 0
+
+    async def chat(request):
+        app.state.calls += 1
+        if app.state.calls <= throttle:
+            return JSONResponse(
+                {"error": {"code": "429", "message": "Rate limit exceeded"}},
+                status_code=429,
+                headers={"retry-after-ms": "50", "x-ratelimit-remaining-requests": "0"},
+            )
+        app.state.active += 1
+        app.state.max_active = max(app.state.max_active, app.state.active)
+        await asyncio.sleep(delay)
+        app.state.active -= 1
+        return JSONResponse(
+            COMPLETION,
+            headers={
+                "x-ratelimit-remaining-requests": "99",
+                "x-ratelimit-remaining-tokens": "50000",
+            },
+        )
+
+    app.add_route("/openai/deployments/{deployment}/chat/completions", chat, ["POST"])
+    return app
+
+
+def azure_client(app, limiter: RateLimiter) -> AsyncAzureOpenAI:
+    transport = RateLimitedTransport(limiter, transport=httpx.ASGITransport(app=app))
+    return AsyncAzureOpenAI(
+        api_key="test",
+        azure_endpoint="http://stub",
+        api_version="2025-03-01-preview",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=transport),
+    )
+
+
+async def ask(client: AsyncAzureOpenAI) -> str:
+    response = await client.chat.completions.create(
+        model="gpt-4o", messages=[{"role": "user", "content": "hi"}], max_tokens=10
+    )
+    return response.choices[0].message.content
+
+
+@pytest.mark.asyncio
+async def test_retries_429_after_retry_after():
+    app = stub_azure_openai(throttle=2)
+    limiter = RateLimiter(requests_per_minute=6000, max_concurrency=8)
+    start = time.monotonic()
+
+    assert await ask(azure_client(app, limiter)) == "ok"
+
+    assert app.state.calls == 3
+    assert time.monotonic() - start >= 0.1  # two 50ms Retry-After pauses
+    stats = limiter.stats()
+    assert stats["throttled"] == 2
+    # Halved twice, then one additive increase
+    assert stats["concurrency"] == pytest.approx(2.5)
+    assert stats["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_hands_429_to_caller_after_max_retries():
+    app = stub_azure_openai(throttle=10)
+    limiter = RateLimiter(requests_per_minute=6000)
+    client = httpx.AsyncClient(
+        transport=RateLimitedTransport(
+            limiter, transport=httpx.ASGITransport(app=app), max_retries=1
+        )
+    )
+    response = await client.post(
+        "http://stub/openai/deployments/gpt-4o/chat/completions", json={}
+    )
+    assert response.status_code == 429
+    assert app.state.calls == 2
+    assert limiter.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrency_window_limits_burst():
+    app = stub_azure_openai(throttle=0, delay=0.02)
+    limiter = RateLimiter(max_concurrency=2)
+    client = azure_client(app, limiter)
+
+    results = await asyncio.gather(*(ask(client) for _ in range(6)))
+
+    assert results == ["ok"] * 6
+    assert app.state.max_active <= 2
+    assert limiter.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_waiters_served_in_arrival_order():
+    limiter = RateLimiter(max_concurrency=1)
+    first = await limiter.acquire()
+    order = []
+
+    async def caller(i):
+        permit = await limiter.acquire()
+        order.append(i)
+        permit.release()
+
+    callers = [asyncio.create_task(caller(i)) for i in range(5)]
+    await asyncio.sleep(0.01)
+    assert order == []
+    first.release()
+    await asyncio.gather(*callers)
+    assert order == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_tokens_per_minute_budget_delays_requests():
+    limiter = RateLimiter(tokens_per_minute=6000)  # 100 tokens per second
+    await limiter.acquire(estimated_tokens=6000)
+    start = time.monotonic()
+    await limiter.acquire(estimated_tokens=20)
+    assert time.monotonic() - start >= 0.15
+
+
+def test_remaining_headers_trim_buckets():
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=10_000)
+    limiter._observe(
+        200,
+        httpx.Headers(
+            {"x-ratelimit-remaining-requests": "3", "x-ratelimit-remaining-tokens": "42"}
+        ),
+    )
+    assert limiter.requests.level < 4
+    assert limiter.tokens.level < 50
+
+
+def test_token_bucket_refill():
+    bucket = TokenBucket(per_minute=600, capacity=1)
+    assert bucket.wait_time(1) == 0
+    bucket.consume(1)
+    assert bucket.wait_time(1) == pytest.approx(0.1, abs=0.01)
+    # Requests larger than the burst only wait for a full bucket
+    assert bucket.wait_time(5) == pytest.approx(0.1, abs=0.01)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(httpx.Headers({"retry-after-ms": "250"})) == 0.25
+    assert parse_retry_after(httpx.Headers({"retry-after": "2"})) == 2
+    assert parse_retry_after(httpx.Headers({})) is None
+
+
+def test_estimate_request_tokens():
+    body = json.dumps(
+        {"messages": [{"role": "user", "content": "x" * 400}], "max_tokens": 100}
+    ).encode()
+    assert 200 <= estimate_request_tokens(body) <= 220
+    assert estimate_request_tokens(b"not json") == 2
@@ -0,0 +1,146 @@
+"""Test cases for the stub LLM server of the end-to-end benchmark"""
+from concurrent.futures import ThreadPoolExecutor
+
+import openai
+import pytest
+from google.genai import Client, types
+
+from agents.autogen.agent import AutogenAgent
+from benchmarks.stub_llm_server import (
+    LatencyDistribution,
+    StubConfig,
+    StubLLMServer,
+    schema_instance,
+)
+from hosts.multiagent.gemini import HOST_MODEL, host_model
+
+CANDIDATE = "Rate this candidate: John Walker; 3 years SRE at Apple, AI enthusiast."
+
+
+@pytest.fixture
+def stub_server():
+    with StubLLMServer(StubConfig(reply="hello from the stub", seed=1)) as server:
+        yield server
+
+
+def azure_client(url: str, max_retries: int = 2) -> openai.AsyncAzureOpenAI:
+    return openai.AsyncAzureOpenAI(
+        azure_endpoint=url,
+        api_key="stub",
+        api_version="2024-10-21",
+        max_retries=max_retries,
+    )
+
+
+def test_latency_distribution():
+    assert LatencyDistribution.parse("uniform:0.1,0.3").params == [0.1, 0.3]
+    with pytest.raises(ValueError):
+        LatencyDistribution.parse("gamma:1")
+    with pytest.raises(ValueError):
+        LatencyDistribution.parse("normal:1")
+
+
+def test_schema_instance_prefers_completed():
+    schema = {
+        "type": "object",
+        "properties": {
+            "status": {"$ref": "#/$defs/Status"},
+            "score": {"type": "integer", "minimum": 1, "maximum": 10},
+            "tags": {"type": "array", "items": {"type": "string"}},
+        },
+        "$defs": {"Status": {"enum": ["input_required", "completed", "error"]}},
+    }
+    assert schema_instance(schema) == {
+        "status": "completed",
+        "score": 5,
+        "tags": ["stub"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_azure_openai_chat(stub_server):
+    client = azure_client(stub_server.url)
+    messages = [{"role": "user", "content": "hi"}]
+
+    completion = await client.chat.completions.create(model="gpt-4o", messages=messages)
+    stream = await client.chat.completions.create(
+        model="gpt-4o", messages=messages, stream=True
+    )
+    streamed = "".join(
+        [c.choices[0].delta.content or "" async for c in stream if c.choices]
+    )
+
+    assert completion.choices[0].message.content == "hello from the stub"
+    assert completion.usage.prompt_tokens > 0
+    assert streamed == "hello from the stub"
+    assert stub_server.stub.stats["requests:gpt-4o"] == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_with_retry_after():
+    config = StubConfig(error_rate=1.0, retry_after=7)
+    with StubLLMServer(config) as server:
+        client = azure_client(server.url, max_retries=0)
+        with pytest.raises(openai.RateLimitError) as error:
+            await client.chat.completions.create(
+                model="gpt-4o", messages=[{"role": "user", "content": "hi"}]
+            )
+    assert error.value.response.headers["retry-after"] == "7"
+
+
+@pytest.mark.asyncio
+async def test_gemini_text_and_function_call(stub_server):
+    stub_server.stub.config.tool_calls = {"send_task": {"message": "{message}"}}
+    client = Client(
+        api_key="stub", http_options=types.HttpOptions(base_url=stub_server.url)
+    )
+
+    text = await client.aio.models.generate_content(model=HOST_MODEL, contents="hi")
+    call = await client.aio.models.generate_content(
+        model=HOST_MODEL,
+        contents="rate Jane",
+        config=types.GenerateContentConfig(
+            tools=[
+                types.Tool(
+                    function_declarations=[
+                        types.FunctionDeclaration(name="send_task")
+                    ]
+                )
+            ]
+        ),
+    )
+
+    assert text.text == "hello from the stub"
+    assert call.function_calls[0].name == "send_task"
+    assert call.function_calls[0].args == {"message": "rate Jane"}
+
+
+def test_host_model_base_url(monkeypatch):
+    monkeypatch.delenv("GEMINI_BASE_URL", raising=False)
+    assert host_model().base_url is None
+
+    monkeypatch.setenv("GEMINI_BASE_URL", "http://127.0.0.1:8090")
+    monkeypatch.setenv("GOOGLE_API_KEY", "stub")
+    model = host_model()
+    assert model.model == HOST_MODEL
+    assert model.api_client is model.api_client
+    # Each of the host's message threads gets a Client of its own
+    with ThreadPoolExecutor(1) as pool:
+        assert pool.submit(lambda: model.api_client).result() is not model.api_client
+    assert model.base_url == "http://127.0.0.1:8090"
+
+
+@pytest.mark.asyncio
+async def test_autogen_swarm_through_the_stub(stub_server, monkeypatch):
+    stub_server.stub.config.tool_calls = {
+        "transfer_to_inclusionrater": {},
+        "transfer_to_reporter": {},
+    }
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", stub_server.url)
+    monkeypatch.setenv("AZURE_OPENAI_TOKEN", "stub")
+
+    result = await AutogenAgent(mode="swarm").invoke(CANDIDATE, "session")
+
+    assert result["is_task_complete"]
+    assert "Rating" in result["content"]
+    assert stub_server.stub.stats["requests:gpt-4o"] == 2